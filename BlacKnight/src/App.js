@@ -16,7 +16,7 @@ import VersionControlSection from "./components/VersionControlSection";
 
 // API 서비스 가져오기
 import {
-  generateArticle,
+  generateAndSaveArticle,
   saveInitialArticle,
   saveModifiedArticle,
 } from "./services/api";
@@ -50,6 +50,8 @@ function App({ user, onLogout }) {
   const [versions, setVersions] = useState([]);
   const [currentVersionIndex, setCurrentVersionIndex] = useState(-1);
   const originIdRef = useRef(null);
+  // 마지막으로 저장된 버전 번호 (서버가 정한 번호, 직접 저장할 때 다음 번호 계산용)
+  const savedVersionRef = useRef(0);
 
   // API 작업 중인지 확인하는 상태값 추가 (기사 생성 또는 수정 중)
   const isProcessing = isGeneratingArticle || isModifyingArticle;
@@ -117,9 +119,10 @@ function App({ user, onLogout }) {
     setIsArticleModified(false);
     setHighlightedDiff("");
 
+    // 템플릿 예시는 다시 생성해도 같으므로 context로 따로 보내 프롬프트 캐시 사용
+    const context = `형식 참고 예시: ${pdfContent}`;
     const prompt = `
       다음 정보를 바탕으로 기사를 작성해주세요:
-      형식 참고 예시: ${pdfContent}
       기관/조직: ${formData.organization}
       사업명: ${formData.project}
       업체명: ${formData.company}
@@ -135,7 +138,17 @@ function App({ user, onLogout }) {
     setIsGeneratingArticle(true); // 생성 버튼에만 스피너 표시
 
     try {
-      const generatedArticle = await generateArticle(prompt);
+      // 생성 결과는 서버가 바로 저장 (본문을 다시 올리지 않음)
+      const { output: generatedArticle, saved } = await generateAndSaveArticle(
+        prompt,
+        user?.id,
+        context,
+        {
+          // 버전은 서버가 기존 버전 다음 번호로 정함
+          originId: originIdRef.current || undefined,
+          description: jsonData, // 원문 요청 정보
+        }
+      );
       if (generatedArticle) {
         logger.log("기사 생성 성공", generatedArticle.substring(0, 50) + "...");
         logger.log("기사 생성 JSON:", jsonData);
@@ -152,23 +165,30 @@ function App({ user, onLogout }) {
 
         showNotification("흑기사가 초안 작성을 완료하였습니다.", "success");
 
-        const newsId = uuidv4();
-        if (!originIdRef.current) originIdRef.current = newsId;
-
-        // DB에 기사 저장
-        try {
-          await saveInitialArticle({
-            newsId,
-            originId: originIdRef.current,
-            ownerId: String(user?.id),
-            version: "1",
-            createdAt: initialVersion.timestamp,
-            content: generatedArticle,
-            description: jsonData, // 원문 요청 정보
-          });
-          logger.log("기사 생성 로그 API 전송 완료");
-        } catch (apiError) {
-          logger.warn("기사 생성 로그 API 전송 실패", apiError);
+        if (saved && !saved.error) {
+          if (!originIdRef.current) originIdRef.current = saved.originId;
+          savedVersionRef.current = Number(saved.version) || 1;
+          logger.log("기사 생성과 함께 저장 완료", saved.newsId);
+        } else {
+          // 서버 저장에 실패한 경우에만 직접 저장
+          const newsId = uuidv4();
+          if (!originIdRef.current) originIdRef.current = newsId;
+          savedVersionRef.current = 1;
+
+          try {
+            await saveInitialArticle({
+              newsId,
+              originId: originIdRef.current,
+              ownerId: String(user?.id),
+              version: "1",
+              createdAt: initialVersion.timestamp,
+              content: generatedArticle,
+              description: jsonData, // 원문 요청 정보
+            });
+            logger.log("기사 생성 로그 API 전송 완료");
+          } catch (apiError) {
+            logger.warn("기사 생성 로그 API 전송 실패", apiError);
+          }
         }
 
         // 콜백 함수가 제공된 경우 생성된 기사를 전달
@@ -227,7 +247,18 @@ function App({ user, onLogout }) {
     setIsModifyingArticle(true); // 수정 버튼에만 스피너 표시
 
     try {
-      const newModifiedArticle = await generateArticle(prompt);
+      // 수정 결과는 서버가 같은 기사(originId)의 새 버전으로 바로 저장
+      const { output: newModifiedArticle, saved } = await generateAndSaveArticle(
+        prompt,
+        user?.id,
+        undefined,
+        {
+          originId: originIdRef.current || undefined,
+          description: {
+            modificationRequest,
+          },
+        }
+      );
       if (newModifiedArticle) {
         logger.log(
           "기사 수정 성공",
@@ -258,21 +289,28 @@ function App({ user, onLogout }) {
 
         showNotification("흑기사가 수정을 완료했습니다.", "success");
 
-        const newsId = uuidv4();
-        if (!originIdRef.current) originIdRef.current = newsId;
-
-        // DB API 호출
-        await saveModifiedArticle({
-          newsId,
-          originId: originIdRef.current,
-          ownerId: String(user?.id),
-          version: (setVersions.length + 1).toString(),
-          createdAt: new Date().toISOString(),
-          content: newModifiedArticle,
-          description: {
-            modificationRequest,
-          },
-        });
+        if (saved && !saved.error) {
+          if (!originIdRef.current) originIdRef.current = saved.originId;
+          savedVersionRef.current = Number(saved.version) || newVersions.length;
+        } else {
+          // 서버 저장에 실패한 경우에만 직접 저장 (서버가 마지막으로 정한 번호 다음)
+          const newsId = uuidv4();
+          if (!originIdRef.current) originIdRef.current = newsId;
+          savedVersionRef.current =
+            Math.max(savedVersionRef.current, versions.length) + 1;
+
+          await saveModifiedArticle({
+            newsId,
+            originId: originIdRef.current,
+            ownerId: String(user?.id),
+            version: savedVersionRef.current.toString(),
+            createdAt: new Date().toISOString(),
+            content: newModifiedArticle,
+            description: {
+              modificationRequest,
+            },
+          });
+        }
 
         // 콜백 함수가 제공된 경우 수정된 기사를 전달
         if (typeof callback === "function") {
@@ -304,6 +342,7 @@ function App({ user, onLogout }) {
     const timestamp = new Date().toISOString();
     const newNewsId = uuidv4();
     originIdRef.current = newNewsId; // 새 origin으로 전환
+    savedVersionRef.current = 1;
 
     try {
       await saveInitialArticle({
@@ -11,26 +11,27 @@ const logger = {
   error: process.env.NODE_ENV === "production" ? () => {} : console.error,
 };
 
-// 기사 생성 API 호출
-export const generateArticle = async (prompt) => {
+// 생성 요청 제한 시간 (ms) - 생성과 저장을 함께 요청하면 이어 쓰기, 병렬 초안, 저장까지 기다림
+const GENERATION_TIMEOUT = 30000;
+const GENERATE_AND_SAVE_TIMEOUT = 120000;
+
+// 기사 생성 API 요청 (응답 본문 전체 반환)
+const requestGeneration = async (body, userId, timeout = GENERATION_TIMEOUT) => {
   try {
     logger.log("기사 생성 API 요청 전송:", AI_LAMBDA_URL);
-    logger.log("요청 데이터:", { prompt });
-
-    const response = await axios.post(
-      AI_LAMBDA_URL,
-      { prompt },
-      {
-        headers: {
-          "Content-Type": "application/json",
-          Accept: "application/json",
-        },
-        timeout: 30000,
-      }
-    );
+    logger.log("요청 데이터:", { prompt: body.prompt });
+
+    const response = await axios.post(AI_LAMBDA_URL, body, {
+      headers: {
+        "Content-Type": "application/json",
+        Accept: "application/json",
+        ...(userId ? { Authorization: String(userId) } : {}),
+      },
+      timeout,
+    });
 
     logger.log("API 응답 수신 완료");
-    return response.data.output;
+    return response.data;
   } catch (error) {
     logger.error("generateArticle 오류:", error);
 
@@ -52,6 +53,29 @@ export const generateArticle = async (prompt) => {
   }
 };
 
+// 기사 생성 API 호출 (userId는 사용량 집계용)
+// context는 세션 안에서 바뀌지 않는 앞부분(템플릿 예시) - 서버가 프롬프트 캐시로 재사용
+export const generateArticle = async (prompt, userId, context) => {
+  const data = await requestGeneration(
+    context ? { prompt, context } : { prompt },
+    userId
+  );
+  return data.output;
+};
+
+// 기사 생성과 저장을 한 번에 요청 - 서버가 생성 결과를 기사 테이블에 바로 저장
+// save: { originId, description } (모두 선택, originId가 없으면 새 기사)
+// 버전은 서버가 originId의 마지막 버전 다음 번호로 정함 (version을 주면 그 번호와 같아야 함)
+// 반환: { output, saved } - saved가 없거나 saved.error가 있으면 저장되지 않은 것
+export const generateAndSaveArticle = async (prompt, userId, context, save) => {
+  const data = await requestGeneration(
+    context ? { prompt, context, save } : { prompt, save },
+    userId,
+    GENERATE_AND_SAVE_TIMEOUT
+  );
+  return { output: data.output, saved: data.saved };
+};
+
 // 생성된 기사 저장 API 호출
 export async function saveInitialArticle({
   newsId,
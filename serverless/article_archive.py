@@ -0,0 +1,235 @@
+"""
+오래된 기사 중간 버전의 S3 보관(archive)과 조회 시 복원
+
+보관 작업(lambda_handler, 예약 실행)은 기사 테이블을 병렬 구간 Scan(parallel_scan)으로 읽어
+originId별로 최신 버전(head, createdAt이 가장 늦은 버전)을 제외하고 ARCHIVE_AGE_DAYS일보다 오래된
+버전을 고른다. 고른 버전 전체를 originId마다 gzip JSON 묶음(bundle) 하나로 S3에 쓰고,
+테이블 항목은 본문(content, description)을 뺀 작은 항목(stub, archived=True)으로 바꾼다.
+stub은 키와 GSI 속성(ownerId, originId, organization, createdAt)을 그대로 가지므로 목록 조회에는
+계속 나오지만 OwnerIdIndex/ArticleIdIndex 조회가 읽는 크기가 줄어든다.
+
+S3 묶음을 먼저 쓰고 stub으로 바꾸므로 중간에 실패해도 본문이 사라지지 않는다. 같은 originId를
+다시 보관하면 기존 묶음에 새 버전을 합쳐 다시 쓴다.
+
+get_article_version은 stub을 만나면 resolve()로 묶음에서 원래 항목을 꺼낸다. 최근 연 묶음은
+컨테이너 캐시(ARTICLE_BUNDLE_CACHE_SIZE개, LRU + TTL)에 두고, 캐시된 묶음에 찾는 버전이 없으면
+(그 사이 다시 보관됨) S3에서 다시 읽는다.
+
+    핸들러 설정: article_archive.lambda_handler
+    이벤트: {"days": 180, "segments": 8, "dryRun": true}
+
+환경 변수
+    ARTICLE_ARCHIVE_BUCKET      묶음을 저장할 버킷 (기본 PDF_BUCKET)
+    ARTICLE_ARCHIVE_PREFIX      묶음 키 접두사 (기본 archive/articles/)
+    ARCHIVE_AGE_DAYS            보관 대상 최소 경과 일수 (기본 180)
+    ARTICLE_BUNDLE_CACHE_SIZE   컨테이너에 보관할 묶음 수 (기본 32)
+    ARTICLE_BUNDLE_CACHE_TTL    묶음 보관 시간(초, 기본 600)
+"""
+import gzip
+import json
+import logging
+import os
+import threading
+from collections import Counter, defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+
+from botocore.exceptions import ClientError
+
+import aws_clients
+import parallel_scan
+import serialization
+import tracing
+from cache import TTLCache
+
+logger = logging.getLogger()
+
+ARTICLES_TABLE = os.environ.get('ARTICLES_TABLE', 'Articles')
+ARCHIVE_BUCKET = os.environ.get('ARTICLE_ARCHIVE_BUCKET') or os.environ.get('PDF_BUCKET', '')
+ARCHIVE_PREFIX = os.environ.get('ARTICLE_ARCHIVE_PREFIX', 'archive/articles/')
+ARCHIVE_AGE_DAYS = float(os.environ.get('ARCHIVE_AGE_DAYS', '180'))
+
+bundle_cache = TTLCache(
+    'articleBundles',
+    maxsize=int(os.environ.get('ARTICLE_BUNDLE_CACHE_SIZE', '32')),
+    ttl=float(os.environ.get('ARTICLE_BUNDLE_CACHE_TTL', '600'))
+)
+
+# stub에 남기는 속성 (키, GSI 속성, 목록 표시용 필드)
+STUB_FIELDS = ('newsId', 'originId', 'ownerId', 'organization', 'version', 'createdAt', 'isCurrent')
+
+
+def bundle_key(origin_id):
+    return f"{ARCHIVE_PREFIX}{origin_id}.json.gz"
+
+
+def is_archived(article):
+    return bool(article and article.get('archived'))
+
+
+def stub(article, key):
+    """
+    보관한 버전 대신 테이블에 남길 작은 항목
+    """
+    item = {name: article[name] for name in STUB_FIELDS if name in article}
+    item['archived'] = True
+    item['archiveKey'] = key
+    item['contentBytes'] = len(str(article.get('content', '') or '').encode('utf-8'))
+    return item
+
+
+def read_bundle(key):
+    """
+    S3 묶음 읽기 - {newsId: 항목}, 없으면 빈 dict
+    """
+    try:
+        with tracing.segment('S3.GetObject'):
+            response = aws_clients.s3().get_object(Bucket=ARCHIVE_BUCKET, Key=key)
+            data = response['Body'].read()
+    except ClientError as e:
+        if e.response.get('Error', {}).get('Code') in ('NoSuchKey', '404'):
+            return {}
+        raise
+    return json.loads(gzip.decompress(data))['versions']
+
+
+def write_bundle(key, origin_id, versions):
+    body = gzip.compress(serialization.dumps({'originId': origin_id, 'versions': versions}).encode('utf-8'))
+    with tracing.segment('S3.PutObject'):
+        aws_clients.s3().put_object(
+            Bucket=ARCHIVE_BUCKET,
+            Key=key,
+            Body=body,
+            ContentType='application/json',
+            ContentEncoding='gzip'
+        )
+    bundle_cache.invalidate(key)
+    return len(body)
+
+
+def resolve(article):
+    """
+    stub이면 묶음에서 원래 항목을 꺼내 반환 (stub이 아니면 그대로, 묶음에 없으면 None)
+    """
+    if not is_archived(article):
+        return article
+    key = article.get('archiveKey') or bundle_key(article.get('originId'))
+    news_id = article.get('newsId')
+    versions = bundle_cache.get(key)
+    if versions is None or news_id not in versions:
+        versions = read_bundle(key)
+        bundle_cache.put(key, versions)
+    restored = versions.get(news_id)
+    if restored is None:
+        logger.error("[ARCHIVE] 묶음에 기사 버전 없음: %s, newsId=%s", key, news_id)
+    return restored
+
+
+def candidates(items, cutoff):
+    """
+    originId별 보관 대상 newsId 목록 (head와 이미 보관한 버전, cutoff 이후 버전 제외)
+    """
+    by_origin = defaultdict(list)
+    for item in items:
+        by_origin[item.get('originId') or item['newsId']].append(item)
+    selected = {}
+    for origin_id, versions in by_origin.items():
+        head = max(versions, key=lambda item: (str(item.get('createdAt', '')), item['newsId']))
+        chosen = [
+            item['newsId'] for item in versions
+            if item is not head and not is_archived(item) and str(item.get('createdAt', '')) < cutoff
+        ]
+        if chosen:
+            selected[origin_id] = chosen
+    return selected
+
+
+def archive_origin(table, origin_id, news_ids):
+    """
+    originId 하나의 대상 버전을 묶음에 합쳐 쓰고 stub으로 교체 - 교체한 버전 수 반환
+    """
+    items = []
+    for news_id in news_ids:
+        with tracing.segment('ArticlesTable.GetItem'):
+            item = table.get_item(Key={'newsId': news_id}).get('Item')
+        if item and not is_archived(item):
+            items.append(item)
+    if not items:
+        return 0
+
+    key = bundle_key(origin_id)
+    versions = read_bundle(key)
+    versions.update({item['newsId']: item for item in items})
+    write_bundle(key, origin_id, versions)
+
+    replaced = 0
+    for item in items:
+        try:
+            with tracing.segment('ArticlesTable.PutItem'):
+                table.put_item(
+                    Item=stub(item, key),
+                    ConditionExpression='attribute_exists(newsId) AND attribute_not_exists(archived)'
+                )
+            replaced += 1
+        except ClientError as e:
+            if e.response.get('Error', {}).get('Code') != 'ConditionalCheckFailedException':
+                raise
+    return replaced
+
+
+def archive(days=None, segments=None, workers=None, dry_run=False):
+    """
+    보관 작업 실행 - 결과 건수 반환
+    """
+    cutoff = (datetime.now(timezone.utc) - timedelta(days=ARCHIVE_AGE_DAYS if days is None else days)).isoformat()
+    items = parallel_scan.collect(
+        ARTICLES_TABLE, segments, workers, 'ArticlesTable.Scan',
+        ProjectionExpression='newsId, originId, createdAt, archived'
+    )
+    selected = candidates(items, cutoff)
+    summary = Counter({
+        'scanned': len(items),
+        'origins': len(selected),
+        'candidates': sum(len(news_ids) for news_ids in selected.values()),
+    })
+    if dry_run:
+        logger.info("[ARCHIVE] 보관 대상 확인(dry run): %s", dict(summary))
+        return dict(summary, cutoff=cutoff, dryRun=True)
+
+    table = aws_clients.dynamodb().Table(ARTICLES_TABLE)
+    lock = threading.Lock()
+
+    def run(origin_id):
+        try:
+            replaced = archive_origin(table, origin_id, selected[origin_id])
+            with lock:
+                summary['archived'] += replaced
+        except Exception as e:
+            logger.error("[ARCHIVE] 기사 보관 실패: originId=%s, %s", origin_id, e, exc_info=True)
+            with lock:
+                summary['failed'] += 1
+
+    with ThreadPoolExecutor(max_workers=workers or parallel_scan.WORKERS, thread_name_prefix='archive') as pool:
+        list(pool.map(run, selected))
+
+    logger.info("[ARCHIVE] 기사 보관 완료: %s", dict(summary))
+    return dict(summary, cutoff=cutoff)
+
+
+@tracing.traced_handler('article_archive', default_action='archive')
+def lambda_handler(event, context):
+    """
+    예약 실행용 보관 핸들러
+    """
+    event = event or {}
+    summary = archive(
+        days=float(event['days']) if event.get('days') is not None else None,
+        segments=int(event['segments']) if event.get('segments') else None,
+        workers=int(event['workers']) if event.get('workers') else None,
+        dry_run=bool(event.get('dryRun'))
+    )
+    return {
+        'statusCode': 200,
+        'headers': {'Content-Type': 'application/json'},
+        'body': json.dumps(summary)
+    }
@@ -0,0 +1,109 @@
+"""
+기존 기사 항목에 organization 채우기 (OrganizationIndex 도입 전에 저장된 기사)
+
+기사 테이블을 병렬 구간 Scan(parallel_scan)으로 읽어 organization이 없는 항목마다
+작성자의 소속 조직(Users 테이블, common 사용자 캐시)을 UpdateItem으로 기록한다.
+조건식(attribute_not_exists)으로 쓰므로 그 사이 save_article이 기록한 값은 덮어쓰지 않고,
+여러 번 실행해도 결과가 같다.
+
+    핸들러 설정: article_backfill.lambda_handler
+    이벤트: {"segments": 16, "workers": 16}              전체 구간을 한 번에 처리
+            {"segment": 3, "segments": 16}               구간 하나만 처리 (Step Functions Map 등으로 분할 실행)
+
+환경 변수
+    ARTICLES_TABLE  기사 테이블 (기본 Articles)
+    SCAN_SEGMENTS, SCAN_WORKERS : parallel_scan 기본값
+"""
+import json
+import logging
+import os
+import threading
+from collections import Counter
+
+from botocore.exceptions import ClientError
+
+import aws_clients
+import parallel_scan
+import tracing
+from common import get_user_info
+
+logger = logging.getLogger()
+
+ARTICLES_TABLE = os.environ.get('ARTICLES_TABLE', 'Articles')
+
+
+def _stamp(table, item, organization):
+    try:
+        with tracing.segment('ArticlesTable.UpdateItem'):
+            table.update_item(
+                Key={'newsId': item['newsId']},
+                UpdateExpression='SET organization = :org',
+                ConditionExpression='attribute_exists(newsId) AND attribute_not_exists(organization)',
+                ExpressionAttributeValues={':org': organization}
+            )
+        return 'updated'
+    except ClientError as e:
+        if e.response.get('Error', {}).get('Code') == 'ConditionalCheckFailedException':
+            return 'skipped'
+        raise
+
+
+def backfill(segments=None, workers=None, segment=None):
+    """
+    organization이 없는 기사 항목 채우기 - 결과 건수 반환 (updated, skipped, unknownOwner, failed)
+    """
+    table = aws_clients.dynamodb().Table(ARTICLES_TABLE)
+    results = Counter()
+    lock = threading.Lock()
+
+    def process(items):
+        page = Counter()
+        for item in items:
+            user = get_user_info(str(item.get('ownerId', ''))) or {}
+            organization = user.get('organization', '')
+            if not organization:
+                page['unknownOwner'] += 1
+                continue
+            try:
+                page[_stamp(table, item, organization)] += 1
+            except Exception as e:
+                logger.error("[BACKFILL] 기사 조직 기록 실패: newsId=%s, %s", item.get('newsId'), e)
+                page['failed'] += 1
+        with lock:
+            results.update(page)
+
+    scan_kwargs = {
+        'ProjectionExpression': 'newsId, ownerId',
+        'FilterExpression': 'attribute_not_exists(organization)',
+    }
+    segments = segments or parallel_scan.SEGMENTS
+    if segment is not None:
+        pages, count = parallel_scan.scan_segment(
+            ARTICLES_TABLE, segment, segments, process, 'ArticlesTable.Scan', **scan_kwargs
+        )
+        summary = {'segments': 1, 'pages': pages, 'items': count}
+    else:
+        summary = parallel_scan.scan(ARTICLES_TABLE, process, segments, workers, 'ArticlesTable.Scan', **scan_kwargs)
+
+    summary.update({name: results.get(name, 0) for name in ('updated', 'skipped', 'unknownOwner', 'failed')})
+    logger.info("[BACKFILL] 기사 조직 채우기 완료: %s", summary)
+    return summary
+
+
+@tracing.traced_handler('article_backfill', default_action='backfill')
+def lambda_handler(event, context):
+    """
+    기사 organization 채우기 핸들러
+    """
+    event = event or {}
+    segment = event.get('segment')
+    summary = backfill(
+        segments=int(event['segments']) if event.get('segments') else None,
+        workers=int(event['workers']) if event.get('workers') else None,
+        segment=int(segment) if segment is not None else None
+    )
+    return {
+        'statusCode': 200,
+        'headers': {'Content-Type': 'application/json'},
+        'body': json.dumps(summary)
+    }
@@ -0,0 +1,325 @@
+"""
+기사 저장 write-behind - 저장 요청을 큐에 넣고 바로 응답, 소비자가 묶어서 기사 테이블에 반영
+
+ARTICLE_WRITE_BEHIND=1이면 put_article.save_article이 검증/권한 확인 뒤 기사를 바로 쓰지 않고 enqueue()로
+큐에 넣은 다음 202로 응답한다. 초안/수정이 연달아 저장돼도 요청마다 PutItem과 후속 쓰기(변경 기록,
+검색 색인, 통계)를 하지 않고, 소비자(lambda_handler, SQS 이벤트 소스)가 한 번에 받은 메시지를
+  - newsId마다 가장 늦게 넣은 저장 하나만 남기고
+  - 이미 같은 저장이나 더 늦은 저장이 반영된 newsId는 건너뛰고(재전달, 순서 뒤바뀜에도 멱등)
+  - originId, version, createdAt 순서로 정렬해
+BatchWriteItem(25개씩)으로 쓴다. 후속 쓰기도 묶는다: 변경 기록은 작성자별 카운터 한 번 + BatchWriteItem,
+검색 색인은 originId마다 마지막 버전만, 통계는 요약 항목마다 UpdateItem 한 번(article_stats.record_saves).
+
+반영 순서 판단에는 저장마다 붙이는 queuedAt(큐에 넣은 시각)과 saveId를 항목에 함께 기록해 쓴다.
+같은 originId의 저장이 동시에 반영되지 않도록 SQS FIFO 큐(MessageGroupId=originId)를 쓴다.
+표준 큐도 동작하지만 같은 newsId의 저장이 동시에 처리되면 순서 판단이 어긋날 수 있다.
+쓰지 못한 메시지는 batchItemFailures로 돌려줘 다시 전달받는다(이벤트 소스에 ReportBatchItemFailures 설정).
+
+큐에 넣은 뒤 소비자가 반영할 때까지(보통 수 초)는 목록/버전 조회에 새 버전이 보이지 않는다.
+큐에 넣지 못하거나 메시지가 SQS 한도(256KB)를 넘으면 save_article이 바로 저장한다.
+
+ARTICLE_SAVE_QUEUE_URL이 없으면 프로세스 안 로컬 큐(LocalQueue)를 쓴다. 컨테이너가 끝나면 사라지므로
+테스트/로컬 실행 전용이며, flush()로 직접 비운다.
+
+    핸들러 설정 (소비자): article_queue.lambda_handler (SQS 이벤트 소스, 배치 크기 최대 10, FIFO)
+
+환경 변수
+    ARTICLE_WRITE_BEHIND        1이면 saveArticle을 큐에 넣고 202로 응답 (기본 0)
+    ARTICLE_SAVE_QUEUE_URL      저장 큐 URL (.fifo면 MessageGroupId/MessageDeduplicationId 설정, 없으면 로컬 큐)
+    ARTICLE_FLUSH_ATTEMPTS      BatchWriteItem 미처리 항목 재시도 횟수 (기본 5)
+"""
+import json
+import logging
+import os
+import threading
+import time
+import uuid
+from collections import deque
+from datetime import datetime, timezone
+from decimal import Decimal
+
+import article_stats
+import aws_clients
+import change_counters
+import changelog
+import concurrency
+import search_index
+import serialization
+import tracing
+
+logger = logging.getLogger()
+
+ENABLED = os.environ.get('ARTICLE_WRITE_BEHIND', '0') == '1'
+QUEUE_URL = os.environ.get('ARTICLE_SAVE_QUEUE_URL', '')
+FLUSH_ATTEMPTS = int(os.environ.get('ARTICLE_FLUSH_ATTEMPTS', '5'))
+ARTICLES_TABLE = os.environ.get('ARTICLES_TABLE', 'Articles')
+
+MAX_MESSAGE_BYTES = 256 * 1024
+BATCH_WRITE_SIZE = 25
+BATCH_GET_SIZE = 100
+
+
+class LocalQueue:
+    """
+    SQS 클라이언트 대신 쓰는 프로세스 안 큐 (send_message/receive_message/delete_message_batch만)
+    """
+
+    def __init__(self):
+        self._messages = deque()
+        self._in_flight = {}
+        self._lock = threading.Lock()
+
+    def send_message(self, QueueUrl=None, MessageBody='', **kwargs):
+        message_id = uuid.uuid4().hex
+        with self._lock:
+            self._messages.append({'MessageId': message_id, 'ReceiptHandle': message_id, 'Body': MessageBody})
+        return {'MessageId': message_id}
+
+    def receive_message(self, QueueUrl=None, MaxNumberOfMessages=1, **kwargs):
+        messages = []
+        with self._lock:
+            while self._messages and len(messages) < MaxNumberOfMessages:
+                message = self._messages.popleft()
+                self._in_flight[message['ReceiptHandle']] = message
+                messages.append(message)
+        return {'Messages': messages} if messages else {}
+
+    def delete_message_batch(self, QueueUrl=None, Entries=()):
+        with self._lock:
+            for entry in Entries:
+                self._in_flight.pop(entry['ReceiptHandle'], None)
+        return {'Successful': [{'Id': entry['Id']} for entry in Entries], 'Failed': []}
+
+    def release(self, receipt_handles):
+        """
+        처리하지 못한 메시지를 큐 앞으로 되돌림 (SQS 가시성 제한 시간 만료와 같은 효과)
+        """
+        with self._lock:
+            for handle in reversed(list(receipt_handles)):
+                message = self._in_flight.pop(handle, None)
+                if message is not None:
+                    self._messages.appendleft(message)
+
+    def __len__(self):
+        return len(self._messages)
+
+
+local_queue = LocalQueue()
+
+
+def _queue():
+    return aws_clients.sqs() if QUEUE_URL else local_queue
+
+
+def enqueue(article):
+    """
+    기사 저장 하나를 큐에 넣고 saveId 반환 - 넣지 못하면 None (호출한 쪽이 바로 저장)
+    """
+    queued_at = datetime.now(timezone.utc).isoformat(timespec='microseconds')
+    save_id = uuid.uuid4().hex
+    body = serialization.dumps({'article': article, 'queuedAt': queued_at, 'saveId': save_id})
+    if len(body.encode('utf-8')) > MAX_MESSAGE_BYTES:
+        logger.warning("[QUEUE] 메시지 크기 초과로 바로 저장: newsId=%s", article.get('newsId'))
+        return None
+    kwargs = {'QueueUrl': QUEUE_URL, 'MessageBody': body}
+    if QUEUE_URL.endswith('.fifo'):
+        kwargs['MessageGroupId'] = str(article.get('originId') or article.get('newsId'))
+        kwargs['MessageDeduplicationId'] = save_id
+    try:
+        with tracing.segment('SQS.SendMessage'):
+            _queue().send_message(**kwargs)
+        logger.info("[QUEUE] 기사 저장 대기열 추가: newsId=%s, saveId=%s", article.get('newsId'), save_id)
+        return save_id
+    except Exception as e:
+        logger.error("[QUEUE] 기사 저장 대기열 추가 실패: newsId=%s, %s", article.get('newsId'), e, exc_info=True)
+        return None
+
+
+def _order(save):
+    article = save['article']
+    try:
+        version = int(article.get('version') or 0)
+    except (TypeError, ValueError):
+        version = 0
+    return (str(article.get('originId') or article.get('newsId')), version,
+            str(article.get('createdAt', '')), save['queuedAt'])
+
+
+def _stamp(item):
+    return (item.get('queuedAt') or '', item.get('saveId') or '')
+
+
+def _existing(news_ids):
+    """
+    newsId -> 현재 항목 (이전 항목과의 바이트 차이 계산, 반영 순서 판단용)
+    """
+    dynamodb = aws_clients.dynamodb()
+    found = {}
+    for start in range(0, len(news_ids), BATCH_GET_SIZE):
+        request = {ARTICLES_TABLE: {'Keys': [{'newsId': news_id} for news_id in news_ids[start:start + BATCH_GET_SIZE]]}}
+        for attempt in range(FLUSH_ATTEMPTS):
+            with tracing.segment('ArticlesTable.BatchGetItem'):
+                response = dynamodb.batch_get_item(RequestItems=request)
+            for item in response.get('Responses', {}).get(ARTICLES_TABLE, []):
+                found[item['newsId']] = item
+            request = response.get('UnprocessedKeys') or {}
+            if not request:
+                break
+            time.sleep(0.05 * (2 ** attempt))
+        if request:
+            raise RuntimeError(f"기존 기사 조회 미처리 키 {len(request[ARTICLES_TABLE]['Keys'])}개")
+    return found
+
+
+def _write(items):
+    """
+    항목을 BatchWriteItem 25개씩 쓰고 끝내 쓰지 못한 newsId 집합 반환
+    """
+    dynamodb = aws_clients.dynamodb()
+    failed = set()
+    for start in range(0, len(items), BATCH_WRITE_SIZE):
+        requests = [{'PutRequest': {'Item': item}} for item in items[start:start + BATCH_WRITE_SIZE]]
+        for attempt in range(FLUSH_ATTEMPTS):
+            with tracing.segment('ArticlesTable.BatchWriteItem'):
+                response = dynamodb.batch_write_item(RequestItems={ARTICLES_TABLE: requests})
+            requests = (response.get('UnprocessedItems') or {}).get(ARTICLES_TABLE) or []
+            if not requests:
+                break
+            time.sleep(0.05 * (2 ** attempt))
+        failed.update(request['PutRequest']['Item']['newsId'] for request in requests)
+    return failed
+
+
+def apply(messages):
+    """
+    큐 메시지 묶음을 기사 테이블에 반영 - (요약, 다시 받아야 할 메시지 ID 목록)
+
+    messages: [(메시지 ID, 본문 JSON)]
+    """
+    saves = {}
+    message_ids = {}
+    retry = []
+    for message_id, body in messages:
+        try:
+            # boto3 리소스는 float를 받지 않으므로 소수는 Decimal로 읽음
+            save = json.loads(body, parse_float=Decimal)
+            news_id = save['article']['newsId']
+        except (ValueError, KeyError, TypeError) as e:
+            # 형식이 잘못된 메시지는 다시 받아도 같으므로 재전달 횟수를 넘기면 DLQ로 감
+            logger.error("[QUEUE] 잘못된 저장 메시지: %s, %s", message_id, e)
+            retry.append(message_id)
+            continue
+        message_ids.setdefault(news_id, []).append(message_id)
+        current = saves.get(news_id)
+        if current is None or (save['queuedAt'], save['saveId']) > (current['queuedAt'], current['saveId']):
+            saves[news_id] = save
+
+    summary = {'messages': len(messages), 'articles': len(saves), 'written': 0, 'stale': 0, 'failed': 0}
+    if not saves:
+        return summary, retry
+
+    try:
+        existing = _existing(list(saves))
+    except Exception as e:
+        logger.error("[QUEUE] 기존 기사 조회 실패: %s", e, exc_info=True)
+        return dict(summary, failed=len(saves)), retry + [mid for ids in message_ids.values() for mid in ids]
+
+    pending = []
+    for news_id, save in saves.items():
+        previous = existing.get(news_id)
+        if previous is not None and _stamp(previous) >= (save['queuedAt'], save['saveId']):
+            # 이미 반영된 저장(재전달)이거나 더 늦은 저장이 먼저 반영됨
+            summary['stale'] += 1
+            continue
+        pending.append(save)
+    pending.sort(key=_order)
+
+    items = [dict(save['article'], queuedAt=save['queuedAt'], saveId=save['saveId']) for save in pending]
+    failed = _write(items)
+    written = [(item, existing.get(item['newsId'])) for item in items if item['newsId'] not in failed]
+    summary['written'] = len(written)
+    summary['failed'] = len(failed)
+    for news_id in failed:
+        retry.extend(message_ids[news_id])
+
+    _follow_up(written)
+    logger.info("[QUEUE] 기사 저장 반영: %s", summary)
+    return summary, retry
+
+
+def _follow_up(written):
+    """
+    반영한 버전들의 변경 기록, 검색 색인, 통계 갱신 (서로 독립이므로 동시에, 각각 실패해도 로그만 남김)
+
+    written은 반영 순서(originId, version)로 정렬돼 있다. 변경 기록과 통계의 마지막 버전은
+    저장 요청 순서(queuedAt)를 따르고, 검색 색인은 originId마다 가장 높은 버전 하나만 쓴다.
+    """
+    if not written:
+        return
+    by_owner = {}
+    latest_by_origin = {}
+    for item, _ in sorted(written, key=lambda entry: _stamp(entry[0])):
+        by_owner.setdefault(item.get('ownerId'), []).append(('put', item.get('newsId'), changelog.article_item(item)))
+    for item, _ in written:
+        latest_by_origin[item.get('originId') or item.get('newsId')] = item
+
+    def record_changes(owner_id, changes):
+        feed_key = change_counters.articles_key(owner_id)
+        changelog.record_batch(feed_key, change_counters.bump(feed_key, len(changes)), changes)
+
+    calls = {
+        ('changelog', owner_id): (lambda owner_id=owner_id, changes=changes: record_changes(owner_id, changes))
+        for owner_id, changes in by_owner.items()
+    }
+    for origin_id, item in latest_by_origin.items():
+        calls[('search', origin_id)] = lambda item=item: search_index.index_article(item.get('organization', ''), item)
+    calls[('stats',)] = lambda: article_stats.record_saves([
+        (item.get('organization', ''), item, previous)
+        for item, previous in sorted(written, key=lambda entry: _stamp(entry[0]))
+    ])
+    concurrency.follow_up(calls, '[QUEUE]')
+
+
+def flush(max_messages=None):
+    """
+    큐를 직접 비우며 반영 (로컬 큐, 로컬 실행/테스트용) - 요약 합계 반환
+    """
+    queue = _queue()
+    totals = {'messages': 0, 'articles': 0, 'written': 0, 'stale': 0, 'failed': 0}
+    while max_messages is None or totals['messages'] < max_messages:
+        with tracing.segment('SQS.ReceiveMessage'):
+            response = queue.receive_message(QueueUrl=QUEUE_URL, MaxNumberOfMessages=10)
+        messages = response.get('Messages') or []
+        if not messages:
+            break
+        summary, retry = apply([(message['MessageId'], message['Body']) for message in messages])
+        for key in totals:
+            totals[key] += summary[key]
+        done = [message for message in messages if message['MessageId'] not in retry]
+        if done:
+            with tracing.segment('SQS.DeleteMessageBatch'):
+                queue.delete_message_batch(QueueUrl=QUEUE_URL, Entries=[
+                    {'Id': str(index), 'ReceiptHandle': message['ReceiptHandle']} for index, message in enumerate(done)
+                ])
+        if retry:
+            if isinstance(queue, LocalQueue):
+                queue.release(message['ReceiptHandle'] for message in messages if message['MessageId'] in retry)
+            break
+    return totals
+
+
+@tracing.traced_handler('article_queue', default_action='flush')
+def lambda_handler(event, context):
+    """
+    SQS 이벤트 소스 소비자 - 실패한 메시지는 batchItemFailures로 돌려줌
+    """
+    records = (event or {}).get('Records') or []
+    summary, retry = apply([(record['messageId'], record['body']) for record in records])
+    tracing.add_metric('QueuedSaves', summary['messages'])
+    tracing.add_metric('ArticlesWritten', summary['written'])
+    return {
+        'statusCode': 200,
+        'headers': {'Content-Type': 'application/json'},
+        'body': json.dumps(summary),
+        'batchItemFailures': [{'itemIdentifier': message_id} for message_id in retry],
+    }
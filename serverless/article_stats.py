@@ -0,0 +1,299 @@
+"""
+기사 작성 통계 - 작성자/조직별 요약 항목 하나 (기사 수, 버전 수, 본문 바이트, 마지막 활동 시각)
+
+save_article이 기사 버전을 저장할 때마다 record_save()가 작성자 항목과 조직 항목을
+UpdateItem(ADD) 한 번씩으로 갱신한다. 같은 newsId를 다시 저장한 경우(재시도, 덮어쓰기)에는
+PutItem의 이전 항목(ReturnValues=ALL_OLD)과 비교해 바이트 차이만 반영하므로 중복 집계되지 않는다.
+write-behind 소비자(article_queue)는 record_saves()로 한 묶음의 저장을 요약 항목별로 합쳐 한 번씩 갱신한다.
+대시보드는 OwnerIdIndex 전체를 페이지 단위로 읽는 대신 요약 항목 한 건만 읽는다.
+
+갱신은 기사 저장과 별개의 쓰기라 중간에 실패하면 요약이 어긋날 수 있다. reconcile()(예약 실행용
+lambda_handler)은 기사 테이블 전체를 병렬 구간 Scan(parallel_scan)으로 읽어 페이지마다 누적하며 요약을
+처음부터 다시 계산하고 덮어쓴다. 본문은 읽지 않고 저장 시 기록한 contentBytes를 쓴다. 재계산 중에 저장된 기사는 덮어쓰기로 빠질 수 있으므로 사용량이 적은 시간에 실행한다.
+
+저장 구조 (ARTICLE_STATS_TABLE, 파티션 키 statsKey)
+    statsKey = owner#{ownerId} 또는 org#{organization}
+    articleCount    : 기사 수 (originId 기준, 첫 버전 newsId == originId 저장 시 증가)
+    versionCount    : 저장된 버전 수
+    totalBytes      : 모든 버전 본문(content)의 UTF-8 바이트 합계
+    lastActivityAt  : 가장 최근 버전의 createdAt, lastNewsId : 그 버전 (갱신 순서와 관계없이 createdAt 기준)
+
+    핸들러 설정 (재계산): article_stats.lambda_handler (EventBridge 예약 실행)
+
+환경 변수
+    ARTICLE_STATS_TABLE     통계 테이블 (기본 ArticleStats)
+    ARTICLES_TABLE          기사 테이블 (기본 Articles, 재계산 시 Scan)
+"""
+import json
+import logging
+import os
+import threading
+from collections import Counter
+from datetime import datetime, timezone
+
+import aws_clients
+import parallel_scan
+import tracing
+from common import get_user_info
+
+logger = logging.getLogger()
+
+ARTICLE_STATS_TABLE = os.environ.get('ARTICLE_STATS_TABLE', 'ArticleStats')
+ARTICLES_TABLE = os.environ.get('ARTICLES_TABLE', 'Articles')
+
+COUNTERS = ('articleCount', 'versionCount', 'totalBytes')
+
+
+def owner_key(owner_id):
+    return f"owner#{owner_id}"
+
+
+def organization_key(organization):
+    return f"org#{organization}"
+
+
+def _table():
+    return aws_clients.dynamodb().Table(ARTICLE_STATS_TABLE)
+
+
+def content_bytes(article):
+    if 'contentBytes' in article:
+        # S3로 보관된 버전(article_archive stub)은 본문 대신 보관 전 크기를 가짐
+        return int(article['contentBytes'])
+    return len(str(article.get('content', '') or '').encode('utf-8'))
+
+
+def is_first_version(article):
+    return article.get('newsId') == (article.get('originId') or article.get('newsId'))
+
+
+def _empty(key):
+    values = {name: 0 for name in COUNTERS}
+    values['statsKey'] = key
+    return values
+
+
+def deltas(article, previous=None):
+    """
+    저장한 버전 하나가 요약에 더할 값 (previous: 같은 newsId로 덮어쓴 이전 항목)
+    """
+    if previous:
+        return Counter({'totalBytes': content_bytes(article) - content_bytes(previous)})
+    return Counter({
+        'articleCount': 1 if is_first_version(article) else 0,
+        'versionCount': 1,
+        'totalBytes': content_bytes(article),
+    })
+
+
+def record_save(organization, article, previous=None):
+    """
+    작성자/조직 요약 갱신 - 실패해도 기사 저장은 성공으로 처리하고 로그만 남김
+    """
+    values = deltas(article, previous)
+    for key in _keys(organization, article):
+        _update(key, values, article)
+
+
+def record_saves(saves):
+    """
+    여러 버전 저장을 요약 항목별로 합쳐 항목마다 UpdateItem 한 번으로 갱신 (write-behind 일괄 반영용)
+
+    saves: [(organization, article, previous)] 저장 순서대로 - createdAt이 가장 최근인 버전이 lastActivityAt/lastNewsId 후보가 됨
+    """
+    totals = {}
+    for organization, article, previous in saves:
+        values = deltas(article, previous)
+        for key in _keys(organization, article):
+            entry = totals.setdefault(key, [Counter(), None])
+            entry[0].update(values)
+            if entry[1] is None or str(article.get('createdAt', '')) >= str(entry[1].get('createdAt', '')):
+                entry[1] = article
+    for key, (values, article) in totals.items():
+        _update(key, values, article)
+    return len(totals)
+
+
+def _keys(organization, article):
+    keys = [owner_key(article.get('ownerId', ''))]
+    if organization:
+        keys.append(organization_key(organization))
+    return keys
+
+
+def _update(key, values, article):
+    """
+    요약 항목 하나 갱신 - 마지막 활동(lastActivityAt, lastNewsId)은 더 최근 createdAt일 때만 바꿈
+
+    저장 경로가 통계를 기다리지 않으므로 갱신 순서가 저장 순서와 다를 수 있다. 보통은 조건부 UpdateItem
+    한 번이고, 더 최근 활동이 이미 기록돼 있으면 카운터만 더한다 (rebuild()와 같은 기준).
+    """
+    names = [name for name in COUNTERS if values.get(name)]
+    added = {f":{name}": values[name] for name in names}
+    activity = {
+        ':now': article.get('createdAt') or datetime.now(timezone.utc).isoformat(),
+        ':newsId': article.get('newsId', ''),
+    }
+    add = 'ADD ' + ', '.join(f"{name} :{name}" for name in names) if names else ''
+    try:
+        try:
+            with tracing.segment('ArticleStatsTable.UpdateItem'):
+                _table().update_item(
+                    Key={'statsKey': key},
+                    UpdateExpression=f"{add} SET lastActivityAt = :now, lastNewsId = :newsId".strip(),
+                    ConditionExpression='attribute_not_exists(lastActivityAt) OR lastActivityAt <= :now',
+                    ExpressionAttributeValues=dict(added, **activity)
+                )
+        except Exception as e:
+            if aws_clients.error_code(e) != 'ConditionalCheckFailedException' or not names:
+                raise
+            with tracing.segment('ArticleStatsTable.UpdateItem'):
+                _table().update_item(
+                    Key={'statsKey': key},
+                    UpdateExpression=add,
+                    ExpressionAttributeValues=added
+                )
+    except Exception as e:
+        if aws_clients.error_code(e) == 'ConditionalCheckFailedException':
+            return
+        logger.error("[STATS] 기사 통계 갱신 실패: %s, %s", key, e, exc_info=True)
+
+
+def get_stats(key):
+    """
+    요약 항목 하나 (없으면 0으로 채운 항목)
+    """
+    with tracing.segment('ArticleStatsTable.GetItem'):
+        response = _table().get_item(Key={'statsKey': key})
+    item = response.get('Item')
+    if not item:
+        return _empty(key)
+    for name in COUNTERS:
+        item[name] = int(item.get(name, 0))
+    return item
+
+
+class _Rebuild:
+    """
+    기사를 페이지 단위로 받아 요약 항목을 누적 (병렬 Scan 작업 스레드에서 동시에 호출)
+    """
+
+    def __init__(self):
+        self.summaries = {}
+        self.organizations = {}
+        self._lock = threading.Lock()
+
+    def _organization(self, article, owner_id):
+        organization = article.get('organization')
+        if organization:
+            return organization
+        # organization이 기록되기 전에 저장된 기사는 작성자의 현재 소속으로 집계
+        if owner_id not in self.organizations:
+            user = get_user_info(owner_id) or {}
+            self.organizations[owner_id] = user.get('organization', '')
+        return self.organizations[owner_id]
+
+    def add(self, articles):
+        for article in articles:
+            owner_id = str(article.get('ownerId', ''))
+            organization = self._organization(article, owner_id)
+            keys = [owner_key(owner_id)]
+            if organization:
+                keys.append(organization_key(organization))
+            values = deltas(article)
+            created_at = str(article.get('createdAt', ''))
+            with self._lock:
+                for key in keys:
+                    summary = self.summaries.setdefault(key, _empty(key))
+                    for name in COUNTERS:
+                        summary[name] += values[name]
+                    if created_at >= summary.get('lastActivityAt', ''):
+                        summary['lastActivityAt'] = created_at
+                        summary['lastNewsId'] = article.get('newsId', '')
+
+
+def rebuild(articles):
+    """
+    기사 목록으로 요약 항목 전체 계산 (statsKey -> 항목)
+    """
+    summaries = _Rebuild()
+    summaries.add(articles)
+    return summaries.summaries
+
+
+def _fill_content_bytes(page):
+    """
+    contentBytes가 없는 기사(기록 전에 저장된 버전)만 본문을 BatchGetItem으로 읽어 크기를 채움 (본문은 버림)
+    """
+    missing = [article for article in page if 'contentBytes' not in article]
+    if not missing:
+        return
+    dynamodb = aws_clients.dynamodb()
+    by_id = {article['newsId']: article for article in missing}
+    ids = list(by_id)
+    for start in range(0, len(ids), 100):
+        request = {ARTICLES_TABLE: {
+            'Keys': [{'newsId': news_id} for news_id in ids[start:start + 100]],
+            'ProjectionExpression': 'newsId, content',
+        }}
+        while request:
+            with tracing.segment('ArticlesTable.BatchGetItem'):
+                response = dynamodb.batch_get_item(RequestItems=request)
+            for item in response.get('Responses', {}).get(ARTICLES_TABLE, []):
+                by_id[item['newsId']]['contentBytes'] = content_bytes(item)
+            request = response.get('UnprocessedKeys') or {}
+
+
+def reconcile():
+    """
+    기사 테이블 전체로 요약을 다시 계산해 덮어쓰고, 기사가 없어진 요약 항목은 삭제
+
+    Scan은 본문 없이 읽고 페이지마다 바로 누적하므로 메모리에는 페이지 하나와 요약 항목만 남는다.
+    본문 크기는 저장 시 기록한 contentBytes를 쓰고, 없는 기사만 본문을 따로 읽는다.
+    """
+    rebuilt = _Rebuild()
+
+    def process(page):
+        _fill_content_bytes(page)
+        rebuilt.add(page)
+
+    parallel_scan.scan(
+        ARTICLES_TABLE,
+        process,
+        segment_name='ArticlesTable.Scan',
+        ProjectionExpression='newsId, originId, ownerId, organization, contentBytes, createdAt'
+    )
+    summaries = rebuilt.summaries
+    table = _table()
+
+    stale = []
+    kwargs = {'ProjectionExpression': 'statsKey'}
+    while True:
+        with tracing.segment('ArticleStatsTable.Scan'):
+            response = table.scan(**kwargs)
+        stale.extend(item['statsKey'] for item in response.get('Items', []) if item['statsKey'] not in summaries)
+        if 'LastEvaluatedKey' not in response:
+            break
+        kwargs['ExclusiveStartKey'] = response['LastEvaluatedKey']
+
+    now = datetime.now(timezone.utc).isoformat()
+    with tracing.segment('ArticleStatsTable.BatchWriteItem'):
+        with table.batch_writer() as batch:
+            for summary in summaries.values():
+                batch.put_item(Item=dict(summary, reconciledAt=now))
+            for key in stale:
+                batch.delete_item(Key={'statsKey': key})
+    logger.info("[STATS] 기사 통계 재계산: 요약 %s건, 삭제 %s건", len(summaries), len(stale))
+    return {'summaries': len(summaries), 'deleted': len(stale)}
+
+
+@tracing.traced_handler('article_stats', default_action='reconcile')
+def lambda_handler(event, context):
+    """
+    예약 실행용 재계산 핸들러
+    """
+    return {
+        'statusCode': 200,
+        'headers': {'Content-Type': 'application/json'},
+        'body': json.dumps(reconcile())
+    }
@@ -0,0 +1,293 @@
+"""
+AWS 클라이언트 팩토리 - 모든 핸들러가 공유
+
+- 클라이언트는 최초 사용 시점에 한 번만 생성하여 컨테이너 안에서 재사용
+- 서비스별 커넥션 풀 크기, 연결/읽기 타임아웃, adaptive 재시도, TCP keep-alive 설정
+- 서비스별 호출/재시도/오류 횟수와 커넥션 재사용 통계 수집
+
+환경 변수 (SERVICE는 S3, DYNAMODB, BEDROCK, SQS, LAMBDA)
+    AWS_REGION / AWS_DEFAULT_REGION     기본 리전
+    BEDROCK_REGION                      Bedrock 리전 (기본 ap-northeast-2)
+    {SERVICE}_MAX_POOL_CONNECTIONS      커넥션 풀 크기
+    {SERVICE}_CONNECT_TIMEOUT           연결 타임아웃(초)
+    {SERVICE}_READ_TIMEOUT              읽기 타임아웃(초)
+    {SERVICE}_MAX_ATTEMPTS              최대 시도 횟수 (최초 요청 포함)
+    {SERVICE}_ENDPOINT_URL              엔드포인트 재정의 (로컬 스텁 엔드포인트 등)
+    AWS_RETRY_MODE                      재시도 모드 (기본 adaptive)
+    AWS_TCP_KEEPALIVE                   TCP keep-alive 사용 여부 (기본 1)
+"""
+import os
+import threading
+import time
+
+import init_profiler
+
+# 서비스별 기본 설정
+SERVICE_DEFAULTS = {
+    's3': {
+        'env': 'S3',
+        'max_pool_connections': 50,
+        'connect_timeout': 2,
+        'read_timeout': 10,
+        'max_attempts': 4,
+    },
+    'dynamodb': {
+        'env': 'DYNAMODB',
+        'max_pool_connections': 50,
+        'connect_timeout': 1,
+        'read_timeout': 3,
+        'max_attempts': 5,
+    },
+    'bedrock-runtime': {
+        'env': 'BEDROCK',
+        'max_pool_connections': 20,
+        'connect_timeout': 2,
+        'read_timeout': 120,
+        'max_attempts': 3,
+        'region': 'ap-northeast-2',
+    },
+    'sqs': {
+        'env': 'SQS',
+        'max_pool_connections': 20,
+        'connect_timeout': 1,
+        'read_timeout': 25,
+        'max_attempts': 4,
+    },
+    'lambda': {
+        'env': 'LAMBDA',
+        'max_pool_connections': 10,
+        'connect_timeout': 1,
+        'read_timeout': 5,
+        'max_attempts': 3,
+    },
+}
+
+# AWS 서비스 클라이언트 - 최초 사용 시점에 한 번만 생성하여 컨테이너 안에서 공유
+# (boto3 import와 클라이언트 생성 비용을 실제로 필요한 요청 경로로 미룸)
+_clients = {}
+_overridden = set()
+_lock = threading.Lock()
+
+# 서비스별 호출 통계
+_metrics = {}
+_metrics_lock = threading.Lock()
+
+
+def _setting(service_name, key, cast=int):
+    defaults = SERVICE_DEFAULTS.get(service_name, {})
+    env_name = f"{defaults.get('env', service_name.upper())}_{key.upper()}"
+    value = os.environ.get(env_name)
+    if value is None or value == '':
+        return defaults.get(key)
+    return cast(value)
+
+
+def client_config(service_name):
+    """
+    서비스별 botocore Config 생성
+    """
+    from botocore.config import Config
+
+    options = {
+        'max_pool_connections': _setting(service_name, 'max_pool_connections') or 10,
+        'connect_timeout': _setting(service_name, 'connect_timeout', float) or 60,
+        'read_timeout': _setting(service_name, 'read_timeout', float) or 60,
+        'retries': {
+            'mode': os.environ.get('AWS_RETRY_MODE', 'adaptive'),
+            'max_attempts': _setting(service_name, 'max_attempts') or 3,
+        },
+    }
+    if os.environ.get('AWS_TCP_KEEPALIVE', '1') == '1':
+        options['tcp_keepalive'] = True
+    return Config(**options)
+
+
+def client_kwargs(service_name):
+    """
+    boto3.client / boto3.resource 생성 인자
+    """
+    kwargs = {'config': client_config(service_name)}
+
+    region = None
+    if service_name == 'bedrock-runtime':
+        region = os.environ.get('BEDROCK_REGION')
+    region = region or os.environ.get('AWS_REGION') or os.environ.get('AWS_DEFAULT_REGION')
+    region = region or SERVICE_DEFAULTS.get(service_name, {}).get('region')
+    if region:
+        kwargs['region_name'] = region
+
+    endpoint_url = _setting(service_name, 'endpoint_url', str)
+    if endpoint_url:
+        kwargs['endpoint_url'] = endpoint_url
+    return kwargs
+
+
+def _service_metrics(service_name):
+    metrics = _metrics.get(service_name)
+    if metrics is None:
+        with _metrics_lock:
+            metrics = _metrics.setdefault(
+                service_name, {'calls': 0, 'retries': 0, 'errors': 0, 'throttles': 0}
+            )
+    return metrics
+
+
+def _register_metrics(service_name, client):
+    """
+    호출 완료/실패 이벤트에 재시도 통계 수집 핸들러 등록
+    """
+    def after_call(parsed=None, **kwargs):
+        retries = (parsed or {}).get('ResponseMetadata', {}).get('RetryAttempts', 0)
+        metrics = _service_metrics(service_name)
+        with _metrics_lock:
+            metrics['calls'] += 1
+            metrics['retries'] += retries
+
+    def after_call_error(exception=None, **kwargs):
+        response = getattr(exception, 'response', None) or {}
+        retries = response.get('ResponseMetadata', {}).get('RetryAttempts', 0)
+        code = response.get('Error', {}).get('Code', '')
+        metrics = _service_metrics(service_name)
+        with _metrics_lock:
+            metrics['calls'] += 1
+            metrics['errors'] += 1
+            metrics['retries'] += retries
+            if 'Throttl' in code or code == 'ProvisionedThroughputExceededException':
+                metrics['throttles'] += 1
+
+    client.meta.events.register('after-call', after_call)
+    client.meta.events.register('after-call-error', after_call_error)
+
+
+def _create(kind, service_name, **kwargs):
+    """
+    boto3 클라이언트/리소스 생성 (생성 시간은 init_profiler에 기록)
+    """
+    import boto3
+
+    start = time.perf_counter()
+    options = client_kwargs(service_name)
+    options.update(kwargs)
+    if kind == 'resource':
+        obj = boto3.resource(service_name, **options)
+        _register_metrics(service_name, obj.meta.client)
+    else:
+        obj = boto3.client(service_name, **options)
+        _register_metrics(service_name, obj)
+    init_profiler.record(f"{kind}:{service_name}", time.perf_counter() - start)
+    return obj
+
+
+def _get(kind, service_name, region=None, **kwargs):
+    key = (kind, service_name, region) if region else (kind, service_name)
+    obj = _clients.get(key)
+    if obj is not None:
+        return obj
+    with _lock:
+        obj = _clients.get(key)
+        if obj is None:
+            if region:
+                kwargs['region_name'] = region
+            obj = _create(kind, service_name, **kwargs)
+            _clients[key] = obj
+    return obj
+
+
+def s3():
+    """
+    S3 클라이언트
+    """
+    return _get('client', 's3')
+
+
+def dynamodb():
+    """
+    DynamoDB 리소스
+    """
+    return _get('resource', 'dynamodb')
+
+
+def sqs():
+    """
+    SQS 클라이언트
+    """
+    return _get('client', 'sqs')
+
+
+def lambda_client():
+    """
+    Lambda 클라이언트 (다른 함수 비동기 호출용)
+    """
+    return _get('client', 'lambda')
+
+
+def bedrock_runtime(region=None):
+    """
+    Bedrock runtime 클라이언트 (region을 주면 그 리전 클라이언트, model_router의 리전 전환용)
+
+    리전별 가짜 클라이언트가 없고 기본 클라이언트만 override로 주입했으면 기본 클라이언트를 쓴다.
+    """
+    if region and ('client', 'bedrock-runtime', region) not in _clients \
+            and ('client', 'bedrock-runtime') in _overridden:
+        return _clients[('client', 'bedrock-runtime')]
+    return _get('client', 'bedrock-runtime', region)
+
+
+def error_code(error):
+    """
+    AWS 호출 예외의 오류 코드 (ClientError가 아니면 None) - botocore를 import하지 않고 확인
+    """
+    return (getattr(error, 'response', None) or {}).get('Error', {}).get('Code')
+
+
+def connection_stats(client):
+    """
+    클라이언트 커넥션 풀의 생성 커넥션 수와 요청 수 (urllib3 풀 기준)
+    """
+    stats = {'connections': 0, 'requests': 0}
+    try:
+        manager = client._endpoint.http_session._manager
+        for key in list(manager.pools.keys()):
+            pool = manager.pools[key]
+            stats['connections'] += getattr(pool, 'num_connections', 0)
+            stats['requests'] += getattr(pool, 'num_requests', 0)
+    except Exception:
+        # 스텁/가짜 클라이언트이거나 botocore 내부 구조가 다른 경우
+        pass
+    stats['reused'] = max(stats['requests'] - stats['connections'], 0)
+    return stats
+
+
+def metrics():
+    """
+    서비스별 호출/재시도/오류 횟수와 커넥션 재사용 통계
+    """
+    with _metrics_lock:
+        result = {name: dict(values) for name, values in _metrics.items()}
+    for (kind, service_name, *_), obj in list(_clients.items()):
+        client = obj
+        if kind == 'resource':
+            client = getattr(getattr(obj, 'meta', None), 'client', None)
+        result.setdefault(service_name, {}).update(connection_stats(client))
+    return result
+
+
+def override(kind, service_name, obj, region=None):
+    """
+    로컬 스텁/가짜 클라이언트 주입 (벤치마크, 로컬 실행용, region을 주면 그 리전 클라이언트만)
+    """
+    key = (kind, service_name, region) if region else (kind, service_name)
+    with _lock:
+        _clients[key] = obj
+        _overridden.add(key)
+
+
+def reset():
+    """
+    생성된 클라이언트와 통계 모두 제거 (다음 호출 시 다시 생성)
+    """
+    with _lock:
+        _clients.clear()
+        _overridden.clear()
+    with _metrics_lock:
+        _metrics.clear()
@@ -0,0 +1,114 @@
+"""
+기본 boto3 클라이언트와 aws_clients 팩토리 클라이언트 비교 벤치마크
+
+로컬 스텁 엔드포인트에 동시 요청을 보내 처리량, 지연 시간, 서버가 받은 TCP 연결 수,
+재시도 횟수를 비교한다.
+
+    python bench/client_reuse.py [--requests 2000] [--threads 32] [--latency-ms 5] [--throttle-rate 0.02]
+"""
+import argparse
+import os
+import statistics
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+os.environ.setdefault('AWS_DEFAULT_REGION', 'ap-northeast-2')
+os.environ.setdefault('AWS_ACCESS_KEY_ID', 'local')
+os.environ.setdefault('AWS_SECRET_ACCESS_KEY', 'local')
+
+import boto3  # noqa: E402
+from botocore.config import Config  # noqa: E402
+
+import aws_clients  # noqa: E402
+from stub_endpoint import StubServer  # noqa: E402
+
+
+def build_clients(endpoint_url):
+    default = boto3.client(
+        'dynamodb', endpoint_url=endpoint_url,
+        config=Config(retries={'mode': 'legacy'}),
+    )
+    options = aws_clients.client_kwargs('dynamodb')
+    options['endpoint_url'] = endpoint_url
+    tuned = boto3.client('dynamodb', **options)
+    return {'default': default, 'tuned': tuned}
+
+
+def run(client, server, total, threads):
+    server.reset_stats()
+    latencies = []
+    errors = [0]
+    retries = [0]
+    lock = threading.Lock()
+    per_thread = total // threads
+
+    def worker():
+        local_latencies = []
+        local_retries = 0
+        local_errors = 0
+        for _ in range(per_thread):
+            start = time.perf_counter()
+            try:
+                response = client.get_item(TableName='Users', Key={'id': {'S': 'user-1'}})
+                local_retries += response['ResponseMetadata'].get('RetryAttempts', 0)
+            except Exception as e:
+                local_errors += 1
+                local_retries += getattr(e, 'response', {}).get('ResponseMetadata', {}).get('RetryAttempts', 0)
+            local_latencies.append((time.perf_counter() - start) * 1000)
+        with lock:
+            latencies.extend(local_latencies)
+            retries[0] += local_retries
+            errors[0] += local_errors
+
+    start = time.perf_counter()
+    workers = [threading.Thread(target=worker) for _ in range(threads)]
+    for thread in workers:
+        thread.start()
+    for thread in workers:
+        thread.join()
+    elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    return {
+        'throughput': len(latencies) / elapsed,
+        'p50': statistics.median(latencies),
+        'p99': latencies[int(len(latencies) * 0.99) - 1],
+        'server_connections': server.stats['connections'],
+        'client': aws_clients.connection_stats(client),
+        'retries': retries[0],
+        'errors': errors[0],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='AWS 클라이언트 커넥션 재사용 벤치마크')
+    parser.add_argument('--requests', type=int, default=2000)
+    parser.add_argument('--threads', type=int, default=32)
+    parser.add_argument('--latency-ms', type=float, default=5.0)
+    parser.add_argument('--throttle-rate', type=float, default=0.0)
+    args = parser.parse_args()
+
+    server = StubServer(latency_ms=args.latency_ms, throttle_rate=args.throttle_rate).start()
+    clients = build_clients(server.url)
+
+    print(
+        f"{'client':<8} {'req/s':>8} {'p50(ms)':>8} {'p99(ms)':>8} "
+        f"{'server conn':>12} {'reused':>7} {'retries':>8} {'errors':>7}"
+    )
+    for name, client in clients.items():
+        # 첫 연결 수립 비용을 제외하기 위한 워밍업
+        run(client, server, args.threads, args.threads)
+        result = run(client, server, args.requests, args.threads)
+        print(
+            f"{name:<8} {result['throughput']:>8.0f} {result['p50']:>8.2f} {result['p99']:>8.2f} "
+            f"{result['server_connections']:>12} {result['client']['reused']:>7} "
+            f"{result['retries']:>8} {result['errors']:>7}"
+        )
+    server.shutdown()
+
+
+if __name__ == '__main__':
+    main()
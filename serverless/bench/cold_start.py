@@ -0,0 +1,104 @@
+"""
+핸들러별 콜드 스타트 벤치마크
+
+각 핸들러를 새 파이썬 인터프리터에서 실행하여
+  - 핸들러 모듈 import 시간
+  - 첫 요청 처리 시간 (boto3 import + 클라이언트 생성 포함)
+  - 웜 요청 처리 시간
+을 측정한다. AWS 호출은 botocore Stubber로 대체하므로 네트워크나 자격 증명이
+필요하지 않으며, 실제 boto3 클라이언트 생성 비용은 그대로 측정된다.
+
+    python bench/cold_start.py [--runs 5] [--warm 20] [handler ...]
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+import stubs
+
+HANDLER_SCENARIOS = ['get_pdf_list', 'put_pdf_resource', 'put_article', 'text_ai_api']
+
+
+def run_child(handler_name, warm):
+    """
+    새 인터프리터 안에서 실행되는 측정 코드
+    """
+    start = time.perf_counter()
+    stubs.setup_environment()
+
+    import logging
+    logging.disable(logging.CRITICAL)
+
+    stubs.install(handler_name, warm + 1)
+
+    import_start = time.perf_counter()
+    module = __import__(handler_name)
+    import_ms = (time.perf_counter() - import_start) * 1000
+
+    first_start = time.perf_counter()
+    result = module.lambda_handler(stubs.event(handler_name), None)
+    first_ms = (time.perf_counter() - first_start) * 1000
+    if result.get('statusCode', 500) >= 400:
+        raise RuntimeError(f"{handler_name} 첫 요청 실패: {result}")
+
+    warm_ms = []
+    for _ in range(warm):
+        warm_start = time.perf_counter()
+        module.lambda_handler(stubs.event(handler_name), None)
+        warm_ms.append((time.perf_counter() - warm_start) * 1000)
+
+    print(json.dumps({
+        'import_ms': import_ms,
+        'first_ms': first_ms,
+        'warm_ms': statistics.median(warm_ms) if warm_ms else 0.0,
+        'in_process_ms': (time.perf_counter() - start) * 1000,
+    }))
+
+
+def run_parent(handlers, runs, warm):
+    env = dict(os.environ)
+    env.update(stubs.LOCAL_ENV)
+
+    print(f"{'handler':<18} {'import':>9} {'first':>9} {'warm':>9} {'process':>9}  (ms, {runs}회 중앙값)")
+    for handler_name in handlers:
+        samples = []
+        for _ in range(runs):
+            start = time.perf_counter()
+            output = subprocess.run(
+                [sys.executable, os.path.abspath(__file__), '--child', handler_name,
+                 '--warm', str(warm)],
+                env=env, capture_output=True, text=True, check=True,
+            ).stdout
+            sample = json.loads(output.strip().splitlines()[-1])
+            sample['process_ms'] = (time.perf_counter() - start) * 1000
+            samples.append(sample)
+
+        def median(key):
+            return statistics.median(sample[key] for sample in samples)
+
+        print(
+            f"{handler_name:<18} {median('import_ms'):>9.1f} {median('first_ms'):>9.1f} "
+            f"{median('warm_ms'):>9.2f} {median('process_ms'):>9.1f}"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description='핸들러 콜드 스타트 벤치마크')
+    parser.add_argument('handlers', nargs='*', default=HANDLER_SCENARIOS)
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--warm', type=int, default=20)
+    parser.add_argument('--child')
+    args = parser.parse_args()
+
+    if args.child:
+        run_child(args.child, args.warm)
+    else:
+        run_parent(args.handlers, args.runs, args.warm)
+
+
+if __name__ == '__main__':
+    main()
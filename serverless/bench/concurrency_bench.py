@@ -0,0 +1,159 @@
+"""
+요청 안 동시 호출(concurrency) 벤치마크 - 지연을 주입한 가짜 AWS에서 액션별 임계 경로 비교
+
+local_aws로 DynamoDB/S3 호출마다 지연을 주입하고, 같은 요청을 CONCURRENCY_ENABLED=0(차례로)과
+1(동시에)로 보내 액션별 p50/p95를 비교한다. 사용자/메타데이터 캐시는 요청마다 비워
+모든 조회가 DynamoDB까지 가는 경우(새 컨테이너, 캐시 만료)를 잰다.
+
+- getTemplate        : 파일 메타데이터 조회를 사용자 조회와 동시에
+- getArticleVersion  : 기사 항목 조회를 사용자 조회와 동시에
+- deleteFile         : 원본/파생본 삭제 동시, 메타데이터 삭제 뒤 변경 기록/검색/구간 tombstone 동시
+- saveArticle        : 저장 뒤 변경 기록/검색 색인/통계 갱신 동시
+
+    python bench/concurrency_bench.py [--requests 50] [--dynamodb-ms 8] [--s3-ms 20]
+"""
+import argparse
+import contextlib
+import io
+import json
+import logging
+import os
+import random
+import sys
+import time
+import uuid
+from datetime import datetime, timezone
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import local_aws
+
+
+def percentile(sorted_values, fraction):
+    if not sorted_values:
+        return 0.0
+    index = min(int(round(fraction * (len(sorted_values) - 1))), len(sorted_values) - 1)
+    return sorted_values[index]
+
+
+def build_events(aws, data, rng, requests):
+    """
+    액션 -> (핸들러 이름, 이벤트 목록 2벌) - 삭제는 모드마다 다른 파일을 지움
+    """
+    files = aws.table('PDF_FILES_TABLE').items
+    articles = aws.table('ARTICLES_TABLE').items
+    file_ids = list(data['files'])
+    rng.shuffle(file_ids)
+
+    def get_template():
+        file_id = rng.choice(data['files'])
+        return {
+            'headers': {'authorization': files[(file_id,)]['ownerId']},
+            'queryStringParameters': {'action': 'getTemplate', 'fileId': file_id},
+        }
+
+    def get_article_version():
+        origin_id = rng.choice(data['articles'])
+        return {
+            'headers': {'authorization': articles[(origin_id,)]['ownerId']},
+            'queryStringParameters': {'method': 'GET', 'action': '/articles/version/{versionId}'},
+            'pathParameters': {'versionId': f'{origin_id}-v2'},
+        }
+
+    def delete_file():
+        file_id = file_ids.pop()
+        return {
+            'headers': {'authorization': files[(file_id,)]['ownerId']},
+            'queryStringParameters': {'method': 'DELETE', 'action': 'deleteFile', 'fileId': file_id},
+        }
+
+    def save_article():
+        user_id = rng.choice(data['users'])
+        news_id = f'news-{uuid.uuid4().hex[:12]}'
+        return {
+            'headers': {'authorization': user_id},
+            'queryStringParameters': {'method': 'POST', 'action': 'saveArticle'},
+            'body': json.dumps({
+                'newsId': news_id, 'originId': news_id, 'ownerId': user_id, 'version': '1',
+                'content': '흑기사가 작성한 기사 본문입니다. ' * 150, 'description': '{}',
+                'createdAt': datetime.now(timezone.utc).isoformat(),
+            }),
+        }
+
+    factories = {
+        'getTemplate': ('get_pdf_list', get_template),
+        'getArticleVersion': ('put_article', get_article_version),
+        'deleteFile': ('put_pdf_resource', delete_file),
+        'saveArticle': ('put_article', save_article),
+    }
+    return {
+        action: (module, [[factory() for _ in range(requests)] for _ in range(2)])
+        for action, (module, factory) in factories.items()
+    }
+
+
+def run(handler, events, caches):
+    latencies = []
+    statuses = {}
+    for event in events:
+        for cache in caches:
+            cache.clear()
+        started = time.perf_counter()
+        response = handler(event, None)
+        latencies.append((time.perf_counter() - started) * 1000.0)
+        statuses[response['statusCode']] = statuses.get(response['statusCode'], 0) + 1
+    latencies.sort()
+    return percentile(latencies, 0.5), percentile(latencies, 0.95), statuses
+
+
+def main():
+    parser = argparse.ArgumentParser(description='요청 안 동시 호출 벤치마크')
+    parser.add_argument('--requests', type=int, default=50, help='액션/모드별 요청 수')
+    parser.add_argument('--dynamodb-ms', type=float, default=8.0)
+    parser.add_argument('--s3-ms', type=float, default=20.0)
+    parser.add_argument('--seed', type=int, default=1)
+    args = parser.parse_args()
+
+    local_aws.setup_environment()
+    aws = local_aws.install(latency_ms={'dynamodb': args.dynamodb_ms, 's3': args.s3_ms}, seed=args.seed)
+    logging.getLogger().addHandler(logging.NullHandler())
+    rng = random.Random(args.seed)
+    data = local_aws.seed(aws, users=50, organizations=5, templates=args.requests * 2 + 50,
+                          articles=200, rng=rng)
+
+    import common
+    import concurrency
+    import get_pdf_list
+    import put_article
+    import put_pdf_resource
+    import tracing
+
+    tracing.ENABLED = False
+    logging.getLogger().setLevel(logging.ERROR)
+    handlers = {
+        'get_pdf_list': get_pdf_list.lambda_handler,
+        'put_article': put_article.lambda_handler,
+        'put_pdf_resource': put_pdf_resource.lambda_handler,
+    }
+    caches = (common.user_cache, common.file_metadata_cache)
+    plan = build_events(aws, data, rng, args.requests)
+
+    print(f"액션별 {args.requests}건, 지연 dynamodb={args.dynamodb_ms:.0f}ms s3={args.s3_ms:.0f}ms, 캐시 없음")
+    lines = []
+    with contextlib.redirect_stdout(io.StringIO()):
+        for action, (module, (sequential_events, concurrent_events)) in plan.items():
+            concurrency.ENABLED = False
+            base_p50, base_p95, base_statuses = run(handlers[module], sequential_events, caches)
+            concurrency.ENABLED = True
+            p50, p95, statuses = run(handlers[module], concurrent_events, caches)
+            lines.append(
+                f"{action:<18} 차례로 p50 {base_p50:>5.0f}ms p95 {base_p95:>5.0f}ms  "
+                f"동시 p50 {p50:>5.0f}ms p95 {p95:>5.0f}ms  p50 {1 - p50 / base_p50:>5.1%} 감소  "
+                f"상태 {base_statuses} / {statuses}"
+            )
+    for line in lines:
+        print(line)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,154 @@
+"""
+병렬 초안(drafts) 모드와 순차 재시도 비교
+
+가짜 Bedrock(fakes.FakeBedrockRuntime)이 로그 정규분포 지연으로 초안을 돌려주고, 일부 초안은
+짧거나(--short) 앞머리 안내 문구가 붙는다(--filler). 기사 한 건을 받을 때까지의 지연 시간과
+생성된 출력 토큰 수(버린 초안 포함)를 비교한다.
+
+- sequential : drafts=1로 호출하고 클라이언트가 검사에 실패하면 다시 요청 (App.js 수동 재시도와 같음)
+- drafts=k   : text_ai_api가 초안 k개를 동시에 요청하고 검사를 통과한 첫 초안 반환
+
+    python bench/draft_bench.py [--requests 200] [--median-ms 300] [--sigma 0.6] [--short 0.25] [--filler 0.1]
+        [--drafts 2,3,4] [--max-attempts 4]
+"""
+import argparse
+import contextlib
+import io
+import json
+import logging
+import math
+import os
+import random
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import local_aws
+import stubs
+
+FILLER = '네, 요청하신 내용으로 기사를 작성하겠습니다.\n\n'
+
+
+class DraftResponder:
+    """
+    지연 시간과 초안 품질이 무작위인 Bedrock 응답 (생성한 출력 토큰 수 누적)
+    """
+
+    def __init__(self, rng, median_ms, sigma, short_rate, filler_rate):
+        self.rng = rng
+        self.mu = math.log(median_ms / 1000.0)
+        self.sigma = sigma
+        self.short_rate = short_rate
+        self.filler_rate = filler_rate
+        self.output_tokens = 0
+        self._lock = threading.Lock()
+
+    def __call__(self, model_id, request):
+        with self._lock:
+            delay = self.rng.lognormvariate(self.mu, self.sigma)
+            short = self.rng.random() < self.short_rate
+            filler = self.rng.random() < self.filler_rate
+            text = stubs.korean_text(self.rng, 600 if short else 1300)
+        if filler:
+            text = FILLER + text
+        output_tokens = int(len(text) / 1.5)
+        with self._lock:
+            self.output_tokens += output_tokens
+        time.sleep(delay)
+        return {
+            'id': 'msg_local',
+            'type': 'message',
+            'role': 'assistant',
+            'model': model_id,
+            'content': [{'type': 'text', 'text': text}],
+            'stop_reason': 'end_turn',
+            'usage': {'input_tokens': 200, 'output_tokens': output_tokens},
+        }
+
+
+def percentile(sorted_values, fraction):
+    index = min(int(round(fraction * (len(sorted_values) - 1))), len(sorted_values) - 1)
+    return sorted_values[index]
+
+
+def call(handler, drafts_count):
+    body = {'prompt': '다음 내용으로 보도자료를 작성해주세요: 신제품 출시'}
+    if drafts_count > 1:
+        body['drafts'] = drafts_count
+    response = handler({'body': json.dumps(body)}, None)
+    return json.loads(response['body'])
+
+
+def run(label, handler, responder, drafts_module, requests, drafts_count, max_attempts):
+    # 이전 모드에서 버린 초안이 끝날 때까지 대기
+    drafts_module.executor().submit(lambda: None).result()
+    time.sleep(2.0)
+    tokens_before = responder.output_tokens
+    latencies = []
+    accepted = 0
+    calls = 0
+    for _ in range(requests):
+        started = time.perf_counter()
+        for _ in range(max_attempts if drafts_count == 1 else 1):
+            result = call(handler, drafts_count)
+            calls += 1
+            if not drafts_module.problems(result['output']):
+                accepted += 1
+                break
+        latencies.append((time.perf_counter() - started) * 1000.0)
+    latencies.sort()
+    # 버린 초안이 끝나야 토큰 수가 확정됨
+    time.sleep(2.0)
+    tokens = responder.output_tokens - tokens_before
+    print(
+        f"{label:<12} p50 {percentile(latencies, 0.5):>7.0f}ms  p95 {percentile(latencies, 0.95):>7.0f}ms  "
+        f"p99 {percentile(latencies, 0.99):>7.0f}ms  통과 {accepted / requests:>6.1%}  "
+        f"호출 {calls / requests:.2f}회/건  출력 토큰 {tokens / requests:>6.0f}/건"
+    )
+    return tokens / requests
+
+
+def main():
+    parser = argparse.ArgumentParser(description='병렬 초안과 순차 재시도 비교')
+    parser.add_argument('--requests', type=int, default=200)
+    parser.add_argument('--median-ms', type=float, default=300.0, help='초안 생성 지연 중앙값(ms)')
+    parser.add_argument('--sigma', type=float, default=0.6, help='로그 정규분포 표준편차 (꼬리 길이)')
+    parser.add_argument('--short', type=float, default=0.25, help='1000자 미만 초안 비율')
+    parser.add_argument('--filler', type=float, default=0.1, help='앞머리 안내 문구가 붙은 초안 비율')
+    parser.add_argument('--drafts', default='2,3,4')
+    parser.add_argument('--max-attempts', type=int, default=4, help='순차 재시도 최대 횟수')
+    parser.add_argument('--seed', type=int, default=1)
+    args = parser.parse_args()
+
+    local_aws.setup_environment()
+    responder = DraftResponder(random.Random(args.seed), args.median_ms, args.sigma, args.short, args.filler)
+    local_aws.install(responder=responder)
+    logging.getLogger().addHandler(logging.NullHandler())
+
+    import drafts
+    import text_ai_api
+    import tracing
+
+    tracing.ENABLED = False
+    logging.getLogger().setLevel(logging.WARNING)
+
+    with contextlib.redirect_stdout(io.StringIO()) as captured:
+        rows = []
+        rows.append(('sequential', run('sequential', text_ai_api.lambda_handler, responder, drafts,
+                                       args.requests, 1, args.max_attempts)))
+        for count in [int(value) for value in args.drafts.split(',')]:
+            rows.append((f'drafts={count}', run(f'drafts={count}', text_ai_api.lambda_handler, responder, drafts,
+                                                args.requests, count, args.max_attempts)))
+    # 요청별 EMF 줄은 버리고 결과 줄만 출력
+    for line in captured.getvalue().splitlines():
+        if not line.startswith('{'):
+            print(line)
+    baseline = rows[0][1]
+    for label, tokens in rows[1:]:
+        print(f"{label}: 순차 재시도 대비 출력 토큰 {tokens / baseline:.2f}배")
+
+
+if __name__ == '__main__':
+    main()
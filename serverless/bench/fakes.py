@@ -0,0 +1,1111 @@
+"""
+S3, DynamoDB, Bedrock, SQS 인메모리 가짜 구현 (로컬 실행/벤치마크용)
+
+핸들러가 사용하는 boto3 호출 형태를 그대로 받는다.
+    - DynamoDB 리소스: Table().get_item/put_item/delete_item/update_item/query/scan,
+      batch_get_item, batch_write_item, Table().batch_writer()
+      (문자열 Key/Filter/Condition/Update 표현식, GSI, 1MB 페이지 단위 페이지네이션,
+       Limit, Segment/TotalSegments 병렬 스캔 지원)
+    - S3 클라이언트: head_object/get_object/put_object/delete_object/delete_objects/copy_object,
+      list_objects_v2, generate_presigned_url
+    - Bedrock runtime 클라이언트: invoke_model (응답 생성 함수 교체 가능, 프롬프트 캐시 흉내)
+    - SQS 클라이언트: send_message/receive_message/delete_message_batch (FIFO 중복 제거)
+
+Faults로 서비스/오퍼레이션별 지연 시간과 스로틀링 비율을 주입할 수 있다.
+실제 SDK의 재시도는 흉내 내지 않으므로 스로틀링은 그대로 ClientError로 전달된다.
+"""
+import copy
+import hashlib
+import io
+import json
+import random
+import re
+import threading
+import time
+import zlib
+from collections import Counter
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from decimal import Decimal
+
+from botocore.exceptions import ClientError
+
+# DynamoDB 한 번의 Query/Scan 응답 최대 크기
+PAGE_BYTES = 1024 * 1024
+
+
+def client_error(code, message, operation, status=400):
+    return ClientError(
+        {
+            'Error': {'Code': code, 'Message': message},
+            'ResponseMetadata': {'HTTPStatusCode': status, 'RetryAttempts': 0},
+        },
+        operation,
+    )
+
+
+class Faults:
+    """
+    지연 시간/스로틀링 주입 설정
+
+    latency_ms, throttle_rate 키는 'service' 또는 'service.operation'
+    (예: {'dynamodb': 4, 'dynamodb.query': 8, 'bedrock': 1500}).
+    지연 시간 값은 숫자(평균 ms) 또는 (평균, 표준편차) 튜플.
+    """
+
+    THROTTLE_CODES = {
+        'dynamodb': ('ProvisionedThroughputExceededException', 400),
+        's3': ('SlowDown', 503),
+        'bedrock': ('ThrottlingException', 429),
+    }
+
+    def __init__(self, latency_ms=None, throttle_rate=None, seed=None):
+        self.latency_ms = dict(latency_ms or {})
+        self.throttle_rate = dict(throttle_rate or {})
+        self.calls = Counter()
+        self.throttled = Counter()
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def _lookup(self, table, service, operation):
+        return table.get(f"{service}.{operation}", table.get(service))
+
+    def before(self, service, operation, throttle=True):
+        """
+        호출 전 지연 주입, 스로틀링 대상이면 True 반환(throttle=False) 또는 예외 발생
+        """
+        name = f"{service}.{operation}"
+        with self._lock:
+            self.calls[name] += 1
+            latency = self._lookup(self.latency_ms, service, operation)
+            rate = self._lookup(self.throttle_rate, service, operation) or 0.0
+            throttled = rate > 0 and self._random.random() < rate
+            delay = 0.0
+            if latency:
+                mean, stddev = latency if isinstance(latency, (tuple, list)) else (latency, latency * 0.2)
+                delay = max(self._random.gauss(mean, stddev), 0.0) / 1000.0
+            if throttled:
+                self.throttled[name] += 1
+        if delay:
+            time.sleep(delay)
+        if throttled:
+            if not throttle:
+                return True
+            code, status = self.THROTTLE_CODES.get(service, ('ThrottlingException', 400))
+            raise client_error(code, 'Rate exceeded (injected)', operation, status)
+        return False
+
+
+# ---------------------------------------------------------------------------
+# DynamoDB 표현식
+# ---------------------------------------------------------------------------
+
+_TOKEN = re.compile(
+    r"\s*(?:(?P<op><>|<=|>=|=|<|>|\(|\)|,|\+|-|\.|\[|\])"
+    r"|(?P<value>:[A-Za-z0-9_]+)"
+    r"|(?P<name>#?[A-Za-z_][A-Za-z0-9_\-]*)"
+    r"|(?P<number>\d+))"
+)
+
+_KEYWORDS = {'AND', 'OR', 'NOT', 'BETWEEN', 'IN', 'SET', 'ADD', 'REMOVE', 'DELETE'}
+
+
+def _tokenize(expression):
+    tokens = []
+    position = 0
+    expression = expression.strip()
+    while position < len(expression):
+        match = _TOKEN.match(expression, position)
+        if not match or match.end() == position:
+            raise ValueError(f"표현식 해석 실패: {expression[position:]}")
+        position = match.end()
+        kind = match.lastgroup
+        text = match.group(kind)
+        if kind == 'name' and text.upper() in _KEYWORDS:
+            tokens.append(('kw', text.upper()))
+        else:
+            tokens.append((kind, text))
+    return tokens
+
+
+_MISSING = object()
+
+
+def _type_rank(value):
+    if isinstance(value, bool):
+        return 0
+    if isinstance(value, (int, float, Decimal)):
+        return 1
+    if isinstance(value, str):
+        return 2
+    if isinstance(value, (bytes, bytearray)):
+        return 3
+    return 4
+
+
+def _compare(left, right, op):
+    if left is _MISSING or right is _MISSING:
+        return op == '<>' and not (left is _MISSING and right is _MISSING)
+    if op == '=':
+        return left == right
+    if op == '<>':
+        return left != right
+    if _type_rank(left) != _type_rank(right):
+        return False
+    try:
+        if op == '<':
+            return left < right
+        if op == '<=':
+            return left <= right
+        if op == '>':
+            return left > right
+        if op == '>=':
+            return left >= right
+    except TypeError:
+        return False
+    raise ValueError(op)
+
+
+class _Parser:
+    """
+    조건/키 조건/업데이트 표현식 파서 - 항목(dict)을 받는 함수로 컴파일
+    """
+
+    def __init__(self, expression, names=None, values=None):
+        self.tokens = _tokenize(expression)
+        self.position = 0
+        self.names = names or {}
+        self.values = values or {}
+
+    # 토큰 처리
+    def peek(self, offset=0):
+        index = self.position + offset
+        return self.tokens[index] if index < len(self.tokens) else (None, None)
+
+    def take(self, expected=None):
+        token = self.peek()
+        if expected is not None and token[1] != expected:
+            raise ValueError(f"'{expected}' 필요, '{token[1]}' 발견")
+        self.position += 1
+        return token
+
+    def done(self):
+        return self.position >= len(self.tokens)
+
+    # 경로와 값
+    def _name(self, text):
+        if text.startswith('#'):
+            if text not in self.names:
+                raise ValueError(f"ExpressionAttributeNames에 {text} 없음")
+            return self.names[text]
+        return text
+
+    def path(self):
+        kind, text = self.take()
+        if kind != 'name':
+            raise ValueError(f"속성 이름 필요: {text}")
+        parts = [self._name(text)]
+        while True:
+            if self.peek()[1] == '.':
+                self.take('.')
+                parts.append(self._name(self.take()[1]))
+            elif self.peek()[1] == '[':
+                self.take('[')
+                parts.append(int(self.take()[1]))
+                self.take(']')
+            else:
+                return parts
+
+    def operand(self):
+        kind, text = self.peek()
+        if kind == 'value':
+            self.take()
+            if text not in self.values:
+                raise ValueError(f"ExpressionAttributeValues에 {text} 없음")
+            value = self.values[text]
+            return lambda item: value
+        if kind == 'name' and self.peek(1)[1] == '(':
+            return self.function()
+        parts = self.path()
+        return lambda item: get_path(item, parts)
+
+    def function(self):
+        name = self.take()[1]
+        self.take('(')
+        args = []
+        paths = []
+        while self.peek()[1] != ')':
+            if self.peek()[0] == 'name' and self.peek(1)[1] != '(':
+                start = self.position
+                paths.append(self.path())
+                self.position = start
+            else:
+                paths.append(None)
+            args.append(self.operand())
+            if self.peek()[1] == ',':
+                self.take(',')
+        self.take(')')
+
+        if name == 'attribute_exists':
+            return lambda item: get_path(item, paths[0]) is not _MISSING
+        if name == 'attribute_not_exists':
+            return lambda item: get_path(item, paths[0]) is _MISSING
+        if name == 'begins_with':
+            def begins_with(item):
+                value, prefix = args[0](item), args[1](item)
+                return isinstance(value, str) and isinstance(prefix, str) and value.startswith(prefix)
+            return begins_with
+        if name == 'contains':
+            def contains(item):
+                value, part = args[0](item), args[1](item)
+                if value is _MISSING:
+                    return False
+                try:
+                    return part in value
+                except TypeError:
+                    return False
+            return contains
+        if name == 'size':
+            def size(item):
+                value = args[0](item)
+                return _MISSING if value is _MISSING else Decimal(len(value))
+            return size
+        if name == 'if_not_exists':
+            def if_not_exists(item):
+                value = args[0](item)
+                return args[1](item) if value is _MISSING else value
+            return if_not_exists
+        if name == 'list_append':
+            def list_append(item):
+                left, right = args[0](item), args[1](item)
+                return list(left if left is not _MISSING else []) + list(right if right is not _MISSING else [])
+            return list_append
+        raise ValueError(f"지원하지 않는 함수: {name}")
+
+    # 조건 표현식
+    def condition(self):
+        left = self.conjunction()
+        while self.peek() == ('kw', 'OR'):
+            self.take()
+            right = self.conjunction()
+            left = (lambda a, b: lambda item: a(item) or b(item))(left, right)
+        return left
+
+    def conjunction(self):
+        left = self.negation()
+        while self.peek() == ('kw', 'AND'):
+            self.take()
+            right = self.negation()
+            left = (lambda a, b: lambda item: a(item) and b(item))(left, right)
+        return left
+
+    def negation(self):
+        if self.peek() == ('kw', 'NOT'):
+            self.take()
+            inner = self.negation()
+            return lambda item: not inner(item)
+        return self.comparison()
+
+    def comparison(self):
+        if self.peek()[1] == '(':
+            self.take('(')
+            inner = self.condition()
+            self.take(')')
+            return inner
+
+        is_function = self.peek()[0] == 'name' and self.peek(1)[1] == '('
+        left = self.operand()
+        kind, text = self.peek()
+        if kind == 'op' and text in ('=', '<>', '<', '<=', '>', '>='):
+            self.take()
+            right = self.operand()
+            return lambda item: _compare(left(item), right(item), text)
+        if (kind, text) == ('kw', 'BETWEEN'):
+            self.take()
+            low = self.operand()
+            self.take('AND')
+            high = self.operand()
+            return lambda item: _compare(left(item), low(item), '>=') and _compare(left(item), high(item), '<=')
+        if (kind, text) == ('kw', 'IN'):
+            self.take()
+            self.take('(')
+            options = [self.operand()]
+            while self.peek()[1] == ',':
+                self.take(',')
+                options.append(self.operand())
+            self.take(')')
+            return lambda item: any(_compare(left(item), option(item), '=') for option in options)
+        if is_function:
+            return lambda item: bool(left(item))
+        raise ValueError(f"비교 연산자 필요: {text}")
+
+    # 업데이트 표현식
+    def value_expression(self):
+        left = self.operand()
+        while self.peek()[1] in ('+', '-'):
+            op = self.take()[1]
+            right = self.operand()
+            if op == '+':
+                left = (lambda a, b: lambda item: a(item) + b(item))(left, right)
+            else:
+                left = (lambda a, b: lambda item: a(item) - b(item))(left, right)
+        return left
+
+    def update(self):
+        actions = []
+        while not self.done():
+            clause = self.take()[1]
+            while True:
+                if clause == 'SET':
+                    target = self.path()
+                    self.take('=')
+                    actions.append(('SET', target, self.value_expression()))
+                elif clause == 'REMOVE':
+                    actions.append(('REMOVE', self.path(), None))
+                elif clause in ('ADD', 'DELETE'):
+                    target = self.path()
+                    actions.append((clause, target, self.operand()))
+                else:
+                    raise ValueError(f"지원하지 않는 업데이트 절: {clause}")
+                if self.peek()[1] == ',':
+                    self.take(',')
+                    continue
+                break
+        return actions
+
+
+def get_path(item, parts):
+    value = item
+    for part in parts:
+        if isinstance(part, int):
+            if not isinstance(value, list) or part >= len(value):
+                return _MISSING
+            value = value[part]
+        else:
+            if not isinstance(value, dict) or part not in value:
+                return _MISSING
+            value = value[part]
+    return value
+
+
+def _set_path(item, parts, value):
+    target = item
+    for part in parts[:-1]:
+        target = target[part]
+    target[parts[-1]] = value
+
+
+def _remove_path(item, parts):
+    target = get_path(item, parts[:-1]) if len(parts) > 1 else item
+    if isinstance(target, dict):
+        target.pop(parts[-1], None)
+    elif isinstance(target, list) and isinstance(parts[-1], int) and parts[-1] < len(target):
+        target.pop(parts[-1])
+
+
+def compile_condition(expression, names=None, values=None):
+    parser = _Parser(expression, names, values)
+    condition = parser.condition()
+    if not parser.done():
+        raise ValueError(f"표현식 끝에 해석되지 않은 부분: {parser.peek()[1]}")
+    return condition
+
+
+def to_dynamo(value):
+    """
+    boto3 리소스와 같은 입력 검증/변환 (float 거부, int -> Decimal)
+    """
+    if isinstance(value, bool) or value is None:
+        return value
+    if isinstance(value, float):
+        raise TypeError('Float types are not supported. Use Decimal types instead.')
+    if isinstance(value, int):
+        return Decimal(value)
+    if isinstance(value, dict):
+        return {key: to_dynamo(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [to_dynamo(item) for item in value]
+    if isinstance(value, (set, frozenset)):
+        return {to_dynamo(item) for item in value}
+    return value
+
+
+def _item_size(item):
+    return len(json.dumps(item, default=str, ensure_ascii=False).encode('utf-8'))
+
+
+def _project(item, projection, names):
+    if not projection:
+        return item
+    result = {}
+    for part in projection.split(','):
+        part = part.strip()
+        name = names.get(part, part) if part.startswith('#') else part
+        if name in item:
+            result[name] = item[name]
+    return result
+
+
+class FakeTable:
+    """
+    DynamoDB 테이블 - key는 (해시 키, 범위 키 또는 None), indexes는 {이름: (해시 키, 범위 키)}
+    """
+
+    def __init__(self, resource, name, key, indexes=None):
+        self.resource = resource
+        self.name = name
+        self.table_name = name
+        self.key = key
+        self.indexes = dict(indexes or {})
+        self.items = {}
+        self._lock = threading.RLock()
+        # 기본 키 -> 병렬 Scan 구간 해시 (페이지마다 다시 계산하지 않도록 보관)
+        self._segment_hashes = {}
+
+    # 내부 유틸리티
+    def _faults(self, operation):
+        self.resource.faults.before('dynamodb', operation)
+
+    def _pk(self, item):
+        hash_name, range_name = self.key
+        if hash_name not in item or (range_name and range_name not in item):
+            raise client_error('ValidationException', 'The provided key element does not match the schema', 'GetItem')
+        return (item[hash_name], item[range_name]) if range_name else (item[hash_name],)
+
+    def _segment_hash(self, pk):
+        value = self._segment_hashes.get(pk)
+        if value is None:
+            value = self._segment_hashes[pk] = zlib.crc32(repr(pk).encode('utf-8'))
+        return value
+
+    def _key_of(self, item, index_name=None):
+        names = [name for name in self.key if name]
+        if index_name:
+            names += [name for name in self.indexes[index_name] if name and name not in names]
+        return {name: item[name] for name in names if name in item}
+
+    def _schema(self, index_name):
+        if index_name is None:
+            return self.key
+        if index_name not in self.indexes:
+            raise client_error('ValidationException', f'The table does not have the specified index: {index_name}', 'Query')
+        return self.indexes[index_name]
+
+    def _sorted(self, items, range_name, forward=True):
+        if not range_name:
+            return list(items)
+        return sorted(
+            items,
+            key=lambda item: (_type_rank(item.get(range_name)), item.get(range_name)),
+            reverse=not forward,
+        )
+
+    def _page(self, candidates, kwargs, matches, index_name, operation):
+        start_key = kwargs.get('ExclusiveStartKey')
+        if start_key:
+            start_pk = self._pk(start_key)
+            for position, item in enumerate(candidates):
+                if self._pk(item) == start_pk:
+                    candidates = candidates[position + 1:]
+                    break
+
+        limit = kwargs.get('Limit')
+        names = kwargs.get('ExpressionAttributeNames') or {}
+        values = kwargs.get('ExpressionAttributeValues') or {}
+        filter_expression = kwargs.get('FilterExpression')
+        condition = compile_condition(filter_expression, names, values) if filter_expression else None
+
+        result_items = []
+        scanned = 0
+        size = 0
+        last_key = None
+        for item in candidates:
+            if not matches(item):
+                continue
+            scanned += 1
+            size += _item_size(item)
+            if condition is None or condition(item):
+                result_items.append(copy.deepcopy(_project(item, kwargs.get('ProjectionExpression'), names)))
+            if (limit and scanned >= limit) or size >= self.resource.page_bytes:
+                last_key = self._key_of(item, index_name)
+                break
+
+        # 마지막 항목에서 멈췄으면 다음 페이지가 없음
+        if last_key is not None and candidates and self._key_of(candidates[-1], index_name) == last_key:
+            remaining = [item for item in candidates[candidates.index(item) + 1:] if matches(item)]
+            if not remaining:
+                last_key = None
+
+        response = {'Count': len(result_items), 'ScannedCount': scanned}
+        if kwargs.get('Select') != 'COUNT':
+            response['Items'] = result_items
+        if last_key is not None:
+            response['LastEvaluatedKey'] = copy.deepcopy(last_key)
+        return response
+
+    # 단건 API
+    def get_item(self, Key, **kwargs):
+        self._faults('get_item')
+        with self._lock:
+            item = self.items.get(self._pk(Key))
+            if item is None:
+                return {}
+            names = kwargs.get('ExpressionAttributeNames') or {}
+            return {'Item': copy.deepcopy(_project(item, kwargs.get('ProjectionExpression'), names))}
+
+    def _check(self, existing, kwargs, operation):
+        expression = kwargs.get('ConditionExpression')
+        if not expression:
+            return
+        condition = compile_condition(
+            expression, kwargs.get('ExpressionAttributeNames'), kwargs.get('ExpressionAttributeValues')
+        )
+        if not condition(existing or {}):
+            raise client_error('ConditionalCheckFailedException', 'The conditional request failed', operation)
+
+    def put_item(self, Item, **kwargs):
+        self._faults('put_item')
+        item = to_dynamo(copy.deepcopy(Item))
+        with self._lock:
+            pk = self._pk(item)
+            existing = self.items.get(pk)
+            self._check(existing, kwargs, 'PutItem')
+            self.items[pk] = item
+        response = {}
+        if kwargs.get('ReturnValues') == 'ALL_OLD' and existing:
+            response['Attributes'] = copy.deepcopy(existing)
+        return response
+
+    def delete_item(self, Key, **kwargs):
+        self._faults('delete_item')
+        with self._lock:
+            pk = self._pk(Key)
+            existing = self.items.get(pk)
+            self._check(existing, kwargs, 'DeleteItem')
+            self.items.pop(pk, None)
+        response = {}
+        if kwargs.get('ReturnValues') == 'ALL_OLD' and existing:
+            response['Attributes'] = copy.deepcopy(existing)
+        return response
+
+    def update_item(self, Key, UpdateExpression=None, **kwargs):
+        self._faults('update_item')
+        names = kwargs.get('ExpressionAttributeNames') or {}
+        values = to_dynamo(kwargs.get('ExpressionAttributeValues') or {})
+        with self._lock:
+            pk = self._pk(Key)
+            existing = self.items.get(pk)
+            self._check(existing, dict(kwargs, ExpressionAttributeValues=values), 'UpdateItem')
+            item = copy.deepcopy(existing) if existing else to_dynamo(copy.deepcopy(Key))
+            before = copy.deepcopy(item)
+            updated = set()
+            if UpdateExpression:
+                actions = _Parser(UpdateExpression, names, values).update()
+                # 모든 값은 갱신 전 항목 기준으로 계산
+                computed = [(action, target, value(before) if value else None) for action, target, value in actions]
+                for action, target, value in computed:
+                    updated.add(target[0])
+                    if action == 'SET':
+                        _set_path(item, target, value)
+                    elif action == 'REMOVE':
+                        _remove_path(item, target)
+                    elif action == 'ADD':
+                        current = get_path(item, target)
+                        if current is _MISSING:
+                            _set_path(item, target, value)
+                        elif isinstance(current, set):
+                            _set_path(item, target, current | set(value))
+                        else:
+                            _set_path(item, target, current + value)
+                    elif action == 'DELETE':
+                        current = get_path(item, target)
+                        if isinstance(current, set):
+                            remaining = current - set(value)
+                            if remaining:
+                                _set_path(item, target, remaining)
+                            else:
+                                _remove_path(item, target)
+            self.items[pk] = item
+
+        response = {}
+        return_values = kwargs.get('ReturnValues', 'NONE')
+        if return_values == 'ALL_NEW':
+            response['Attributes'] = copy.deepcopy(item)
+        elif return_values == 'UPDATED_NEW':
+            response['Attributes'] = {name: copy.deepcopy(item[name]) for name in updated if name in item}
+        elif return_values == 'ALL_OLD' and existing:
+            response['Attributes'] = copy.deepcopy(existing)
+        elif return_values == 'UPDATED_OLD' and existing:
+            response['Attributes'] = {name: copy.deepcopy(existing[name]) for name in updated if name in existing}
+        return response
+
+    # 다건 API
+    def query(self, KeyConditionExpression, IndexName=None, **kwargs):
+        self._faults('query')
+        hash_name, range_name = self._schema(IndexName)
+        names = kwargs.get('ExpressionAttributeNames') or {}
+        values = kwargs.get('ExpressionAttributeValues') or {}
+        key_condition = compile_condition(KeyConditionExpression, names, values)
+
+        # 해시 키 동등 조건으로 후보를 먼저 좁힘
+        hash_value = _MISSING
+        for part in re.split(r'\s+AND\s+', KeyConditionExpression, flags=re.IGNORECASE):
+            match = re.match(r'^\s*\(?\s*(#?[\w\-]+)\s*=\s*(:\w+)\s*\)?\s*$', part)
+            if match:
+                name = names.get(match.group(1), match.group(1))
+                if name == hash_name:
+                    hash_value = values.get(match.group(2), _MISSING)
+        if hash_value is _MISSING:
+            raise client_error('ValidationException', 'Query condition missed key schema element', 'Query')
+
+        with self._lock:
+            candidates = [
+                item for item in self.items.values()
+                if item.get(hash_name) == hash_value and (not range_name or range_name in item)
+            ]
+            candidates = self._sorted(candidates, range_name, kwargs.get('ScanIndexForward', True))
+            return self._page(candidates, kwargs, key_condition, IndexName, 'Query')
+
+    def scan(self, IndexName=None, **kwargs):
+        self._faults('scan')
+        hash_name, range_name = self._schema(IndexName)
+        segment = kwargs.get('Segment')
+        total_segments = kwargs.get('TotalSegments')
+        with self._lock:
+            if total_segments:
+                candidates = [
+                    item for pk, item in self.items.items()
+                    if self._segment_hash(pk) % total_segments == segment
+                ]
+            else:
+                candidates = list(self.items.values())
+            candidates = [item for item in candidates if hash_name in item]
+            if IndexName and range_name:
+                candidates = [item for item in candidates if range_name in item]
+            return self._page(candidates, kwargs, lambda item: True, IndexName, 'Scan')
+
+    @contextmanager
+    def batch_writer(self, overwrite_by_pkeys=None):
+        writer = _BatchWriter(self)
+        try:
+            yield writer
+        finally:
+            writer.flush()
+
+
+class _BatchWriter:
+    def __init__(self, table):
+        self.table = table
+        self.requests = []
+
+    def put_item(self, Item):
+        self.requests.append({'PutRequest': {'Item': Item}})
+        if len(self.requests) >= 25:
+            self.flush()
+
+    def delete_item(self, Key):
+        self.requests.append({'DeleteRequest': {'Key': Key}})
+        if len(self.requests) >= 25:
+            self.flush()
+
+    def flush(self):
+        while self.requests:
+            batch, self.requests = self.requests[:25], self.requests[25:]
+            while batch:
+                response = self.table.resource.batch_write_item(RequestItems={self.table.name: batch})
+                batch = response.get('UnprocessedItems', {}).get(self.table.name, [])
+
+
+class _Meta:
+    def __init__(self, client):
+        self.client = client
+
+
+class FakeDynamoDB:
+    """
+    boto3.resource('dynamodb') 대체
+    """
+
+    def __init__(self, faults=None, page_bytes=PAGE_BYTES):
+        self.faults = faults or Faults()
+        self.page_bytes = page_bytes
+        self.tables = {}
+        self.meta = _Meta(self)
+
+    def create_table(self, name, key, indexes=None):
+        table = FakeTable(self, name, key, indexes)
+        self.tables[name] = table
+        return table
+
+    def Table(self, name):
+        if name not in self.tables:
+            raise client_error('ResourceNotFoundException', f'Requested resource not found: {name}', 'DescribeTable')
+        return self.tables[name]
+
+    def batch_get_item(self, RequestItems, **kwargs):
+        total = sum(len(request.get('Keys', [])) for request in RequestItems.values())
+        if total > 100:
+            raise client_error('ValidationException', 'Too many items requested for the BatchGetItem call', 'BatchGetItem')
+        throttled = self.faults.before('dynamodb', 'batch_get_item', throttle=False)
+        if throttled:
+            return {'Responses': {}, 'UnprocessedKeys': copy.deepcopy(RequestItems)}
+
+        responses = {}
+        for table_name, request in RequestItems.items():
+            table = self.Table(table_name)
+            names = request.get('ExpressionAttributeNames') or {}
+            found = []
+            with table._lock:
+                for key in request.get('Keys', []):
+                    item = table.items.get(table._pk(key))
+                    if item is not None:
+                        found.append(copy.deepcopy(_project(item, request.get('ProjectionExpression'), names)))
+            responses[table_name] = found
+        return {'Responses': responses, 'UnprocessedKeys': {}}
+
+    def batch_write_item(self, RequestItems, **kwargs):
+        total = sum(len(requests) for requests in RequestItems.values())
+        if total > 25:
+            raise client_error('ValidationException', 'Too many items requested for the BatchWriteItem call', 'BatchWriteItem')
+        throttled = self.faults.before('dynamodb', 'batch_write_item', throttle=False)
+        if throttled:
+            return {'UnprocessedItems': copy.deepcopy(RequestItems)}
+
+        for table_name, requests in RequestItems.items():
+            table = self.Table(table_name)
+            with table._lock:
+                for request in requests:
+                    if 'PutRequest' in request:
+                        item = to_dynamo(copy.deepcopy(request['PutRequest']['Item']))
+                        table.items[table._pk(item)] = item
+                    elif 'DeleteRequest' in request:
+                        table.items.pop(table._pk(request['DeleteRequest']['Key']), None)
+        return {'UnprocessedItems': {}}
+
+
+# ---------------------------------------------------------------------------
+# S3
+# ---------------------------------------------------------------------------
+
+class _Body:
+    def __init__(self, data):
+        self._stream = io.BytesIO(data)
+
+    def read(self, amount=None):
+        return self._stream.read() if amount is None else self._stream.read(amount)
+
+    def close(self):
+        pass
+
+
+class FakeS3:
+    """
+    boto3.client('s3') 대체
+    """
+
+    def __init__(self, faults=None):
+        self.faults = faults or Faults()
+        self.objects = {}
+        self._lock = threading.Lock()
+        self.meta = _Meta(self)
+
+    def _get(self, Bucket, Key, operation):
+        with self._lock:
+            entry = self.objects.get((Bucket, Key))
+        if entry is None:
+            raise client_error('404' if operation == 'HeadObject' else 'NoSuchKey', 'Not Found', operation, 404)
+        return entry
+
+    def put_object(self, Bucket, Key, Body=b'', ContentType='binary/octet-stream', **kwargs):
+        self.faults.before('s3', 'put_object')
+        if hasattr(Body, 'read'):
+            Body = Body.read()
+        if isinstance(Body, str):
+            Body = Body.encode('utf-8')
+        entry = {
+            'Body': bytes(Body),
+            'ContentType': ContentType,
+            'ContentEncoding': kwargs.get('ContentEncoding'),
+            'Metadata': dict(kwargs.get('Metadata') or {}),
+            'LastModified': datetime.now(timezone.utc),
+            'ETag': '"%08x"' % zlib.crc32(bytes(Body)),
+        }
+        with self._lock:
+            self.objects[(Bucket, Key)] = entry
+        return {'ETag': entry['ETag']}
+
+    def head_object(self, Bucket, Key, **kwargs):
+        self.faults.before('s3', 'head_object')
+        entry = self._get(Bucket, Key, 'HeadObject')
+        return {
+            'ContentLength': len(entry['Body']),
+            'ContentType': entry['ContentType'],
+            'ETag': entry['ETag'],
+            'LastModified': entry['LastModified'],
+            'Metadata': dict(entry['Metadata']),
+        }
+
+    def get_object(self, Bucket, Key, **kwargs):
+        self.faults.before('s3', 'get_object')
+        entry = self._get(Bucket, Key, 'GetObject')
+        data = entry['Body']
+        byte_range = kwargs.get('Range')
+        if byte_range:
+            start, _, end = byte_range.replace('bytes=', '').partition('-')
+            data = data[int(start):int(end) + 1 if end else None]
+        response = {
+            'Body': _Body(data),
+            'ContentLength': len(data),
+            'ContentType': entry['ContentType'],
+            'ETag': entry['ETag'],
+            'LastModified': entry['LastModified'],
+            'Metadata': dict(entry['Metadata']),
+        }
+        if entry['ContentEncoding']:
+            response['ContentEncoding'] = entry['ContentEncoding']
+        return response
+
+    def delete_object(self, Bucket, Key, **kwargs):
+        self.faults.before('s3', 'delete_object')
+        with self._lock:
+            self.objects.pop((Bucket, Key), None)
+        return {}
+
+    def delete_objects(self, Bucket, Delete, **kwargs):
+        self.faults.before('s3', 'delete_objects')
+        keys = [entry['Key'] for entry in Delete.get('Objects', [])]
+        with self._lock:
+            for key in keys:
+                self.objects.pop((Bucket, key), None)
+        return {} if Delete.get('Quiet') else {'Deleted': [{'Key': key} for key in keys]}
+
+    def copy_object(self, Bucket, Key, CopySource, **kwargs):
+        self.faults.before('s3', 'copy_object')
+        entry = self._get(CopySource['Bucket'], CopySource['Key'], 'CopyObject')
+        with self._lock:
+            self.objects[(Bucket, Key)] = dict(entry, LastModified=datetime.now(timezone.utc))
+        return {'CopyObjectResult': {'ETag': entry['ETag']}}
+
+    def list_objects_v2(self, Bucket, Prefix='', MaxKeys=1000, ContinuationToken=None, **kwargs):
+        self.faults.before('s3', 'list_objects_v2')
+        with self._lock:
+            keys = sorted(key for bucket, key in self.objects if bucket == Bucket and key.startswith(Prefix))
+        if ContinuationToken:
+            keys = [key for key in keys if key > ContinuationToken]
+        page, rest = keys[:MaxKeys], keys[MaxKeys:]
+        response = {
+            'KeyCount': len(page),
+            'Contents': [
+                {'Key': key, 'Size': len(self.objects[(Bucket, key)]['Body'])} for key in page
+            ],
+            'IsTruncated': bool(rest),
+        }
+        if rest:
+            response['NextContinuationToken'] = page[-1]
+        return response
+
+    def generate_presigned_url(self, ClientMethod, Params=None, ExpiresIn=3600, **kwargs):
+        params = Params or {}
+        return (
+            f"https://{params.get('Bucket')}.s3.local/{params.get('Key')}"
+            f"?X-Amz-Method={ClientMethod}&X-Amz-Expires={ExpiresIn}"
+        )
+
+
+# ---------------------------------------------------------------------------
+# Bedrock
+# ---------------------------------------------------------------------------
+
+# 기본 응답 기사 (문장마다 번호가 달라 이어 쓰기 연결 위치를 확인할 수 있음)
+_ARTICLE = ''.join(f'흑기사가 작성한 보도자료 {number}번째 문장입니다. ' for number in range(1, 200))
+
+
+def default_responder(model_id, request):
+    """
+    기본 응답 생성 - 요청한 max_tokens 안에서 고정 길이의 한국어 기사 생성
+    (한국어 약 1.5자를 토큰 1개로 계산)
+
+    마지막 메시지가 assistant(이어 쓰기)면 그 글자 수만큼 이미 생성된 것으로 보고 나머지만 생성한다.
+    """
+    prompt_chars = 0
+    for message in request.get('messages', []):
+        content = message.get('content')
+        if isinstance(content, str):
+            prompt_chars += len(content)
+        else:
+            prompt_chars += sum(len(block.get('text', '')) for block in content or [])
+    system = request.get('system') or ''
+    if isinstance(system, list):
+        system = ''.join(block.get('text', '') for block in system)
+    prompt_chars += len(system)
+
+    messages = request.get('messages') or [{}]
+    prefill = ''
+    if messages[-1].get('role') == 'assistant':
+        content = messages[-1].get('content')
+        prefill = content if isinstance(content, str) else ''.join(block.get('text', '') for block in content or [])
+
+    target_chars = int(900 * 1.5)
+    remaining_tokens = max(int((target_chars - len(prefill)) / 1.5), 1)
+    max_tokens = int(request.get('max_tokens', 1024))
+    output_tokens = min(remaining_tokens, max_tokens)
+    article = _ARTICLE
+    text = article[len(prefill):len(prefill) + int(output_tokens * 1.5)]
+    return {
+        'id': 'msg_local',
+        'type': 'message',
+        'role': 'assistant',
+        'model': model_id,
+        'content': [{'type': 'text', 'text': text}],
+        'stop_reason': 'max_tokens' if output_tokens < remaining_tokens else 'end_turn',
+        'usage': {'input_tokens': max(int(prompt_chars / 1.5), 1), 'output_tokens': output_tokens},
+    }
+
+
+def _block_text(block):
+    return block if isinstance(block, str) else block.get('text', '')
+
+
+def cached_prefix(request):
+    """
+    cache_control이 붙은 마지막 블록까지의 텍스트 (system 블록, 메시지 순서) - 표시가 없으면 None
+    """
+    blocks = []
+    system = request.get('system')
+    if isinstance(system, list):
+        blocks.extend(system)
+    for message in request.get('messages', []):
+        content = message.get('content')
+        blocks.extend(content if isinstance(content, list) else [content or ''])
+    marked = [index for index, block in enumerate(blocks) if isinstance(block, dict) and block.get('cache_control')]
+    if not marked:
+        return None
+    return ''.join(_block_text(block) for block in blocks[:marked[-1] + 1])
+
+
+class FakeBedrockRuntime:
+    """
+    boto3.client('bedrock-runtime') 대체
+
+    responder(model_id, request) -> 응답 dict 로 응답 내용을 바꿀 수 있고,
+    ms_per_output_token으로 출력 길이에 비례한 생성 지연, ms_per_input_token으로 입력 처리 지연을 줄 수 있다.
+
+    prompt_cache=True면 프롬프트 캐시를 흉내 낸다. cache_control 표시까지의 앞부분이 cache_ttl초 안에
+    같은 모델로 다시 오면 cache_read_input_tokens로, 처음이면 cache_creation_input_tokens로 세고
+    input_tokens에서 뺀다. 캐시에서 읽은 토큰의 입력 처리 지연은 cache_read_cost 배로 줄인다.
+    """
+
+    def __init__(self, faults=None, responder=None, ms_per_output_token=0.0, ms_per_input_token=0.0,
+                 prompt_cache=False, cache_ttl=300.0, cache_read_cost=0.1):
+        self.faults = faults or Faults()
+        self.responder = responder or default_responder
+        self.ms_per_output_token = ms_per_output_token
+        self.ms_per_input_token = ms_per_input_token
+        self.prompt_cache = prompt_cache
+        self.cache_ttl = cache_ttl
+        self.cache_read_cost = cache_read_cost
+        self.requests = []
+        self._prefixes = {}
+        self._lock = threading.Lock()
+        self.meta = _Meta(self)
+
+    def _apply_cache(self, model_id, request, usage):
+        prefix = cached_prefix(request) if self.prompt_cache else None
+        if prefix is None:
+            return
+        tokens = min(int(len(prefix) / 1.5), usage.get('input_tokens', 0))
+        key = (model_id, hashlib.sha256(prefix.encode('utf-8')).hexdigest())
+        now = time.monotonic()
+        with self._lock:
+            hit = self._prefixes.get(key, 0.0) > now
+            # 캐시 항목은 읽을 때마다 유효 시간이 다시 늘어남
+            self._prefixes[key] = now + self.cache_ttl
+        usage['input_tokens'] = usage.get('input_tokens', 0) - tokens
+        usage['cache_read_input_tokens' if hit else 'cache_creation_input_tokens'] = tokens
+
+    def invoke_model(self, modelId, body, **kwargs):
+        self.faults.before('bedrock', 'invoke_model')
+        request = json.loads(body)
+        with self._lock:
+            self.requests.append((modelId, request))
+        response = self.responder(modelId, request)
+        usage = response.setdefault('usage', {})
+        self._apply_cache(modelId, request, usage)
+        delay_ms = usage.get('output_tokens', 0) * self.ms_per_output_token
+        delay_ms += (
+            usage.get('input_tokens', 0) + usage.get('cache_creation_input_tokens', 0)
+            + usage.get('cache_read_input_tokens', 0) * self.cache_read_cost
+        ) * self.ms_per_input_token
+        if delay_ms:
+            time.sleep(delay_ms / 1000.0)
+        data = json.dumps(response, ensure_ascii=False).encode('utf-8')
+        return {
+            'body': _Body(data),
+            'contentType': 'application/json',
+            'ResponseMetadata': {'HTTPStatusCode': 200, 'RetryAttempts': 0},
+        }
+
+
+class FakeSQS:
+    """
+    boto3.client('sqs') 대체 (send_message, receive_message, delete_message_batch)
+
+    큐 URL마다 메시지를 순서대로 보관한다. 받은 메시지는 지워질 때까지 처리 중으로 두고,
+    release()로 되돌리면 다시 받을 수 있다(가시성 제한 시간 만료 대신).
+    .fifo 큐는 MessageDeduplicationId가 같은 메시지를 한 번만 넣는다.
+    """
+
+    def __init__(self, faults=None):
+        self.faults = faults or Faults()
+        self.queues = {}
+        self.in_flight = {}
+        self._deduplication = set()
+        self._lock = threading.Lock()
+        self.meta = _Meta(self)
+
+    def send_message(self, QueueUrl, MessageBody, MessageGroupId=None, MessageDeduplicationId=None, **kwargs):
+        self.faults.before('sqs', 'send_message')
+        if len(MessageBody.encode('utf-8')) > 256 * 1024:
+            raise client_error('InvalidParameterValue', 'Message must be shorter than 262144 bytes.', 'SendMessage')
+        message_id = hashlib.sha1(f"{QueueUrl}|{time.perf_counter_ns()}|{id(MessageBody)}".encode()).hexdigest()
+        with self._lock:
+            if QueueUrl.endswith('.fifo') and MessageDeduplicationId:
+                key = (QueueUrl, MessageDeduplicationId)
+                if key in self._deduplication:
+                    return {'MessageId': message_id}
+                self._deduplication.add(key)
+            self.queues.setdefault(QueueUrl, []).append({
+                'MessageId': message_id,
+                'ReceiptHandle': message_id,
+                'Body': MessageBody,
+                'Attributes': {'MessageGroupId': MessageGroupId} if MessageGroupId else {},
+            })
+        return {'MessageId': message_id}
+
+    def receive_message(self, QueueUrl, MaxNumberOfMessages=1, **kwargs):
+        self.faults.before('sqs', 'receive_message')
+        with self._lock:
+            queue = self.queues.get(QueueUrl, [])
+            messages = queue[:min(MaxNumberOfMessages, 10)]
+            del queue[:len(messages)]
+            for message in messages:
+                self.in_flight[message['ReceiptHandle']] = (QueueUrl, message)
+        return {'Messages': [copy.deepcopy(message) for message in messages]} if messages else {}
+
+    def delete_message_batch(self, QueueUrl, Entries):
+        self.faults.before('sqs', 'delete_message_batch')
+        with self._lock:
+            for entry in Entries:
+                self.in_flight.pop(entry['ReceiptHandle'], None)
+        return {'Successful': [{'Id': entry['Id']} for entry in Entries], 'Failed': []}
+
+    def release(self, receipt_handles):
+        with self._lock:
+            for handle in reversed(list(receipt_handles)):
+                entry = self.in_flight.pop(handle, None)
+                if entry is not None:
+                    self.queues.setdefault(entry[0], []).insert(0, entry[1])
+
+    def depth(self, queue_url):
+        with self._lock:
+            return len(self.queues.get(queue_url, []))
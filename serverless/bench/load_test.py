@@ -0,0 +1,346 @@
+"""
+인메모리 가짜 AWS 위에서 혼합 트래픽을 재생하는 부하 테스트
+
+router.lambda_handler로 액션 비율(--mix)에 맞춰 요청을 보내고,
+액션별 처리량과 p50/p95/p99 지연 시간, 상태 코드별 건수를 출력한다.
+지연 시간/스로틀링은 서비스 또는 서비스.오퍼레이션 단위로 주입한다.
+
+    python bench/load_test.py [--requests 5000] [--concurrency 8] [--seed 1]
+        [--mix listTemplates=22,getTemplate=12,...]
+        [--latency dynamodb=4,dynamodb.scan=12,s3=15,bedrock=200]
+        [--throttle dynamodb=0.01] [--bedrock-ms-per-token 0] [--conditional]
+
+--conditional을 주면 브라우저 캐시처럼 사용자별로 마지막 ETag를 기억했다가 If-None-Match로 보낸다.
+"""
+import argparse
+import contextlib
+import io
+import json
+import logging
+import os
+import random
+import sys
+import threading
+import time
+import uuid
+from collections import defaultdict
+from datetime import datetime, timezone
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import local_aws
+import stubs
+
+# 액션 -> 비율 (warm_pool의 트래픽 비율에 기사 버전 조회, 검색, 항목 기반 생성 추가)
+DEFAULT_MIX = {
+    'listTemplates': 20,
+    'listTemplateChanges': 4,
+    'getTemplate': 12,
+    'getPresignedUrl': 4,
+    'saveFileMetadata': 4,
+    'deleteFile': 1,
+    'saveArticle': 22,
+    'getUserArticles': 10,
+    'getArticleStats': 3,
+    'getOrgArticles': 2,
+    'getArticleVersions': 3,
+    'search': 5,
+    'generate': 25,
+    'generateFromFields': 5,
+}
+
+
+def _parse_weights(value, cast=float):
+    weights = {}
+    for part in (value or '').split(','):
+        if '=' in part:
+            key, number = part.split('=', 1)
+            weights[key.strip()] = cast(number)
+    return weights
+
+
+class EventFactory:
+    """
+    시드 데이터 기반 액션별 요청 이벤트 생성
+    """
+
+    def __init__(self, data, aws, rng, conditional=False):
+        self.data = data
+        self.aws = aws
+        self.rng = rng
+        self.conditional = conditional
+        self._lock = threading.Lock()
+        # (사용자, 액션) -> 마지막으로 받은 ETag
+        self.etags = {}
+        # 사용자 -> 템플릿 변경분 watermark
+        self.watermarks = {}
+        # 접근 가능한 대상으로 요청하도록 조직별 파일, 소유자별 기사 목록 준비
+        users = aws.table('USERS_TABLE').items
+        self.organization_of = {user_id: users[(user_id,)]['organization'] for user_id in data['users']}
+        self.files_by_organization = defaultdict(list)
+        for item in aws.table('PDF_FILES_TABLE').items.values():
+            self.files_by_organization[item['organization']].append(item['fileId'])
+        self.admin_of = {
+            users[(user_id,)]['organization']: user_id
+            for user_id in data['users'] if users[(user_id,)].get('role') == 'admin'
+        }
+        self.articles_by_owner = defaultdict(list)
+        for item in aws.table('ARTICLES_TABLE').items.values():
+            if item['newsId'] == item['originId']:
+                self.articles_by_owner[item['ownerId']].append(item['originId'])
+
+    def _user(self):
+        return self.rng.choice(self.data['users'])
+
+    def _owned_file(self):
+        # 삭제 권한이 있도록 파일 소유자로 요청
+        files_table = self.aws.table('PDF_FILES_TABLE')
+        with self._lock:
+            if not self.data['files']:
+                return None, None
+            file_id = self.data['files'].pop(self.rng.randrange(len(self.data['files'])))
+        item = files_table.items.get((file_id,))
+        return file_id, item['ownerId'] if item else self._user()
+
+    def observe(self, action, event, response):
+        if action == 'listTemplateChanges' and response.get('statusCode') == 200:
+            with self._lock:
+                self.watermarks[event['headers']['authorization']] = json.loads(response['body'])['watermark']
+        etag = (response.get('headers') or {}).get('ETag')
+        if self.conditional and etag:
+            with self._lock:
+                self.etags[(event['headers']['authorization'], action)] = etag
+
+    def build(self, action):
+        user_id = self._user()
+        headers = {'authorization': user_id}
+        etag = self.etags.get((user_id, action)) if self.conditional else None
+        if etag:
+            headers['if-none-match'] = etag
+
+        if action == 'listTemplates':
+            return {'headers': headers, 'queryStringParameters': {'action': 'listTemplates'}}
+        if action == 'listTemplateChanges':
+            since = str(self.watermarks.get(user_id, 0))
+            return {'headers': headers, 'queryStringParameters': {'action': 'listTemplateChanges', 'since': since}}
+        if action == 'getTemplate':
+            file_id = self.rng.choice(self.files_by_organization[self.organization_of[user_id]] or ['file-0'])
+            return {'headers': headers, 'queryStringParameters': {'action': 'getTemplate', 'fileId': file_id}}
+        if action == 'getPresignedUrl':
+            return {
+                'headers': headers,
+                'queryStringParameters': {
+                    'method': 'GET', 'action': 'getPresignedUrl', 'fileName': 'template.pdf', 'isPublic': 'true'
+                },
+            }
+        if action == 'saveFileMetadata':
+            file_id = f'file-{uuid.uuid4().hex[:12]}'
+            organization = self.organization_of[user_id]
+            with self._lock:
+                self.data['files'].append(file_id)
+                self.files_by_organization[organization].append(file_id)
+            return {
+                'headers': headers,
+                'queryStringParameters': {'method': 'POST', 'action': 'saveFileMetadata'},
+                'body': json.dumps({
+                    'fileId': file_id,
+                    'fileName': 'template.pdf',
+                    'description': '부하 테스트 템플릿',
+                    'organization': organization,
+                    'ownerId': user_id,
+                    'isPublic': True,
+                    's3Key': f'{user_id}/{file_id}_template.pdf',
+                    'createdAt': datetime.now(timezone.utc).isoformat(),
+                }),
+            }
+        if action == 'deleteFile':
+            file_id, owner_id = self._owned_file()
+            return {
+                'headers': {'authorization': owner_id or user_id},
+                'queryStringParameters': {'method': 'DELETE', 'action': 'deleteFile', 'fileId': file_id or 'missing'},
+            }
+        if action == 'saveArticle':
+            news_id = f'news-{uuid.uuid4().hex[:12]}'
+            return {
+                'headers': headers,
+                'queryStringParameters': {'method': 'POST', 'action': 'saveArticle'},
+                'body': json.dumps({
+                    'newsId': news_id, 'originId': news_id, 'ownerId': user_id, 'version': '1',
+                    'content': '흑기사가 작성한 기사 본문입니다. ' * 150, 'description': '{}',
+                    'createdAt': datetime.now(timezone.utc).isoformat(),
+                }),
+            }
+        if action == 'getUserArticles':
+            return {
+                'headers': headers,
+                'queryStringParameters': {'method': 'GET', 'action': '/articles/user/{ownerId}'},
+                'pathParameters': {'ownerId': user_id},
+            }
+        if action == 'getOrgArticles':
+            organization = self.organization_of[user_id]
+            return {
+                'headers': dict(headers, authorization=self.admin_of.get(organization, user_id)),
+                'queryStringParameters': {'method': 'GET', 'action': '/articles/org/{organization}', 'limit': '50'},
+                'pathParameters': {'organization': organization},
+            }
+        if action == 'getArticleStats':
+            return {
+                'headers': headers,
+                'queryStringParameters': {'method': 'GET', 'action': '/articles/stats/{ownerId}'},
+                'pathParameters': {'ownerId': user_id},
+            }
+        if action == 'getArticleVersions':
+            owned = self.articles_by_owner[user_id] or self.data['articles']
+            return {
+                'headers': headers,
+                'queryStringParameters': {'method': 'GET', 'action': '/articles/{originId}/version'},
+                'pathParameters': {'originId': self.rng.choice(owned)},
+            }
+        if action == 'search':
+            query = ' '.join(self.rng.sample(stubs.WORDS, self.rng.choice((1, 2))))
+            return {
+                'headers': headers,
+                'queryStringParameters': {'action': 'search', 'q': query, 'limit': '20'},
+            }
+        if action == 'generate':
+            return {
+                'headers': headers,
+                'requestContext': {'http': {'method': 'POST'}},
+                'body': json.dumps({'prompt': '다음 내용으로 보도자료를 작성해주세요: 신제품 출시'}),
+            }
+        if action == 'generateFromFields':
+            return {
+                'headers': headers,
+                'requestContext': {'http': {'method': 'POST'}},
+                'body': json.dumps({
+                    'project': ' '.join(self.rng.sample(stubs.WORDS, 2)),
+                    'company': '흑기사',
+                    'keywords': ', '.join(self.rng.sample(stubs.WORDS, 3)),
+                }),
+            }
+        raise ValueError(f'알 수 없는 액션: {action}')
+
+
+def percentile(sorted_values, fraction):
+    if not sorted_values:
+        return 0.0
+    index = min(int(round(fraction * (len(sorted_values) - 1))), len(sorted_values) - 1)
+    return sorted_values[index]
+
+
+def run(handler, factory, mix, total_requests, concurrency, seed):
+    """
+    요청 total_requests건을 concurrency개 스레드로 실행 - 액션별 (지연 시간 목록, 상태 코드 건수)
+    """
+    actions = [action for action, weight in mix.items() if weight > 0]
+    weights = [mix[action] for action in actions]
+    schedule_rng = random.Random(seed)
+    schedule = [schedule_rng.choices(actions, weights)[0] for _ in range(total_requests)]
+
+    latencies = defaultdict(list)
+    statuses = defaultdict(lambda: defaultdict(int))
+    lock = threading.Lock()
+    position = [0]
+
+    def worker():
+        while True:
+            with lock:
+                if position[0] >= len(schedule):
+                    return
+                action = schedule[position[0]]
+                position[0] += 1
+            event = factory.build(action)
+            started = time.perf_counter()
+            try:
+                response = handler(event, None)
+                status = response.get('statusCode', 0)
+            except Exception:
+                response, status = {}, 'exception'
+            elapsed_ms = (time.perf_counter() - started) * 1000.0
+            factory.observe(action, event, response)
+            with lock:
+                latencies[action].append(elapsed_ms)
+                statuses[action][status] += 1
+
+    threads = [threading.Thread(target=worker) for _ in range(concurrency)]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return latencies, statuses, time.perf_counter() - started
+
+
+def main():
+    parser = argparse.ArgumentParser(description='가짜 AWS 기반 혼합 트래픽 부하 테스트')
+    parser.add_argument('--requests', type=int, default=5000)
+    parser.add_argument('--concurrency', type=int, default=8)
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--mix', default='', help='액션=비율 목록 (기본값에 덮어씀)')
+    parser.add_argument('--latency', default='dynamodb=4,dynamodb.scan=12,s3=15,bedrock=200',
+                        help='서비스[.오퍼레이션]=평균 ms 목록')
+    parser.add_argument('--throttle', default='', help='서비스[.오퍼레이션]=비율 목록')
+    parser.add_argument('--bedrock-ms-per-token', type=float, default=0.0)
+    parser.add_argument('--conditional', action='store_true', help='If-None-Match 재검증 요청 사용')
+    parser.add_argument('--users', type=int, default=200)
+    parser.add_argument('--organizations', type=int, default=10)
+    parser.add_argument('--templates', type=int, default=500)
+    parser.add_argument('--articles', type=int, default=2000)
+    args = parser.parse_args()
+
+    os.environ.setdefault('LOG_LEVEL', 'WARNING')
+    aws = local_aws.install(
+        latency_ms=_parse_weights(args.latency),
+        throttle_rate=_parse_weights(args.throttle),
+        seed=args.seed,
+        ms_per_output_token=args.bedrock_ms_per_token,
+    )
+    data = local_aws.seed(
+        aws, users=args.users, organizations=args.organizations,
+        templates=args.templates, articles=args.articles, rng=random.Random(args.seed),
+    )
+    mix = dict(DEFAULT_MIX, **_parse_weights(args.mix))
+
+    # 핸들러 로그와 요청별 EMF 출력은 버림
+    logging.getLogger().addHandler(logging.NullHandler())
+    import cache
+    import concurrency
+    import router
+
+    factory = EventFactory(data, aws, random.Random(args.seed), args.conditional)
+    with contextlib.redirect_stdout(io.StringIO()):
+        latencies, statuses, elapsed = run(
+            router.lambda_handler, factory, mix, args.requests, args.concurrency, args.seed
+        )
+        # 응답 뒤에 반영되는 후속 갱신까지 끝난 뒤 AWS 호출 수를 셈
+        concurrency.shutdown()
+
+    total = sum(len(values) for values in latencies.values())
+    print(f"요청 {total}건, 동시성 {args.concurrency}, {elapsed:.2f}s, {total / elapsed:.1f} req/s")
+    print(f"{'action':<20} {'count':>6} {'req/s':>8} {'p50':>8} {'p95':>8} {'p99':>8}  status")
+    all_latencies = []
+    for action in mix:
+        values = sorted(latencies.get(action, []))
+        if not values:
+            continue
+        all_latencies.extend(values)
+        codes = ' '.join(f"{code}:{count}" for code, count in sorted(statuses[action].items(), key=str))
+        print(
+            f"{action:<20} {len(values):>6} {len(values) / elapsed:>8.1f} "
+            f"{percentile(values, 0.50):>8.1f} {percentile(values, 0.95):>8.1f} "
+            f"{percentile(values, 0.99):>8.1f}  {codes}"
+        )
+    all_latencies.sort()
+    print(
+        f"{'(전체)':<20} {total:>6} {total / elapsed:>8.1f} {percentile(all_latencies, 0.50):>8.1f} "
+        f"{percentile(all_latencies, 0.95):>8.1f} {percentile(all_latencies, 0.99):>8.1f}"
+    )
+
+    print('\nAWS 호출:', ', '.join(f"{name}={count}" for name, count in sorted(aws.faults.calls.items())))
+    if aws.faults.throttled:
+        print('주입된 스로틀링:', ', '.join(f"{name}={count}" for name, count in sorted(aws.faults.throttled.items())))
+    print('캐시:', json.dumps(cache.stats(), ensure_ascii=False))
+
+
+if __name__ == '__main__':
+    main()
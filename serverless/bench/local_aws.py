@@ -0,0 +1,251 @@
+"""
+인메모리 가짜 AWS(fakes)로 핸들러를 로컬 실행하기 위한 설정
+
+테이블 정의(키 스키마, GSI)를 배포 환경과 같게 만들고 aws_clients.override로
+가짜 클라이언트를 주입한다. stubs와 달리 요청 순서에 묶이지 않으므로
+컨테이너 캐시를 켠 채로 여러 액션을 섞어 실행할 수 있다.
+
+    import local_aws
+    aws = local_aws.install(latency_ms={'dynamodb': 4, 's3': 15}, throttle_rate={'dynamodb': 0.01})
+    data = local_aws.seed(aws, users=200, organizations=10, templates=500, articles=2000)
+"""
+import os
+import random
+import sys
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+
+import fakes
+import stubs
+
+# 테이블 이름 환경 변수 -> (기본 이름, 키 스키마, GSI)
+TABLES = {
+    'USERS_TABLE': ('Users', ('id', None), {}),
+    'PDF_FILES_TABLE': ('PdfFiles', ('fileId', None), {}),
+    'ARTICLES_TABLE': ('Articles', ('newsId', None), {
+        'OwnerIdIndex': ('ownerId', 'createdAt'),
+        'ArticleIdIndex': ('originId', 'createdAt'),
+        'OrganizationIndex': ('organization', 'createdAt'),
+    }),
+    'COUNTERS_TABLE': ('ChangeCounters', ('counterId', None), {}),
+    'SEARCH_INDEX_TABLE': ('SearchIndex', ('organization', 'docId'), {
+        'SeqIndex': ('organization', 'seq'),
+    }),
+    'TEMPLATE_PASSAGES_TABLE': ('TemplatePassages', ('organization', 'docId'), {
+        'SeqIndex': ('organization', 'seq'),
+    }),
+    'USAGE_TABLE': ('TokenUsage', ('usageKey', 'day'), {
+        'OrganizationDayIndex': ('memberOf', 'day'),
+    }),
+    'ARTICLE_STATS_TABLE': ('ArticleStats', ('statsKey', None), {}),
+    'CHANGELOG_TABLE': ('ChangeLog', ('feedKey', 'seq'), {}),
+}
+
+# 캐시와 요청 안 동시 호출은 켠 채로 실행 (stubs.LOCAL_ENV의 비활성화 설정은 제외)
+LOCAL_ENV = {
+    key: value for key, value in stubs.LOCAL_ENV.items()
+    if key not in ('USER_CACHE_TTL', 'FILE_METADATA_CACHE_TTL', 'CONCURRENCY_ENABLED')
+}
+
+
+class LocalAWS:
+    """
+    가짜 서비스 묶음
+    """
+
+    def __init__(self, faults, dynamodb, s3, bedrock, sqs):
+        self.faults = faults
+        self.dynamodb = dynamodb
+        self.s3 = s3
+        self.bedrock = bedrock
+        self.sqs = sqs
+
+    def table(self, env_name):
+        return self.dynamodb.Table(os.environ.get(env_name, TABLES[env_name][0]))
+
+    @property
+    def bucket(self):
+        return os.environ.get('PDF_BUCKET', LOCAL_ENV['PDF_BUCKET'])
+
+
+def setup_environment():
+    """
+    로컬 실행용 환경 변수 설정과 serverless 디렉터리 import 경로 추가
+    """
+    for key, value in LOCAL_ENV.items():
+        os.environ.setdefault(key, value)
+    if stubs.SERVERLESS_DIR not in sys.path:
+        sys.path.insert(0, stubs.SERVERLESS_DIR)
+
+
+def install(latency_ms=None, throttle_rate=None, seed=None, responder=None, ms_per_output_token=0.0):
+    """
+    가짜 S3/DynamoDB/Bedrock/SQS 생성 후 aws_clients에 주입
+    """
+    setup_environment()
+    import aws_clients
+
+    faults = fakes.Faults(latency_ms, throttle_rate, seed)
+    dynamodb = fakes.FakeDynamoDB(faults)
+    for env_name, (default_name, key, indexes) in TABLES.items():
+        dynamodb.create_table(os.environ.get(env_name, default_name), key, indexes)
+    s3 = fakes.FakeS3(faults)
+    bedrock = fakes.FakeBedrockRuntime(faults, responder, ms_per_output_token)
+    sqs = fakes.FakeSQS(faults)
+
+    aws_clients.reset()
+    aws_clients.override('resource', 'dynamodb', dynamodb)
+    aws_clients.override('client', 's3', s3)
+    aws_clients.override('client', 'bedrock-runtime', bedrock)
+    aws_clients.override('client', 'sqs', sqs)
+    return LocalAWS(faults, dynamodb, s3, bedrock, sqs)
+
+
+def _seed_search_document(table, search_seq, item, kind, text):
+    import search_index
+
+    organization = item['organization']
+    search_seq[organization] = search_seq.get(organization, 0) + 1
+    doc_id = item['fileId'] if kind == 'template' else item['originId']
+    title = item['fileName'] if kind == 'template' else search_index.article_title(item)
+    terms = Counter(search_index.tokenize(text[:search_index.MAX_CHARS]))
+    document = {
+        'organization': organization,
+        'docId': f"{kind}#{doc_id}",
+        'kind': kind,
+        'seq': search_seq[organization],
+        'title': title,
+        'ownerId': item['ownerId'],
+        'isPublic': bool(item.get('isPublic', False)),
+        'createdAt': item['createdAt'],
+        'terms': search_index.encode_terms(terms),
+    }
+    table.items[(organization, document['docId'])] = fakes.to_dynamo(document)
+
+
+def _seed_template_passages(table, passage_seq, item, text):
+    import template_retrieval
+
+    organization = item['organization']
+    passage_seq[organization] = passage_seq.get(organization, 0) + 1
+    passages = template_retrieval.split_passages(text)
+    document = {
+        'organization': organization,
+        'docId': item['fileId'],
+        'seq': passage_seq[organization],
+        'title': item['fileName'],
+        'ownerId': item['ownerId'],
+        'isPublic': bool(item.get('isPublic', False)),
+        'createdAt': item['createdAt'],
+        'source': 'pdf',
+        'passageCount': len(passages),
+        'passages': template_retrieval.encode_passages(passages),
+    }
+    table.items[(organization, document['docId'])] = fakes.to_dynamo(document)
+
+
+def seed(aws, users=100, organizations=5, templates=300, articles=1000, versions=3, rng=None):
+    """
+    조직/사용자/템플릿/기사 데이터와 검색 문서, 템플릿 구간, 기사 통계 생성 - 부하 테스트에서 쓸 ID 목록 반환
+
+    주입한 지연/스로틀링은 적용하지 않고 테이블에 직접 기록한다.
+    """
+    import article_stats
+    import change_counters
+
+    rng = rng or random.Random(1)
+    users_table = aws.table('USERS_TABLE')
+    files_table = aws.table('PDF_FILES_TABLE')
+    articles_table = aws.table('ARTICLES_TABLE')
+    search_table = aws.table('SEARCH_INDEX_TABLE')
+    passages_table = aws.table('TEMPLATE_PASSAGES_TABLE')
+    counters_table = aws.table('COUNTERS_TABLE')
+    stats_table = aws.table('ARTICLE_STATS_TABLE')
+    search_seq = {}
+    passage_seq = {}
+    article_summaries = {}
+    base_time = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+    user_ids = []
+    for index in range(users):
+        user = {
+            'id': f'user-{index}',
+            'organization': f'org-{index % organizations}',
+            'role': 'admin' if index < organizations else 'user',
+            'password': 'local',
+        }
+        users_table.items[(user['id'],)] = fakes.to_dynamo(user)
+        user_ids.append(user['id'])
+
+    file_ids = []
+    for index in range(templates):
+        owner = rng.choice(user_ids)
+        owner_item = users_table.items[(owner,)]
+        file_id = f'file-{index}'
+        s3_key = f'{owner}/{file_id}_template.pdf'
+        files_table.items[(file_id,)] = fakes.to_dynamo({
+            'fileId': file_id,
+            'fileName': f'template-{index}.pdf',
+            'description': stubs.korean_text(rng, 40),
+            'organization': owner_item['organization'],
+            'ownerId': owner,
+            'isPublic': rng.random() < 0.5,
+            's3Key': s3_key,
+            'createdAt': (base_time + timedelta(minutes=index)).isoformat(),
+        })
+        aws.s3.objects[(aws.bucket, s3_key)] = {
+            'Body': b'%PDF-1.4 local template' + b' ' * 1024,
+            'ContentType': 'application/pdf',
+            'ContentEncoding': None,
+            'Metadata': {},
+            'LastModified': base_time,
+            'ETag': f'"{index:08x}"',
+        }
+        file_ids.append(file_id)
+        template = files_table.items[(file_id,)]
+        _seed_search_document(
+            search_table, search_seq, template, 'template', f"{template['fileName']}\n{template['description']}"
+        )
+        # 템플릿 PDF 본문 대신 문단 5개짜리 무작위 본문
+        body = '\n\n'.join(stubs.korean_text(rng, 400) for _ in range(5))
+        _seed_template_passages(passages_table, passage_seq, template, body)
+
+    origin_ids = []
+    for index in range(articles):
+        owner = rng.choice(user_ids)
+        origin_id = f'news-{index}'
+        content = stubs.korean_text(rng, 1500)
+        for version in range(1, versions + 1):
+            news_id = origin_id if version == 1 else f'{origin_id}-v{version}'
+            articles_table.items[(news_id,)] = fakes.to_dynamo({
+                'newsId': news_id,
+                'originId': origin_id,
+                'ownerId': owner,
+                'organization': users_table.items[(owner,)]['organization'],
+                'version': str(version),
+                'isCurrent': version == versions,
+                'content': content,
+                'description': '{}',
+                'createdAt': (base_time + timedelta(minutes=index, seconds=version)).isoformat(),
+            })
+        origin_ids.append(origin_id)
+        article = articles_table.items[(news_id,)]
+        _seed_search_document(search_table, search_seq, article, 'article', content)
+        for key in (article_stats.owner_key(owner), article_stats.organization_key(article['organization'])):
+            summary = article_summaries.setdefault(key, {'statsKey': key, 'articleCount': 0, 'versionCount': 0, 'totalBytes': 0})
+            summary['articleCount'] += 1
+            summary['versionCount'] += versions
+            summary['totalBytes'] += versions * len(content.encode('utf-8'))
+            summary['lastActivityAt'] = article['createdAt']
+            summary['lastNewsId'] = news_id
+
+    for key, summary in article_summaries.items():
+        stats_table.items[(key,)] = fakes.to_dynamo(summary)
+    for organization, seq in search_seq.items():
+        counter_id = change_counters.search_key(organization)
+        counters_table.items[(counter_id,)] = fakes.to_dynamo({'counterId': counter_id, 'version': seq})
+    for organization, seq in passage_seq.items():
+        counter_id = change_counters.passages_key(organization)
+        counters_table.items[(counter_id,)] = fakes.to_dynamo({'counterId': counter_id, 'version': seq})
+
+    return {'users': user_ids, 'files': file_ids, 'articles': origin_ids}
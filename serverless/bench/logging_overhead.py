@@ -0,0 +1,113 @@
+"""
+로깅 설정별 핸들러 오버헤드 벤치마크
+
+시나리오마다 로깅 모드를 바꿔 새 인터프리터에서 웜 요청을 반복 실행하고,
+요청당 처리 시간과 로그 출력량(바이트, 줄 수)을 비교한다.
+AWS 호출은 botocore Stubber로 대체한다.
+
+    python bench/logging_overhead.py [--requests 300] [scenario ...]
+
+모드
+    verbose   LOG_LEVEL=DEBUG (전체 이벤트 로그 포함 - 변경 전과 비슷한 출력량)
+    info      LOG_LEVEL=INFO (기본값)
+    sampled   LOG_LEVEL=INFO, LOG_SAMPLE_RATES=*=0.05
+    quiet     LOG_LEVEL=WARNING (요약 줄만)
+"""
+import argparse
+import io
+import json
+import os
+import subprocess
+import sys
+import time
+
+import stubs
+
+MODES = {
+    'verbose': {'LOG_LEVEL': 'DEBUG', 'LOG_MAX_FIELD_CHARS': '100000'},
+    'info': {'LOG_LEVEL': 'INFO'},
+    'sampled': {'LOG_LEVEL': 'INFO', 'LOG_SAMPLE_RATES': '*=0.05'},
+    'quiet': {'LOG_LEVEL': 'WARNING'},
+}
+
+
+class CountingStream(io.TextIOBase):
+    """
+    출력 내용을 버리고 바이트/줄 수만 집계하는 스트림
+    """
+
+    def __init__(self):
+        self.bytes = 0
+        self.lines = 0
+
+    def write(self, text):
+        self.bytes += len(text.encode('utf-8'))
+        self.lines += text.count('\n')
+        return len(text)
+
+
+def run_child(scenario_name, requests):
+    stubs.setup_environment()
+    import logging
+
+    handler_name = stubs.SCENARIOS[scenario_name].get('handler', scenario_name)
+    stubs.install(scenario_name, requests + 1)
+    module = __import__(handler_name)
+
+    stream = CountingStream()
+    log_handler = logging.StreamHandler(stream)
+    log_handler.setFormatter(logging.Formatter('[%(levelname)s]\t%(asctime)s\t%(message)s'))
+    logging.getLogger().addHandler(log_handler)
+
+    real_stdout = sys.stdout
+    sys.stdout = stream
+    try:
+        # 클라이언트 생성을 제외하기 위한 워밍업
+        module.lambda_handler(stubs.event(scenario_name), None)
+        stream.bytes = stream.lines = 0
+
+        start = time.perf_counter()
+        for _ in range(requests):
+            module.lambda_handler(stubs.event(scenario_name), None)
+        elapsed = time.perf_counter() - start
+    finally:
+        sys.stdout = real_stdout
+
+    print(json.dumps({
+        'us_per_request': elapsed / requests * 1e6,
+        'bytes_per_request': stream.bytes / requests,
+        'lines_per_request': stream.lines / requests,
+    }))
+
+
+def main():
+    parser = argparse.ArgumentParser(description='로깅 오버헤드 벤치마크')
+    parser.add_argument('scenarios', nargs='*', default=['list_templates', 'get_pdf_list', 'put_article'])
+    parser.add_argument('--requests', type=int, default=300)
+    parser.add_argument('--child')
+    args = parser.parse_args()
+
+    if args.child:
+        run_child(args.child, args.requests)
+        return
+
+    print(f"{'scenario':<16} {'mode':<8} {'us/req':>9} {'bytes/req':>10} {'lines/req':>10}")
+    for scenario_name in args.scenarios:
+        for mode, mode_env in MODES.items():
+            env = dict(os.environ)
+            env.update(stubs.LOCAL_ENV)
+            env.update(mode_env)
+            output = subprocess.run(
+                [sys.executable, os.path.abspath(__file__), '--child', scenario_name,
+                 '--requests', str(args.requests)],
+                env=env, capture_output=True, text=True, check=True,
+            ).stdout
+            result = json.loads(output.strip().splitlines()[-1])
+            print(
+                f"{scenario_name:<16} {mode:<8} {result['us_per_request']:>9.0f} "
+                f"{result['bytes_per_request']:>10.0f} {result['lines_per_request']:>10.1f}"
+            )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,152 @@
+"""
+컨테이너 캐시 미리 채우기(prewarm) 벤치마크 - 새 컨테이너의 첫 요청 지연 시간과 캐시 적중률
+
+새 컨테이너를 --containers번 흉내 낸다(컨테이너 캐시를 비움). 컨테이너마다 첫 요청 --first건을
+인기 편중(Zipf) 분포로 고른 사용자/템플릿에 보낸다(listTemplates 60%, getTemplate 40%).
+hot set은 같은 분포로 만든 지난 트래픽 표본에서 요청이 많은 사용자/템플릿 상위 --hot개로 만든다.
+
+- cold     : 미리 채우기 없음
+- prewarm  : 첫 요청 전에 prewarm.warm(hot set) 실행 (초기화 단계에서 걸리는 시간은 따로 표시)
+
+    python bench/prewarm_bench.py [--containers 30] [--first 20] [--hot 50] [--dynamodb-ms 8] [--s3-ms 15]
+"""
+import argparse
+import contextlib
+import io
+import logging
+import os
+import random
+import sys
+import time
+from collections import Counter
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import local_aws
+
+
+def percentile(sorted_values, fraction):
+    if not sorted_values:
+        return 0.0
+    index = min(int(round(fraction * (len(sorted_values) - 1))), len(sorted_values) - 1)
+    return sorted_values[index]
+
+
+def zipf_weights(count, exponent=1.1):
+    return [1.0 / (rank + 1) ** exponent for rank in range(count)]
+
+
+def build_event(rng, users, user_weights, files_by_organization, organization_of):
+    user_id = rng.choices(users, user_weights)[0]
+    headers = {'authorization': user_id}
+    if rng.random() < 0.6:
+        return {'headers': headers, 'queryStringParameters': {'action': 'listTemplates'}}
+    # 같은 조직 템플릿 중 앞쪽(인기) 템플릿을 더 자주 조회
+    files = files_by_organization[organization_of[user_id]]
+    file_id = rng.choices(files, zipf_weights(len(files)))[0]
+    return {'headers': headers, 'queryStringParameters': {'action': 'getTemplate', 'fileId': file_id}}
+
+
+def reset_caches(caches):
+    for cache in caches:
+        cache.clear()
+        cache.hits = 0
+        cache.misses = 0
+
+
+def run(label, handler, prewarm, hot_set, containers, caches):
+    first_latencies = []
+    latencies = []
+    warm_ms = []
+    hits = misses = 0
+    for events in containers:
+        reset_caches(caches)
+        if hot_set is not None:
+            warm_ms.append(prewarm.warm(hot_set)['durationMs'])
+            for cache in caches:
+                cache.hits = 0
+                cache.misses = 0
+        for index, event in enumerate(events):
+            started = time.perf_counter()
+            handler(event, None)
+            elapsed = (time.perf_counter() - started) * 1000.0
+            latencies.append(elapsed)
+            if index == 0:
+                first_latencies.append(elapsed)
+        hits += sum(cache.hits for cache in caches)
+        misses += sum(cache.misses for cache in caches)
+    latencies.sort()
+    first_latencies.sort()
+    warm_text = f"  미리 채우기 {sum(warm_ms) / len(warm_ms):>5.0f}ms" if warm_ms else ''
+    return (
+        f"{label:<8} 첫 요청 p50 {percentile(first_latencies, 0.5):>5.1f}ms  "
+        f"첫 {len(containers[0])}건 p50 {percentile(latencies, 0.5):>5.1f}ms p95 {percentile(latencies, 0.95):>5.1f}ms  "
+        f"캐시 적중률 {hits / max(1, hits + misses):>6.1%}{warm_text}"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description='컨테이너 캐시 미리 채우기 벤치마크')
+    parser.add_argument('--containers', type=int, default=30)
+    parser.add_argument('--first', type=int, default=20, help='컨테이너마다 측정할 첫 요청 수')
+    parser.add_argument('--hot', type=int, default=50, help='hot set 사용자/템플릿 수')
+    parser.add_argument('--users', type=int, default=300)
+    parser.add_argument('--templates', type=int, default=600)
+    parser.add_argument('--dynamodb-ms', type=float, default=8.0)
+    parser.add_argument('--s3-ms', type=float, default=15.0)
+    parser.add_argument('--seed', type=int, default=1)
+    args = parser.parse_args()
+
+    local_aws.setup_environment()
+    aws = local_aws.install(latency_ms={'dynamodb': args.dynamodb_ms, 's3': args.s3_ms}, seed=args.seed)
+    logging.getLogger().addHandler(logging.NullHandler())
+    rng = random.Random(args.seed)
+    data = local_aws.seed(aws, users=args.users, organizations=10, templates=args.templates, articles=50, rng=rng)
+
+    import common
+    import get_pdf_list
+    import prewarm
+    import tracing
+
+    tracing.ENABLED = False
+    logging.getLogger().setLevel(logging.ERROR)
+
+    users_table = aws.table('USERS_TABLE').items
+    organization_of = {user_id: users_table[(user_id,)]['organization'] for user_id in data['users']}
+    files_by_organization = {}
+    for item in aws.table('PDF_FILES_TABLE').items.values():
+        files_by_organization.setdefault(item['organization'], []).append(item['fileId'])
+    users = list(data['users'])
+    rng.shuffle(users)
+    user_weights = zipf_weights(len(users))
+
+    # 지난 트래픽 표본에서 hot set 만들기
+    sample = [build_event(rng, users, user_weights, files_by_organization, organization_of) for _ in range(5000)]
+    user_counts = Counter(event['headers']['authorization'] for event in sample)
+    file_counts = Counter(
+        event['queryStringParameters']['fileId'] for event in sample if 'fileId' in event['queryStringParameters']
+    )
+    hot_set = {
+        'users': [user_id for user_id, _ in user_counts.most_common(args.hot)],
+        'files': [file_id for file_id, _ in file_counts.most_common(args.hot)],
+    }
+
+    containers = [
+        [build_event(rng, users, user_weights, files_by_organization, organization_of) for _ in range(args.first)]
+        for _ in range(args.containers)
+    ]
+    caches = (common.user_cache, common.template_list_cache, common.file_metadata_cache)
+
+    print(f"새 컨테이너 {args.containers}개 x 첫 요청 {args.first}건, hot set 사용자/템플릿 {args.hot}개, "
+          f"지연 dynamodb={args.dynamodb_ms:.0f}ms s3={args.s3_ms:.0f}ms")
+    with contextlib.redirect_stdout(io.StringIO()):
+        lines = [
+            run('cold', get_pdf_list.lambda_handler, prewarm, None, containers, caches),
+            run('prewarm', get_pdf_list.lambda_handler, prewarm, hot_set, containers, caches),
+        ]
+    for line in lines:
+        print(line)
+
+
+if __name__ == '__main__':
+    main()
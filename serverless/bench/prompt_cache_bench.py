@@ -0,0 +1,123 @@
+"""
+프롬프트 캐시 벤치마크 - 템플릿 예시(context)를 캐시할 수 있는 앞부분으로 보낼 때의 지연 시간과 비용
+
+세션마다 템플릿 하나를 고르고 같은 템플릿으로 생성 요청을 --turns번(초안, 재생성) 보낸다.
+가짜 Bedrock(fakes.FakeBedrockRuntime)이 프롬프트 캐시를 흉내 내어 cache_control 표시까지의 앞부분이
+다시 오면 cache_read_input_tokens로 세고 입력 처리 지연을 줄인다(--ms-per-input-token, 캐시 읽기는 1/10).
+
+- no-cache : PROMPT_CACHE=0 (context를 system 블록으로 보내지만 cache_control 표시 없음)
+- cache    : context에 cache_control 표시, 모델 표 항목 promptCache=true
+
+비용은 1M 토큰당 단가(기본값은 Claude 3.5 Haiku on Bedrock 기준, 캐시 쓰기 1.25배/읽기 0.1배)로 계산한다.
+
+    python bench/prompt_cache_bench.py [--sessions 20] [--turns 5] [--template-chars 12000]
+        [--ms-per-input-token 0.05] [--ms-per-token 0.2]
+"""
+import argparse
+import contextlib
+import io
+import json
+import logging
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import fakes
+import local_aws
+import stubs
+
+MODEL_ID = 'anthropic.claude-3-5-haiku-20241022-v1:0'
+
+
+def percentile(sorted_values, fraction):
+    index = min(int(round(fraction * (len(sorted_values) - 1))), len(sorted_values) - 1)
+    return sorted_values[index]
+
+
+def run(label, handler, sessions, turns, prices):
+    latencies = []
+    totals = {'input_tokens': 0, 'output_tokens': 0, 'cache_read_input_tokens': 0, 'cache_creation_input_tokens': 0}
+    for template, fields in sessions:
+        for turn in range(turns):
+            body = {'context': f"형식 참고 예시: {template}", 'prompt': f"{fields}\n요청 {turn + 1}회차"}
+            started = time.perf_counter()
+            response = handler({'body': json.dumps(body)}, None)
+            latencies.append((time.perf_counter() - started) * 1000.0)
+            result = json.loads(response['body'])
+            for key in totals:
+                totals[key] += result[key]
+    count = len(latencies)
+    latencies.sort()
+    cost = sum(totals[key] * prices[key] for key in totals) / 1_000_000
+    print(
+        f"{label:<9} p50 {percentile(latencies, 0.5):>6.0f}ms  p95 {percentile(latencies, 0.95):>6.0f}ms  "
+        f"입력 {totals['input_tokens'] / count:>6.0f}  캐시 쓰기 {totals['cache_creation_input_tokens'] / count:>6.0f}  "
+        f"캐시 읽기 {totals['cache_read_input_tokens'] / count:>6.0f}  출력 {totals['output_tokens'] / count:>5.0f} (토큰/건)  "
+        f"${cost / count * 1000:.3f}/1000건"
+    )
+    return percentile(latencies, 0.5), cost
+
+
+def main():
+    parser = argparse.ArgumentParser(description='프롬프트 캐시 벤치마크')
+    parser.add_argument('--sessions', type=int, default=20)
+    parser.add_argument('--turns', type=int, default=5, help='세션당 같은 템플릿으로 보내는 생성 요청 수')
+    parser.add_argument('--template-chars', type=int, default=12000)
+    parser.add_argument('--ms-per-input-token', type=float, default=0.05)
+    parser.add_argument('--ms-per-token', type=float, default=0.2, help='출력 토큰당 생성 지연(ms)')
+    parser.add_argument('--input-price', type=float, default=0.8, help='입력 1M 토큰당 USD')
+    parser.add_argument('--output-price', type=float, default=4.0)
+    parser.add_argument('--cache-write-price', type=float, default=1.0)
+    parser.add_argument('--cache-read-price', type=float, default=0.08)
+    parser.add_argument('--seed', type=int, default=1)
+    args = parser.parse_args()
+
+    local_aws.setup_environment()
+    local_aws.install()
+    logging.getLogger().addHandler(logging.NullHandler())
+
+    import aws_clients
+    import generation
+    import model_router
+    import text_ai_api
+    import tracing
+
+    tracing.ENABLED = False
+    logging.getLogger().setLevel(logging.ERROR)
+    aws_clients.override('client', 'bedrock-runtime', fakes.FakeBedrockRuntime(
+        ms_per_output_token=args.ms_per_token, ms_per_input_token=args.ms_per_input_token, prompt_cache=True
+    ))
+
+    rng = random.Random(args.seed)
+    sessions = [
+        (stubs.korean_text(rng, args.template_chars),
+         f"기관/조직: 기관{index}\n사업명: 사업{index}\n업체명: 업체{index}\n핵심 키워드: 키워드{index}")
+        for index in range(args.sessions)
+    ]
+    prices = {
+        'input_tokens': args.input_price,
+        'output_tokens': args.output_price,
+        'cache_creation_input_tokens': args.cache_write_price,
+        'cache_read_input_tokens': args.cache_read_price,
+    }
+
+    print(f"세션 {args.sessions}개 x 생성 {args.turns}회, 템플릿 {args.template_chars}자")
+    with contextlib.redirect_stdout(io.StringIO()) as captured:
+        generation.PROMPT_CACHE = False
+        model_router.ROUTES = [{'name': 'haiku35', 'modelId': MODEL_ID}]
+        base_p50, base_cost = run('no-cache', text_ai_api.lambda_handler, sessions, args.turns, prices)
+        generation.PROMPT_CACHE = True
+        model_router.ROUTES = [{'name': 'haiku35', 'modelId': MODEL_ID, 'promptCache': True}]
+        # no-cache와 같은 템플릿이지만 표시가 없던 요청은 캐시를 만들지 않았으므로 세션 첫 요청은 캐시 쓰기
+        p50, cost = run('cache', text_ai_api.lambda_handler, sessions, args.turns, prices)
+    for line in captured.getvalue().splitlines():
+        if not line.startswith('{'):
+            print(line)
+    print(f"cache: p50 {p50 / base_p50:.2f}배, 비용 {cost / base_cost:.2f}배 (no-cache 대비)")
+
+
+if __name__ == '__main__':
+    main()
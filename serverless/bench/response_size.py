@@ -0,0 +1,114 @@
+"""
+응답 본문 인코딩별 크기/처리 시간 비교
+
+기사 목록(사용자 기사 목록, 버전 목록 응답과 같은 형태)을 기존 방식(ASCII 이스케이프 JSON),
+UTF-8 JSON, gzip, brotli(설치된 경우)로 인코딩해 본문 크기와 base64 전송 크기,
+인코딩 시간을 출력한다. 마지막으로 가짜 AWS 위에서 put_article 핸들러 응답을 직접 확인한다.
+
+    python bench/response_size.py [--counts 1,10,50,200] [--repeat 20]
+"""
+import argparse
+import base64
+import contextlib
+import io
+import json
+import os
+import random
+import sys
+import time
+from decimal import Decimal
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import local_aws
+import stubs
+
+local_aws.setup_environment()
+
+import responses
+
+
+def article_items(count, seed=1):
+    rng = random.Random(seed)
+    return [
+        {
+            'newsId': f'news-{index}',
+            'originId': f'news-{index}',
+            'ownerId': 'user-1',
+            'version': '1',
+            'isCurrent': True,
+            'content': stubs.korean_text(rng, len(stubs.ARTICLE_CONTENT)),
+            'description': json.dumps({'title': '신제품 출시 보도자료', 'tone': '공식'}, ensure_ascii=False),
+            'wordCount': Decimal(len(stubs.ARTICLE_CONTENT.split())),
+            'createdAt': '2024-01-01T00:00:00+00:00',
+        }
+        for index in range(count)
+    ]
+
+
+def timed(function, repeat):
+    started = time.perf_counter()
+    for _ in range(repeat):
+        result = function()
+    return result, (time.perf_counter() - started) / repeat * 1e6
+
+
+def measure(items, repeat):
+    rows = []
+    escaped, escaped_us = timed(lambda: json.dumps(items, default=str).encode('utf-8'), repeat)
+    rows.append(('ascii json', len(escaped), len(escaped), escaped_us))
+    plain, plain_us = timed(lambda: responses.dumps(items).encode('utf-8'), repeat)
+    rows.append(('utf-8 json', len(plain), len(plain), plain_us))
+    encodings = ['gzip'] + (['br'] if responses.brotli is not None else [])
+    for encoding in encodings:
+        data, us = timed(lambda: responses.compress(plain, encoding), repeat)
+        rows.append((encoding, len(data), len(base64.b64encode(data)), plain_us + us))
+    return rows
+
+
+def handler_check():
+    """
+    가짜 AWS에서 put_article 사용자 기사 목록 응답 확인 - (Accept-Encoding, 응답) 목록
+    """
+    aws = local_aws.install()
+    local_aws.seed(aws, users=2, organizations=1, templates=0, articles=40, versions=1)
+    import put_article
+
+    results = []
+    for accept in ('', 'gzip, deflate, br'):
+        event = {
+            'headers': {'authorization': 'user-0', 'accept-encoding': accept},
+            'queryStringParameters': {'method': 'GET', 'action': '/articles/user/{ownerId}'},
+            'pathParameters': {'ownerId': 'user-0'},
+        }
+        # 요청별 EMF 출력은 버림
+        with contextlib.redirect_stdout(io.StringIO()):
+            results.append((accept, put_article.lambda_handler(event, None)))
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description='응답 본문 인코딩 크기 비교')
+    parser.add_argument('--counts', default='1,10,50,200')
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    print(f"brotli: {'사용 가능' if responses.brotli is not None else '없음 (gzip만 사용)'}")
+    print(f"{'items':>5} {'encoding':<11} {'body B':>10} {'wire B':>10} {'ratio':>7} {'encode µs':>10}")
+    for count in [int(value) for value in args.counts.split(',')]:
+        rows = measure(article_items(count), args.repeat)
+        baseline = rows[0][2]
+        for name, size, wire, us in rows:
+            print(f"{count:>5} {name:<11} {size:>10} {wire:>10} {wire / baseline:>7.2f} {us:>10.0f}")
+
+    print('\nput_article 사용자 기사 목록 응답 (기사 40건)')
+    for accept, response in handler_check():
+        print(
+            f"  Accept-Encoding={accept or '(없음)':<18} status={response['statusCode']} "
+            f"Content-Encoding={response['headers'].get('Content-Encoding', '-'):<5} "
+            f"isBase64Encoded={response.get('isBase64Encoded', False)} body={len(response['body'])}B"
+        )
+
+
+if __name__ == '__main__':
+    main()
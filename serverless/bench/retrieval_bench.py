@@ -0,0 +1,106 @@
+"""
+템플릿 구간 검색 벤치마크 (기본 조직 하나에 템플릿 1,000건)
+
+1. 템플릿 본문 구간 분할 + 저장 형식(zlib 압축 JSON) 인코딩 시간과 항목 크기
+2. 저장 항목으로 조직 구간 색인을 만드는 시간(콜드 컨테이너의 전체 로드)
+3. 생성 요청 항목(사업명/업체명/핵심 키워드) 질의 지연 시간 p50/p95/p99
+4. 템플릿 전문 대신 고른 구간만 넣었을 때의 프롬프트 예시 글자 수
+
+템플릿 본문은 search_bench와 같은 Zipf 어휘로 만든다.
+
+    python bench/retrieval_bench.py [--templates 1000] [--chars 12000] [--queries 500] [--k 3]
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import stubs
+
+stubs.setup_environment()
+
+import template_retrieval
+from search_bench import Vocabulary, percentile
+
+
+def template_body(vocabulary, rng, chars):
+    paragraphs = []
+    length = 0
+    while length < chars:
+        paragraph = vocabulary.text(rng, rng.randint(150, 900))
+        paragraphs.append(paragraph)
+        length += len(paragraph)
+    return '\n\n'.join(paragraphs)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='템플릿 구간 검색 벤치마크')
+    parser.add_argument('--templates', type=int, default=1000)
+    parser.add_argument('--chars', type=int, default=12000, help='템플릿당 본문 글자 수')
+    parser.add_argument('--queries', type=int, default=500)
+    parser.add_argument('--k', type=int, default=template_retrieval.TOP_K)
+    parser.add_argument('--vocabulary', type=int, default=20000)
+    parser.add_argument('--seed', type=int, default=1)
+    args = parser.parse_args()
+    rng = random.Random(args.seed)
+    vocabulary = Vocabulary(args.vocabulary, rng)
+
+    bodies = [template_body(vocabulary, rng, args.chars) for _ in range(args.templates)]
+    started = time.perf_counter()
+    items = []
+    for index, body in enumerate(bodies):
+        passages = template_retrieval.split_passages(body)
+        items.append({
+            'organization': 'org-0',
+            'docId': f'file-{index}',
+            'seq': index + 1,
+            'title': f'template-{index}.pdf',
+            'ownerId': f'user-{index % 50}',
+            'isPublic': index % 2 == 0,
+            'createdAt': '2024-01-01T00:00:00+00:00',
+            'passages': template_retrieval.encode_passages(passages),
+        })
+    elapsed = time.perf_counter() - started
+    stored = sum(len(item['passages']) for item in items)
+    print(f"템플릿 {len(items)}건 구간 분할+인코딩: {elapsed:.2f}s ({elapsed * 1000 / len(items):.1f}ms/건), "
+          f"항목 평균 {stored / len(items) / 1024:.1f}KB (zlib)")
+
+    index = template_retrieval.PassageIndex()
+    started = time.perf_counter()
+    for item in items:
+        index.apply(item)
+    build = time.perf_counter() - started
+    print(f"조직 구간 색인 로드: 구간 {len(index)}개, {build:.2f}s, 용어 {len(index.postings)}개")
+
+    user = {'id': 'user-7', 'role': 'user', 'organization': 'org-0'}
+    admin = {'id': 'user-0', 'role': 'admin', 'organization': 'org-0'}
+    template_retrieval.passage_cache.put('org-0', index)
+    # 카운터 조회 없이 캐시된 색인을 그대로 쓰도록 동기화 함수 대체
+    template_retrieval.organization_index = lambda organization: index
+
+    full_chars = sum(len(body) for body in bodies) / len(bodies)
+    for label, requester in (('일반 사용자', user), ('관리자', admin)):
+        latencies = []
+        context_chars = 0
+        for _ in range(args.queries):
+            fields = {
+                'project': vocabulary.text(rng, 9),
+                'company': vocabulary.text(rng, 3),
+                'keywords': vocabulary.text(rng, 12),
+            }
+            started = time.perf_counter()
+            passages = template_retrieval.retrieve(requester, template_retrieval.fields_query(fields), args.k)
+            context = template_retrieval.prompt_context(passages)
+            latencies.append((time.perf_counter() - started) * 1000.0)
+            context_chars += len(context)
+        latencies.sort()
+        print(f"질의 {args.queries}건 ({label}): p50 {percentile(latencies, 0.5):.2f}ms, "
+              f"p95 {percentile(latencies, 0.95):.2f}ms, p99 {percentile(latencies, 0.99):.2f}ms, "
+              f"예시 평균 {context_chars / args.queries:.0f}자 (템플릿 전문 평균 {full_chars:.0f}자)")
+
+
+if __name__ == '__main__':
+    main()
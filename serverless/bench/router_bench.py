@@ -0,0 +1,158 @@
+"""
+모델 라우팅(model_router) 벤치마크 - 리전/모델별 가짜 Bedrock으로 전환, 크기별 선택, 지연 목표 비교
+
+리전마다 따로 지연/스로틀링을 주입한 가짜 Bedrock(fakes.FakeBedrockRuntime)을 aws_clients에 주입하고
+text_ai_api.lambda_handler로 생성 요청을 보낸다.
+
+- single    : 기본 리전 모델 하나 (스로틀링/타임아웃이면 요청 실패)
+- failover  : 기본 리전 모델 + us-east-1 대체 모델 (스로틀링/타임아웃이면 바로 전환)
+- size      : 짧은 프롬프트는 빠른 모델, 긴 프롬프트(maxInputTokens 초과)는 큰 모델
+- slo       : 느린 모델과 빠른 모델을 나란히 두고 sloMs를 주면 측정한 지연으로 빠른 모델을 먼저 고름
+
+    python bench/router_bench.py [--requests 100] [--throttle 0.2] [--timeout 0.05] [--cooldown 2]
+        [--ms-per-token 0.2] [--slo-ms 250]
+"""
+import argparse
+import contextlib
+import io
+import json
+import logging
+import os
+import random
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import fakes
+import local_aws
+
+MODEL_ID = 'anthropic.claude-3-haiku-20240307-v1:0'
+LARGE_MODEL_ID = 'anthropic.claude-3-5-sonnet-20240620-v1:0'
+
+
+class TimeoutResponder:
+    """
+    일정 비율로 읽기 타임아웃을 내는 응답 (나머지는 기본 응답)
+    """
+
+    def __init__(self, rng, rate, wait_ms):
+        self.rng = rng
+        self.rate = rate
+        self.wait_ms = wait_ms
+        self._lock = threading.Lock()
+
+    def __call__(self, model_id, request):
+        with self._lock:
+            timed_out = self.rng.random() < self.rate
+        if timed_out:
+            from botocore.exceptions import ReadTimeoutError
+            time.sleep(self.wait_ms / 1000.0)
+            raise ReadTimeoutError(endpoint_url='https://bedrock-runtime.local')
+        return fakes.default_responder(model_id, request)
+
+
+def percentile(sorted_values, fraction):
+    if not sorted_values:
+        return 0.0
+    index = min(int(round(fraction * (len(sorted_values) - 1))), len(sorted_values) - 1)
+    return sorted_values[index]
+
+
+def backend(args, rng, throttle=0.0, timeout=0.0, ms_per_token=None, latency_ms=80.0):
+    faults = fakes.Faults(latency_ms={'bedrock': latency_ms}, throttle_rate={'bedrock': throttle},
+                          seed=rng.randrange(1 << 30))
+    responder = TimeoutResponder(random.Random(rng.randrange(1 << 30)), timeout, args.timeout_wait_ms)
+    return fakes.FakeBedrockRuntime(faults, responder, args.ms_per_token if ms_per_token is None else ms_per_token)
+
+
+def run(label, handler, model_router, routes, prompts, slo_ms=None):
+    model_router.ROUTES = routes
+    model_router.reset_stats()
+    latencies = []
+    failed = 0
+    used = {}
+    for prompt in prompts:
+        body = {'prompt': prompt}
+        if slo_ms:
+            body['sloMs'] = slo_ms
+        started = time.perf_counter()
+        response = handler({'body': json.dumps(body)}, None)
+        latencies.append((time.perf_counter() - started) * 1000.0)
+        if response['statusCode'] != 200:
+            failed += 1
+            continue
+        model = json.loads(response['body'])['model']
+        used[model] = used.get(model, 0) + 1
+    latencies.sort()
+    print(
+        f"{label:<9} p50 {percentile(latencies, 0.5):>6.0f}ms  p95 {percentile(latencies, 0.95):>6.0f}ms  "
+        f"p99 {percentile(latencies, 0.99):>6.0f}ms  실패 {failed / len(prompts):>6.1%}  "
+        f"모델 {', '.join(f'{name}={count}' for name, count in sorted(used.items()))}"
+    )
+    for name, values in sorted(model_router.stats().items()):
+        print(f"          {name:<16} 호출 {values['calls']:>4}  스로틀링 {values['throttles']:>3}  "
+              f"타임아웃 {values['timeouts']:>3}  EWMA {values['latencyMs'] or 0:>6.0f}ms  "
+              f"{values['msPerOutputToken'] or 0:.2f}ms/토큰")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='모델 라우팅 벤치마크')
+    parser.add_argument('--requests', type=int, default=100)
+    parser.add_argument('--throttle', type=float, default=0.2, help='기본 리전 스로틀링 비율')
+    parser.add_argument('--timeout', type=float, default=0.05, help='기본 리전 읽기 타임아웃 비율')
+    parser.add_argument('--timeout-wait-ms', type=float, default=300.0, help='타임아웃까지 걸리는 시간(ms)')
+    parser.add_argument('--cooldown', type=float, default=2.0, help='MODEL_COOLDOWN (초)')
+    parser.add_argument('--ms-per-token', type=float, default=0.2, help='출력 토큰당 생성 지연(ms)')
+    parser.add_argument('--slo-ms', type=float, default=250.0)
+    parser.add_argument('--seed', type=int, default=1)
+    args = parser.parse_args()
+
+    local_aws.setup_environment()
+    os.environ['BEDROCK_REGION'] = 'ap-northeast-2'
+    local_aws.install()
+    logging.getLogger().addHandler(logging.NullHandler())
+
+    import aws_clients
+    import model_router
+    import text_ai_api
+    import tracing
+
+    tracing.ENABLED = False
+    logging.getLogger().setLevel(logging.ERROR)
+    model_router.COOLDOWN = args.cooldown
+    rng = random.Random(args.seed)
+
+    short_prompt = '다음 내용으로 보도자료를 작성해주세요: 신제품 출시'
+    long_prompt = short_prompt + '\n참고 템플릿: ' + '가나다라마바사아자차카타파하 ' * 600
+    short_prompts = [short_prompt] * args.requests
+    mixed_prompts = [long_prompt if rng.random() < 0.3 else short_prompt for _ in range(args.requests)]
+
+    # 기본 리전은 스로틀링/타임아웃, us-east-1은 왕복 지연이 더 크지만 안정적
+    aws_clients.override('client', 'bedrock-runtime', backend(args, rng, args.throttle, args.timeout))
+    aws_clients.override('client', 'bedrock-runtime', backend(args, rng, latency_ms=200.0), region='us-east-1')
+    # size/slo용 큰 모델과 느린 리전
+    aws_clients.override('client', 'bedrock-runtime', backend(args, rng, ms_per_token=args.ms_per_token * 3),
+                         region='us-west-2')
+    aws_clients.override('client', 'bedrock-runtime', backend(args, rng), region='ap-northeast-1')
+
+    primary = {'name': 'haiku', 'modelId': MODEL_ID}
+    fallback = {'name': 'haiku-use1', 'modelId': MODEL_ID, 'region': 'us-east-1', 'fallback': True}
+    small = {'name': 'haiku-apne1', 'modelId': MODEL_ID, 'region': 'ap-northeast-1', 'maxInputTokens': 2000}
+    large = {'name': 'sonnet-usw2', 'modelId': LARGE_MODEL_ID, 'region': 'us-west-2'}
+
+    print(f"요청 {args.requests}건, 기본 리전 스로틀링 {args.throttle:.0%}, 타임아웃 {args.timeout:.0%}, "
+          f"전환 대기 {args.cooldown:.0f}s")
+    with contextlib.redirect_stdout(io.StringIO()) as captured:
+        run('single', text_ai_api.lambda_handler, model_router, [primary], short_prompts)
+        run('failover', text_ai_api.lambda_handler, model_router, [primary, fallback], short_prompts)
+        run('size', text_ai_api.lambda_handler, model_router, [small, large], mixed_prompts)
+        run('slo', text_ai_api.lambda_handler, model_router, [large, small], short_prompts, args.slo_ms)
+    for line in captured.getvalue().splitlines():
+        if not line.startswith('{'):
+            print(line)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,69 @@
+"""
+병렬 구간 Scan 벤치마크 - 구간 수에 따른 기사 테이블 전체 읽기 시간
+
+가짜 DynamoDB(fakes)에 기사 버전을 채우고 Scan 페이지 하나마다 지연(--scan-ms)을 넣어
+parallel_scan.scan을 구간 수별로 실행한다. 페이지 크기는 실제 DynamoDB와 같은 1MB 기준이다.
+마지막으로 organization을 지운 뒤 article_backfill로 다시 채우는 시간도 잰다
+(항목마다 UpdateItem 지연 --update-ms).
+
+구간이 늘면 구간마다 마지막 페이지가 덜 차서 페이지 수가 늘고, 가짜 테이블의 항목 복사는 GIL 안에서
+처리되므로 로컬에서는 구간 수가 어느 정도를 넘으면 시간이 더 줄지 않는다.
+
+    python bench/scan_bench.py [--articles 3000] [--versions 3] [--scan-ms 40] [--update-ms 5]
+        [--segments 1,2,4,8,16,32] [--backfill-segments 16]
+"""
+import argparse
+import os
+import random
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import local_aws
+
+
+def main():
+    parser = argparse.ArgumentParser(description='병렬 구간 Scan 벤치마크')
+    parser.add_argument('--articles', type=int, default=3000, help='기사 수 (버전마다 항목 하나)')
+    parser.add_argument('--versions', type=int, default=3)
+    parser.add_argument('--scan-ms', type=float, default=40.0, help='Scan 페이지 하나의 평균 지연(ms)')
+    parser.add_argument('--update-ms', type=float, default=5.0, help='UpdateItem 평균 지연(ms)')
+    parser.add_argument('--segments', default='1,2,4,8,16,32')
+    parser.add_argument('--backfill-segments', type=int, default=16)
+    parser.add_argument('--seed', type=int, default=1)
+    args = parser.parse_args()
+
+    aws = local_aws.install(
+        latency_ms={'dynamodb.scan': args.scan_ms, 'dynamodb.update_item': args.update_ms}, seed=args.seed
+    )
+    local_aws.seed(aws, users=100, organizations=5, templates=0, articles=args.articles,
+                   versions=args.versions, rng=random.Random(args.seed))
+
+    import article_backfill
+    import parallel_scan
+    import tracing
+
+    tracing.ENABLED = False
+    table_name = os.environ['ARTICLES_TABLE']
+    total = len(aws.table('ARTICLES_TABLE').items)
+    print(f"기사 항목 {total}건, Scan 페이지 지연 {args.scan_ms:.0f}ms")
+
+    baseline = None
+    for segments in [int(value) for value in args.segments.split(',')]:
+        summary = parallel_scan.scan(table_name, lambda items: None, segments=segments, workers=segments)
+        baseline = baseline or summary['seconds']
+        print(f"구간 {segments:>3}  페이지 {summary['pages']:>4}  {summary['seconds']:>6.2f}s  "
+              f"{summary['items'] / summary['seconds']:>8.0f}항목/s  단일 Scan 대비 {baseline / summary['seconds']:>5.1f}배")
+
+    for item in aws.table('ARTICLES_TABLE').items.values():
+        item.pop('organization', None)
+    for segments in (1, args.backfill_segments):
+        summary = article_backfill.backfill(segments=segments, workers=segments)
+        print(f"organization 채우기 (구간 {segments}): 갱신 {summary['updated']}건, "
+              f"{summary['seconds']:.2f}s")
+        for item in aws.table('ARTICLES_TABLE').items.values():
+            item.pop('organization', None)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,150 @@
+"""
+검색 색인 벤치마크 (기본 문서 100,000건)
+
+1. 문서 토큰화 + 저장 형식(zlib 압축 terms) 인코딩 처리량과 항목 크기
+2. 저장 항목으로 조직 색인을 만드는 시간(콜드 컨테이너의 전체 로드)과 포스팅 메모리
+3. 검색어 1~3단어 질의 지연 시간 p50/p95/p99 (접근 권한 필터 포함)
+4. 변경분(추가/수정/삭제) 반영 시간
+
+문서는 Zipf 분포로 뽑은 무작위 한글 단어로 만든다. 기본값(--organizations 1)은
+모든 문서가 한 조직에 있는 최악의 경우다.
+
+    python bench/search_bench.py [--documents 100000] [--organizations 1] [--chars 400] [--queries 500]
+        [--vocabulary 20000]
+"""
+import argparse
+import os
+import random
+import sys
+import time
+from collections import Counter
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import stubs
+
+stubs.setup_environment()
+
+import search_index
+
+
+def percentile(sorted_values, fraction):
+    index = min(int(round(fraction * (len(sorted_values) - 1))), len(sorted_values) - 1)
+    return sorted_values[index]
+
+
+class Vocabulary:
+    """
+    무작위 한글 음절로 만든 단어 집합 - 단어 빈도는 Zipf 분포 (실제 기사처럼 흔한 단어와 드문 단어가 섞임)
+    """
+
+    def __init__(self, size, rng):
+        syllables = [chr(code) for code in range(0xAC00, 0xAC00 + 11172, 7)]
+        self.words = [''.join(rng.choice(syllables) for _ in range(rng.choice((2, 2, 3, 4)))) for _ in range(size)]
+        weights = [1.0 / rank for rank in range(1, size + 1)]
+        total = 0.0
+        self.cumulative = []
+        for weight in weights:
+            total += weight
+            self.cumulative.append(total)
+
+    def text(self, rng, chars):
+        count = max(chars // 3, 1)
+        return ' '.join(rng.choices(self.words, cum_weights=self.cumulative, k=count))
+
+
+def make_items(count, organizations, chars, rng, vocabulary):
+    """
+    SearchIndex 테이블 항목 형태의 문서 목록 (조직별 seq 증가)
+    """
+    items = []
+    seqs = Counter()
+    for index in range(count):
+        organization = f'org-{index % organizations}'
+        seqs[organization] += 1
+        kind = 'template' if index % 10 == 0 else 'article'
+        text = vocabulary.text(rng, chars if kind == 'article' else 60)
+        terms = Counter(search_index.tokenize(text[:search_index.MAX_CHARS]))
+        items.append({
+            'organization': organization,
+            'docId': f'{kind}#doc-{index}',
+            'kind': kind,
+            'seq': seqs[organization],
+            'title': text[:40],
+            'ownerId': f'user-{index % 500}',
+            'isPublic': index % 3 == 0,
+            'createdAt': '2024-01-01T00:00:00+00:00',
+            'terms': search_index.encode_terms(terms),
+        })
+    return items
+
+
+def posting_bytes(index):
+    return sum(posting.itemsize * len(posting) for posting in index.postings.values())
+
+
+def main():
+    parser = argparse.ArgumentParser(description='검색 색인 벤치마크')
+    parser.add_argument('--documents', type=int, default=100000)
+    parser.add_argument('--organizations', type=int, default=1)
+    parser.add_argument('--chars', type=int, default=400, help='기사 문서당 글자 수')
+    parser.add_argument('--queries', type=int, default=500)
+    parser.add_argument('--vocabulary', type=int, default=20000, help='단어 종류 수')
+    parser.add_argument('--seed', type=int, default=1)
+    args = parser.parse_args()
+    rng = random.Random(args.seed)
+
+    started = time.perf_counter()
+    vocabulary = Vocabulary(args.vocabulary, rng)
+    items = make_items(args.documents, args.organizations, args.chars, rng, vocabulary)
+    elapsed = time.perf_counter() - started
+    stored = sum(len(item['terms']) for item in items)
+    print(f"문서 {len(items)}건 토큰화+인코딩: {elapsed:.2f}s ({elapsed * 1e6 / len(items):.0f}µs/건), "
+          f"terms 평균 {stored / len(items):.0f}B (zlib)")
+
+    # 가장 큰 조직 하나의 색인 (콜드 컨테이너 첫 검색과 같은 전체 로드)
+    partition = [item for item in items if item['organization'] == 'org-0']
+    index = search_index.InvertedIndex()
+    started = time.perf_counter()
+    for item in partition:
+        index.apply(item)
+    build = time.perf_counter() - started
+    postings = sum(len(posting) for posting in index.postings.values())
+    print(f"조직 색인 로드: 문서 {len(index)}건, {build:.2f}s, 용어 {len(index.postings)}개, "
+          f"포스팅 {postings}개 ({posting_bytes(index) / 1024 / 1024:.1f}MB)")
+
+    user = {'id': 'user-7', 'role': 'user', 'organization': 'org-0'}
+    admin = {'id': 'user-0', 'role': 'admin', 'organization': 'org-0'}
+    for label, requester in (('일반 사용자', user), ('관리자', admin)):
+        latencies = []
+        totals = 0
+        for _ in range(args.queries):
+            query = vocabulary.text(rng, 3 * rng.choice((1, 2, 3)))
+            started = time.perf_counter()
+            # search_index.search와 같은 권한 범위 (일반 사용자는 본인 문서 + 공개 템플릿)
+            allowed = None if requester['role'] == 'admin' else index.owned_or_public(requester['id'])
+            total, _ = index.search(query, None, 0, 20, allowed)
+            latencies.append((time.perf_counter() - started) * 1000.0)
+            totals += total
+        latencies.sort()
+        print(f"질의 {args.queries}건 ({label}): p50 {percentile(latencies, 0.5):.2f}ms, "
+              f"p95 {percentile(latencies, 0.95):.2f}ms, p99 {percentile(latencies, 0.99):.2f}ms, "
+              f"평균 결과 {totals / args.queries:.0f}건")
+
+    # 변경분 반영: 수정 1000건 + 삭제(tombstone) 1000건
+    next_seq = max(int(item['seq']) for item in partition) + 1
+    deltas = []
+    for offset, item in enumerate(rng.sample(partition, min(2000, len(partition)))):
+        if offset % 2:
+            deltas.append(dict(item, seq=next_seq + offset))
+        else:
+            deltas.append({'organization': 'org-0', 'docId': item['docId'], 'seq': next_seq + offset, 'deleted': True})
+    started = time.perf_counter()
+    for item in deltas:
+        index.apply(item)
+    elapsed = time.perf_counter() - started
+    print(f"변경분 {len(deltas)}건 반영: {elapsed * 1000:.1f}ms ({elapsed * 1e6 / len(deltas):.0f}µs/건), 문서 {len(index)}건")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,108 @@
+"""
+DynamoDB 기사 항목 직렬화 마이크로벤치마크
+
+boto3 리소스가 돌려주는 형태(Decimal, set 포함)의 기사 항목 10~10,000건을
+기존 방식(json.dumps(default=str)), 표준 json + 1회 변환, orjson(설치된 경우),
+항목 단위 스트리밍으로 직렬화해 시간과 최대 메모리 증가량을 비교한다.
+
+    python bench/serialize_speed.py [--counts 10,100,1000,10000] [--repeat 5]
+"""
+import argparse
+import json
+import os
+import sys
+import time
+import tracemalloc
+from decimal import Decimal
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import stubs
+
+stubs.setup_environment()
+
+import serialization
+
+
+def article_items(count):
+    return [
+        {
+            'newsId': f'news-{index}',
+            'originId': f'news-{index // 3}',
+            'ownerId': f'user-{index % 50}',
+            'version': str(index % 3 + 1),
+            'isCurrent': index % 3 == 2,
+            'content': stubs.ARTICLE_CONTENT[:2000],
+            'description': '{"title": "보도자료"}',
+            'wordCount': Decimal(index * 7 % 900 + 100),
+            'score': Decimal('0.875'),
+            'tags': {'보도자료', '지역', f'tag-{index % 10}'},
+            'createdAt': '2024-01-01T00:00:00+00:00',
+        }
+        for index in range(count)
+    ]
+
+
+def legacy(items):
+    return json.dumps(items, default=str)
+
+
+def streamed_stdlib(items):
+    return ''.join(serialization.iter_array(items, serialization.dumps_stdlib))
+
+
+def streamed_orjson(items):
+    return ''.join(serialization.iter_array(items, serialization.dumps_orjson))
+
+
+def candidates():
+    result = [
+        ('default=str', legacy),
+        ('stdlib', serialization.dumps_stdlib),
+        ('stdlib stream', streamed_stdlib),
+    ]
+    if serialization.orjson is not None:
+        result += [
+            ('orjson', serialization.dumps_orjson),
+            ('orjson stream', streamed_orjson),
+        ]
+    return result
+
+
+def measure(function, items, repeat):
+    function(items)
+    started = time.perf_counter()
+    for _ in range(repeat):
+        output = function(items)
+    elapsed_ms = (time.perf_counter() - started) / repeat * 1000.0
+
+    tracemalloc.start()
+    function(items)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return output, elapsed_ms, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description='DynamoDB 항목 직렬화 비교')
+    parser.add_argument('--counts', default='10,100,1000,10000')
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"orjson: {'사용 가능' if serialization.orjson is not None else '없음'}")
+    print(f"{'items':>6} {'method':<14} {'ms':>9} {'µs/item':>8} {'peak KB':>9} {'bytes':>10}")
+    for count in [int(value) for value in args.counts.split(',')]:
+        items = article_items(count)
+        expected = serialization.to_json_types(items)
+        for name, function in candidates():
+            output, elapsed_ms, peak = measure(function, items, args.repeat)
+            if name != 'default=str' and json.loads(output) != expected:
+                raise SystemExit(f"{name}: 변환 결과가 다름")
+            print(
+                f"{count:>6} {name:<14} {elapsed_ms:>9.2f} {elapsed_ms * 1000.0 / count:>8.1f} "
+                f"{peak / 1024:>9.0f} {len(output.encode('utf-8')):>10}"
+            )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,165 @@
+"""
+로컬 AWS 스텁 엔드포인트 (벤치마크용)
+
+DynamoDB(JSON 프로토콜), S3(HEAD/GET/PUT/DELETE), Bedrock invoke_model 요청에
+고정 응답을 돌려주는 HTTP/1.1 서버. 지연 시간과 스로틀링 비율을 주입할 수 있고,
+서버에서 받은 TCP 연결 수를 집계하여 커넥션 재사용 여부를 확인할 수 있다.
+
+    python bench/stub_endpoint.py --port 4566 --latency-ms 5 --throttle-rate 0.05
+
+핸들러를 이 엔드포인트로 연결하려면
+    DYNAMODB_ENDPOINT_URL=http://127.0.0.1:4566
+    S3_ENDPOINT_URL=http://127.0.0.1:4566
+    BEDROCK_ENDPOINT_URL=http://127.0.0.1:4566
+"""
+import argparse
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+DYNAMODB_ITEM = {
+    'id': {'S': 'user-1'},
+    'organization': {'S': 'org-1'},
+    'role': {'S': 'user'},
+}
+BEDROCK_RESPONSE = {
+    'content': [{'type': 'text', 'text': '기사 본문'}],
+    'usage': {'input_tokens': 100, 'output_tokens': 200},
+    'stop_reason': 'end_turn',
+}
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def setup(self):
+        super().setup()
+        with self.server.stats_lock:
+            self.server.stats['connections'] += 1
+
+    def log_message(self, format, *args):
+        pass
+
+    def _count_request(self):
+        with self.server.stats_lock:
+            self.server.stats['requests'] += 1
+        if self.server.latency:
+            time.sleep(self.server.latency)
+        return random.random() < self.server.throttle_rate
+
+    def _read_body(self):
+        length = int(self.headers.get('Content-Length', 0) or 0)
+        return self.rfile.read(length) if length else b''
+
+    def _send(self, status, body=b'', headers=None, content_length=None):
+        self.send_response(status)
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.send_header('Content-Length', str(len(body) if content_length is None else content_length))
+        self.end_headers()
+        if body and self.command != 'HEAD':
+            self.wfile.write(body)
+
+    def _send_json(self, status, payload, headers=None):
+        body = json.dumps(payload).encode('utf-8')
+        headers = dict(headers or {})
+        headers.setdefault('Content-Type', 'application/x-amz-json-1.0')
+        self._send(status, body, headers)
+
+    def do_POST(self):
+        self._read_body()
+        throttled = self._count_request()
+        target = self.headers.get('X-Amz-Target', '')
+
+        if target.startswith('DynamoDB_'):
+            if throttled:
+                with self.server.stats_lock:
+                    self.server.stats['throttled'] += 1
+                return self._send_json(400, {
+                    '__type': 'com.amazonaws.dynamodb.v20120810#ThrottlingException',
+                    'message': 'Rate of requests exceeds the allowed throughput.',
+                })
+            operation = target.split('.', 1)[-1]
+            if operation == 'GetItem':
+                return self._send_json(200, {'Item': DYNAMODB_ITEM})
+            if operation in ('Query', 'Scan'):
+                return self._send_json(200, {'Items': [DYNAMODB_ITEM], 'Count': 1})
+            return self._send_json(200, {})
+
+        if self.path.startswith('/model/'):
+            if throttled:
+                with self.server.stats_lock:
+                    self.server.stats['throttled'] += 1
+                return self._send_json(
+                    429, {'message': 'Too many requests'},
+                    {'x-amzn-ErrorType': 'ThrottlingException', 'Content-Type': 'application/json'},
+                )
+            return self._send_json(200, BEDROCK_RESPONSE, {'Content-Type': 'application/json'})
+
+        return self._send(404)
+
+    def do_HEAD(self):
+        self._count_request()
+        self._send(200, headers={'Content-Type': 'application/pdf'}, content_length=1024)
+
+    def do_GET(self):
+        self._count_request()
+        self._send(200, b'%PDF-1.4 stub', {'Content-Type': 'application/pdf'})
+
+    def do_PUT(self):
+        self._read_body()
+        self._count_request()
+        self._send(200, headers={'ETag': '"stub"'})
+
+    def do_DELETE(self):
+        self._count_request()
+        self._send(204)
+
+
+class StubServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address=('127.0.0.1', 0), latency_ms=0.0, throttle_rate=0.0):
+        super().__init__(address, StubHandler)
+        self.latency = latency_ms / 1000.0
+        self.throttle_rate = throttle_rate
+        self.stats_lock = threading.Lock()
+        self.reset_stats()
+
+    @property
+    def url(self):
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def reset_stats(self):
+        with self.stats_lock:
+            self.stats = {'connections': 0, 'requests': 0, 'throttled': 0}
+
+    def start(self):
+        thread = threading.Thread(target=self.serve_forever, daemon=True)
+        thread.start()
+        return self
+
+
+def main():
+    parser = argparse.ArgumentParser(description='로컬 AWS 스텁 엔드포인트')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=4566)
+    parser.add_argument('--latency-ms', type=float, default=0.0)
+    parser.add_argument('--throttle-rate', type=float, default=0.0)
+    args = parser.parse_args()
+
+    server = StubServer((args.host, args.port), args.latency_ms, args.throttle_rate)
+    print(f"스텁 엔드포인트 실행: {server.url}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        print(f"통계: {server.stats}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,203 @@
+"""
+벤치마크 공용 botocore Stubber 시나리오
+
+핸들러별 요청 이벤트와 요청 1회에 필요한 AWS 응답을 정의하고, aws_clients가
+클라이언트를 생성하는 시점에 Stubber를 붙여 네트워크 없이 실행할 수 있게 한다.
+"""
+import copy
+import io
+import json
+import os
+import sys
+
+SERVERLESS_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+USER_ITEM = {
+    'id': {'S': 'user-1'},
+    'organization': {'S': 'org-1'},
+    'role': {'S': 'user'},
+}
+FILE_ITEM = {
+    'fileId': {'S': 'file-1'},
+    'fileName': {'S': 'template.pdf'},
+    'organization': {'S': 'org-1'},
+    'ownerId': {'S': 'user-1'},
+    'isPublic': {'BOOL': True},
+    's3Key': {'S': 'user-1/file-1_template.pdf'},
+}
+TEMPLATE_ITEMS = [
+    dict(FILE_ITEM, fileId={'S': f'file-{index}'}, description={'S': '보도자료 템플릿 ' * 5})
+    for index in range(50)
+]
+COUNTER_ITEM = {
+    'counterId': {'S': 'templates#org-1'},
+    'version': {'N': '3'},
+}
+ARTICLE_CONTENT = '흑기사가 작성한 기사 본문입니다. ' * 150
+
+# 본문 생성용 어휘 (같은 문장 반복은 압축률/검색 결과가 실제와 크게 다름)
+WORDS = (
+    '정부는 올해 지역 기업 지원 사업 규모를 확대한다고 밝혔다 이번 발표에 따라 '
+    '대학 연구소 협력 기술 개발 예산 신규 일자리 창출 주민 설명회 개최 예정이며 '
+    '관계자는 현장 의견을 반영해 세부 계획을 마련하겠다고 말했다 행사에는 시민 '
+    '학생 전문가 등 약 300명이 참석했고 주요 성과와 향후 과제를 공유했다 '
+    '인공지능 반도체 친환경 에너지 스마트시티 관광 축제 장학금 봉사활동 공모전'
+).split()
+BEDROCK_BODY = json.dumps({
+    'content': [{'type': 'text', 'text': '기사 본문'}],
+    'usage': {'input_tokens': 100, 'output_tokens': 200},
+    'stop_reason': 'end_turn',
+}).encode('utf-8')
+
+# 시나리오별 요청 이벤트와 요청 1회당 스텁 응답 (서비스, 메서드, 응답)
+# 'handler'가 없으면 시나리오 이름이 곧 핸들러 모듈 이름
+SCENARIOS = {
+    'get_pdf_list': {
+        'event': {
+            'headers': {'authorization': 'user-1'},
+            'queryStringParameters': {'action': 'getTemplate', 'fileId': 'file-1'},
+        },
+        # 파일 메타데이터 조회를 사용자 조회보다 먼저 시작
+        'responses': [
+            ('dynamodb', 'get_item', {'Item': FILE_ITEM}),
+            ('dynamodb', 'get_item', {'Item': USER_ITEM}),
+            ('s3', 'head_object', {'ContentLength': 1024}),
+        ],
+    },
+    'list_templates': {
+        'handler': 'get_pdf_list',
+        'event': {
+            'headers': {'authorization': 'user-1'},
+            'queryStringParameters': {'action': 'listTemplates'},
+        },
+        'responses': [
+            ('dynamodb', 'get_item', {'Item': USER_ITEM}),
+            ('dynamodb', 'get_item', {'Item': COUNTER_ITEM}),
+            ('dynamodb', 'scan', {'Items': TEMPLATE_ITEMS, 'Count': len(TEMPLATE_ITEMS)}),
+        ],
+    },
+    'put_pdf_resource': {
+        'event': {
+            'headers': {'authorization': 'user-1'},
+            'queryStringParameters': {
+                'method': 'GET', 'action': 'getPresignedUrl', 'fileName': 'template.pdf'
+            },
+        },
+        'responses': [
+            ('dynamodb', 'get_item', {'Item': USER_ITEM}),
+        ],
+    },
+    'put_article': {
+        'event': {
+            'headers': {'authorization': 'user-1'},
+            'queryStringParameters': {'method': 'POST', 'action': 'saveArticle'},
+            'body': json.dumps({
+                'newsId': 'news-1', 'originId': 'news-1', 'content': ARTICLE_CONTENT,
+                'ownerId': 'user-1', 'version': '1', 'description': '{}',
+                'createdAt': '2024-01-01T00:00:00+00:00',
+            }),
+        },
+        'responses': [
+            ('dynamodb', 'get_item', {'Item': USER_ITEM}),
+            ('dynamodb', 'put_item', {}),
+            ('dynamodb', 'update_item', {}),
+            ('dynamodb', 'update_item', {'Attributes': {'version': {'N': '7'}}}),
+            ('dynamodb', 'put_item', {}),
+            ('dynamodb', 'update_item', {}),
+            ('dynamodb', 'update_item', {}),
+        ],
+    },
+    'text_ai_api': {
+        'event': {'body': json.dumps({'prompt': '기사를 작성해주세요'})},
+        'responses': [
+            ('bedrock-runtime', 'invoke_model', 'BEDROCK'),
+        ],
+    },
+}
+
+LOCAL_ENV = {
+    'PDF_BUCKET': 'local-bucket',
+    'USERS_TABLE': 'Users',
+    'PDF_FILES_TABLE': 'PdfFiles',
+    'ARTICLES_TABLE': 'Articles',
+    'COUNTERS_TABLE': 'ChangeCounters',
+    'SEARCH_INDEX_TABLE': 'SearchIndex',
+    'TEMPLATE_PASSAGES_TABLE': 'TemplatePassages',
+    'USAGE_TABLE': 'TokenUsage',
+    'ARTICLE_STATS_TABLE': 'ArticleStats',
+    'CHANGELOG_TABLE': 'ChangeLog',
+    'AWS_DEFAULT_REGION': 'ap-northeast-2',
+    'AWS_ACCESS_KEY_ID': 'local',
+    'AWS_SECRET_ACCESS_KEY': 'local',
+    # 요청마다 같은 순서로 스텁 응답을 소비하도록 컨테이너 캐시 사용 안 함
+    'USER_CACHE_TTL': '0',
+    'FILE_METADATA_CACHE_TTL': '0',
+    # Stubber 응답은 등록 순서대로 소비되므로 요청 안 호출도 차례로 실행
+    'CONCURRENCY_ENABLED': '0',
+}
+
+
+def korean_text(rng, chars):
+    """
+    WORDS에서 무작위로 고른 단어로 chars 글자 이상의 한국어 본문 생성
+    """
+    words = []
+    length = 0
+    while length < chars:
+        word = rng.choice(WORDS)
+        words.append(word)
+        length += len(word) + 1
+        if rng.random() < 0.12:
+            words[-1] += '.'
+    return ' '.join(words)
+
+
+def setup_environment():
+    """
+    로컬 실행용 환경 변수 설정과 serverless 디렉터리 import 경로 추가
+    """
+    for key, value in LOCAL_ENV.items():
+        os.environ.setdefault(key, value)
+    if SERVERLESS_DIR not in sys.path:
+        sys.path.insert(0, SERVERLESS_DIR)
+
+
+def install(scenario_name, invocations):
+    """
+    aws_clients가 생성하는 클라이언트에 시나리오 응답을 invocations회 분량 등록
+    """
+    import aws_clients
+
+    scenario = SCENARIOS[scenario_name]
+    original_create = aws_clients._create
+
+    def create_stubbed(kind, service_name, **kwargs):
+        from botocore.response import StreamingBody
+        from botocore.stub import Stubber
+
+        obj = original_create(kind, service_name, **kwargs)
+        client = obj.meta.client if kind == 'resource' else obj
+        stubber = Stubber(client)
+        for _ in range(invocations):
+            for service, method, response in scenario['responses']:
+                if service != service_name:
+                    continue
+                if response == 'BEDROCK':
+                    response = {
+                        'body': StreamingBody(io.BytesIO(BEDROCK_BODY), len(BEDROCK_BODY)),
+                        'contentType': 'application/json',
+                    }
+                # boto3 리소스는 응답을 제자리에서 변환하므로 요청마다 사본 사용
+                stubber.add_response(method, copy.deepcopy(response))
+        stubber.activate()
+        return obj
+
+    aws_clients._create = create_stubbed
+    return scenario
+
+
+def event(scenario_name):
+    """
+    시나리오 요청 이벤트 사본
+    """
+    return copy.deepcopy(SCENARIOS[scenario_name]['event'])
@@ -0,0 +1,124 @@
+"""
+개별 함수 4개 배포와 router 통합 배포의 콜드 스타트 빈도 비교 시뮬레이션
+
+하루 동안의 혼합 트래픽(주간 집중, 포아송 도착)을 만들어 함수별 컨테이너 풀을
+시뮬레이션한다. 유휴 컨테이너가 없거나 유휴 시간이 만료된 경우 콜드 스타트로 센다.
+
+    python bench/warm_pool.py [--daily-requests 3000] [--idle-minutes 10] [--days 7] [--seed 1]
+"""
+import argparse
+import random
+from collections import defaultdict
+
+# 액션: (비율, 평균 처리 시간 ms, 개별 배포 시 함수)
+ACTION_MIX = {
+    'listTemplates': (0.22, 120, 'get_pdf_list'),
+    'getTemplate': (0.12, 150, 'get_pdf_list'),
+    'getPresignedUrl': (0.04, 60, 'put_pdf_resource'),
+    'saveFileMetadata': (0.04, 60, 'put_pdf_resource'),
+    'deleteFile': (0.01, 100, 'put_pdf_resource'),
+    'saveArticle': (0.22, 60, 'put_article'),
+    'getUserArticles': (0.10, 200, 'put_article'),
+    'generate': (0.25, 12000, 'text_ai_api'),
+}
+
+# 시간대별 트래픽 가중치 (0~23시, 주간 업무 시간 집중)
+HOURLY_WEIGHTS = [
+    0.1, 0.05, 0.05, 0.05, 0.05, 0.1, 0.2, 0.5, 1.0, 1.6, 1.8, 1.5,
+    1.0, 1.5, 1.8, 1.7, 1.5, 1.2, 0.8, 0.5, 0.4, 0.3, 0.2, 0.15,
+]
+
+# 콜드 스타트 시 추가되는 초기화 시간 (ms)
+INIT_MS = {'get_pdf_list': 450, 'put_pdf_resource': 450, 'put_article': 420, 'text_ai_api': 380, 'router': 500}
+
+
+def generate_requests(daily_requests, days, rng):
+    """
+    (도착 시각 초, 액션) 목록
+    """
+    actions = list(ACTION_MIX)
+    weights = [ACTION_MIX[action][0] for action in actions]
+    total_weight = sum(HOURLY_WEIGHTS)
+    requests = []
+    for day in range(days):
+        for hour, weight in enumerate(HOURLY_WEIGHTS):
+            rate = daily_requests * weight / total_weight / 3600.0  # 초당 요청 수
+            t = 0.0
+            while True:
+                t += rng.expovariate(rate)
+                if t >= 3600:
+                    break
+                action = rng.choices(actions, weights)[0]
+                requests.append(((day * 24 + hour) * 3600 + t, action))
+    requests.sort()
+    return requests
+
+
+def simulate(requests, function_of, idle_seconds, rng):
+    """
+    함수별 컨테이너 풀 시뮬레이션 - 액션별 (요청 수, 콜드 스타트 수)
+    """
+    # 함수 -> 컨테이너 목록 [busy_until, last_used, expires_after]
+    pools = defaultdict(list)
+    totals = defaultdict(lambda: [0, 0])
+
+    for arrival, action in requests:
+        function = function_of(action)
+        duration = rng.expovariate(1.0 / ACTION_MIX[action][1]) / 1000.0
+        pool = pools[function]
+
+        # 유휴 시간이 만료된 컨테이너 회수
+        pool[:] = [c for c in pool if c[0] > arrival or arrival - c[1] < c[2]]
+
+        idle = [c for c in pool if c[0] <= arrival]
+        cold = not idle
+        if cold:
+            # 실제 Lambda의 유휴 회수 시간은 일정하지 않으므로 약간의 변동을 줌
+            container = [0.0, 0.0, idle_seconds * rng.uniform(0.5, 1.5)]
+            pool.append(container)
+            duration += INIT_MS[function] / 1000.0
+        else:
+            # 가장 최근에 쓰인 컨테이너 재사용
+            container = max(idle, key=lambda c: c[1])
+
+        container[0] = arrival + duration
+        container[1] = arrival + duration
+        totals[action][0] += 1
+        totals[action][1] += 1 if cold else 0
+
+    return totals
+
+
+def main():
+    parser = argparse.ArgumentParser(description='통합 진입점 콜드 스타트 빈도 시뮬레이션')
+    parser.add_argument('--daily-requests', type=int, default=3000)
+    parser.add_argument('--idle-minutes', type=float, default=10.0)
+    parser.add_argument('--days', type=int, default=7)
+    parser.add_argument('--seed', type=int, default=1)
+    args = parser.parse_args()
+
+    requests = generate_requests(args.daily_requests, args.days, random.Random(args.seed))
+    idle_seconds = args.idle_minutes * 60
+
+    results = {
+        'split': simulate(requests, lambda action: ACTION_MIX[action][2], idle_seconds, random.Random(args.seed)),
+        'router': simulate(requests, lambda action: 'router', idle_seconds, random.Random(args.seed)),
+    }
+
+    print(f"요청 {len(requests)}건, {args.days}일, 유휴 회수 약 {args.idle_minutes}분")
+    print(f"{'action':<18} {'split cold%':>12} {'router cold%':>13}")
+    for action in ACTION_MIX:
+        row = [action]
+        for name in ('split', 'router'):
+            count, cold = results[name].get(action, (0, 0))
+            row.append(100.0 * cold / count if count else 0.0)
+        print(f"{row[0]:<18} {row[1]:>12.2f} {row[2]:>13.2f}")
+
+    for name, totals in results.items():
+        count = sum(values[0] for values in totals.values())
+        cold = sum(values[1] for values in totals.values())
+        print(f"{name:<8} 콜드 스타트 {cold}건 ({100.0 * cold / count:.2f}%)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,171 @@
+"""
+기사 저장 write-behind(article_queue) 벤치마크 - 클라이언트가 기다리는 저장 지연과 쓰기 증폭
+
+작성자 --writers명이 기사마다 초안 1번 + 수정 --edits번을 연달아 저장하는 편집 흐름을 섞어 보낸다.
+저장의 --retry-rate 비율은 같은 본문을 한 번 더 보낸다(클라이언트 재시도).
+
+- direct       : saveArticle이 PutItem과 후속 쓰기(변경 기록, 검색 색인, 통계)를 요청 안에서 처리
+- write-behind : saveArticle은 SQS(FIFO)에 넣고 202 응답, 소비자가 10건씩 받아 BatchWriteItem으로 반영
+
+저장 지연은 핸들러 응답까지(p50/p95), 쓰기 증폭은 반영된 기사 버전 하나당 DynamoDB 쓰기 호출 수와
+소비자 반영 시간으로 비교한다. 끝나면 두 모드의 기사 테이블과 통계 항목이 같은지 확인한다.
+
+    python bench/write_behind_bench.py [--writers 20] [--edits 4] [--retry-rate 0.1] [--dynamodb-ms 8] [--sqs-ms 6]
+"""
+import argparse
+import contextlib
+import io
+import json
+import logging
+import os
+import random
+import sys
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import local_aws
+
+QUEUE_URL = 'https://sqs.local/000000000000/article-saves.fifo'
+WRITE_OPERATIONS = ('put_item', 'update_item', 'delete_item', 'batch_write_item')
+
+
+def percentile(sorted_values, fraction):
+    if not sorted_values:
+        return 0.0
+    index = min(int(round(fraction * (len(sorted_values) - 1))), len(sorted_values) - 1)
+    return sorted_values[index]
+
+
+def build_events(data, rng, writers, edits, retry_rate):
+    """
+    편집 흐름을 섞은 saveArticle 이벤트 목록 (재시도는 바로 다음에 같은 본문으로)
+    """
+    started = datetime(2026, 10, 1, tzinfo=timezone.utc)
+    sessions = []
+    for user_id in rng.sample(data['users'], writers):
+        origin_id = f'news-{uuid.UUID(int=rng.getrandbits(128)).hex[:12]}'
+        saves = []
+        for edit in range(edits + 1):
+            news_id = origin_id if edit == 0 else f'news-{uuid.UUID(int=rng.getrandbits(128)).hex[:12]}'
+            saves.append({
+                'newsId': news_id, 'originId': origin_id, 'ownerId': user_id,
+                'version': '1' if edit == 0 else '2',
+                'content': f'흑기사 수정 {edit}회차 기사 본문입니다. ' * rng.randint(80, 200),
+                'description': '{}',
+                'createdAt': (started + timedelta(minutes=len(sessions), seconds=edit)).isoformat(),
+            })
+        sessions.append(saves)
+
+    events = []
+    while any(sessions):
+        saves = rng.choice([saves for saves in sessions if saves])
+        article = saves.pop(0)
+        event = {
+            'headers': {'authorization': article['ownerId']},
+            'queryStringParameters': {'method': 'POST', 'action': 'saveArticle'},
+            'body': json.dumps(article, ensure_ascii=False),
+        }
+        events.append(event)
+        if rng.random() < retry_rate:
+            events.append(dict(event))
+    return events
+
+
+def writes(aws):
+    return sum(count for name, count in aws.faults.calls.items()
+               if name.startswith('dynamodb.') and name.split('.', 1)[1] in WRITE_OPERATIONS)
+
+
+def snapshot(aws, news_ids):
+    articles = aws.table('ARTICLES_TABLE').items
+    versions = {
+        news_id: {key: value for key, value in articles[(news_id,)].items() if key not in ('queuedAt', 'saveId')}
+        for news_id in news_ids if (news_id,) in articles
+    }
+    stats = {
+        key[0]: {name: item.get(name) for name in ('articleCount', 'versionCount', 'totalBytes', 'lastNewsId')}
+        for key, item in aws.table('ARTICLE_STATS_TABLE').items.items()
+    }
+    return versions, stats
+
+
+def run(label, args, write_behind):
+    aws = local_aws.install(latency_ms={'dynamodb': args.dynamodb_ms, 'sqs': args.sqs_ms}, seed=args.seed)
+    rng = random.Random(args.seed)
+    data = local_aws.seed(aws, users=args.writers * 2, organizations=5, templates=20, articles=50, rng=rng)
+    events = build_events(data, rng, args.writers, args.edits, args.retry_rate)
+    news_ids = {json.loads(event['body'])['newsId'] for event in events}
+
+    import article_queue
+    import concurrency
+    import put_article
+
+    article_queue.ENABLED = write_behind
+    article_queue.QUEUE_URL = QUEUE_URL
+    aws.faults.calls.clear()
+    latencies = []
+    statuses = {}
+    for event in events:
+        started = time.perf_counter()
+        response = put_article.lambda_handler(event, None)
+        latencies.append((time.perf_counter() - started) * 1000.0)
+        statuses[response['statusCode']] = statuses.get(response['statusCode'], 0) + 1
+    # 검색 색인/통계는 응답 뒤에 반영되므로 끝날 때까지 기다린 뒤 셈 (direct의 요청 안 쓰기에 포함)
+    concurrency.shutdown()
+    request_writes = writes(aws)
+
+    drain_ms = 0.0
+    summary = None
+    if write_behind:
+        started = time.perf_counter()
+        summary = article_queue.flush()
+        drain_ms = (time.perf_counter() - started) * 1000.0
+    total_writes = writes(aws)
+    latencies.sort()
+
+    line = (
+        f"{label:<13} 저장 p50 {percentile(latencies, 0.5):>5.1f}ms p95 {percentile(latencies, 0.95):>5.1f}ms  "
+        f"DynamoDB 쓰기 {total_writes:>4}회 (요청 안 {request_writes:>4}회), "
+        f"버전당 {total_writes / len(news_ids):>4.2f}회  상태 {statuses}"
+    )
+    if summary is not None:
+        line += (
+            f"\n{'':<13} 소비자 반영 {drain_ms:>6.0f}ms (메시지 {summary['messages']}건 -> 버전 {summary['written']}개, "
+            f"중복/지난 저장 {summary['stale']}건 건너뜀, 실패 {summary['failed']}건)"
+        )
+    return line, snapshot(aws, news_ids), len(events), len(news_ids)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='기사 저장 write-behind 벤치마크')
+    parser.add_argument('--writers', type=int, default=20)
+    parser.add_argument('--edits', type=int, default=4, help='기사마다 초안 뒤 수정 저장 횟수')
+    parser.add_argument('--retry-rate', type=float, default=0.1)
+    parser.add_argument('--dynamodb-ms', type=float, default=8.0)
+    parser.add_argument('--sqs-ms', type=float, default=6.0)
+    parser.add_argument('--seed', type=int, default=1)
+    args = parser.parse_args()
+
+    local_aws.setup_environment()
+    logging.getLogger().addHandler(logging.NullHandler())
+    import tracing
+
+    tracing.ENABLED = False
+    logging.getLogger().setLevel(logging.ERROR)
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        direct_line, direct_state, saves, versions = run('direct', args, False)
+        queued_line, queued_state, _, _ = run('write-behind', args, True)
+
+    print(f"저장 {saves}건 (기사 {args.writers}개 x 버전 {args.edits + 1}개 = {versions}개, 재시도 포함), "
+          f"지연 dynamodb={args.dynamodb_ms:.0f}ms sqs={args.sqs_ms:.0f}ms")
+    print(direct_line)
+    print(queued_line)
+    print(f"기사 테이블 일치: {direct_state[0] == queued_state[0]}, 통계 일치: {direct_state[1] == queued_state[1]}")
+
+
+if __name__ == '__main__':
+    main()
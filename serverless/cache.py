@@ -0,0 +1,86 @@
+"""
+컨테이너 메모리 캐시 - 크기 제한(LRU)과 TTL을 갖는 단순 캐시
+
+같은 컨테이너에서 처리되는 요청끼리 공유되며, 다른 컨테이너와는 공유되지 않는다.
+쓰기 경로에서는 invalidate()로 같은 컨테이너의 항목을 바로 지우고,
+다른 컨테이너의 항목은 TTL이 지나면 만료된다.
+"""
+import threading
+import time
+from collections import OrderedDict
+
+_MISSING = object()
+
+# 이름 -> TTLCache (통계 보고용)
+_registry = {}
+
+
+class TTLCache:
+    """
+    스레드 안전한 LRU + TTL 캐시
+    """
+
+    def __init__(self, name, maxsize=256, ttl=60.0):
+        self.name = name
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._items = OrderedDict()
+        self._lock = threading.Lock()
+        _registry[name] = self
+
+    @property
+    def enabled(self):
+        return self.ttl > 0 and self.maxsize > 0
+
+    def get(self, key, default=None):
+        if not self.enabled:
+            return default
+        with self._lock:
+            entry = self._items.get(key, _MISSING)
+            if entry is _MISSING or entry[0] < time.monotonic():
+                if entry is not _MISSING:
+                    del self._items[key]
+                self.misses += 1
+                return default
+            self._items.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def put(self, key, value, ttl=None):
+        if not self.enabled:
+            return
+        expires_at = time.monotonic() + (self.ttl if ttl is None else ttl)
+        with self._lock:
+            self._items[key] = (expires_at, value)
+            self._items.move_to_end(key)
+            while len(self._items) > self.maxsize:
+                self._items.popitem(last=False)
+
+    def invalidate(self, key):
+        with self._lock:
+            self._items.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._items.clear()
+
+    def __len__(self):
+        return len(self._items)
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            'size': len(self._items),
+            'hits': self.hits,
+            'misses': self.misses,
+            'hitRate': round(self.hits / lookups, 4) if lookups else 0.0,
+        }
+
+
+def stats():
+    """
+    등록된 모든 캐시의 통계
+    """
+    return {name: cache.stats() for name, cache in _registry.items()}
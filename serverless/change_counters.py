@@ -0,0 +1,184 @@
+"""
+목록 변경 카운터와 조건부 GET(ETag) 처리
+
+조직별 템플릿 목록(templates#{organization})과 사용자별 기사 목록(articles#{ownerId})마다
+변경 카운터를 두고, 쓰기 경로(saveFileMetadata, deleteFile, saveArticle)에서 1씩 올린다.
+조직별 검색 색인 카운터(search#{organization})는 search_index가 문서를 쓸 때마다 올리고,
+새 값을 문서의 seq로 사용해 컨테이너 색인의 변경분 동기화 기준으로 삼는다.
+템플릿 구간 색인 카운터(passages#{organization})도 template_retrieval에서 같은 방식으로 쓴다.
+기사 버전 카운터(versions#{originId})는 생성 후 바로 저장(text_ai_api)할 버전 번호를 reserve()로 미리 잡는다.
+목록 응답의 ETag는 카운터 값으로 만들기 때문에 클라이언트가 If-None-Match로 다시 요청하면
+카운터 한 건만 읽고 304로 응답할 수 있다.
+
+브라우저는 Cache-Control: private, no-cache 응답을 저장해 두었다가 같은 요청에
+If-None-Match를 자동으로 붙이고, 304를 받으면 저장된 본문을 그대로 사용한다.
+
+환경 변수
+    COUNTERS_TABLE      변경 카운터 테이블 (파티션 키 counterId, 기본 ChangeCounters)
+"""
+import hashlib
+import logging
+import os
+from datetime import datetime, timezone
+
+import aws_clients
+import tracing
+
+logger = logging.getLogger()
+
+COUNTERS_TABLE = os.environ.get('COUNTERS_TABLE', 'ChangeCounters')
+
+
+def templates_key(organization):
+    return f"templates#{organization}"
+
+
+def articles_key(owner_id):
+    return f"articles#{owner_id}"
+
+
+def search_key(organization):
+    return f"search#{organization}"
+
+
+def passages_key(organization):
+    return f"passages#{organization}"
+
+
+def versions_key(origin_id):
+    return f"versions#{origin_id}"
+
+
+def bump(counter_id, count=1):
+    """
+    카운터 증가 후 새 값 반환 - 실패해도 쓰기 요청 자체는 성공으로 처리하고 로그만 남김 (None 반환)
+
+    count만큼 한 번에 올리면 new - count + 1 .. new를 호출한 쪽이 차례로 쓸 수 있다.
+    """
+    try:
+        table = aws_clients.dynamodb().Table(COUNTERS_TABLE)
+        with tracing.segment('CountersTable.UpdateItem'):
+            response = table.update_item(
+                Key={'counterId': counter_id},
+                UpdateExpression='ADD version :one SET updatedAt = :now',
+                ExpressionAttributeValues={
+                    ':one': count,
+                    ':now': datetime.now(timezone.utc).isoformat()
+                },
+                ReturnValues='UPDATED_NEW'
+            )
+        version = response.get('Attributes', {}).get('version')
+        logger.info("[COUNTER] 변경 카운터 증가: %s, version=%s", counter_id, version)
+        return int(version) if version is not None else None
+    except Exception as e:
+        logger.error("[COUNTER] 변경 카운터 증가 실패: %s, %s", counter_id, e, exc_info=True)
+        return None
+
+
+def reserve(counter_id, floor):
+    """
+    floor 이상인 새 카운터 값 하나를 원자적으로 잡아 반환 - 동시에 호출해도 같은 값을 두 번 돌려주지 않음
+
+    카운터가 floor보다 작으면(없으면) floor로 올리고, 이미 floor 이상이면 1 올린다.
+    두 갱신 모두 카운터를 늘리는 조건부 쓰기라 반환값은 호출마다 다르다. 실패는 예외로 올림.
+    """
+    table = aws_clients.dynamodb().Table(COUNTERS_TABLE)
+    now = datetime.now(timezone.utc).isoformat()
+    try:
+        with tracing.segment('CountersTable.UpdateItem'):
+            table.update_item(
+                Key={'counterId': counter_id},
+                UpdateExpression='SET version = :floor, updatedAt = :now',
+                ConditionExpression='attribute_not_exists(version) OR version < :floor',
+                ExpressionAttributeValues={':floor': floor, ':now': now}
+            )
+        version = floor
+    except Exception as e:
+        if aws_clients.error_code(e) != 'ConditionalCheckFailedException':
+            raise
+        with tracing.segment('CountersTable.UpdateItem'):
+            response = table.update_item(
+                Key={'counterId': counter_id},
+                UpdateExpression='ADD version :one SET updatedAt = :now',
+                ExpressionAttributeValues={':one': 1, ':now': now},
+                ReturnValues='UPDATED_NEW'
+            )
+        version = int(response['Attributes']['version'])
+    logger.info("[COUNTER] 카운터 값 예약: %s, version=%s", counter_id, version)
+    return version
+
+
+def current(counter_id):
+    """
+    현재 카운터 값 (항목이 없으면 0, 조회 실패 시 None)
+    """
+    try:
+        table = aws_clients.dynamodb().Table(COUNTERS_TABLE)
+        with tracing.segment('CountersTable.GetItem'):
+            response = table.get_item(
+                Key={'counterId': counter_id},
+                ConsistentRead=True
+            )
+        return int(response.get('Item', {}).get('version', 0))
+    except Exception as e:
+        logger.error("[COUNTER] 변경 카운터 조회 실패: %s, %s", counter_id, e, exc_info=True)
+        return None
+
+
+def list_etag(counter_id, *variant):
+    """
+    목록 응답 ETag - 카운터 값과 응답을 달리하는 요청자 정보(variant)로 계산, 조회 실패 시 None
+    """
+    version = current(counter_id)
+    if version is None:
+        return None
+    return etag_for(counter_id, version, *variant)
+
+
+def etag_for(counter_id, version, *variant):
+    """
+    이미 읽은 카운터 값으로 계산한 목록 응답 ETag (list_etag와 같은 값)
+    """
+    source = '|'.join(str(part) for part in (counter_id, version) + variant)
+    return 'W/"%s"' % hashlib.sha1(source.encode('utf-8')).hexdigest()[:20]
+
+
+def with_etag(headers, etag):
+    """
+    ETag와 재검증 캐시 헤더를 추가한 응답 헤더 사본
+    """
+    return dict(headers, **{'ETag': etag, 'Cache-Control': 'private, no-cache'})
+
+
+def is_not_modified(request_headers, etag):
+    """
+    요청의 If-None-Match가 etag와 일치하는지 (헤더 이름 대소문자 무시, 약한 비교)
+    """
+    value = ''
+    for name, header in (request_headers or {}).items():
+        if name.lower() == 'if-none-match':
+            value = header or ''
+            break
+    if not value:
+        return False
+    if value.strip() == '*':
+        return True
+    expected = etag[2:] if etag.startswith('W/') else etag
+    for candidate in value.split(','):
+        candidate = candidate.strip()
+        if candidate.startswith('W/'):
+            candidate = candidate[2:]
+        if candidate == expected:
+            return True
+    return False
+
+
+def not_modified(headers):
+    """
+    304 응답 (본문 없음)
+    """
+    return {
+        'statusCode': 304,
+        'headers': headers,
+        'body': ''
+    }
@@ -0,0 +1,195 @@
+"""
+목록 변경분("changes since") 동기화 - 사용자별 기사 목록, 조직별 템플릿 목록
+
+쓰기 경로가 목록 변경 카운터(change_counters.articles_key / templates_key)를 올리면 그 새 값을
+정렬 키(seq)로 변경 기록 하나를 남긴다. 삭제는 항목 대신 op=delete 기록(tombstone)으로 남긴다.
+카운터는 목록마다 변경 순서대로 1씩 오르므로 seq가 곧 시간 순서이고, 클라이언트는 마지막으로 받은
+seq(watermark)를 since로 보내 그 이후 기록만 받는다. 바뀐 것이 없으면 카운터 한 건만 읽고,
+있으면 바뀐 건수만큼만 읽으므로 폴링 비용은 목록 크기가 아니라 변경량에 비례한다.
+
+카운터 증가와 기록 쓰기 사이의 경합으로 늦게 기록된 항목을 놓치지 않도록 since 이전
+CHANGES_OVERLAP개를 겹쳐 읽는다. 같은 항목이 다시 올 수 있으므로 클라이언트는 id 기준으로
+덮어쓰거나 지우는 방식으로 반영한다. 읽은 기록의 seq는 since 다음부터 빈 번호 없이 이어져야 한다.
+빈 번호(카운터는 올렸지만 기록 쓰기가 실패했거나 아직 쓰이는 중)가 있으면, 그 뒤 기록이 CHANGES_GAP_GRACE초
+이내에 쓰인 경우에는 아직 쓰이는 중으로 보고 빈 번호 앞까지만 돌려주며 watermark도 그 앞에서 멈춘다.
+그보다 오래됐으면(보관 기간이 지나 만료됐거나 기록이 유실됨) resync=true를 돌려준다.
+클라이언트는 전체 목록을 다시 받은 뒤 응답의 watermark부터 이어 간다.
+처음 동기화(since=0)도 resync 응답으로 시작 watermark를 받는다.
+
+저장 구조 (CHANGELOG_TABLE, 파티션 키 feedKey, 정렬 키 seq)
+    feedKey   : 목록 카운터 ID (articles#{ownerId}, templates#{organization})
+    seq       : 카운터 값
+    op        : put 또는 delete, itemId : newsId 또는 fileId
+    item      : put일 때 항목 사본 (기사 버전은 저장 후 바뀌지 않으므로 사본이 곧 현재 값,
+                본문 content/description은 빼고 기록 - 클라이언트는 필요할 때 버전을 조회)
+    expiresAt : DynamoDB TTL (CHANGELOG_RETENTION_DAYS 후 삭제)
+
+환경 변수
+    CHANGELOG_TABLE             변경 기록 테이블 (기본 ChangeLog)
+    CHANGELOG_RETENTION_DAYS    기록 보관 기간(일, 기본 30)
+    CHANGES_OVERLAP             겹쳐 읽을 기록 수 (기본 5)
+    CHANGES_PAGE_SIZE           요청 한 번에 돌려줄 최대 기록 수 (기본 100)
+    CHANGES_GAP_GRACE           빠진 기록을 쓰이는 중으로 볼 시간(초, 기본 60)
+"""
+import logging
+import os
+import time
+from datetime import datetime, timezone
+
+import aws_clients
+import change_counters
+import tracing
+
+logger = logging.getLogger()
+
+CHANGELOG_TABLE = os.environ.get('CHANGELOG_TABLE', 'ChangeLog')
+RETENTION_DAYS = int(os.environ.get('CHANGELOG_RETENTION_DAYS', '30'))
+OVERLAP = int(os.environ.get('CHANGES_OVERLAP', '5'))
+PAGE_SIZE = int(os.environ.get('CHANGES_PAGE_SIZE', '100'))
+GAP_GRACE = float(os.environ.get('CHANGES_GAP_GRACE', '60'))
+
+
+def _table():
+    return aws_clients.dynamodb().Table(CHANGELOG_TABLE)
+
+
+def article_item(article):
+    """
+    기사 변경 기록에 남길 사본 - 본문(content, description)을 뺀 목록 표시용 속성만
+    """
+    return {key: value for key, value in article.items() if key not in ('content', 'description')}
+
+
+def record(feed_key, seq, op, item_id, item=None):
+    """
+    변경 기록 하나 쓰기 - 실패해도 원래 쓰기 요청은 성공으로 처리하고 로그만 남김
+    (카운터 증가에 실패해 seq가 없으면 기록하지 않음, 클라이언트는 다음 resync에서 맞춰짐)
+    """
+    if seq is None:
+        logger.warning("[CHANGES] 카운터 값이 없어 변경 기록 생략: %s, %s", feed_key, item_id)
+        return
+    entry = {
+        'feedKey': feed_key,
+        'seq': seq,
+        'op': op,
+        'itemId': item_id,
+        'changedAt': datetime.now(timezone.utc).isoformat(),
+        'expiresAt': int(time.time()) + RETENTION_DAYS * 86400,
+    }
+    if item is not None:
+        entry['item'] = item
+    try:
+        with tracing.segment('ChangeLogTable.PutItem'):
+            _table().put_item(Item=entry)
+        logger.info("[CHANGES] 변경 기록: %s, seq=%s, %s %s", feed_key, seq, op, item_id)
+    except Exception as e:
+        logger.error("[CHANGES] 변경 기록 실패: %s, seq=%s, %s", feed_key, seq, e, exc_info=True)
+
+
+def record_batch(feed_key, last_seq, changes):
+    """
+    변경 기록 여러 건을 BatchWriteItem으로 쓰기 - last_seq는 bump(feed_key, len(changes))의 반환값
+
+    changes: [(op, item_id, item)] 순서대로 last_seq - len(changes) + 1부터 seq를 매김
+    """
+    if last_seq is None:
+        logger.warning("[CHANGES] 카운터 값이 없어 변경 기록 %s건 생략: %s", len(changes), feed_key)
+        return
+    changed_at = datetime.now(timezone.utc).isoformat()
+    expires_at = int(time.time()) + RETENTION_DAYS * 86400
+    first_seq = last_seq - len(changes) + 1
+    try:
+        with tracing.segment('ChangeLogTable.BatchWriteItem'):
+            with _table().batch_writer() as writer:
+                for offset, (op, item_id, item) in enumerate(changes):
+                    entry = {
+                        'feedKey': feed_key,
+                        'seq': first_seq + offset,
+                        'op': op,
+                        'itemId': item_id,
+                        'changedAt': changed_at,
+                        'expiresAt': expires_at,
+                    }
+                    if item is not None:
+                        entry['item'] = item
+                    writer.put_item(Item=entry)
+        logger.info("[CHANGES] 변경 기록 %s건: %s, seq=%s..%s", len(changes), feed_key, first_seq, last_seq)
+    except Exception as e:
+        logger.error("[CHANGES] 변경 기록 실패: %s, seq=%s..%s, %s", feed_key, first_seq, last_seq, e, exc_info=True)
+
+
+def parse_since(query_params):
+    """
+    since, limit 파라미터 - 잘못된 값이면 None
+    """
+    try:
+        since = int(query_params.get('since') or 0)
+        limit = int(query_params.get('limit') or PAGE_SIZE)
+    except ValueError:
+        return None
+    if since < 0 or not 1 <= limit <= PAGE_SIZE:
+        return None
+    return since, limit
+
+
+def changes(feed_key, since, limit=PAGE_SIZE):
+    """
+    since 이후 변경 기록
+
+    반환값: {'changes': [{'op', 'id', 'seq', 'item'}], 'watermark', 'hasMore', 'resync'}
+    changes는 항목 id마다 마지막 기록 하나만 seq 순서로 담는다.
+    """
+    current = change_counters.current(feed_key)
+    if current is not None and since >= current:
+        if since > current:
+            # 카운터가 초기화되는 등 클라이언트 watermark가 앞서 있으면 전체 다시 받기
+            return {'changes': [], 'watermark': current, 'hasMore': False, 'resync': True}
+        return {'changes': [], 'watermark': since, 'hasMore': False, 'resync': False}
+
+    if since == 0 and current:
+        # 처음 동기화는 전체 목록으로 (변경 기록 도입 전 항목과 만료된 기록이 있으므로)
+        return {'changes': [], 'watermark': current, 'hasMore': False, 'resync': True}
+
+    start = max(0, since - OVERLAP)
+    with tracing.segment('ChangeLogTable.Query'):
+        response = _table().query(
+            KeyConditionExpression='feedKey = :key AND seq > :start',
+            ExpressionAttributeValues={':key': feed_key, ':start': start},
+            Limit=limit + (since - start)
+        )
+    entries = response.get('Items', [])
+    seqs = {int(entry['seq']) for entry in entries}
+    newer = [seq for seq in seqs if seq > since]
+
+    # since 다음부터 이어지지 않는 첫 번호 (그 뒤 기록을 먼저 돌려주면 빈 번호의 변경을 영영 놓침)
+    hole = next((seq for seq in range(since + 1, max(newer, default=since) + 1) if seq not in seqs), None)
+    watermark = max(newer, default=since)
+    if hole is not None:
+        after = min((entry for entry in entries if int(entry['seq']) > hole), key=lambda entry: int(entry['seq']))
+        age = (datetime.now(timezone.utc) - datetime.fromisoformat(after['changedAt'])).total_seconds()
+        if age >= GAP_GRACE:
+            # 보관 기간이 지나 만료됐거나 기록이 유실됨
+            logger.info("[CHANGES] 빠진 변경 기록, 전체 재동기화 필요: %s, since=%s, seq=%s", feed_key, since, hole)
+            return {'changes': [], 'watermark': current or max(seqs), 'hasMore': False, 'resync': True}
+        # 빈 번호가 아직 쓰이는 중일 수 있으므로 그 앞까지만 돌려주고 다음 요청에서 다시 읽음
+        watermark = hole - 1
+        entries = [entry for entry in entries if int(entry['seq']) < hole]
+
+    latest = {}
+    for entry in entries:
+        latest[entry['itemId']] = entry
+    result = [
+        {
+            'op': entry['op'],
+            'id': entry['itemId'],
+            'seq': int(entry['seq']),
+            'item': entry.get('item'),
+        }
+        for entry in sorted(latest.values(), key=lambda entry: int(entry['seq']))
+    ]
+    return {
+        'changes': result,
+        'watermark': watermark,
+        'hasMore': hole is None and 'LastEvaluatedKey' in response,
+        'resync': False,
+    }
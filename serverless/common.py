@@ -0,0 +1,182 @@
+"""
+핸들러 공용 조회/권한 함수
+
+get_pdf_list, put_pdf_resource, put_article, router가 같은 코드를 쓰도록 한 곳에 모은 것.
+사용자 정보와 파일 메타데이터는 컨테이너 캐시(cache.TTLCache)에 보관하므로
+router로 여러 액션을 한 함수에서 처리하면 캐시도 함께 공유된다.
+조직별 템플릿 목록은 조직 변경 카운터 값과 함께 보관하고, 카운터가 바뀌면 다시 읽는다.
+
+환경 변수
+    USER_CACHE_TTL              사용자 정보 캐시 유지 시간(초, 0이면 사용 안 함, 기본 60)
+    FILE_METADATA_CACHE_TTL     파일 메타데이터 캐시 유지 시간(초, 0이면 사용 안 함, 기본 30)
+    TEMPLATE_LIST_CACHE_TTL     조직별 템플릿 목록 캐시 유지 시간(초, 0이면 사용 안 함, 기본 300)
+    TEMPLATE_LIST_CACHE_SIZE    템플릿 목록을 보관할 조직 수 (기본 64)
+"""
+import logging
+import os
+
+import aws_clients
+import tracing
+from cache import TTLCache
+
+logger = logging.getLogger()
+
+USERS_TABLE = os.environ.get('USERS_TABLE', 'Users')
+PDF_FILES_TABLE = os.environ.get('PDF_FILES_TABLE', 'PdfFiles')
+
+user_cache = TTLCache('users', maxsize=1024, ttl=float(os.environ.get('USER_CACHE_TTL', '60')))
+file_metadata_cache = TTLCache(
+    'fileMetadata', maxsize=1024, ttl=float(os.environ.get('FILE_METADATA_CACHE_TTL', '30'))
+)
+template_list_cache = TTLCache(
+    'templateLists',
+    maxsize=int(os.environ.get('TEMPLATE_LIST_CACHE_SIZE', '64')),
+    ttl=float(os.environ.get('TEMPLATE_LIST_CACHE_TTL', '300'))
+)
+
+def get_user_info(user_id):
+    """
+    사용자 정보 가져오기
+    """
+    if user_id == '0':
+        logger.warning("[AUTH] 사용자 ID가 0으로 설정됨")
+        return None
+
+    user = user_cache.get(user_id)
+    if user is not None:
+        logger.info("[AUTH] 사용자 정보 캐시 적중: %s", user_id)
+        return user
+
+    try:
+        logger.info("[AUTH] 사용자 정보 조회 시작: %s", user_id)
+        table = aws_clients.dynamodb().Table(USERS_TABLE)
+        with tracing.segment('UsersTable.GetItem'):
+            response = table.get_item(
+                Key={'id': user_id}
+            )
+        
+        user = response.get('Item')
+        if user:
+            user_cache.put(user_id, user)
+            logger.info("[AUTH] 사용자 정보 조회 성공: %s, 조직: %s", user.get('id'), user.get('organization'))
+        else:
+            logger.warning("[AUTH] 사용자 정보 없음: %s", user_id)
+            
+        return user
+    except Exception as e:
+        logger.error("[AUTH] 사용자 정보 조회 오류: %s", e, exc_info=True)
+        return None
+
+
+def get_file_metadata(file_id):
+    """
+    DynamoDB에서 파일 메타데이터 조회
+    """
+    item = file_metadata_cache.get(file_id)
+    if item is not None:
+        logger.info("[FILE] 파일 메타데이터 캐시 적중: fileId=%s", file_id)
+        return item
+
+    try:
+        logger.info("[FILE] 파일 메타데이터 조회 시작: fileId=%s", file_id)
+        table = aws_clients.dynamodb().Table(PDF_FILES_TABLE)
+        with tracing.segment('PdfFilesTable.GetItem'):
+            response = table.get_item(
+                Key={'fileId': file_id}
+            )
+        
+        item = response.get('Item')
+        if item:
+            file_metadata_cache.put(file_id, item)
+            logger.info("[FILE] 파일 메타데이터 조회 성공: fileName=%s", item.get('fileName'))
+        else:
+            logger.warning("[FILE] 파일 메타데이터 없음: fileId=%s", file_id)
+            
+        return item
+    except Exception as e:
+        logger.error("[FILE] 파일 메타데이터 조회 오류: %s", e, exc_info=True)
+        return None
+
+
+def invalidate_file_metadata(file_id):
+    """
+    메타데이터 저장/삭제 후 이 컨테이너의 캐시 항목 제거
+    """
+    file_metadata_cache.invalidate(file_id)
+
+def get_organization_templates(organization, version=None):
+    """
+    조직의 템플릿 메타데이터 전체
+
+    version은 조직 변경 카운터 값으로, 캐시된 목록의 카운터 값과 같을 때만 캐시를 쓴다.
+    None(카운터 조회 실패)이면 캐시를 건너뛰고 조회한다.
+    """
+    if version is not None:
+        entry = template_list_cache.get(organization)
+        if entry is not None and entry[0] == version:
+            logger.info("[FILE] 템플릿 목록 캐시 적중: 조직=%s, version=%s", organization, version)
+            return entry[1]
+
+    table = aws_clients.dynamodb().Table(PDF_FILES_TABLE)
+    kwargs = {
+        'FilterExpression': 'organization = :org',
+        'ExpressionAttributeValues': {':org': organization},
+        'ConsistentRead': True,
+    }
+    items = []
+    while True:
+        with tracing.segment('PdfFilesTable.Scan'):
+            response = table.scan(**kwargs)
+        items.extend(response.get('Items', []))
+        if 'LastEvaluatedKey' not in response:
+            break
+        kwargs['ExclusiveStartKey'] = response['LastEvaluatedKey']
+
+    if version is not None:
+        template_list_cache.put(organization, (version, items))
+    logger.info("[FILE] 템플릿 목록 조회: 조직=%s, %s개", organization, len(items))
+    return items
+
+
+def invalidate_organization_templates(organization):
+    """
+    템플릿 저장/삭제 후 이 컨테이너의 조직 목록 캐시 제거 (다른 컨테이너는 카운터 값으로 알아챔)
+    """
+    template_list_cache.invalidate(organization)
+
+def can_access_file(user_info, file_metadata):
+    """
+    파일 접근 권한 확인
+    """
+    user_id = user_info.get('id', '')
+    role = user_info.get('role', '')
+    organization = user_info.get('organization', '')
+    
+    owner_id = file_metadata.get('ownerId', '')
+    file_org = file_metadata.get('organization', '')
+    is_public = file_metadata.get('isPublic', False)
+    
+    logger.info(
+        "[FILE] 파일 접근 권한 확인: 사용자=%s, 소유자=%s, "
+        "사용자조직=%s, 파일조직=%s, "
+        "사용자역할=%s, 공유=%s",
+        user_id, owner_id, organization, file_org, role, is_public
+    )
+    
+    # 1. 파일 소유자인 경우
+    if owner_id == user_id:
+        logger.info("[FILE] 파일 접근 권한 있음 (소유자): 사용자=%s", user_id)
+        return True
+
+    # 2. 관리자이고 같은 조직의 파일인 경우
+    if role == 'admin' and file_org == organization:
+        logger.info("[FILE] 파일 접근 권한 있음 (관리자): 사용자=%s, 조직=%s", user_id, organization)
+        return True
+
+    # 3. 같은 조직이고 파일이 공개(isPublic)된 경우
+    if file_org == organization and is_public:
+        logger.info("[FILE] 파일 접근 권한 있음 (공유): 사용자=%s, 조직=%s", user_id, organization)
+        return True
+
+    logger.warning("[FILE] 파일 접근 권한 없음: 사용자=%s", user_id)
+    return False
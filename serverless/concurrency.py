@@ -0,0 +1,156 @@
+"""
+요청 안의 독립된 AWS 호출 동시 실행 - 컨테이너 공용 스레드 풀
+
+boto3 클라이언트는 스레드 안전하므로(리소스 객체는 요청마다 만든 Table만 공유) 서로 결과에 의존하지 않는
+호출을 풀 스레드에서 동시에 보내고 모두 끝날 때까지 기다린다. 요청의 임계 경로가 호출 지연의 합에서
+가장 느린 호출의 지연으로 줄어든다.
+
+    pending = concurrency.submit(get_file_metadata, file_id)   # 먼저 보내고
+    user_info = get_user_info(user_id)                          # 다른 호출을 하는 동안
+    file_metadata = pending.result()                            # 필요할 때 결과 받기
+
+    results = concurrency.gather({'s3': delete_object, 'table': delete_item})
+
+오류 처리
+    - submit().result()는 호출이 올린 예외를 그대로 올린다.
+    - gather는 모든 호출이 끝날 때까지 기다린 뒤(이미 보낸 AWS 호출은 취소할 수 없음) 실패한 호출 중
+      인자 순서로 첫 번째 예외를 올린다(나머지 실패는 경고 로그). return_exceptions=True면 예외 객체를 결과 자리에 담아 돌려준다.
+    - follow_up은 쓰기 뒤의 후속 갱신용으로, 실패한 호출을 오류 로그로만 남기고 올리지 않는다.
+      wait=False면 풀에 넘기기만 하고 바로 돌아온다(응답 뒤 Lambda가 멈추면 다음 호출 때 이어서 실행되고,
+      컨테이너가 사라지면 빠질 수 있으므로 다시 계산할 수 있는 갱신에만 쓴다).
+    - 결과를 받지 않은 submit 호출(인증 실패로 버린 선조회 등)은 풀에서 끝까지 실행되고 결과는 버려진다.
+
+동시에 실행한 구간(tracing.segment)의 시간은 각각 더해지므로 요청의 구간 시간 합이 Duration보다 클 수 있다.
+
+풀 스레드 안에서 다시 submit/gather를 부르면 풀이 가득 찼을 때 서로 기다리지 않도록 호출한 스레드에서
+차례로 실행한다. CONCURRENCY_ENABLED=0이면 모든 호출을 차례로 실행한다(비교, 문제 확인용).
+
+환경 변수
+    CONCURRENCY_ENABLED         동시 실행 여부 (기본 1)
+    CONCURRENCY_MAX_WORKERS     공용 스레드 풀 크기 (기본 16, AWS 클라이언트 커넥션 풀보다 작게)
+"""
+import logging
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import tracing
+
+logger = logging.getLogger()
+
+ENABLED = os.environ.get('CONCURRENCY_ENABLED', '1') == '1'
+MAX_WORKERS = int(os.environ.get('CONCURRENCY_MAX_WORKERS', '16'))
+
+_executor = None
+_executor_lock = threading.Lock()
+_worker = threading.local()
+
+
+def executor():
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=MAX_WORKERS, thread_name_prefix='io', initializer=_mark_worker
+            )
+        return _executor
+
+
+def shutdown():
+    """
+    풀에 넘긴 호출(기다리지 않는 후속 갱신 포함)이 모두 끝날 때까지 기다리고 풀 정리 (로컬 실행/벤치마크용)
+    """
+    global _executor
+    with _executor_lock:
+        pool, _executor = _executor, None
+    if pool is not None:
+        pool.shutdown(wait=True)
+
+
+def _mark_worker():
+    _worker.active = True
+
+
+class Pending:
+    """
+    submit 결과 - result()로 값을 받거나 호출이 올린 예외를 다시 올림
+    """
+
+    def __init__(self, future=None, value=None, error=None):
+        self._future = future
+        self._value = value
+        self._error = error
+
+    def result(self):
+        if self._future is not None:
+            return self._future.result()
+        if self._error is not None:
+            raise self._error
+        return self._value
+
+    def exception(self):
+        if self._future is not None:
+            return self._future.exception()
+        return self._error
+
+
+def submit(func, *args, **kwargs):
+    """
+    func(*args, **kwargs)를 풀 스레드에서 시작하고 Pending 반환
+    """
+    if ENABLED and not getattr(_worker, 'active', False):
+        return Pending(future=executor().submit(tracing.wrap(func), *args, **kwargs))
+    try:
+        return Pending(value=func(*args, **kwargs))
+    except Exception as e:
+        return Pending(error=e)
+
+
+def gather(calls, return_exceptions=False):
+    """
+    {이름: 인자 없는 호출}을 동시에 실행하고 {이름: 결과} 반환
+    """
+    pending = {name: submit(call) for name, call in calls.items()}
+    tracing.add_metric('ConcurrentCalls', len(pending))
+    results = {}
+    first_error = None
+    for name, item in pending.items():
+        error = item.exception()
+        if error is None:
+            results[name] = item.result()
+            continue
+        if not return_exceptions:
+            if first_error is None:
+                first_error = error
+            else:
+                # 올리지 않는 나머지 실패는 로그로만 남김
+                logger.warning("[CONCURRENCY] 동시 호출 실패: %s, %s", name, error)
+        results[name] = error
+    if first_error is not None:
+        raise first_error
+    return results
+
+
+def _logged(name, call, tag):
+    try:
+        return call()
+    except Exception as e:
+        logger.error("%s 후속 갱신 실패: %s, %s", tag, name, e, exc_info=True)
+
+
+def follow_up(calls, tag, wait=True):
+    """
+    쓰기 뒤의 독립된 후속 갱신을 동시에 실행 - 실패한 호출은 로그만 남기고 실패한 이름 목록 반환
+
+    이미 반영한 쓰기를 후속 갱신 실패로 되돌리거나 다시 시도하게 하지 않도록 예외를 올리지 않는다.
+    wait=False면 결과를 기다리지 않고 빈 목록 반환 (실패는 풀 스레드에서 로그로 남김)
+    """
+    if not wait:
+        for name, call in calls.items():
+            submit(_logged, name, call, tag)
+        return []
+    results = gather(calls, return_exceptions=True)
+    failed = [name for name, result in results.items() if isinstance(result, Exception)]
+    for name in failed:
+        logger.error("%s 후속 갱신 실패: %s, %s", tag, name, results[name], exc_info=results[name])
+    return failed
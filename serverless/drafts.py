@@ -0,0 +1,149 @@
+"""
+기사 초안 로컬 검사와 병렬 초안 생성 (text_ai_api의 선택 모드)
+
+요청 본문에 drafts(2 이상)를 주면 같은 프롬프트로 초안 여러 개를 동시에 요청하고,
+도착하는 순서대로 로컬 검사(길이, 앞머리 안내 문구, 한글 비율)를 통과한 첫 초안을 돌려준다.
+아직 보내지 않은 요청은 취소하고, 이미 보낸 요청의 결과는 버린다(늦게 끝난 초안의 토큰 수는 로그로 남김).
+모두 검사에 실패하면 문제가 가장 적은(같으면 가장 긴) 초안을 돌려준다.
+
+동시 요청 수는 컨테이너 전체에서 DRAFT_MAX_PARALLEL개로 제한한다 (스레드 풀 공유).
+
+환경 변수
+    DRAFT_MAX_COUNT         요청당 최대 초안 수 (기본 4)
+    DRAFT_MAX_PARALLEL      동시에 보내는 최대 초안 요청 수 (기본 4)
+    DRAFT_MIN_CHARS         최소 글자 수 (앞뒤 공백 제외, 기본 1000)
+    DRAFT_MIN_KOREAN_RATIO  문자(한글, 영문) 중 한글의 최소 비율 (기본 0.6)
+"""
+import logging
+import os
+import re
+import threading
+from collections import Counter
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+import tracing
+
+logger = logging.getLogger()
+
+MAX_COUNT = int(os.environ.get('DRAFT_MAX_COUNT', '4'))
+MAX_PARALLEL = int(os.environ.get('DRAFT_MAX_PARALLEL', '4'))
+MIN_CHARS = int(os.environ.get('DRAFT_MIN_CHARS', '1000'))
+MIN_KOREAN_RATIO = float(os.environ.get('DRAFT_MIN_KOREAN_RATIO', '0.6'))
+
+# 기사 앞에 붙는 안내 문구 (App.js 수정 프롬프트에서 금지한 "생성하겠습니다", "수정한 결과입니다" 등)
+_LEADING_FILLER = re.compile(
+    r'^\s*(네[,.!]|알겠습니다|물론입니다|요청하신|다음은|아래는|생성하겠습니다|작성하겠습니다|'
+    r'수정한 결과|수정된 기사|작성한 기사입니다|기사를 작성)'
+)
+_HANGUL = re.compile(r'[가-힣]')
+_LATIN = re.compile(r'[A-Za-z]')
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def problems(text):
+    """
+    초안 검사 결과 - 통과하면 빈 목록
+    """
+    text = (text or '').strip()
+    found = []
+    if len(text) < MIN_CHARS:
+        found.append('tooShort')
+    if _LEADING_FILLER.match(text):
+        found.append('leadingFiller')
+    hangul = len(_HANGUL.findall(text))
+    letters = hangul + len(_LATIN.findall(text))
+    if not letters or hangul / letters < MIN_KOREAN_RATIO:
+        found.append('lowKoreanRatio')
+    return found
+
+
+def executor():
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=MAX_PARALLEL, thread_name_prefix='draft')
+        return _executor
+
+
+def _usage(response_body):
+    usage = response_body.get('usage', {})
+    return usage.get('input_tokens', 0), usage.get('output_tokens', 0)
+
+
+def _discarded(on_discarded):
+    def done(future):
+        if future.cancelled() or future.exception() is not None:
+            return
+        usage = future.result().get('usage', {})
+        logger.info("[AI] 버린 초안 완료: 입력 토큰=%s, 출력 토큰=%s",
+                    usage.get('input_tokens', 0), usage.get('output_tokens', 0))
+        if on_discarded is not None:
+            try:
+                on_discarded(usage)
+            except Exception as e:
+                logger.error("[AI] 버린 초안 사용량 처리 실패: %s", e, exc_info=True)
+    return done
+
+
+def first_acceptable(invoke, count, on_discarded=None):
+    """
+    invoke()(Bedrock 응답 본문 반환)를 count번 동시에 실행해 검사를 통과한 첫 초안 선택
+
+    반환값: {'response', 'problems', 'launched', 'completed', 'failed', 'inputTokens', 'outputTokens', 'usage'}
+    토큰 수와 usage(Bedrock usage 필드별 합계, 캐시 토큰 포함)는 응답 전에 끝난 초안 전체의 합계.
+    응답 뒤에 끝나는 초안의 usage는 끝날 때 on_discarded(usage)로 넘긴다 (사용량 집계용).
+    """
+    pool = executor()
+    # 응답 뒤에 끝나는 초안의 구간이 다음 요청에 기록되지 않도록 이 요청의 Trace에 묶음
+    pending = {pool.submit(tracing.wrap(invoke)) for _ in range(count)}
+    completed = 0
+    failed = 0
+    input_tokens = 0
+    output_tokens = 0
+    usage = Counter()
+    best = None
+    last_error = None
+
+    while pending:
+        done, pending = wait(pending, return_when=FIRST_COMPLETED)
+        for future in done:
+            try:
+                response_body = future.result()
+            except Exception as e:
+                failed += 1
+                last_error = e
+                logger.warning("[AI] 초안 요청 실패: %s", e)
+                continue
+            completed += 1
+            used_input, used_output = _usage(response_body)
+            input_tokens += used_input
+            output_tokens += used_output
+            usage.update(response_body.get('usage', {}))
+            text = response_body['content'][0]['text']
+            found = problems(text)
+            logger.info("[AI] 초안 %s/%s 도착: %d자, 검사=%s", completed, count, len(text), found or '통과')
+            rank = (len(found), -len(text))
+            # 통과한 초안이 이미 있으면 같은 순간 끝난 다른 초안은 토큰 수만 합산
+            if best is None or best[2] and rank < best[0]:
+                best = (rank, response_body, found)
+        if best is not None and not best[2]:
+            break
+
+    for future in pending:
+        if not future.cancel():
+            future.add_done_callback(_discarded(on_discarded))
+
+    if best is None:
+        raise last_error
+    return {
+        'response': best[1],
+        'problems': best[2],
+        'launched': count - sum(1 for future in pending if future.cancelled()),
+        'completed': completed,
+        'failed': failed,
+        'inputTokens': input_tokens,
+        'outputTokens': output_tokens,
+        'usage': dict(usage),
+    }
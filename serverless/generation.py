@@ -0,0 +1,137 @@
+"""
+Bedrock 기사 생성 호출과 max_tokens 이어 쓰기
+
+응답의 stop_reason이 max_tokens이면 지금까지의 출력을 assistant 메시지로 붙여(prefill)
+남은 부분만 이어서 생성하고 결과를 이어 붙인다. 처음부터 다시 생성하지 않으므로
+추가 비용은 이어 쓴 출력과 다시 보내는 입력(프롬프트 + 앞부분)뿐이다.
+이어 쓰기는 횟수, 누적 출력 토큰, 경과 시간(Lambda 남은 시간 포함) 예산 안에서만 한다.
+context(템플릿 예시 등 세션 안에서 바뀌지 않는 앞부분)는 system 블록에 cache_control을 붙여 보내므로
+같은 context로 다시 생성하면 Bedrock 프롬프트 캐시에서 읽는다(cache_read_input_tokens, 입력 요금과 지연 감소).
+이어 쓰기 요청도 같은 system을 쓰므로 캐시를 읽는다.
+모델과 리전은 model_router가 요청 종류와 크기로 고르고, 이어 쓰기는 처음 응답한 모델로 먼저 보낸다.
+
+환경 변수
+    GENERATION_MAX_TOKENS           호출 1회의 max_tokens (기본 10000)
+    GENERATION_MAX_CONTINUATIONS    최대 이어 쓰기 횟수 (기본 2)
+    GENERATION_TOKEN_BUDGET         이어 쓰기를 포함한 누적 출력 토큰 예산 (기본 12000)
+    GENERATION_TIME_BUDGET          이어 쓰기를 새로 시작할 수 있는 경과 시간 한도(초, 기본 20)
+    PROMPT_CACHE                    context에 cache_control 표시 여부 (기본 1)
+"""
+import logging
+import os
+import time
+
+import model_router
+
+logger = logging.getLogger()
+
+MODEL_ID = model_router.DEFAULT_MODEL_ID
+ANTHROPIC_VERSION = "bedrock-2023-05-31"
+
+MAX_TOKENS = int(os.environ.get("GENERATION_MAX_TOKENS", "10000"))
+MAX_CONTINUATIONS = int(os.environ.get("GENERATION_MAX_CONTINUATIONS", "2"))
+TOKEN_BUDGET = int(os.environ.get("GENERATION_TOKEN_BUDGET", "12000"))
+TIME_BUDGET = float(os.environ.get("GENERATION_TIME_BUDGET", "20"))
+PROMPT_CACHE = os.environ.get("PROMPT_CACHE", "1") == "1"
+
+# 이어 쓴 부분이 앞부분 끝을 되풀이했는지 확인할 최소/최대 길이(글자)
+MIN_OVERLAP = 10
+MAX_OVERLAP = 200
+
+
+def build_request(prompt, max_tokens=None, context=None):
+    """
+    Bedrock Anthropic 메시지 요청 본문(dict) - context가 있으면 캐시할 수 있는 system 블록으로
+    """
+    request = {
+        "anthropic_version": ANTHROPIC_VERSION,
+        "max_tokens": max_tokens or MAX_TOKENS,
+        "messages": [
+            {
+                "role": "user",
+                "content": [{"type": "text", "text": prompt}],
+            }
+        ],
+    }
+    if context:
+        block = {"type": "text", "text": context}
+        if PROMPT_CACHE:
+            block["cache_control"] = {"type": "ephemeral"}
+        request["system"] = [block]
+    return request
+
+
+def invoke_model(request, kind="generate", slo_ms=None, prefer=None):
+    """
+    model_router로 고른 모델 호출 후 응답 본문(dict) 반환 (사용한 모델 이름은 model 키)
+    """
+    response_body, model = model_router.invoke(request, kind, slo_ms, prefer)
+    response_body["model"] = model
+    return response_body
+
+
+def response_text(response_body):
+    return "".join(block.get("text", "") for block in response_body.get("content", []) if block.get("type") == "text")
+
+
+def stitch(previous, continuation):
+    """
+    앞부분과 이어 쓴 부분 연결 (이어 쓴 부분이 앞부분 끝을 되풀이하면 겹친 부분 제거)
+    """
+    longest = min(len(previous), len(continuation), MAX_OVERLAP)
+    for size in range(longest, MIN_OVERLAP - 1, -1):
+        if previous.endswith(continuation[:size]):
+            return previous + continuation[size:]
+    return previous + continuation
+
+
+def complete(request, deadline=None, kind="generate", slo_ms=None):
+    """
+    request로 생성하고 max_tokens에서 멈추면 예산 안에서 이어 쓰기 - 합친 응답 본문 반환
+
+    반환 본문의 content는 이어 붙인 텍스트 하나, usage는 모든 호출의 합계,
+    continuations는 이어 쓰기 횟수, model은 마지막으로 응답한 모델. deadline(time.monotonic 기준)이 있으면 시간 한도와 함께 적용한다.
+    """
+    time_limit = time.monotonic() + TIME_BUDGET
+    if deadline is not None:
+        time_limit = min(time_limit, deadline)
+
+    response_body = invoke_model(request, kind, slo_ms)
+    text = response_text(response_body)
+    usage = dict(response_body.get("usage", {}))
+    continuations = 0
+
+    while response_body.get("stop_reason") == "max_tokens":
+        remaining = TOKEN_BUDGET - usage.get("output_tokens", 0)
+        # 마지막 assistant 메시지는 공백으로 끝날 수 없음
+        prefix = text.rstrip()
+        if continuations >= MAX_CONTINUATIONS or remaining <= 0 or not prefix or time.monotonic() >= time_limit:
+            logger.warning(
+                "[AI] 이어 쓰기 중단: 횟수=%s, 출력 토큰=%s, %d자에서 잘림",
+                continuations, usage.get("output_tokens", 0), len(text)
+            )
+            break
+
+        follow_up = dict(
+            request,
+            max_tokens=min(request.get("max_tokens", MAX_TOKENS), remaining),
+            messages=list(request["messages"]) + [
+                {"role": "assistant", "content": [{"type": "text", "text": prefix}]}
+            ],
+        )
+        response_body = invoke_model(follow_up, kind, slo_ms, prefer=response_body["model"])
+        continuations += 1
+        text = stitch(prefix, response_text(response_body))
+        for key, value in response_body.get("usage", {}).items():
+            usage[key] = usage.get(key, 0) + value
+        logger.info(
+            "[AI] 이어 쓰기 %s회: %d자, stop_reason=%s",
+            continuations, len(text), response_body.get("stop_reason")
+        )
+
+    return dict(
+        response_body,
+        content=[{"type": "text", "text": text}],
+        usage=usage,
+        continuations=continuations,
+    )
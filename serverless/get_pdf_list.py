@@ -1,64 +1,97 @@
+import init_profiler
+init_profiler.install()
+
 import json
 import os
-import boto3
 import logging
+from datetime import datetime
+
+import change_counters
+import changelog
+import concurrency
+import prewarm
+import request_log
+import responses
+import search_index
+import template_files
+import template_retrieval
+import tracing
+import usage_meter
+from common import get_file_metadata, get_organization_templates, get_user_info
 
 # 로깅 설정 - CloudWatch에 로그 출력
 logger = logging.getLogger()
-logger.setLevel(logging.INFO)
-
-# AWS 서비스 클라이언트 초기화
-s3 = boto3.client('s3')
-dynamodb = boto3.resource('dynamodb')
+logger.setLevel(request_log.LOG_LEVEL)
 
 # 환경 변수
-PDF_BUCKET = os.environ['PDF_BUCKET']
 USERS_TABLE = os.environ['USERS_TABLE']
 PDF_FILES_TABLE = os.environ['PDF_FILES_TABLE']
-URL_EXPIRATION = 3600  # 1시간
 
+# 자주 쓰는 사용자/템플릿 목록/파일 메타데이터를 컨테이너 캐시에 미리 읽어 둠 (PREWARM_ON_INIT=1일 때)
+prewarm.warm_on_init()
+
+@tracing.traced_handler('get_pdf_list')
+@responses.compressed
 def lambda_handler(event, context):
     """
     AWS Lambda GET 핸들러 함수
     """
     # 요청 정보 로깅
-    logger.info(f"[GET] 수신된 이벤트: {json.dumps(event)}")
+    logger.debug("[GET] 수신된 이벤트: %s", request_log.redacted(event))
     
     try:
         headers = {
             'Content-Type': 'application/json'
         }
 
+        # 예약 실행 warm 이벤트는 인증 없이 캐시만 다시 채움
+        if prewarm.is_warm_event(event):
+            return prewarm.handle(event, headers)
+
         # 요청에서 사용자 ID 가져오기
         user_id = event.get('headers', {}).get('authorization', '0')
-        logger.info(f"[GET] 요청 사용자 ID: {user_id}")
-        
+        logger.info("[GET] 요청 사용자 ID: %s", user_id)
+
+        # 쿼리 파라미터에서 액션 가져오기
+        query_params = event.get('queryStringParameters', {}) or {}
+        action = query_params.get('action', '')
+
+        # 파일 조회는 메타데이터를 사용자 조회와 동시에 가져옴 (권한 확인은 두 결과가 모두 온 뒤)
+        # authorization 헤더가 없는 요청은 미리 읽지 않고, 401/403이면 읽은 메타데이터는 버림
+        prefetched = None
+        if action in ('getTemplate', 'getUploadedFile') and query_params.get('fileId') and user_id not in ('', '0'):
+            prefetched = concurrency.submit(get_file_metadata, query_params['fileId'])
+
         # 사용자 정보 가져오기
         user_info = get_user_info(user_id)
         if not user_info:
-            logger.warning(f"[GET] 인증되지 않은 사용자: {user_id}")
+            logger.warning("[GET] 인증되지 않은 사용자: %s", user_id)
             return {
                 'statusCode': 401,
                 'headers': headers,
                 'body': json.dumps({'error': '인증되지 않은 사용자입니다'})
             }
 
-        logger.info(f"[GET] 사용자 정보: {json.dumps(user_info)}")
-
-        # 쿼리 파라미터에서 액션 가져오기
-        query_params = event.get('queryStringParameters', {}) or {}
-        action = query_params.get('action', '')
-        logger.info(f"[GET] 요청 액션: {action}")
+        logger.info("[GET] 사용자 정보: %s", request_log.redacted(user_info))
+        logger.info("[GET] 요청 액션: %s", action)
 
         # 액션에 따라 처리
         if action == 'listTemplates':
-            return list_templates(user_info, query_params, headers)
+            return list_templates(user_info, query_params, headers, event.get('headers') or {})
+        elif action == 'listTemplateChanges':
+            return list_template_changes(user_info, query_params, headers)
         elif action == 'getTemplate':
-            return get_template(user_info, query_params, headers)
+            return template_files.get_template(user_info, query_params, headers, prefetched)
         elif action == 'getUploadedFile':
-            return get_uploaded_file(user_info, query_params, headers)
+            return get_uploaded_file(user_info, query_params, headers, prefetched)
+        elif action == 'search':
+            return search(user_info, query_params, headers)
+        elif action == 'recommendTemplates':
+            return recommend_templates(user_info, query_params, headers)
+        elif action == 'getUsage':
+            return get_usage(user_info, query_params, headers)
         else:
-            logger.warning(f"[GET] 유효하지 않은 액션: {action}")
+            logger.warning("[GET] 유효하지 않은 액션: %s", action)
             return {
                 'statusCode': 400,
                 'headers': headers,
@@ -66,7 +99,7 @@ def lambda_handler(event, context):
             }
 
     except Exception as e:
-        logger.error(f"[GET] 오류 발생: {str(e)}", exc_info=True)
+        logger.error("[GET] 오류 발생: %s", e, exc_info=True)
         return {
             'statusCode': 500,
             'headers': {
@@ -75,70 +108,46 @@ def lambda_handler(event, context):
             },
             'body': json.dumps({'error': f'서버 오류가 발생했습니다: {str(e)}'})
         }
+    finally:
+        init_profiler.report_once('[GET]')
 
-def get_user_info(user_id):
+def list_templates(user_info, query_params, headers, request_headers=None):
     """
-    사용자 정보 가져오기
-    """
-    if user_id == '0':
-        logger.warning("[GET] 사용자 ID가 0으로 설정됨")
-        return None
-
-    try:
-        logger.info(f"[GET] 사용자 정보 조회 시작: {user_id}")
-        table = dynamodb.Table(USERS_TABLE)
-        response = table.get_item(
-            Key={'id': user_id}
-        )
-        
-        user = response.get('Item')
-        if user:
-            logger.info(f"[GET] 사용자 정보 조회 성공: {user.get('id')}, 조직: {user.get('organization')}")
-        else:
-            logger.warning(f"[GET] 사용자 정보 없음: {user_id}")
-            
-        return user
-    except Exception as e:
-        logger.error(f"[GET] 사용자 정보 조회 오류: {str(e)}", exc_info=True)
-        return None
-
-def list_templates(user_info, query_params, headers):
-    """
-    사용자가 접근 가능한 템플릿 목록 가져오기
+    사용자가 접근 가능한 템플릿 목록 가져오기 (If-None-Match가 현재 ETag와 같으면 304)
     """
     organization = user_info.get('organization', '')
     role = user_info.get('role', '')
     user_id = user_info.get('id', '')
     
-    logger.info(f"[GET] 템플릿 목록 조회 시작: 사용자={user_id}, 조직={organization}, 역할={role}")
+    logger.info("[GET] 템플릿 목록 조회 시작: 사용자=%s, 조직=%s, 역할=%s", user_id, organization, role)
+
+    # 목록은 조직 카운터와 요청자(소유 여부, 역할)에 따라 달라짐
+    counter_id = change_counters.templates_key(organization)
+    version = change_counters.current(counter_id)
+    if version is not None:
+        etag = change_counters.etag_for(counter_id, version, user_id, role)
+        headers = change_counters.with_etag(headers, etag)
+        if change_counters.is_not_modified(request_headers, etag):
+            logger.info("[GET] 템플릿 목록 변경 없음: 조직=%s", organization)
+            return change_counters.not_modified(headers)
 
-    table = dynamodb.Table(PDF_FILES_TABLE)
-    
     try:
+        # 조직 템플릿 전체(카운터 값이 같으면 컨테이너 캐시)에서 요청자가 볼 수 있는 항목만 고름
+        organization_items = get_organization_templates(organization, version)
         if role == 'admin':
             # 관리자는 조직 내 모든 템플릿을 볼 수 있음
-            logger.info(f"[GET] 관리자 권한으로 모든 템플릿 조회: 조직={organization}")
-            response = table.scan(
-                FilterExpression='organization = :org',
-                ExpressionAttributeValues={
-                    ':org': organization
-                }
-            )
+            logger.info("[GET] 관리자 권한으로 모든 템플릿 조회: 조직=%s", organization)
+            items = organization_items
         else:
             # 일반 사용자는 자신의 템플릿 + 조직 내 공유된 템플릿을 볼 수 있음
-            logger.info(f"[GET] 일반 사용자 권한으로 템플릿 조회: 사용자={user_id}, 조직={organization}")
-            response = table.scan(
-                FilterExpression='organization = :org AND (ownerId = :userId OR isPublic = :isPublic)',
-                ExpressionAttributeValues={
-                    ':org': organization,
-                    ':userId': user_id,
-                    ':isPublic': True
-                }
-            )
+            logger.info("[GET] 일반 사용자 권한으로 템플릿 조회: 사용자=%s, 조직=%s", user_id, organization)
+            items = [
+                item for item in organization_items
+                if item.get('ownerId') == user_id or item.get('isPublic') is True
+            ]
 
         # 조회 결과 로깅
-        items = response.get('Items', [])
-        logger.info(f"[GET] 템플릿 조회 결과: {len(items)}개 항목 발견")
+        logger.info("[GET] 템플릿 조회 결과: %s개 항목 발견", len(items))
         
         # 클라이언트에 필요한 정보만 포함하여 반환
         templates = []
@@ -152,166 +161,207 @@ def list_templates(user_info, query_params, headers):
                 'createdAt': item.get('createdAt', '')
             }
             templates.append(template)
-            logger.info(f"[GET] 템플릿 발견: ID={template['fileId']}, 이름={template['fileName']}")
+            logger.debug("[GET] 템플릿 발견: ID=%s, 이름=%s", template['fileId'], template['fileName'])
 
         return {
             'statusCode': 200,
             'headers': headers,
-            'body': json.dumps({'templates': templates})
+            'body': responses.dumps({'templates': templates})
         }
     except Exception as e:
-        logger.error(f"[GET] 템플릿 목록 조회 오류: {str(e)}", exc_info=True)
+        logger.error("[GET] 템플릿 목록 조회 오류: %s", e, exc_info=True)
         return {
             'statusCode': 500,
             'headers': headers,
             'body': json.dumps({'error': f'템플릿 목록 조회 실패: {str(e)}'})
         }
 
-def get_template(user_info, query_params, headers):
+def list_template_changes(user_info, query_params, headers):
     """
-    템플릿 파일에 대한 서명된 URL 생성
+    템플릿 목록 변경분 조회 (since 이후 추가/수정/삭제, changelog 참고)
+
+    listTemplates와 같은 항목 형식으로 돌려주고, 요청자가 볼 수 없게 된 템플릿(비공개로 바뀐 다른 사용자 템플릿)은
+    삭제(op=delete)로 돌려준다.
     """
-    file_id = query_params.get('fileId', '')
-    if not file_id:
-        logger.warning("[GET] 파일 ID가 제공되지 않음")
+    organization = user_info.get('organization', '')
+    role = user_info.get('role', '')
+    user_id = user_info.get('id', '')
+
+    parsed = changelog.parse_since(query_params)
+    if parsed is None:
         return {
             'statusCode': 400,
             'headers': headers,
-            'body': json.dumps({'error': '파일 ID가 필요합니다'})
+            'body': json.dumps({'error': f'since는 0 이상, limit은 1~{changelog.PAGE_SIZE} 사이의 정수여야 합니다'})
         }
-    
-    logger.info(f"[GET] 템플릿 정보 조회 시작: fileId={file_id}")
+    since, limit = parsed
 
-    # DynamoDB에서 파일 메타데이터 조회
-    file_metadata = get_file_metadata(file_id)
-    if not file_metadata:
-        logger.warning(f"[GET] 파일 메타데이터 없음: fileId={file_id}")
+    try:
+        result = changelog.changes(change_counters.templates_key(organization), since, limit)
+        for change in result['changes']:
+            item = change.pop('item', None) or {}
+            if change['op'] != 'put':
+                continue
+            if role != 'admin' and item.get('ownerId') != user_id and not item.get('isPublic'):
+                change['op'] = 'delete'
+                continue
+            change['item'] = {
+                'fileId': item.get('fileId', ''),
+                'fileName': item.get('fileName', ''),
+                'description': item.get('description', ''),
+                'isPublic': item.get('isPublic', False),
+                'isOwner': item.get('ownerId', '') == user_id,
+                'createdAt': item.get('createdAt', '')
+            }
+        logger.info(
+            "[GET] 템플릿 변경분 조회: 조직=%s, since=%s, 개수=%s, resync=%s",
+            organization, since, len(result['changes']), result['resync']
+        )
         return {
-            'statusCode': 404,
+            'statusCode': 200,
             'headers': headers,
-            'body': json.dumps({'error': '파일을 찾을 수 없습니다'})
+            'body': responses.dumps(result)
         }
-    
-    logger.info(f"[GET] 파일 메타데이터 조회 성공: fileName={file_metadata.get('fileName')}")
-
-    # 접근 권한 확인
-    if not can_access_file(user_info, file_metadata):
-        logger.warning(
-            f"[GET] 파일 접근 권한 없음: 사용자={user_info.get('id')}, " +
-            f"파일소유자={file_metadata.get('ownerId')}, " +
-            f"공유={file_metadata.get('isPublic')}"
-        )
+    except Exception as e:
+        logger.error("[GET] 템플릿 변경분 조회 오류: %s", e, exc_info=True)
         return {
-            'statusCode': 403,
+            'statusCode': 500,
             'headers': headers,
-            'body': json.dumps({'error': '파일 접근 권한이 없습니다'})
+            'body': json.dumps({'error': f'템플릿 변경분 조회 실패: {str(e)}'})
         }
 
-    # S3 키 가져오기
-    s3_key = file_metadata.get('s3Key', '')
-    logger.info(f"[GET] S3 객체 조회 시작: 버킷={PDF_BUCKET}, 키={s3_key}")
+def get_uploaded_file(user_info, query_params, headers, prefetched=None):
+    """
+    업로드된 파일에 대한 서명된 URL 생성 (getTemplate과 동일)
+    """
+    logger.info("[GET] 업로드된 파일 조회: %s", request_log.redacted(query_params))
+    return template_files.get_template(user_info, query_params, headers, prefetched)
+
+def search(user_info, query_params, headers):
+    """
+    조직의 기사/템플릿 검색 (q: 검색어, kind: article|template, offset, limit)
+    """
+    query = (query_params.get('q') or '').strip()
+    kind = query_params.get('kind', '')
+    if not query or kind not in ('', 'article', 'template'):
+        logger.warning("[GET] 유효하지 않은 검색 요청: q=%s, kind=%s", query, kind)
+        return {
+            'statusCode': 400,
+            'headers': headers,
+            'body': json.dumps({'error': '검색어가 필요합니다'})
+        }
 
-    # 파일이 존재하는지 확인
     try:
-        s3.head_object(
-            Bucket=PDF_BUCKET,
-            Key=s3_key
-        )
-        logger.info(f"[GET] S3 객체 존재 확인 성공: 키={s3_key}")
-    except Exception as e:
-        logger.error(f"[GET] S3 객체 조회 실패: {str(e)}", exc_info=True)
+        offset = max(int(query_params.get('offset', '0')), 0)
+        limit = min(max(int(query_params.get('limit', '20')), 1), 50)
+    except ValueError:
         return {
-            'statusCode': 404,
+            'statusCode': 400,
             'headers': headers,
-            'body': json.dumps({'error': 'S3에서 파일을 찾을 수 없습니다'})
+            'body': json.dumps({'error': 'offset, limit은 숫자여야 합니다'})
         }
 
-    # 서명된 URL 생성
+    logger.info("[GET] 검색 시작: 조직=%s, q=%s, kind=%s, offset=%s", user_info.get('organization', ''), query, kind, offset)
+
     try:
-        url = s3.generate_presigned_url(
-            'get_object',
-            Params={
-                'Bucket': PDF_BUCKET,
-                'Key': s3_key
-            },
-            ExpiresIn=URL_EXPIRATION
-        )
-        logger.info(f"[GET] 서명된 URL 생성 성공: 만료시간={URL_EXPIRATION}초")
-        
+        total, results = search_index.search(user_info, query, kind, offset, limit)
+        logger.info("[GET] 검색 결과: 전체=%s, 반환=%s", total, len(results))
+
+        body = {'results': results, 'total': total}
+        if offset + len(results) < total:
+            body['nextOffset'] = offset + len(results)
         return {
             'statusCode': 200,
             'headers': headers,
-            'body': json.dumps({'url': url, 'metadata': file_metadata})
+            'body': responses.dumps(body)
         }
     except Exception as e:
-        logger.error(f"[GET] 서명된 URL 생성 실패: {str(e)}", exc_info=True)
+        logger.error("[GET] 검색 오류: %s", e, exc_info=True)
         return {
             'statusCode': 500,
             'headers': headers,
-            'body': json.dumps({'error': f'서명된 URL 생성 실패: {str(e)}'})
+            'body': json.dumps({'error': f'검색 실패: {str(e)}'})
         }
 
-def get_uploaded_file(user_info, query_params, headers):
+def recommend_templates(user_info, query_params, headers):
     """
-    업로드된 파일에 대한 서명된 URL 생성 (getTemplate과 동일)
+    생성 요청 항목(project, company, keywords)과 관련도가 높은 템플릿과 구간 (k: 구간 수, 최대 10)
     """
-    logger.info(f"[GET] 업로드된 파일 조회: {json.dumps(query_params)}")
-    return get_template(user_info, query_params, headers)
+    query = template_retrieval.fields_query(query_params)
+    if not query:
+        logger.warning("[GET] 템플릿 추천 검색어 없음")
+        return {
+            'statusCode': 400,
+            'headers': headers,
+            'body': json.dumps({'error': '사업명, 업체명, 핵심 키워드 중 하나가 필요합니다'})
+        }
 
-def get_file_metadata(file_id):
-    """
-    DynamoDB에서 파일 메타데이터 조회
-    """
     try:
-        logger.info(f"[GET] 파일 메타데이터 조회 시작: fileId={file_id}")
-        table = dynamodb.Table(PDF_FILES_TABLE)
-        response = table.get_item(
-            Key={'fileId': file_id}
-        )
-        
-        item = response.get('Item')
-        if item:
-            logger.info(f"[GET] 파일 메타데이터 조회 성공: fileName={item.get('fileName')}")
-        else:
-            logger.warning(f"[GET] 파일 메타데이터 없음: fileId={file_id}")
-            
-        return item
+        k = min(max(int(query_params.get('k', str(template_retrieval.TOP_K))), 1), 10)
+    except ValueError:
+        return {
+            'statusCode': 400,
+            'headers': headers,
+            'body': json.dumps({'error': 'k는 숫자여야 합니다'})
+        }
+
+    logger.info("[GET] 템플릿 추천 시작: 조직=%s, k=%s", user_info.get('organization', ''), k)
+
+    try:
+        passages = template_retrieval.retrieve(user_info, query, k)
+        return {
+            'statusCode': 200,
+            'headers': headers,
+            'body': responses.dumps({'templates': template_retrieval.rank_templates(passages)})
+        }
     except Exception as e:
-        logger.error(f"[GET] 파일 메타데이터 조회 오류: {str(e)}", exc_info=True)
-        return None
+        logger.error("[GET] 템플릿 추천 오류: %s", e, exc_info=True)
+        return {
+            'statusCode': 500,
+            'headers': headers,
+            'body': json.dumps({'error': f'템플릿 추천 실패: {str(e)}'})
+        }
 
-def can_access_file(user_info, file_metadata):
+def get_usage(user_info, query_params, headers):
     """
-    파일 접근 권한 확인
+    조직의 Bedrock 토큰 사용량 (관리자 전용, from/to: YYYY-MM-DD, 기본 최근 30일, 최대 366일)
     """
-    user_id = user_info.get('id', '')
-    role = user_info.get('role', '')
+    if user_info.get('role', '') != 'admin':
+        logger.warning("[GET] 사용량 조회 권한 없음: 사용자=%s", user_info.get('id'))
+        return {
+            'statusCode': 403,
+            'headers': headers,
+            'body': json.dumps({'error': '관리자만 사용량을 조회할 수 있습니다'})
+        }
+
+    start_day, end_day = usage_meter.default_range()
+    start_day = query_params.get('from') or start_day
+    end_day = query_params.get('to') or end_day
+    try:
+        span = (datetime.strptime(end_day, '%Y-%m-%d') - datetime.strptime(start_day, '%Y-%m-%d')).days
+    except ValueError:
+        span = -1
+    if not 0 <= span <= 366:
+        return {
+            'statusCode': 400,
+            'headers': headers,
+            'body': json.dumps({'error': 'from, to는 YYYY-MM-DD 형식이고 366일 이내여야 합니다'})
+        }
+
     organization = user_info.get('organization', '')
-    
-    owner_id = file_metadata.get('ownerId', '')
-    file_org = file_metadata.get('organization', '')
-    is_public = file_metadata.get('isPublic', False)
-    
-    logger.info(
-        f"[GET] 파일 접근 권한 확인: 사용자={user_id}, 소유자={owner_id}, " +
-        f"사용자조직={organization}, 파일조직={file_org}, " +
-        f"사용자역할={role}, 공유={is_public}"
-    )
-    
-    # 1. 파일 소유자인 경우
-    if owner_id == user_id:
-        logger.info(f"[GET] 파일 접근 권한 있음 (소유자): 사용자={user_id}")
-        return True
-
-    # 2. 관리자이고 같은 조직의 파일인 경우
-    if role == 'admin' and file_org == organization:
-        logger.info(f"[GET] 파일 접근 권한 있음 (관리자): 사용자={user_id}, 조직={organization}")
-        return True
-
-    # 3. 같은 조직이고 파일이 공개(isPublic)된 경우
-    if file_org == organization and is_public:
-        logger.info(f"[GET] 파일 접근 권한 있음 (공유): 사용자={user_id}, 조직={organization}")
-        return True
-
-    logger.warning(f"[GET] 파일 접근 권한 없음: 사용자={user_id}")
-    return False
\ No newline at end of file
+    logger.info("[GET] 사용량 조회: 조직=%s, %s ~ %s", organization, start_day, end_day)
+
+    try:
+        report = usage_meter.organization_report(organization, start_day, end_day)
+        return {
+            'statusCode': 200,
+            'headers': headers,
+            'body': responses.dumps(report)
+        }
+    except Exception as e:
+        logger.error("[GET] 사용량 조회 오류: %s", e, exc_info=True)
+        return {
+            'statusCode': 500,
+            'headers': headers,
+            'body': json.dumps({'error': f'사용량 조회 실패: {str(e)}'})
+        }
@@ -0,0 +1,155 @@
+"""
+Lambda 초기화(import/클라이언트 생성) 시간 프로파일러
+
+INIT_PROFILE=1 환경 변수가 설정된 경우에만 동작하며, 설정되지 않은 경우
+install/record/report는 아무 일도 하지 않는다.
+
+로컬에서는 아래처럼 실행하여 모듈별 초기화 시간을 확인할 수 있다.
+    python init_profiler.py get_pdf_list
+    python init_profiler.py get_pdf_list 30 --clients
+"""
+import builtins
+import logging
+import os
+import sys
+import time
+
+logger = logging.getLogger()
+
+ENABLED = os.environ.get('INIT_PROFILE', '0') == '1'
+
+# 모듈 이름 -> [누적 시간(자식 포함), 자체 시간]
+_timings = {}
+_stack = []
+_original_import = None
+_installed_at = None
+_reported = False
+
+
+def _timed_import(name, globals=None, locals=None, fromlist=(), level=0):
+    # 이미 로드된 모듈은 측정 대상이 아님
+    if level == 0 and name in sys.modules:
+        return _original_import(name, globals, locals, fromlist, level)
+
+    start = time.perf_counter()
+    _stack.append(0.0)
+    try:
+        return _original_import(name, globals, locals, fromlist, level)
+    finally:
+        elapsed = time.perf_counter() - start
+        children = _stack.pop()
+        if _stack:
+            _stack[-1] += elapsed
+        if level == 0 and elapsed > 0:
+            total, own = _timings.get(name, (0.0, 0.0))
+            _timings[name] = (total + elapsed, own + elapsed - children)
+
+
+def install(force=False):
+    """
+    import 시간 측정 시작 - 핸들러 모듈 최상단에서 호출
+    """
+    global _original_import, _installed_at
+    if not (ENABLED or force) or _original_import is not None:
+        return
+    _installed_at = time.perf_counter()
+    _original_import = builtins.__import__
+    builtins.__import__ = _timed_import
+
+
+def uninstall():
+    """
+    import 시간 측정 종료
+    """
+    global _original_import
+    if _original_import is not None:
+        builtins.__import__ = _original_import
+        _original_import = None
+
+
+def record(name, seconds):
+    """
+    import 외의 초기화 작업(클라이언트 생성 등) 시간 기록
+    """
+    if not (ENABLED or _original_import is not None):
+        return
+    total, own = _timings.get(name, (0.0, 0.0))
+    _timings[name] = (total + seconds, own + seconds)
+
+
+def timings(limit=20):
+    """
+    자체 시간 기준 상위 항목 목록 (이름, 누적 ms, 자체 ms)
+    """
+    rows = sorted(_timings.items(), key=lambda kv: kv[1][1], reverse=True)
+    return [
+        (name, round(total * 1000, 2), round(own * 1000, 2))
+        for name, (total, own) in rows[:limit]
+    ]
+
+
+def report(prefix, limit=20):
+    """
+    측정 결과를 로그로 출력
+    """
+    if not _timings:
+        return
+    elapsed = 0.0
+    if _installed_at is not None:
+        elapsed = time.perf_counter() - _installed_at
+    logger.info(f"{prefix} 초기화 프로파일: 설치 후 경과={elapsed * 1000:.1f}ms")
+    for name, total_ms, own_ms in timings(limit):
+        logger.info(f"{prefix}   {name}: 누적={total_ms}ms, 자체={own_ms}ms")
+
+
+def report_once(prefix, limit=20):
+    """
+    컨테이너의 첫 요청이 끝난 뒤 한 번만 측정 결과 출력
+    """
+    global _reported
+    if _reported or not ENABLED:
+        return
+    _reported = True
+    uninstall()
+    report(prefix, limit)
+
+
+def main(argv):
+    import importlib
+
+    if len(argv) < 2:
+        print("사용법: python init_profiler.py <모듈명> [상위 N개] [--clients]")
+        return 1
+
+    args = [arg for arg in argv[1:] if not arg.startswith('--')]
+    module_name = args[0]
+    limit = int(args[1]) if len(args) > 1 else 20
+
+    # 핸들러 모듈이 import 시점에 요구하는 환경 변수 기본값
+    for key in ('PDF_BUCKET', 'USERS_TABLE', 'PDF_FILES_TABLE'):
+        os.environ.setdefault(key, 'local')
+    os.environ.setdefault('AWS_DEFAULT_REGION', 'ap-northeast-2')
+
+    install(force=True)
+    start = time.perf_counter()
+    importlib.import_module(module_name)
+    if '--clients' in argv:
+        # 첫 요청에서 생성될 클라이언트까지 포함하여 측정
+        import aws_clients
+        aws_clients.s3()
+        aws_clients.dynamodb()
+        aws_clients.bedrock_runtime()
+    elapsed = time.perf_counter() - start
+    uninstall()
+
+    print(f"{module_name} 초기화: {elapsed * 1000:.1f}ms")
+    print(f"{'모듈':<50} {'누적(ms)':>10} {'자체(ms)':>10}")
+    for name, total_ms, own_ms in timings(limit):
+        print(f"{name:<50} {total_ms:>10} {own_ms:>10}")
+    return 0
+
+
+if __name__ == '__main__':
+    # aws_clients 등에서 import하는 모듈과 같은 측정 상태를 쓰도록 모듈로 다시 불러와 실행
+    import init_profiler
+    sys.exit(init_profiler.main(sys.argv))
@@ -0,0 +1,358 @@
+"""
+Bedrock 모델 라우팅 - 요청 종류, 예상 프롬프트 크기, 지연 목표(SLO)에 따른 모델 선택과 장애 시 전환
+
+모델 표(MODEL_ROUTES, JSON 목록)의 항목 하나가 모델 ID와 리전의 조합이다.
+
+    name             통계와 응답에 쓰는 이름
+    modelId          Bedrock 모델 ID
+    region           호출 리전 (비우면 BEDROCK_REGION)
+    kinds            처리할 요청 종류 목록 (generate, fields, edit 등, 없으면 모든 종류)
+    maxInputTokens   예상 입력 토큰이 이보다 크면 제외 (없으면 제한 없음)
+    fallback         true면 앞의 모델이 모두 실패했을 때만 사용
+    promptCache      true면 요청의 cache_control 표시를 그대로 보냄 (프롬프트 캐시를 지원하는 모델만,
+                     false거나 없으면 표시를 빼고 보냄 - Claude 3 Haiku 등 미지원 모델은 표시가 있으면 거부)
+
+요청마다 종류와 크기가 맞는 모델을 표 순서대로 고르되, 지연 목표가 있으면 지금까지 잰
+출력 토큰당 지연(EWMA)으로 예상한 시간이 목표 안에 드는 모델을 먼저 쓴다. 스로틀링, 일시적
+서비스 오류, 타임아웃이면 그 모델을 MODEL_COOLDOWN초 동안 뒤로 미루고 다음 모델(다른 리전 포함)로
+바로 다시 보낸다. 잘못된 요청(ValidationException 등)은 전환하지 않고 그대로 올린다.
+모델별 호출 수, 실패 수, 지연 시간, 토큰 수는 컨테이너 안에 모아 stats()로 볼 수 있다.
+
+예) 짧은 수정 요청은 기본 리전 Haiku, 긴 템플릿 초안은 Sonnet(프롬프트 캐시), 둘 다 안 되면 us-east-1 Haiku
+    [{"name": "haiku", "modelId": "anthropic.claude-3-haiku-20240307-v1:0", "maxInputTokens": 4000},
+     {"name": "sonnet", "modelId": "anthropic.claude-3-7-sonnet-20250219-v1:0", "promptCache": true},
+     {"name": "haiku-use1", "modelId": "anthropic.claude-3-haiku-20240307-v1:0",
+      "region": "us-east-1", "fallback": true}]
+
+전환이 botocore 재시도를 기다리지 않도록 BEDROCK_MAX_ATTEMPTS를 1~2로 낮춰 쓰는 것이 좋다.
+
+환경 변수
+    MODEL_ROUTES            모델 표 (JSON, 기본은 기본 리전 Haiku + us-east-1 Haiku 대체)
+    MODEL_SLO_MS            요청 종류별 기본 지연 목표(ms, JSON 예: {"edit": 8000}, 기본 없음)
+    MODEL_COOLDOWN          스로틀링/타임아웃 후 모델을 뒤로 미루는 시간(초, 기본 30)
+    MODEL_CHARS_PER_TOKEN   입력 토큰 추정용 토큰당 글자 수 (기본 1.5)
+    MODEL_STATS_ALPHA       지연 시간 EWMA 가중치 (기본 0.2)
+"""
+import json
+import logging
+import os
+import threading
+import time
+
+from botocore.exceptions import ClientError, ConnectTimeoutError, EndpointConnectionError, ReadTimeoutError
+
+import aws_clients
+import tracing
+
+logger = logging.getLogger()
+
+DEFAULT_MODEL_ID = "anthropic.claude-3-haiku-20240307-v1:0"
+
+DEFAULT_ROUTES = [
+    {'name': 'haiku', 'modelId': DEFAULT_MODEL_ID},
+    {'name': 'haiku-us-east-1', 'modelId': DEFAULT_MODEL_ID, 'region': 'us-east-1', 'fallback': True},
+]
+
+COOLDOWN = float(os.environ.get('MODEL_COOLDOWN', '30'))
+CHARS_PER_TOKEN = float(os.environ.get('MODEL_CHARS_PER_TOKEN', '1.5'))
+STATS_ALPHA = float(os.environ.get('MODEL_STATS_ALPHA', '0.2'))
+
+# 다른 모델로 전환할 오류 코드 (스로틀링, 일시적 서비스 오류)
+RETRYABLE_CODES = {
+    'ThrottlingException',
+    'TooManyRequestsException',
+    'ServiceUnavailableException',
+    'ModelNotReadyException',
+    'ModelTimeoutException',
+    'InternalServerException',
+}
+TIMEOUT_ERRORS = (ReadTimeoutError, ConnectTimeoutError, EndpointConnectionError)
+
+
+def load_routes(raw=None):
+    """
+    모델 표 읽기 - 형식이 잘못됐으면 오류 로그 후 기본 표 사용
+    """
+    if raw is None:
+        raw = os.environ.get('MODEL_ROUTES', '')
+    if not raw:
+        return [dict(route) for route in DEFAULT_ROUTES]
+    try:
+        routes = json.loads(raw)
+        for route in routes:
+            route.setdefault('name', f"{route['modelId']}@{route.get('region') or 'default'}")
+            if 'kinds' in route:
+                route['kinds'] = list(route['kinds'])
+        if not routes:
+            raise ValueError('빈 모델 표')
+        return routes
+    except (ValueError, TypeError, KeyError, AttributeError) as e:
+        logger.error("[AI] MODEL_ROUTES 형식 오류, 기본 모델 표 사용: %s", e)
+        return [dict(route) for route in DEFAULT_ROUTES]
+
+
+def _load_slo():
+    try:
+        return {kind: float(ms) for kind, ms in json.loads(os.environ.get('MODEL_SLO_MS') or '{}').items()}
+    except (ValueError, TypeError, AttributeError) as e:
+        logger.error("[AI] MODEL_SLO_MS 형식 오류: %s", e)
+        return {}
+
+
+ROUTES = load_routes()
+SLO_MS = _load_slo()
+
+
+class RouteStats:
+    """
+    모델 하나의 호출 통계와 전환 대기 상태 (스레드 안전)
+    """
+
+    def __init__(self):
+        self.calls = 0
+        self.failures = 0
+        self.throttles = 0
+        self.timeouts = 0
+        self.input_tokens = 0
+        self.output_tokens = 0
+        self.cache_read_tokens = 0
+        self.cache_write_tokens = 0
+        self.latency_ms = None
+        self.ms_per_token = None
+        self.typical_output = None
+        self.cooldown_until = 0.0
+        self._lock = threading.Lock()
+
+    def _ewma(self, current, value):
+        return value if current is None else current + STATS_ALPHA * (value - current)
+
+    def success(self, latency_ms, usage):
+        output_tokens = usage.get('output_tokens', 0)
+        with self._lock:
+            self.calls += 1
+            self.input_tokens += usage.get('input_tokens', 0)
+            self.output_tokens += output_tokens
+            self.cache_read_tokens += usage.get('cache_read_input_tokens', 0)
+            self.cache_write_tokens += usage.get('cache_creation_input_tokens', 0)
+            self.latency_ms = self._ewma(self.latency_ms, latency_ms)
+            if output_tokens:
+                self.ms_per_token = self._ewma(self.ms_per_token, latency_ms / output_tokens)
+                self.typical_output = self._ewma(self.typical_output, output_tokens)
+            self.cooldown_until = 0.0
+
+    def failure(self, reason, cooldown):
+        with self._lock:
+            self.calls += 1
+            self.failures += 1
+            if reason == 'throttle':
+                self.throttles += 1
+            elif reason == 'timeout':
+                self.timeouts += 1
+            if cooldown:
+                self.cooldown_until = time.monotonic() + cooldown
+
+    def cooling_down(self):
+        return time.monotonic() < self.cooldown_until
+
+    def predicted_ms(self, max_tokens):
+        """
+        예상 지연 시간 - 출력 토큰당 지연 x 평소 출력 토큰 수(max_tokens 이하), 측정값이 없으면 None
+        """
+        if self.ms_per_token is None:
+            return self.latency_ms
+        return self.ms_per_token * min(self.typical_output, max_tokens or self.typical_output)
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                'calls': self.calls,
+                'failures': self.failures,
+                'throttles': self.throttles,
+                'timeouts': self.timeouts,
+                'inputTokens': self.input_tokens,
+                'outputTokens': self.output_tokens,
+                'cacheReadTokens': self.cache_read_tokens,
+                'cacheWriteTokens': self.cache_write_tokens,
+                'latencyMs': round(self.latency_ms, 1) if self.latency_ms is not None else None,
+                'msPerOutputToken': round(self.ms_per_token, 2) if self.ms_per_token is not None else None,
+                'coolingDown': self.cooling_down(),
+            }
+
+
+_stats = {}
+_stats_lock = threading.Lock()
+
+
+def route_stats(name):
+    stats = _stats.get(name)
+    if stats is None:
+        with _stats_lock:
+            stats = _stats.setdefault(name, RouteStats())
+    return stats
+
+
+def stats():
+    """
+    모델별 호출 통계 {name: {...}}
+    """
+    return {name: route_stats(name).snapshot() for name in list(_stats)}
+
+
+def reset_stats():
+    with _stats_lock:
+        _stats.clear()
+
+
+def estimate_input_tokens(request):
+    """
+    요청 본문의 system과 메시지 텍스트 글자 수로 입력 토큰 추정
+    """
+    system = request.get('system') or ''
+    if isinstance(system, list):
+        system = ''.join(block.get('text', '') for block in system)
+    chars = len(system)
+    for message in request.get('messages', []):
+        content = message.get('content')
+        if isinstance(content, str):
+            chars += len(content)
+            continue
+        for block in content or []:
+            chars += len(block.get('text', ''))
+    return int(chars / CHARS_PER_TOKEN)
+
+
+def strip_cache_control(request):
+    """
+    cache_control 표시를 뺀 요청 사본 (표시가 없으면 원래 요청)
+    """
+    def strip(blocks):
+        return [
+            {key: value for key, value in block.items() if key != 'cache_control'} if isinstance(block, dict) else block
+            for block in blocks
+        ]
+
+    system = request.get('system')
+    marked = isinstance(system, list) and any('cache_control' in block for block in system)
+    marked = marked or any(
+        isinstance(message.get('content'), list) and any('cache_control' in block for block in message['content'])
+        for message in request.get('messages', [])
+    )
+    if not marked:
+        return request
+    stripped = dict(request, messages=[
+        dict(message, content=strip(message['content'])) if isinstance(message.get('content'), list) else message
+        for message in request.get('messages', [])
+    ])
+    if isinstance(system, list):
+        stripped['system'] = strip(system)
+    return stripped
+
+
+def _eligible(route, kind, input_tokens):
+    kinds = route.get('kinds')
+    if kinds and kind not in kinds:
+        return False
+    limit = route.get('maxInputTokens')
+    return not limit or input_tokens <= limit
+
+
+def select(kind, input_tokens, max_tokens, slo_ms=None, prefer=None, routes=None):
+    """
+    시도할 모델 순서
+
+    지연 목표 안(또는 아직 측정 전)인 모델(표 순서) → 목표를 넘는 모델(예상 지연 순) → fallback 모델
+    → 전환 대기 중인 모델. prefer(모델 이름)가 대기 중이 아니면 맨 앞에 둔다(이어 쓰기는 같은 모델로).
+    """
+    routes = ROUTES if routes is None else routes
+    eligible = [route for route in routes if _eligible(route, kind, input_tokens)]
+    if not eligible:
+        logger.warning("[AI] 조건에 맞는 모델 없음, 전체 모델 표 사용: kind=%s, 입력 토큰=%s", kind, input_tokens)
+        eligible = list(routes)
+
+    ready, over, fallback, waiting = [], [], [], []
+    for route in eligible:
+        stats = route_stats(route['name'])
+        if stats.cooling_down():
+            waiting.append(route)
+        elif route.get('fallback'):
+            fallback.append(route)
+        else:
+            predicted = stats.predicted_ms(max_tokens) if slo_ms else None
+            if predicted is None or predicted <= slo_ms:
+                ready.append(route)
+            else:
+                over.append((predicted, route))
+    ordered = ready + [route for _, route in sorted(over, key=lambda pair: pair[0])] + fallback + waiting
+
+    if prefer:
+        preferred = [route for route in ordered if route['name'] == prefer and route not in waiting]
+        ordered = preferred + [route for route in ordered if route not in preferred]
+    return ordered
+
+
+def _failure_reason(error):
+    """
+    다른 모델로 전환할 오류이면 'throttle'/'unavailable'/'timeout', 아니면 None
+    """
+    if isinstance(error, TIMEOUT_ERRORS):
+        return 'timeout'
+    if isinstance(error, ClientError):
+        code = error.response.get('Error', {}).get('Code', '')
+        if code not in RETRYABLE_CODES:
+            return None
+        if 'Throttl' in code or code == 'TooManyRequestsException':
+            return 'throttle'
+        if 'Timeout' in code:
+            return 'timeout'
+        return 'unavailable'
+    return None
+
+
+def invoke(request, kind='generate', slo_ms=None, prefer=None):
+    """
+    모델 표에서 고른 순서대로 호출 - (응답 본문 dict, 사용한 모델 이름) 반환
+
+    전환할 오류이면 다음 모델로 넘어가고, 모든 모델이 실패하면 마지막 오류를 올린다.
+    """
+    if slo_ms is None:
+        slo_ms = SLO_MS.get(kind)
+    input_tokens = estimate_input_tokens(request)
+    bodies = {}
+    candidates = select(kind, input_tokens, request.get('max_tokens', 0), slo_ms, prefer)
+
+    last_error = None
+    for attempt, route in enumerate(candidates):
+        stats = route_stats(route['name'])
+        cached = bool(route.get('promptCache'))
+        if cached not in bodies:
+            bodies[cached] = json.dumps(request if cached else strip_cache_control(request))
+        started = time.perf_counter()
+        try:
+            with tracing.segment(f"Bedrock.{route['name']}"):
+                response = aws_clients.bedrock_runtime(route.get('region') or None).invoke_model(
+                    modelId=route['modelId'],
+                    body=bodies[cached],
+                )
+                response_body = json.loads(response.get('body').read())
+        except Exception as e:
+            reason = _failure_reason(e)
+            if reason is None:
+                stats.failure('error', 0)
+                raise
+            stats.failure(reason, COOLDOWN)
+            tracing.add_metric('ModelFailovers', 1)
+            logger.warning("[AI] 모델 %s %s, 다음 모델로 전환 (%d/%d): %s",
+                           route['name'], reason, attempt + 1, len(candidates), e)
+            last_error = e
+            continue
+
+        latency_ms = (time.perf_counter() - started) * 1000.0
+        stats.success(latency_ms, response_body.get('usage', {}))
+        usage = response_body.get('usage', {})
+        logger.info("[AI] 모델 %s 응답: %.0fms, kind=%s, 예상 입력 토큰=%s, 출력 토큰=%s, 캐시 읽기/쓰기 토큰=%s/%s",
+                    route['name'], latency_ms, kind, input_tokens, usage.get('output_tokens', 0),
+                    usage.get('cache_read_input_tokens', 0), usage.get('cache_creation_input_tokens', 0))
+        return response_body, route['name']
+
+    logger.error("[AI] 모든 모델 호출 실패: kind=%s, 시도 %d개", kind, len(candidates))
+    raise last_error
@@ -0,0 +1,99 @@
+"""
+DynamoDB 병렬 구간 Scan - 과거 데이터 채우기, 통계 재계산, 분석 작업용
+
+테이블을 TotalSegments개 구간으로 나눠 스레드 풀에서 구간마다 Scan 페이지를 차례로 읽는다.
+한 구간 안의 페이지는 LastEvaluatedKey로 이어지므로 순서대로 읽어야 하지만 구간끼리는 독립적이라,
+페이지 하나를 읽는 왕복 시간이 전체 시간을 좌우하는 단일 Scan보다 구간 수만큼 빨라진다
+(테이블 읽기 용량을 넘으면 스로틀링으로 더 빨라지지 않음).
+
+process(items)는 페이지마다 작업 스레드에서 호출되므로 스레드 안전해야 한다.
+Lambda 한 번으로 끝나지 않는 큰 테이블은 segment를 지정해 구간 하나씩 나눠 실행할 수 있다
+(Step Functions Map 등으로 segment 0..N-1을 각각 호출).
+
+환경 변수
+    SCAN_SEGMENTS   기본 구간 수 (기본 8)
+    SCAN_WORKERS    동시에 읽는 최대 구간 수 (기본 8)
+"""
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import aws_clients
+import tracing
+
+logger = logging.getLogger()
+
+SEGMENTS = int(os.environ.get('SCAN_SEGMENTS', '8'))
+WORKERS = int(os.environ.get('SCAN_WORKERS', '8'))
+
+
+def scan_segment(table_name, segment, total_segments, process, segment_name='Scan', **kwargs):
+    """
+    구간 하나를 끝까지 읽고 (페이지 수, 항목 수) 반환
+    """
+    table = aws_clients.dynamodb().Table(table_name)
+    if total_segments > 1:
+        kwargs = dict(kwargs, Segment=segment, TotalSegments=total_segments)
+    pages = 0
+    count = 0
+    while True:
+        with tracing.segment(segment_name):
+            response = table.scan(**kwargs)
+        items = response.get('Items', [])
+        pages += 1
+        count += len(items)
+        process(items)
+        if 'LastEvaluatedKey' not in response:
+            return pages, count
+        kwargs['ExclusiveStartKey'] = response['LastEvaluatedKey']
+
+
+def scan(table_name, process, segments=None, workers=None, segment_name='Scan', **kwargs):
+    """
+    전체 구간을 최대 workers개씩 동시에 읽고 요약 반환 (segments, pages, items, seconds)
+
+    kwargs는 Scan 요청에 그대로 전달 (ProjectionExpression, FilterExpression 등)
+    """
+    segments = max(1, segments or SEGMENTS)
+    workers = max(1, min(workers or WORKERS, segments))
+    started = time.perf_counter()
+
+    if workers == 1:
+        results = [
+            scan_segment(table_name, segment, segments, process, segment_name, **kwargs)
+            for segment in range(segments)
+        ]
+    else:
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='scan') as pool:
+            futures = [
+                pool.submit(scan_segment, table_name, segment, segments, process, segment_name, **kwargs)
+                for segment in range(segments)
+            ]
+            results = [future.result() for future in futures]
+
+    summary = {
+        'segments': segments,
+        'pages': sum(pages for pages, _ in results),
+        'items': sum(count for _, count in results),
+        'seconds': round(time.perf_counter() - started, 3),
+    }
+    logger.info("[SCAN] %s 병렬 Scan: 구간 %s개, 동시 %s개, 페이지 %s, 항목 %s, %.2fs",
+                table_name, segments, workers, summary['pages'], summary['items'], summary['seconds'])
+    return summary
+
+
+def collect(table_name, segments=None, workers=None, segment_name='Scan', **kwargs):
+    """
+    병렬 Scan으로 모든 항목을 목록으로 반환
+    """
+    items = []
+    lock = threading.Lock()
+
+    def process(page):
+        with lock:
+            items.extend(page)
+
+    scan(table_name, process, segments, workers, segment_name, **kwargs)
+    return items
@@ -0,0 +1,432 @@
+"""
+템플릿 PDF 파생본(derivative) - 페이지별 분할본, 첫 페이지 미리보기, 최적화 사본
+
+편집기가 원본 PDF 전체를 내려받지 않고 필요한 부분만 받을 수 있도록 업로드 후 파생본을 만들어
+같은 버킷의 DERIVATIVE_PREFIX{fileId}/ 아래에 쓰고, 파일 메타데이터의 derivatives 속성에 기록한다.
+getTemplate은 derivative(original, optimized, preview, pages)와 pages(예: 2, 1-3) 파라미터로
+원하는 파생본의 서명된 URL을 받는다.
+
+    pages/{n}.pdf   페이지별 분할본 (1부터, 최대 DERIVATIVE_MAX_PAGES 페이지)
+    preview.jpg     첫 페이지 저해상도 이미지 (pypdfium2와 Pillow가 있을 때, 없으면 첫 페이지 분할본)
+    optimized.pdf   최적화 사본 (pikepdf가 있으면 선형화(Fast Web View)와 객체 스트림 압축,
+                    없으면 pypdf로 중복 객체 제거와 콘텐츠 스트림 압축 - 원본보다 작을 때만 기록)
+
+PDF 처리는 pypdf가 있을 때만 한다(Lambda 레이어, template_retrieval과 같음). 없거나 실패하면
+derivatives를 기록하지 않고 getTemplate은 원본 URL을 준다.
+
+생성 시점은 PDF_DERIVATIVES_MODE로 정한다.
+    inline  saveFileMetadata 요청 안에서 생성 (기본, 별도 함수가 필요 없지만 저장 응답이 수 초 늦어짐)
+    event   saveFileMetadata가 메타데이터를 쓴 뒤 PDF_DERIVATIVES_FUNCTION(이 모듈의 lambda_handler를 배포한 함수)을
+            {"fileId": "..."}로 비동기 호출(trigger)해 생성. 함수 이름이 없거나 호출에 실패하면 inline으로 처리한다.
+            기존 템플릿 파생본 생성에도 같은 이벤트를 쓴다.
+브라우저는 원본을 올린 뒤 메타데이터를 저장하므로 S3 업로드 알림은 메타데이터보다 먼저 온다. lambda_handler는
+S3 알림도 받지만 메타데이터가 없는 파일은 건너뛰고(저장 시 trigger가 다시 호출), 처리 시점은 저장 경로가 정한다.
+원본은 process_source()에서 한 번만 내려받아 템플릿 구간 추출(template_retrieval)과 파생본 생성에 같이 쓴다.
+saveFileMetadata는 원본(s3Key)이 바뀐 경우에만 이 단계를 거치고, 그대로면 기존 derivatives를 유지한다.
+
+derivatives 속성
+    {"status": "ready", "pageCount": 12, "pages": 12, "sourceBytes": 2400000, "generatedAt": "...",
+     "preview": {"key", "contentType", "bytes"}, "optimized": {"key", "bytes", "linearized"}}
+
+환경 변수
+    PDF_DERIVATIVES_MODE    inline 또는 event (기본 inline)
+    PDF_DERIVATIVES_FUNCTION    event 모드에서 비동기 호출할 파생본 함수 이름 (없으면 inline으로 처리)
+    DERIVATIVE_PREFIX       파생본 키 접두사 (기본 derivatives/)
+    DERIVATIVE_MAX_BYTES    파생본을 만들 최대 원본 크기 (기본 50MB)
+    DERIVATIVE_MAX_PAGES    분할할 최대 페이지 수 (기본 50)
+    PREVIEW_WIDTH           미리보기 이미지 너비(px, 기본 480)
+    PREVIEW_QUALITY         미리보기 JPEG 품질 (기본 70)
+"""
+import io
+import json
+import logging
+import os
+import re
+from datetime import datetime, timezone
+from urllib.parse import unquote_plus
+
+from botocore.exceptions import ClientError
+
+import aws_clients
+import common
+import template_retrieval
+import tracing
+
+logger = logging.getLogger()
+
+PDF_FILES_TABLE = os.environ.get('PDF_FILES_TABLE', 'PdfFiles')
+MODE = os.environ.get('PDF_DERIVATIVES_MODE', 'inline')
+FUNCTION = os.environ.get('PDF_DERIVATIVES_FUNCTION', '')
+PREFIX = os.environ.get('DERIVATIVE_PREFIX', 'derivatives/')
+MAX_BYTES = int(os.environ.get('DERIVATIVE_MAX_BYTES', str(50 * 1024 * 1024)))
+MAX_PAGES = int(os.environ.get('DERIVATIVE_MAX_PAGES', '50'))
+PREVIEW_WIDTH = int(os.environ.get('PREVIEW_WIDTH', '480'))
+PREVIEW_QUALITY = int(os.environ.get('PREVIEW_QUALITY', '70'))
+
+# getTemplate derivative 파라미터 값
+KINDS = ('original', 'optimized', 'preview', 'pages')
+
+_PAGE_RANGE = re.compile(r'^\s*(\d+)\s*(?:-\s*(\d+)\s*)?$')
+# 원본 키 {ownerId}/{fileId}_{파일명}의 fileId
+_SOURCE_KEY = re.compile(r'^[^/]+/([^/_]+)_')
+
+
+def _bucket():
+    return os.environ.get('PDF_BUCKET', '')
+
+
+def _pypdf():
+    # 파생본을 만들 때만 import (조회 핸들러 콜드 스타트에 포함되지 않도록)
+    try:
+        from pypdf import PdfReader, PdfWriter
+    except ImportError:
+        return None
+    return PdfReader, PdfWriter
+
+
+def page_key(file_id, page):
+    return f"{PREFIX}{file_id}/pages/{page}.pdf"
+
+
+def preview_key(file_id):
+    return f"{PREFIX}{file_id}/preview.jpg"
+
+
+def optimized_key(file_id):
+    return f"{PREFIX}{file_id}/optimized.pdf"
+
+
+def _put(key, body, content_type):
+    with tracing.segment('S3.PutObject'):
+        aws_clients.s3().put_object(Bucket=_bucket(), Key=key, Body=body, ContentType=content_type)
+    return len(body)
+
+
+def _write(writer):
+    out = io.BytesIO()
+    writer.write(out)
+    return out.getvalue()
+
+
+def split_page(reader, writer_class, index):
+    writer = writer_class()
+    writer.add_page(reader.pages[index])
+    return _write(writer)
+
+
+def render_preview(data):
+    """
+    첫 페이지 JPEG (pypdfium2/Pillow가 없거나 실패하면 None)
+    """
+    try:
+        import pypdfium2
+    except ImportError:
+        return None
+    try:
+        document = pypdfium2.PdfDocument(data)
+        page = document[0]
+        width = page.get_width()
+        image = page.render(scale=PREVIEW_WIDTH / width if width else 1.0).to_pil()
+        out = io.BytesIO()
+        image.convert('RGB').save(out, format='JPEG', quality=PREVIEW_QUALITY, optimize=True)
+        return out.getvalue()
+    except Exception as e:
+        logger.warning("[FILE] 미리보기 이미지 생성 실패: %s", e)
+        return None
+
+
+def optimize(data, reader, writer_class):
+    """
+    최적화 사본 (bytes, 선형화 여부)
+    """
+    try:
+        import pikepdf
+    except ImportError:
+        pikepdf = None
+    if pikepdf is not None:
+        with pikepdf.open(io.BytesIO(data)) as pdf:
+            out = io.BytesIO()
+            pdf.save(out, linearize=True, object_stream_mode=pikepdf.ObjectStreamMode.generate,
+                     compress_streams=True)
+            return out.getvalue(), True
+
+    writer = writer_class(clone_from=reader)
+    for page in writer.pages:
+        page.compress_content_streams()
+    # pypdf 4.3 이전에는 없음
+    compress_identical = getattr(writer, 'compress_identical_objects', None)
+    if compress_identical is not None:
+        compress_identical()
+    return _write(writer), False
+
+
+def build(file_id, data):
+    """
+    파생본을 만들어 S3에 쓰고 derivatives 속성 값 반환 (pypdf가 없으면 None)
+    """
+    classes = _pypdf()
+    if classes is None:
+        logger.info("[FILE] pypdf 없음, 파생본 생성 생략: fileId=%s", file_id)
+        return None
+    reader_class, writer_class = classes
+    with tracing.segment('Template.ReadPdf'):
+        reader = reader_class(io.BytesIO(data))
+        page_count = len(reader.pages)
+
+    split = min(page_count, MAX_PAGES)
+    with tracing.segment('Template.SplitPages'):
+        for index in range(split):
+            _put(page_key(file_id, index + 1), split_page(reader, writer_class, index), 'application/pdf')
+
+    derivatives = {
+        'status': 'ready',
+        'pageCount': page_count,
+        'pages': split,
+        'sourceBytes': len(data),
+        'generatedAt': datetime.now(timezone.utc).isoformat(),
+    }
+
+    with tracing.segment('Template.Preview'):
+        image = render_preview(data)
+    if image is not None:
+        derivatives['preview'] = {
+            'key': preview_key(file_id),
+            'contentType': 'image/jpeg',
+            'bytes': _put(preview_key(file_id), image, 'image/jpeg'),
+        }
+    elif split:
+        derivatives['preview'] = {'key': page_key(file_id, 1), 'contentType': 'application/pdf', 'bytes': 0}
+
+    try:
+        with tracing.segment('Template.Optimize'):
+            optimized, linearized = optimize(data, reader, writer_class)
+        if len(optimized) < len(data) or linearized:
+            derivatives['optimized'] = {
+                'key': optimized_key(file_id),
+                'bytes': _put(optimized_key(file_id), optimized, 'application/pdf'),
+                'linearized': linearized,
+            }
+    except Exception as e:
+        logger.warning("[FILE] 최적화 사본 생성 실패: fileId=%s, %s", file_id, e)
+    return derivatives
+
+
+def _record(file_id, derivatives):
+    table = aws_clients.dynamodb().Table(PDF_FILES_TABLE)
+    with tracing.segment('PdfFilesTable.UpdateItem'):
+        table.update_item(
+            Key={'fileId': file_id},
+            UpdateExpression='SET derivatives = :derivatives',
+            ConditionExpression='attribute_exists(fileId)',
+            ExpressionAttributeValues={':derivatives': derivatives}
+        )
+    common.invalidate_file_metadata(file_id)
+
+
+def keep(file_id, derivatives):
+    """
+    메타데이터만 다시 저장한 파일에 기존 파생본 기록을 되돌림 (원본이 그대로인 경우) - 실패는 로그만 남김
+    """
+    try:
+        _record(file_id, derivatives)
+    except Exception as e:
+        logger.error("[FILE] 파생본 기록 유지 실패: fileId=%s, %s", file_id, e, exc_info=True)
+
+
+def uses_event():
+    """
+    event 모드로 처리할 수 있는지 (모드가 event이고 호출할 함수가 설정됨)
+    """
+    return MODE == 'event' and bool(FUNCTION)
+
+
+def trigger(file_id):
+    """
+    파생본 함수를 {"fileId"}로 비동기 호출 - 호출하지 못하면 False (호출한 쪽이 inline으로 처리)
+    """
+    try:
+        with tracing.segment('Lambda.Invoke'):
+            aws_clients.lambda_client().invoke(
+                FunctionName=FUNCTION,
+                InvocationType='Event',
+                Payload=json.dumps({'fileId': file_id}).encode('utf-8')
+            )
+        logger.info("[FILE] 파생본 생성 요청: fileId=%s, 함수=%s", file_id, FUNCTION)
+        return True
+    except Exception as e:
+        logger.error("[FILE] 파생본 생성 요청 실패, 요청 안에서 처리: fileId=%s, %s", file_id, e, exc_info=True)
+        return False
+
+
+def read_source(file_metadata, max_bytes=MAX_BYTES):
+    """
+    S3 원본 PDF 바이트 (키가 없거나 max_bytes보다 크면 None)
+    """
+    s3_key = file_metadata.get('s3Key', '')
+    if not s3_key:
+        return None
+    with tracing.segment('S3.GetObject'):
+        response = aws_clients.s3().get_object(Bucket=_bucket(), Key=s3_key)
+        if response.get('ContentLength', 0) > max_bytes:
+            logger.warning("[FILE] 원본이 너무 커서 읽지 않음: %s, %s bytes", s3_key, response['ContentLength'])
+            return None
+        return response['Body'].read()
+
+
+def generate(file_metadata, raise_errors=False, data=None):
+    """
+    원본을 읽어 파생본을 만들고 메타데이터에 기록 - derivatives 값 반환 (만들지 않았으면 None)
+
+    data: 이미 읽은 원본 바이트 (없으면 여기서 읽음)
+    raise_errors가 아니면 실패해도 로그만 남김 (저장 요청은 성공으로 처리, getTemplate은 원본 사용)
+    """
+    file_id = file_metadata.get('fileId')
+    try:
+        if _pypdf() is None or not file_metadata.get('s3Key'):
+            return None
+        if data is None:
+            data = read_source(file_metadata)
+        if not data or len(data) > MAX_BYTES:
+            return None
+        derivatives = build(file_id, data)
+        if derivatives is not None:
+            _record(file_id, derivatives)
+            logger.info("[FILE] 파생본 생성: fileId=%s, 페이지=%s/%s, 미리보기=%s, 최적화=%s",
+                        file_id, derivatives['pages'], derivatives['pageCount'],
+                        'preview' in derivatives, derivatives.get('optimized', {}).get('bytes'))
+        return derivatives
+    except Exception as e:
+        if raise_errors:
+            raise
+        logger.error("[FILE] 파생본 생성 실패: fileId=%s, %s", file_id, e, exc_info=True)
+        return None
+
+
+def process_source(file_metadata, raise_errors=False):
+    """
+    원본을 한 번 내려받아 템플릿 구간 색인과 파생본 생성에 같이 씀 - derivatives 값 반환
+    """
+    data = b''
+    if file_metadata.get('s3Key'):
+        try:
+            data = read_source(file_metadata, max(MAX_BYTES, template_retrieval.MAX_BYTES)) or b''
+        except Exception as e:
+            if raise_errors:
+                raise
+            logger.error("[FILE] 원본 읽기 실패: fileId=%s, %s", file_metadata.get('fileId'), e, exc_info=True)
+    template_retrieval.index_template(file_metadata, data=data)
+    return generate(file_metadata, raise_errors, data=data)
+
+
+def remove(file_metadata):
+    """
+    파생본 객체 삭제 - 실패해도 로그만 남김
+    """
+    file_id = file_metadata.get('fileId')
+    if not file_id:
+        return
+    try:
+        s3 = aws_clients.s3()
+        kwargs = {'Bucket': _bucket(), 'Prefix': f"{PREFIX}{file_id}/"}
+        while True:
+            with tracing.segment('S3.ListObjects'):
+                response = s3.list_objects_v2(**kwargs)
+            keys = [{'Key': entry['Key']} for entry in response.get('Contents', [])]
+            if keys:
+                with tracing.segment('S3.DeleteObjects'):
+                    s3.delete_objects(Bucket=_bucket(), Delete={'Objects': keys, 'Quiet': True})
+            if not response.get('IsTruncated'):
+                return
+            kwargs['ContinuationToken'] = response['NextContinuationToken']
+    except Exception as e:
+        logger.error("[FILE] 파생본 삭제 실패: fileId=%s, %s", file_id, e, exc_info=True)
+
+
+def parse_pages(value):
+    """
+    pages 파라미터("3", "1-3") -> (첫 페이지, 마지막 페이지), 없으면 None, 잘못된 값이면 ValueError
+    """
+    if value is None or value == '':
+        return None
+    match = _PAGE_RANGE.match(str(value))
+    if not match:
+        raise ValueError(value)
+    first = int(match.group(1))
+    last = int(match.group(2) or first)
+    if first < 1 or last < first or last - first + 1 > MAX_PAGES:
+        raise ValueError(value)
+    return first, last
+
+
+def resolve(file_metadata, kind='original', pages=None):
+    """
+    요청한 파생본의 (제공한 종류, [(페이지 또는 None, S3 키, Content-Type)])
+
+    파생본이 아직 없거나 요청한 페이지가 분할 범위 밖이면 원본으로 대신한다.
+    요청한 페이지가 문서 페이지 수를 넘으면 ValueError.
+    """
+    original = ('original', [(None, file_metadata.get('s3Key', ''), 'application/pdf')])
+    derivatives = file_metadata.get('derivatives') or {}
+    if pages is not None:
+        kind = 'pages'
+    if kind == 'original' or derivatives.get('status') != 'ready':
+        return original
+
+    if kind == 'pages':
+        first, last = pages or (1, 1)
+        if last > int(derivatives.get('pageCount', 0)):
+            raise ValueError(f"{first}-{last}")
+        if last > int(derivatives.get('pages', 0)):
+            return original
+        file_id = file_metadata['fileId']
+        return 'pages', [(page, page_key(file_id, page), 'application/pdf') for page in range(first, last + 1)]
+
+    entry = derivatives.get(kind)
+    if not entry:
+        return original
+    return kind, [(None, entry['key'], entry.get('contentType', 'application/pdf'))]
+
+
+def _file_id_from_key(key):
+    if key.startswith(PREFIX):
+        return None
+    match = _SOURCE_KEY.match(key)
+    return match.group(1) if match else None
+
+
+@tracing.traced_handler('pdf_derivatives', default_action='generate')
+def lambda_handler(event, context):
+    """
+    S3 ObjectCreated 알림 또는 {"fileId"} 이벤트로 템플릿 구간 색인과 파생본 생성
+    """
+    event = event or {}
+    file_ids = []
+    if event.get('fileId'):
+        file_ids.append(event['fileId'])
+    for record in event.get('Records', []):
+        file_id = _file_id_from_key(unquote_plus(record.get('s3', {}).get('object', {}).get('key', '')))
+        if file_id:
+            file_ids.append(file_id)
+
+    generated = 0
+    for file_id in file_ids:
+        common.invalidate_file_metadata(file_id)
+        file_metadata = common.get_file_metadata(file_id)
+        if not file_metadata:
+            # 업로드 알림이 saveFileMetadata보다 먼저 온 경우 - 저장 후 trigger로 다시 호출됨
+            logger.info("[FILE] 메타데이터 없는 파일 건너뜀: fileId=%s", file_id)
+            continue
+        try:
+            if process_source(file_metadata, raise_errors=True) is not None:
+                generated += 1
+        except ClientError as e:
+            if e.response.get('Error', {}).get('Code') != 'ConditionalCheckFailedException':
+                raise
+            logger.info("[FILE] 파생본 생성 중 파일 삭제됨: fileId=%s", file_id)
+            remove(file_metadata)
+            template_retrieval.remove_template(file_metadata)
+    return {
+        'statusCode': 200,
+        'headers': {'Content-Type': 'application/json'},
+        'body': json.dumps({'files': len(file_ids), 'generated': generated})
+    }
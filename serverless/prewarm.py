@@ -0,0 +1,262 @@
+"""
+컨테이너 캐시 미리 채우기 (prewarm)
+
+새 컨테이너의 첫 요청들은 사용자, 조직 템플릿 목록, 파일 메타데이터 조회를 모두 DynamoDB에서 해야 하고,
+그 비용을 콜드 스타트를 만난 사용자가 떠안는다. 자주 쓰이는 항목(hot set)을 common의 컨테이너 캐시
+(user_cache, template_list_cache, file_metadata_cache)에 미리 읽어 둔다. 캐시 크기와 TTL은
+common 설정을 그대로 따르므로 미리 읽은 항목도 같은 기준으로 만료/교체된다.
+
+- 초기화 시: PREWARM_ON_INIT=1이면 핸들러 모듈 import 중(warm_on_init) 한 번 실행한다.
+  초기화 시간은 init_profiler에 'prewarm'으로 기록된다.
+- 예약 실행: EventBridge 예약 규칙이 핸들러를 호출하면 인증 없이 hot set을 다시 읽고 소요 시간과 캐시
+  적중률을 응답 본문으로 돌려준다. 규칙이 기본 이벤트(source aws.events, Scheduled Event)를 보내거나,
+  고정 입력 {"action": "warm", "secret": PREWARM_SECRET}을 보낼 때만 warm 이벤트로 본다.
+  action 키만 있는 호출은 일반 요청으로 처리된다. 고정 입력에 "hotSet"을 주면 설정 대신 사용한다.
+  예약 이벤트는 웜 컨테이너 하나에만 전달되므로 TTL이 짧은 항목을 그 컨테이너에서 계속 채워 두는 용도다.
+  같은 이벤트에서 컨테이너에 쌓인 토큰 사용량(usage_meter)도 반영한다.
+
+hot set (JSON, 목록마다 앞쪽이 우선)
+    {"users": ["user-1", ...], "organizations": ["org-1", ...], "files": ["file-1", ...]}
+사용자를 주면 그 사용자의 조직도 템플릿 목록 대상에 넣는다. 운영 중에는 접근 로그로 만든 목록을
+PREWARM_HOT_SET_KEY 객체에 올려 두면 배포 없이 바꿀 수 있다.
+
+환경 변수
+    PREWARM_ON_INIT         초기화 시 미리 채우기 (기본 0)
+    PREWARM_HOT_SET         hot set JSON (기본 없음)
+    PREWARM_HOT_SET_KEY     hot set JSON을 읽을 PDF_BUCKET 객체 키 (기본 없음, PREWARM_HOT_SET과 합침)
+    PREWARM_MAX_ITEMS       종류별 최대 항목 수 (기본 200, 캐시 크기를 넘지 않음)
+    PREWARM_BUDGET_MS       시간 한도(ms, 기본 2000) - 넘으면 남은 단계를 건너뜀
+    PREWARM_SECRET          고정 입력 warm 이벤트의 secret 값 (기본 없음, 없으면 EventBridge 기본 이벤트만 받음)
+"""
+import hmac
+import json
+import logging
+import os
+import time
+
+import aws_clients
+import cache
+import change_counters
+import common
+import concurrency
+import init_profiler
+import parallel_scan
+import tracing
+import usage_meter
+
+logger = logging.getLogger()
+
+ON_INIT = os.environ.get('PREWARM_ON_INIT', '0') == '1'
+HOT_SET = os.environ.get('PREWARM_HOT_SET', '')
+HOT_SET_KEY = os.environ.get('PREWARM_HOT_SET_KEY', '')
+MAX_ITEMS = int(os.environ.get('PREWARM_MAX_ITEMS', '200'))
+BUDGET_MS = float(os.environ.get('PREWARM_BUDGET_MS', '2000'))
+SECRET = os.environ.get('PREWARM_SECRET', '')
+
+KINDS = ('users', 'organizations', 'files')
+BATCH_GET_SIZE = 100
+BATCH_GET_ATTEMPTS = 5
+
+_init_done = False
+
+
+def is_warm_event(event):
+    """
+    예약 실행 warm 이벤트 여부 - EventBridge 예약 이벤트이거나 PREWARM_SECRET이 맞는 고정 입력
+
+    API Gateway/함수 URL 요청은 클라이언트가 최상위 키를 정할 수 없으므로 source나 secret을 흉내 낼 수 없다.
+    """
+    if not isinstance(event, dict):
+        return False
+    if event.get('source') == 'aws.events' and event.get('detail-type') == 'Scheduled Event':
+        return True
+    if event.get('action') != 'warm':
+        return False
+    if SECRET and hmac.compare_digest(str(event.get('secret', '')), SECRET):
+        return True
+    logger.warning("[PREWARM] 확인되지 않은 warm 이벤트 무시")
+    return False
+
+
+def load_hot_set(override=None):
+    """
+    {종류: 중복 없는 ID 목록} - override, 없으면 PREWARM_HOT_SET과 PREWARM_HOT_SET_KEY 객체를 합친 것
+    """
+    sources = []
+    if override is not None:
+        sources.append(override)
+    else:
+        if HOT_SET:
+            try:
+                sources.append(json.loads(HOT_SET))
+            except ValueError as e:
+                logger.error("[PREWARM] PREWARM_HOT_SET 형식 오류: %s", e)
+        if HOT_SET_KEY:
+            try:
+                with tracing.segment('S3.GetObject'):
+                    response = aws_clients.s3().get_object(Bucket=os.environ.get('PDF_BUCKET', ''), Key=HOT_SET_KEY)
+                sources.append(json.loads(response['Body'].read()))
+            except Exception as e:
+                logger.error("[PREWARM] hot set 객체 읽기 실패: %s, %s", HOT_SET_KEY, e)
+
+    hot_set = {kind: [] for kind in KINDS}
+    for source in sources:
+        if not isinstance(source, dict):
+            continue
+        for kind in KINDS:
+            for value in source.get(kind) or []:
+                if isinstance(value, str) and value and value not in hot_set[kind]:
+                    hot_set[kind].append(value)
+    return hot_set
+
+
+def _batch_get(table_name, key_name, ids, segment):
+    """
+    ID 목록 항목을 BatchGetItem 100개씩 조회 (처리되지 않은 키는 잠시 쉬었다가 다시 요청)
+    """
+    dynamodb = aws_clients.dynamodb()
+    items = []
+    for start in range(0, len(ids), BATCH_GET_SIZE):
+        request = {table_name: {'Keys': [{key_name: value} for value in ids[start:start + BATCH_GET_SIZE]]}}
+        for attempt in range(BATCH_GET_ATTEMPTS):
+            with tracing.segment(f'{segment}.BatchGetItem'):
+                response = dynamodb.batch_get_item(RequestItems=request)
+            items.extend(response.get('Responses', {}).get(table_name, []))
+            request = response.get('UnprocessedKeys') or {}
+            if not request:
+                break
+            time.sleep(0.05 * (2 ** attempt))
+        if request:
+            logger.warning("[PREWARM] 처리되지 않은 키 %s개 건너뜀: %s",
+                           len(request.get(table_name, {}).get('Keys', [])), table_name)
+    return items
+
+
+def _warm_users(user_ids):
+    users = _batch_get(common.USERS_TABLE, 'id', user_ids, 'UsersTable')
+    for user in users:
+        common.user_cache.put(user['id'], user)
+    return users
+
+
+def _warm_files(file_ids):
+    files = _batch_get(common.PDF_FILES_TABLE, 'fileId', file_ids, 'PdfFilesTable')
+    for item in files:
+        common.file_metadata_cache.put(item['fileId'], item)
+    return files
+
+
+def _warm_organizations(organizations):
+    """
+    조직 템플릿 목록을 카운터 값과 함께 캐시 - 조직이 여럿이면 조직마다 Scan하지 않고 병렬 Scan 한 번으로 나눔
+    """
+    versions = concurrency.gather({
+        organization: (lambda organization=organization:
+                       change_counters.current(change_counters.templates_key(organization)))
+        for organization in organizations
+    })
+    # 카운터 없이 넣은 목록은 검증할 수 없으므로 캐시하지 않음
+    organizations = [organization for organization in organizations if versions[organization] is not None]
+    if len(organizations) == 1:
+        organization = organizations[0]
+        common.get_organization_templates(organization, versions[organization])
+        return organizations
+
+    grouped = {organization: [] for organization in organizations}
+    # 카운터를 먼저 읽었으므로 그 사이 바뀐 목록은 다음 요청에서 카운터 값이 달라 다시 읽힘
+    for item in parallel_scan.collect(common.PDF_FILES_TABLE, segment_name='PdfFilesTable.Scan', ConsistentRead=True):
+        items = grouped.get(item.get('organization'))
+        if items is not None:
+            items.append(item)
+    for organization, items in grouped.items():
+        common.template_list_cache.put(organization, (versions[organization], items))
+    return organizations
+
+
+def warm(hot_set=None):
+    """
+    hot set을 컨테이너 캐시에 읽어 두고 결과 보고 (종류별 적재 수, 소요 시간, 캐시 적중률)
+    """
+    started = time.perf_counter()
+    hot_set = load_hot_set(hot_set)
+    limits = {
+        'users': min(MAX_ITEMS, common.user_cache.maxsize),
+        'organizations': min(MAX_ITEMS, common.template_list_cache.maxsize),
+        'files': min(MAX_ITEMS, common.file_metadata_cache.maxsize),
+    }
+    loaded = {kind: 0 for kind in KINDS}
+    skipped = []
+
+    # 사용자와 파일 메타데이터는 서로 독립이므로 동시에 읽음
+    results = concurrency.gather({
+        'users': lambda: _warm_users(hot_set['users'][:limits['users']]) if hot_set['users'] else [],
+        'files': lambda: _warm_files(hot_set['files'][:limits['files']]) if hot_set['files'] else [],
+    }, return_exceptions=True)
+    for kind in ('users', 'files'):
+        if isinstance(results[kind], Exception):
+            logger.error("[PREWARM] %s 미리 읽기 실패: %s", kind, results[kind])
+        else:
+            loaded[kind] = len(results[kind])
+
+    # 조직 목록은 명시한 조직 + 읽은 사용자의 조직
+    organizations = list(hot_set['organizations'])
+    if not isinstance(results['users'], Exception):
+        for user in results['users']:
+            organization = user.get('organization')
+            if organization and organization not in organizations:
+                organizations.append(organization)
+    organizations = organizations[:limits['organizations']]
+    if organizations and (time.perf_counter() - started) * 1000 > BUDGET_MS:
+        skipped.append('organizations')
+    elif organizations:
+        try:
+            loaded['organizations'] = len(_warm_organizations(organizations))
+        except Exception as e:
+            logger.error("[PREWARM] 템플릿 목록 미리 읽기 실패: %s", e, exc_info=True)
+
+    duration_ms = (time.perf_counter() - started) * 1000
+    caches = cache.stats()
+    report = {
+        'loaded': loaded,
+        'requested': {kind: len(hot_set[kind]) for kind in KINDS},
+        'skipped': skipped,
+        'durationMs': round(duration_ms, 1),
+        'caches': {name: caches[name] for name in ('users', 'templateLists', 'fileMetadata')},
+    }
+    tracing.add_metric('PrewarmDuration', round(duration_ms, 3), 'Milliseconds')
+    tracing.add_metric('PrewarmItems', sum(loaded.values()))
+    logger.info("[PREWARM] 캐시 미리 채우기 완료: %s", json.dumps(report, ensure_ascii=False))
+    return report
+
+
+def warm_on_init():
+    """
+    PREWARM_ON_INIT=1이면 프로세스당 한 번 미리 채우기 (실패해도 초기화는 계속)
+    """
+    global _init_done
+    if not ON_INIT or _init_done:
+        return None
+    _init_done = True
+    started = time.perf_counter()
+    try:
+        return warm()
+    except Exception as e:
+        logger.error("[PREWARM] 초기화 미리 채우기 실패: %s", e, exc_info=True)
+        return None
+    finally:
+        init_profiler.record('prewarm', time.perf_counter() - started)
+
+
+def handle(event, headers=None):
+    """
+    warm 이벤트 처리 - 미리 채우기 결과를 본문으로 돌려줌
+    """
+    tracing.set_action('warm')
+    report = warm(event.get('hotSet'))
+    # 예약 실행 시점에 이 컨테이너에 쌓인 토큰 사용량도 반영
+    report['usageKeys'] = usage_meter.flush()
+    return {
+        'statusCode': 200,
+        'headers': headers or {'Content-Type': 'application/json'},
+        'body': json.dumps(report)
+    }
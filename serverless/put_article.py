@@ -1,27 +1,44 @@
+import init_profiler
+init_profiler.install()
+
+import base64
+import binascii
 import json
 import os
-import boto3
 import logging
-import uuid
 from datetime import datetime, timezone
 
+import article_archive
+import article_queue
+import article_stats
+import aws_clients
+import change_counters
+import changelog
+import concurrency
+import request_log
+import responses
+import search_index
+import tracing
+from common import get_user_info
+
 # 로깅 설정 - CloudWatch에 로그 출력
 logger = logging.getLogger()
-logger.setLevel(logging.INFO)
-
-# AWS 서비스 클라이언트 초기화
-dynamodb = boto3.resource('dynamodb')
+logger.setLevel(request_log.LOG_LEVEL)
 
 # 환경 변수
 ARTICLES_TABLE = os.environ.get('ARTICLES_TABLE', 'Articles')
 USERS_TABLE = os.environ.get('USERS_TABLE', 'Users')
+ORG_ARTICLES_PAGE_SIZE = int(os.environ.get('ORG_ARTICLES_PAGE_SIZE', '50'))
+ORG_ARTICLES_MAX_PAGE_SIZE = int(os.environ.get('ORG_ARTICLES_MAX_PAGE_SIZE', '200'))
 
+@tracing.traced_handler('put_article')
+@responses.compressed
 def lambda_handler(event, context):
     """
     AWS Lambda 핸들러 함수 - 기사 저장 및 조회 처리
     """
     # 요청 정보 로깅
-    logger.info(f"[ARTICLE] 수신된 이벤트: {json.dumps(event)}")
+    logger.debug("[ARTICLE] 수신된 이벤트: %s", request_log.redacted(event))
     
     try:
         headers = {
@@ -30,31 +47,42 @@ def lambda_handler(event, context):
 
         # 요청에서 사용자 ID 가져오기
         user_id = event.get('headers', {}).get('authorization', '0')
-        logger.info(f"[ARTICLE] 요청 사용자 ID: {user_id}")
-        
-        # 사용자 정보 가져오기
-        user_info = get_user_info(user_id)
-        if not user_info:
-            logger.warning(f"[ARTICLE] 인증되지 않은 사용자: {user_id}")
-            return {
-                'statusCode': 401,
-                'headers': headers,
-                'body': json.dumps({'error': '인증되지 않은 사용자입니다'})
-            }
+        logger.info("[ARTICLE] 요청 사용자 ID: %s", user_id)
 
-        logger.info(f"[ARTICLE] 사용자 정보: {json.dumps(user_info)}")
-        
         # 쿼리 파라미터에서 액션 가져오기
         query_params = event.get('queryStringParameters', {}) or {}
 
         # HTTP 메서드에 따라 다른 처리
         http_method = query_params.get('method', '')
         action = query_params.get('action', '')
-        
+
         # 경로 매개변수
         path_parameters = event.get('pathParameters', {}) or {}
-        
-        logger.info(f"[ARTICLE] HTTP 메서드: {http_method}, 리소스 경로: {action}")
+
+        # 버전 조회는 기사 항목을 사용자 조회와 동시에 가져옴 (권한 확인은 두 결과가 모두 온 뒤)
+        # authorization 헤더가 없는 요청은 미리 읽지 않고, 401/403이면 읽은 항목은 버림.
+        # 보관된 버전의 S3 묶음은 권한 확인 뒤에만 읽음 (get_article_version)
+        prefetched = None
+        version_id = None
+        if http_method == 'GET' and action == '/articles/{originId}/version':
+            version_id = path_parameters.get('originId', '')
+        elif http_method == 'GET' and action == '/articles/version/{versionId}':
+            version_id = path_parameters.get('versionId', '')
+        if version_id and user_id not in ('', '0'):
+            prefetched = concurrency.submit(_read_version, version_id)
+
+        # 사용자 정보 가져오기
+        user_info = get_user_info(user_id)
+        if not user_info:
+            logger.warning("[ARTICLE] 인증되지 않은 사용자: %s", user_id)
+            return {
+                'statusCode': 401,
+                'headers': headers,
+                'body': json.dumps({'error': '인증되지 않은 사용자입니다'})
+            }
+
+        logger.info("[ARTICLE] 사용자 정보: %s", request_log.redacted(user_info))
+        logger.info("[ARTICLE] HTTP 메서드: %s, 리소스 경로: %s", http_method, action)
 
         # HTTP 메서드 및 경로에 따른 처리
         if http_method == 'POST' and query_params.get('action') == 'saveArticle':
@@ -63,17 +91,33 @@ def lambda_handler(event, context):
         elif http_method == 'GET' and action == '/articles/user/{ownerId}':
             # 사용자별 기사 목록 조회
             user_id = path_parameters.get('ownerId', '')
-            return get_user_articles(user_info, user_id, headers)
+            return get_user_articles(user_info, user_id, headers, event.get('headers') or {})
+        elif http_method == 'GET' and action == '/articles/user/{ownerId}/changes':
+            # 사용자별 기사 목록 변경분 조회
+            user_id = path_parameters.get('ownerId', '')
+            return get_user_article_changes(user_info, user_id, query_params, headers)
+        elif http_method == 'GET' and action == '/articles/org/{organization}':
+            # 조직 전체 기사 목록 조회 (관리자, 페이지 단위)
+            organization = path_parameters.get('organization', '')
+            return get_organization_articles(user_info, organization, query_params, headers)
+        elif http_method == 'GET' and action == '/articles/stats/{ownerId}':
+            # 사용자별 기사 통계 조회
+            user_id = path_parameters.get('ownerId', '')
+            return get_owner_stats(user_info, user_id, headers)
+        elif http_method == 'GET' and action == '/articles/stats/org/{organization}':
+            # 조직별 기사 통계 조회
+            organization = path_parameters.get('organization', '')
+            return get_organization_stats(user_info, organization, headers)
         elif http_method == 'GET' and action == '/articles/{originId}/version':
             # 기사 버전 목록 조회
             article_id = path_parameters.get('originId', '')
-            return get_article_version(user_info, article_id, headers)
+            return get_article_version(user_info, article_id, headers, prefetched)
         elif http_method == 'GET' and action == '/articles/version/{versionId}':
             # 특정 버전 조회
             version_id = path_parameters.get('versionId', '')
-            return get_article_version(user_info, version_id, headers)
+            return get_article_version(user_info, version_id, headers, prefetched)
         else:
-            logger.warning(f"[ARTICLE] 지원하지 않는 경로 또는 메서드: {http_method} {action}")
+            logger.warning("[ARTICLE] 지원하지 않는 경로 또는 메서드: %s %s", http_method, action)
             return {
                 'statusCode': 400,
                 'headers': headers,
@@ -81,7 +125,7 @@ def lambda_handler(event, context):
             }
 
     except Exception as e:
-        logger.error(f"[ARTICLE] 오류 발생: {str(e)}", exc_info=True)
+        logger.error("[ARTICLE] 오류 발생: %s", e, exc_info=True)
         return {
             'statusCode': 500,
             'headers': {
@@ -89,53 +133,32 @@ def lambda_handler(event, context):
             },
             'body': json.dumps({'error': f'서버 오류가 발생했습니다: {str(e)}'})
         }
+    finally:
+        init_profiler.report_once('[ARTICLE]')
 
-def get_user_info(user_id):
-    """
-    사용자 정보 가져오기
-    """
-    if user_id == '0':
-        logger.warning("[ARTICLE] 사용자 ID가 0으로 설정됨")
-        return None
-
-    try:
-        logger.info(f"[ARTICLE] 사용자 정보 조회 시작: {user_id}")
-        table = dynamodb.Table(USERS_TABLE)
-        response = table.get_item(
-            Key={'id': user_id}
-        )
-        
-        user = response.get('Item')
-        if user:
-            logger.info(f"[ARTICLE] 사용자 정보 조회 성공: {user.get('id')}, 조직: {user.get('organization')}")
-        else:
-            logger.warning(f"[ARTICLE] 사용자 정보 없음: {user_id}")
-            
-        return user
-    except Exception as e:
-        logger.error(f"[ARTICLE] 사용자 정보 조회 오류: {str(e)}", exc_info=True)
-        return None
-
-def save_article(user_info, article_data, headers):
+def save_article(user_info, article_data, headers, create_only=False):
     """
     기사 저장 함수
+
+    create_only: 같은 newsId 항목이 이미 있으면 덮어쓰지 않고 409 (생성 후 바로 저장하는 text_ai_api용,
+    write-behind로 큐에 넣는 경우에는 소비자가 일괄 반영하므로 조건 없이 반영됨)
     """
     # 필수 필드 검증
     required_fields = ['newsId', 'originId', 'content', 'ownerId', 'version', 'description', 'createdAt']
     for field in required_fields:
         if field not in article_data:
-            logger.warning(f"[ARTICLE] 필수 필드 누락: {field}")
+            logger.warning("[ARTICLE] 필수 필드 누락: %s", field)
             return {
                 'statusCode': 400,
                 'headers': headers,
                 'body': json.dumps({'error': f'필수 필드가 누락되었습니다: {field}'})
             }
     
-    logger.info(f"[ARTICLE] 기사 저장 시작: newsId={article_data.get('newsId')}")
+    logger.info("[ARTICLE] 기사 저장 시작: newsId=%s", article_data.get('newsId'))
     
     # 사용자 ID 확인
     if article_data.get('ownerId') != user_info.get('id'):
-        logger.warning(f"[ARTICLE] 요청자 ID와 본문의 소유자 ID가 불일치: {user_info.get('id')} vs {article_data.get('ownerId')}")
+        logger.warning("[ARTICLE] 요청자 ID와 본문의 소유자 ID가 불일치: %s vs %s", user_info.get('id'), article_data.get('ownerId'))
         # 관리자 권한 확인
         role = user_info.get('role', '')
         if role != 'admin':
@@ -148,13 +171,62 @@ def save_article(user_info, article_data, headers):
     # 타임스탬프 추가
     if 'createdAt' not in article_data:
         article_data['createdAt'] = datetime.now(timezone.utc).isoformat()
+
+    # 조직별 목록(OrganizationIndex)용 작성자 소속 조직 기록
+    organization = user_info.get('organization', '')
+    if article_data.get('ownerId') != user_info.get('id'):
+        owner_info = get_user_info(str(article_data.get('ownerId'))) or {}
+        organization = owner_info.get('organization') or organization
+    if organization:
+        article_data['organization'] = organization
+    # 통계 재계산(article_stats.reconcile)이 본문을 읽지 않도록 본문 바이트 수 기록
+    article_data['contentBytes'] = len(str(article_data.get('content', '') or '').encode('utf-8'))
+
+    # write-behind: 큐에 넣으면 바로 응답하고 기사 테이블 반영은 소비자가 묶어서 처리
+    if article_queue.ENABLED:
+        save_id = article_queue.enqueue(article_data)
+        if save_id:
+            return {
+                'statusCode': 202,
+                'headers': headers,
+                'body': json.dumps({
+                    'success': True,
+                    'queued': True,
+                    'message': '기사 저장 요청이 접수되었습니다',
+                    'originId': article_data.get('originId'),
+                    'newsId': article_data.get('newsId')
+                })
+            }
     
     try:
         # DynamoDB에 저장
-        table = dynamodb.Table(ARTICLES_TABLE)
-        table.put_item(Item=article_data)
+        table = aws_clients.dynamodb().Table(ARTICLES_TABLE)
+        condition = {'ConditionExpression': 'attribute_not_exists(newsId)'} if create_only else {}
+        try:
+            with tracing.segment('ArticlesTable.PutItem'):
+                response = table.put_item(Item=article_data, ReturnValues='ALL_OLD', **condition)
+        except Exception as e:
+            if not create_only or aws_clients.error_code(e) != 'ConditionalCheckFailedException':
+                raise
+            logger.warning("[ARTICLE] 이미 있는 기사 버전: newsId=%s", article_data.get('newsId'))
+            return {
+                'statusCode': 409,
+                'headers': headers,
+                'body': json.dumps({'error': '이미 저장된 기사 버전입니다'})
+            }
+        feed_key = change_counters.articles_key(article_data.get('ownerId'))
+        # 변경 기록은 목록 동기화 순서에 필요하므로 응답 전에 쓰고, 검색 색인과 통계는 응답을 기다리게 하지 않음
+        # (각각 실패해도 로그만 남김, 통계는 article_stats.reconcile로 다시 맞춰짐)
+        concurrency.follow_up({
+            'search': lambda: search_index.index_article(organization, article_data),
+            'stats': lambda: article_stats.record_save(organization, article_data, response.get('Attributes')),
+        }, '[ARTICLE]', wait=False)
+        changelog.record(
+            feed_key, change_counters.bump(feed_key), 'put',
+            article_data.get('newsId'), changelog.article_item(article_data)
+        )
         
-        logger.info(f"[ARTICLE] 기사 저장 성공: newsId={article_data.get('newsId')}")
+        logger.info("[ARTICLE] 기사 저장 성공: newsId=%s", article_data.get('newsId'))
         
         return {
             'statusCode': 201,
@@ -166,16 +238,16 @@ def save_article(user_info, article_data, headers):
             })
         }
     except Exception as e:
-        logger.error(f"[ARTICLE] 기사 저장 실패: {str(e)}", exc_info=True)
+        logger.error("[ARTICLE] 기사 저장 실패: %s", e, exc_info=True)
         return {
             'statusCode': 500,
             'headers': headers,
             'body': json.dumps({'error': f'기사 저장 실패: {str(e)}'})
         }
 
-def get_user_articles(user_info, user_id, headers):
+def get_user_articles(user_info, user_id, headers, request_headers=None):
     """
-    특정 사용자의 모든 기사 목록 조회
+    특정 사용자의 모든 기사 목록 조회 (If-None-Match가 현재 ETag와 같으면 304)
     """
     if not user_id:
         logger.warning("[ARTICLE] 사용자 ID가 제공되지 않음")
@@ -185,7 +257,7 @@ def get_user_articles(user_info, user_id, headers):
             'body': json.dumps({'error': '사용자 ID가 필요합니다'})
         }
     
-    logger.info(f"[ARTICLE] 사용자 기사 목록 조회 시작: ownerId={user_id}")
+    logger.info("[ARTICLE] 사용자 기사 목록 조회 시작: ownerId=%s", user_id)
     
     # 권한 검증
     requester_id = user_info.get('id', '')
@@ -195,8 +267,9 @@ def get_user_articles(user_info, user_id, headers):
     # 자신의 기사 또는 관리자인 경우에만 접근 허용
     if requester_id != user_id and role != 'admin':
         logger.warning(
-            f"[ARTICLE] 권한 없음: 요청자={requester_id}, 대상={user_id}, " +
-            f"요청자역할={role}"
+            "[ARTICLE] 권한 없음: 요청자=%s, 대상=%s, "
+            "요청자역할=%s",
+            requester_id, user_id, role
         )
         return {
             'statusCode': 403,
@@ -204,23 +277,17 @@ def get_user_articles(user_info, user_id, headers):
             'body': json.dumps({'error': '권한이 없습니다'})
         }
     
+    etag = change_counters.list_etag(change_counters.articles_key(user_id))
+    if etag:
+        headers = change_counters.with_etag(headers, etag)
+        if change_counters.is_not_modified(request_headers, etag):
+            logger.info("[ARTICLE] 사용자 기사 목록 변경 없음: ownerId=%s", user_id)
+            return change_counters.not_modified(headers)
+
     try:
         # 기사 목록 조회
-        table = dynamodb.Table(ARTICLES_TABLE)
-        response = table.query(
-            IndexName='OwnerIdIndex',
-            KeyConditionExpression='ownerId = :oid',
-            FilterExpression='isCurrent = :ic',
-            ExpressionAttributeValues={
-                ':oid': user_id,
-                ':ic': True
-            }
-        )
-        
-        articles = response.get('Items', [])
-        
-        # 모든 페이지 처리
-        while 'LastEvaluatedKey' in response:
+        table = aws_clients.dynamodb().Table(ARTICLES_TABLE)
+        with tracing.segment('ArticlesTable.Query'):
             response = table.query(
                 IndexName='OwnerIdIndex',
                 KeyConditionExpression='ownerId = :oid',
@@ -228,26 +295,241 @@ def get_user_articles(user_info, user_id, headers):
                 ExpressionAttributeValues={
                     ':oid': user_id,
                     ':ic': True
-                },
-                ExclusiveStartKey=response['LastEvaluatedKey']
+                }
             )
+        
+        articles = response.get('Items', [])
+        
+        # 모든 페이지 처리
+        while 'LastEvaluatedKey' in response:
+            with tracing.segment('ArticlesTable.Query'):
+                response = table.query(
+                    IndexName='OwnerIdIndex',
+                    KeyConditionExpression='ownerId = :oid',
+                    FilterExpression='isCurrent = :ic',
+                    ExpressionAttributeValues={
+                        ':oid': user_id,
+                        ':ic': True
+                    },
+                    ExclusiveStartKey=response['LastEvaluatedKey']
+                )
             articles.extend(response.get('Items', []))
         
-        logger.info(f"[ARTICLE] 사용자 기사 목록 조회 성공: ownerId={user_id}, 개수={len(articles)}")
+        logger.info("[ARTICLE] 사용자 기사 목록 조회 성공: ownerId=%s, 개수=%s", user_id, len(articles))
         
         return {
             'statusCode': 200,
             'headers': headers,
-            'body': json.dumps(articles, default=str)
+            'body': responses.dumps(articles)
         }
     except Exception as e:
-        logger.error(f"[ARTICLE] 사용자 기사 목록 조회 실패: {str(e)}", exc_info=True)
+        logger.error("[ARTICLE] 사용자 기사 목록 조회 실패: %s", e, exc_info=True)
         return {
             'statusCode': 500,
             'headers': headers,
             'body': json.dumps({'error': f'사용자 기사 목록 조회 실패: {str(e)}'})
         }
 
+def get_user_article_changes(user_info, user_id, query_params, headers):
+    """
+    특정 사용자의 기사 목록 변경분 조회 (since 이후 저장된 버전, changelog 참고)
+    """
+    if not user_id:
+        logger.warning("[ARTICLE] 사용자 ID가 제공되지 않음")
+        return {
+            'statusCode': 400,
+            'headers': headers,
+            'body': json.dumps({'error': '사용자 ID가 필요합니다'})
+        }
+
+    # 자신의 기사 또는 관리자인 경우에만 접근 허용
+    requester_id = user_info.get('id', '')
+    role = user_info.get('role', '')
+    if requester_id != user_id and role != 'admin':
+        logger.warning("[ARTICLE] 변경분 조회 권한 없음: 요청자=%s, 대상=%s", requester_id, user_id)
+        return {
+            'statusCode': 403,
+            'headers': headers,
+            'body': json.dumps({'error': '권한이 없습니다'})
+        }
+
+    parsed = changelog.parse_since(query_params)
+    if parsed is None:
+        return {
+            'statusCode': 400,
+            'headers': headers,
+            'body': json.dumps({'error': f'since는 0 이상, limit은 1~{changelog.PAGE_SIZE} 사이의 정수여야 합니다'})
+        }
+    since, limit = parsed
+
+    try:
+        result = changelog.changes(change_counters.articles_key(user_id), since, limit)
+        logger.info(
+            "[ARTICLE] 사용자 기사 변경분 조회: ownerId=%s, since=%s, 개수=%s, resync=%s",
+            user_id, since, len(result['changes']), result['resync']
+        )
+        return {
+            'statusCode': 200,
+            'headers': headers,
+            'body': responses.dumps(result)
+        }
+    except Exception as e:
+        logger.error("[ARTICLE] 사용자 기사 변경분 조회 실패: %s", e, exc_info=True)
+        return {
+            'statusCode': 500,
+            'headers': headers,
+            'body': json.dumps({'error': f'사용자 기사 변경분 조회 실패: {str(e)}'})
+        }
+
+def _encode_cursor(last_key):
+    return base64.urlsafe_b64encode(json.dumps(last_key, separators=(',', ':')).encode('utf-8')).decode('ascii')
+
+def _decode_cursor(cursor):
+    try:
+        last_key = json.loads(base64.urlsafe_b64decode(cursor.encode('ascii')))
+    except (binascii.Error, UnicodeError, ValueError):
+        return None
+    if not isinstance(last_key, dict) or not all(isinstance(value, str) for value in last_key.values()):
+        return None
+    return last_key
+
+def get_organization_articles(user_info, organization, query_params, headers):
+    """
+    조직 전체 기사 버전 목록 조회 (같은 조직의 관리자 전용, 최신순)
+
+    limit(기본 ORG_ARTICLES_PAGE_SIZE, 최대 ORG_ARTICLES_MAX_PAGE_SIZE)개씩 반환하고,
+    다음 페이지가 있으면 nextCursor를 cursor 파라미터로 다시 보내면 이어서 조회한다.
+    """
+    if user_info.get('role', '') != 'admin' or organization != user_info.get('organization', ''):
+        logger.warning("[ARTICLE] 조직 기사 목록 권한 없음: 요청자=%s, 조직=%s", user_info.get('id'), organization)
+        return {
+            'statusCode': 403,
+            'headers': headers,
+            'body': json.dumps({'error': '권한이 없습니다'})
+        }
+
+    try:
+        limit = int(query_params.get('limit') or ORG_ARTICLES_PAGE_SIZE)
+    except ValueError:
+        limit = 0
+    if not 1 <= limit <= ORG_ARTICLES_MAX_PAGE_SIZE:
+        return {
+            'statusCode': 400,
+            'headers': headers,
+            'body': json.dumps({'error': f'limit은 1~{ORG_ARTICLES_MAX_PAGE_SIZE} 사이여야 합니다'})
+        }
+
+    query_kwargs = {
+        'IndexName': 'OrganizationIndex',
+        'KeyConditionExpression': 'organization = :org',
+        'ExpressionAttributeValues': {':org': organization},
+        'ScanIndexForward': False,
+        'Limit': limit
+    }
+    cursor = query_params.get('cursor')
+    if cursor:
+        last_key = _decode_cursor(cursor)
+        if last_key is None or last_key.get('organization') != organization:
+            return {
+                'statusCode': 400,
+                'headers': headers,
+                'body': json.dumps({'error': '유효하지 않은 cursor입니다'})
+            }
+        query_kwargs['ExclusiveStartKey'] = last_key
+
+    logger.info("[ARTICLE] 조직 기사 목록 조회 시작: 조직=%s, limit=%s", organization, limit)
+
+    try:
+        table = aws_clients.dynamodb().Table(ARTICLES_TABLE)
+        with tracing.segment('ArticlesTable.Query'):
+            response = table.query(**query_kwargs)
+
+        articles = response.get('Items', [])
+        result = {'items': articles}
+        if 'LastEvaluatedKey' in response:
+            result['nextCursor'] = _encode_cursor(response['LastEvaluatedKey'])
+
+        logger.info("[ARTICLE] 조직 기사 목록 조회 성공: 조직=%s, 개수=%s", organization, len(articles))
+        return {
+            'statusCode': 200,
+            'headers': headers,
+            'body': responses.dumps(result)
+        }
+    except Exception as e:
+        logger.error("[ARTICLE] 조직 기사 목록 조회 실패: %s", e, exc_info=True)
+        return {
+            'statusCode': 500,
+            'headers': headers,
+            'body': json.dumps({'error': f'조직 기사 목록 조회 실패: {str(e)}'})
+        }
+
+def get_owner_stats(user_info, user_id, headers):
+    """
+    사용자 기사 통계 조회 (기사 수, 버전 수, 본문 바이트, 마지막 활동 시각)
+    """
+    if not user_id:
+        logger.warning("[ARTICLE] 사용자 ID가 제공되지 않음")
+        return {
+            'statusCode': 400,
+            'headers': headers,
+            'body': json.dumps({'error': '사용자 ID가 필요합니다'})
+        }
+
+    # 자신의 통계 또는 관리자인 경우에만 접근 허용
+    requester_id = user_info.get('id', '')
+    role = user_info.get('role', '')
+    if requester_id != user_id and role != 'admin':
+        logger.warning("[ARTICLE] 통계 조회 권한 없음: 요청자=%s, 대상=%s", requester_id, user_id)
+        return {
+            'statusCode': 403,
+            'headers': headers,
+            'body': json.dumps({'error': '권한이 없습니다'})
+        }
+
+    try:
+        stats = article_stats.get_stats(article_stats.owner_key(user_id))
+        logger.info("[ARTICLE] 사용자 기사 통계 조회 성공: ownerId=%s", user_id)
+        return {
+            'statusCode': 200,
+            'headers': headers,
+            'body': responses.dumps(stats)
+        }
+    except Exception as e:
+        logger.error("[ARTICLE] 사용자 기사 통계 조회 실패: %s", e, exc_info=True)
+        return {
+            'statusCode': 500,
+            'headers': headers,
+            'body': json.dumps({'error': f'사용자 기사 통계 조회 실패: {str(e)}'})
+        }
+
+def get_organization_stats(user_info, organization, headers):
+    """
+    조직 기사 통계 조회 (같은 조직의 관리자 전용)
+    """
+    if user_info.get('role', '') != 'admin' or organization != user_info.get('organization', ''):
+        logger.warning("[ARTICLE] 조직 통계 조회 권한 없음: 요청자=%s, 조직=%s", user_info.get('id'), organization)
+        return {
+            'statusCode': 403,
+            'headers': headers,
+            'body': json.dumps({'error': '권한이 없습니다'})
+        }
+
+    try:
+        stats = article_stats.get_stats(article_stats.organization_key(organization))
+        logger.info("[ARTICLE] 조직 기사 통계 조회 성공: 조직=%s", organization)
+        return {
+            'statusCode': 200,
+            'headers': headers,
+            'body': responses.dumps(stats)
+        }
+    except Exception as e:
+        logger.error("[ARTICLE] 조직 기사 통계 조회 실패: %s", e, exc_info=True)
+        return {
+            'statusCode': 500,
+            'headers': headers,
+            'body': json.dumps({'error': f'조직 기사 통계 조회 실패: {str(e)}'})
+        }
+
 def get_article_version(user_info, article_id, headers):
     """
     특정 기사의 모든 버전 목록 조회
@@ -260,36 +542,38 @@ def get_article_version(user_info, article_id, headers):
             'body': json.dumps({'error': '기사 ID가 필요합니다'})
         }
     
-    logger.info(f"[ARTICLE] 기사 버전 목록 조회 시작: originId={article_id}")
+    logger.info("[ARTICLE] 기사 버전 목록 조회 시작: originId=%s", article_id)
     
     try:
         # 기사 버전 목록 조회
-        table = dynamodb.Table(ARTICLES_TABLE)
-        response = table.query(
-            IndexName='ArticleIdIndex',
-            KeyConditionExpression='originId = :aid',
-            ExpressionAttributeValues={
-                ':aid': article_id
-            }
-        )
-        
-        version = response.get('Items', [])
-        
-        # 모든 페이지 처리
-        while 'LastEvaluatedKey' in response:
+        table = aws_clients.dynamodb().Table(ARTICLES_TABLE)
+        with tracing.segment('ArticlesTable.Query'):
             response = table.query(
                 IndexName='ArticleIdIndex',
                 KeyConditionExpression='originId = :aid',
                 ExpressionAttributeValues={
                     ':aid': article_id
-                },
-                ExclusiveStartKey=response['LastEvaluatedKey']
+                }
             )
+        
+        version = response.get('Items', [])
+        
+        # 모든 페이지 처리
+        while 'LastEvaluatedKey' in response:
+            with tracing.segment('ArticlesTable.Query'):
+                response = table.query(
+                    IndexName='ArticleIdIndex',
+                    KeyConditionExpression='originId = :aid',
+                    ExpressionAttributeValues={
+                        ':aid': article_id
+                    },
+                    ExclusiveStartKey=response['LastEvaluatedKey']
+                )
             version.extend(response.get('Items', []))
         
         # 결과가 없는 경우
         if not version:
-            logger.warning(f"[ARTICLE] 기사 버전 없음: originId={article_id}")
+            logger.warning("[ARTICLE] 기사 버전 없음: originId=%s", article_id)
             return {
                 'statusCode': 404,
                 'headers': headers,
@@ -305,8 +589,9 @@ def get_article_version(user_info, article_id, headers):
         # 기사 소유자 또는 관리자만 접근 허용
         if owner_id != requester_id and role != 'admin':
             logger.warning(
-                f"[ARTICLE] 권한 없음: 요청자={requester_id}, 소유자={owner_id}, " +
-                f"요청자역할={role}"
+                "[ARTICLE] 권한 없음: 요청자=%s, 소유자=%s, "
+                "요청자역할=%s",
+                requester_id, owner_id, role
             )
             return {
                 'statusCode': 403,
@@ -314,24 +599,67 @@ def get_article_version(user_info, article_id, headers):
                 'body': json.dumps({'error': '권한이 없습니다'})
             }
         
-        logger.info(f"[ARTICLE] 기사 버전 목록 조회 성공: originId={article_id}, 개수={len(version)}")
+        logger.info("[ARTICLE] 기사 버전 목록 조회 성공: originId=%s, 개수=%s", article_id, len(version))
         
         return {
             'statusCode': 200,
             'headers': headers,
-            'body': json.dumps(version, default=str)
+            'body': responses.dumps(version)
         }
     except Exception as e:
-        logger.error(f"[ARTICLE] 기사 버전 목록 조회 실패: {str(e)}", exc_info=True)
+        logger.error("[ARTICLE] 기사 버전 목록 조회 실패: %s", e, exc_info=True)
         return {
             'statusCode': 500,
             'headers': headers,
             'body': json.dumps({'error': f'기사 버전 목록 조회 실패: {str(e)}'})
         }
 
-def get_article_version(user_info, version_id, headers):
+def _read_version(version_id):
+    """
+    기사 항목 하나 (없으면 None) - S3 묶음으로 보관된 버전은 stub 그대로 반환 (복원은 권한 확인 뒤)
+    """
+    table = aws_clients.dynamodb().Table(ARTICLES_TABLE)
+    with tracing.segment('ArticlesTable.GetItem'):
+        response = table.get_item(
+            Key={'newsId': version_id}
+        )
+    return response.get('Item')
+
+def latest_version(origin_id):
+    """
+    originId의 저장된 버전 중 가장 큰 version 값과 작성자 (버전이 없으면 (0, None))
+
+    write-behind로 큐에 있는 저장은 아직 보이지 않으므로 소비자가 반영하기 전에는 반영된 버전까지만 센다.
+    """
+    table = aws_clients.dynamodb().Table(ARTICLES_TABLE)
+    kwargs = {
+        'IndexName': 'ArticleIdIndex',
+        'KeyConditionExpression': 'originId = :aid',
+        'ExpressionAttributeValues': {':aid': origin_id},
+        'ProjectionExpression': '#version, ownerId',
+        'ExpressionAttributeNames': {'#version': 'version'},
+    }
+    latest = 0
+    owner_id = None
+    while True:
+        with tracing.segment('ArticlesTable.Query'):
+            response = table.query(**kwargs)
+        for item in response.get('Items', []):
+            owner_id = owner_id or item.get('ownerId')
+            try:
+                latest = max(latest, int(item.get('version') or 0))
+            except (TypeError, ValueError):
+                logger.warning("[ARTICLE] 숫자가 아닌 version 무시: originId=%s, %s", origin_id, item.get('version'))
+        if 'LastEvaluatedKey' not in response:
+            break
+        kwargs['ExclusiveStartKey'] = response['LastEvaluatedKey']
+    return latest, owner_id
+
+def get_article_version(user_info, version_id, headers, prefetched=None):
     """
     특정 기사 버전 조회
+
+    prefetched: 핸들러가 사용자 조회와 동시에 시작한 _read_version (concurrency.Pending, 없으면 여기서 조회)
     """
     if not version_id:
         logger.warning("[ARTICLE] 버전 ID가 제공되지 않음")
@@ -341,18 +669,13 @@ def get_article_version(user_info, version_id, headers):
             'body': json.dumps({'error': '버전 ID가 필요합니다'})
         }
     
-    logger.info(f"[ARTICLE] 기사 버전 조회 시작: versionId(newsId)={version_id}")
+    logger.info("[ARTICLE] 기사 버전 조회 시작: versionId(newsId)=%s", version_id)
     
     try:
         # 기사 버전 조회
-        table = dynamodb.Table(ARTICLES_TABLE)
-        response = table.get_item(
-            Key={'newsId': version_id}
-        )
-        
-        article = response.get('Item')
+        article = prefetched.result() if prefetched is not None else _read_version(version_id)
         if not article:
-            logger.warning(f"[ARTICLE] 기사 버전 없음: versionId={version_id}")
+            logger.warning("[ARTICLE] 기사 버전 없음: versionId=%s", version_id)
             return {
                 'statusCode': 404,
                 'headers': headers,
@@ -368,8 +691,9 @@ def get_article_version(user_info, version_id, headers):
         # 기사 소유자 또는 관리자만 접근 허용
         if owner_id != requester_id and role != 'admin':
             logger.warning(
-                f"[ARTICLE] 권한 없음: 요청자={requester_id}, 소유자={owner_id}, " +
-                f"요청자역할={role}"
+                "[ARTICLE] 권한 없음: 요청자=%s, 소유자=%s, "
+                "요청자역할=%s",
+                requester_id, owner_id, role
             )
             return {
                 'statusCode': 403,
@@ -377,17 +701,29 @@ def get_article_version(user_info, version_id, headers):
                 'body': json.dumps({'error': '권한이 없습니다'})
             }
         
-        logger.info(f"[ARTICLE] 기사 버전 조회 성공: versionId={version_id}")
+        if article_archive.is_archived(article):
+            # S3 묶음으로 보관된 버전은 묶음에서 원래 항목 복원 (stub에도 ownerId가 있어 권한 확인은 먼저 함)
+            logger.info("[ARTICLE] 보관된 기사 버전 복원: versionId=%s, 묶음=%s", version_id, article.get('archiveKey'))
+            article = article_archive.resolve(article)
+            if not article:
+                logger.warning("[ARTICLE] 보관 묶음에 기사 버전 없음: versionId=%s", version_id)
+                return {
+                    'statusCode': 404,
+                    'headers': headers,
+                    'body': json.dumps({'error': '해당 기사 버전을 찾을 수 없습니다'})
+                }
+        
+        logger.info("[ARTICLE] 기사 버전 조회 성공: versionId=%s", version_id)
         
         return {
             'statusCode': 200,
             'headers': headers,
-            'body': json.dumps(article, default=str)
+            'body': responses.dumps(article)
         }
     except Exception as e:
-        logger.error(f"[ARTICLE] 기사 버전 조회 실패: {str(e)}", exc_info=True)
+        logger.error("[ARTICLE] 기사 버전 조회 실패: %s", e, exc_info=True)
         return {
             'statusCode': 500,
             'headers': headers,
             'body': json.dumps({'error': f'기사 버전 조회 실패: {str(e)}'})
-        }
\ No newline at end of file
+        }
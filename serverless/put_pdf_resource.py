@@ -1,17 +1,30 @@
+import init_profiler
+init_profiler.install()
+
 import json
 import os
-import boto3
 import logging
 import uuid
 from datetime import datetime, timezone
 
+import aws_clients
+import change_counters
+import changelog
+import common
+import concurrency
+import pdf_derivatives
+import prewarm
+import request_log
+import responses
+import search_index
+import template_files
+import template_retrieval
+import tracing
+from common import get_file_metadata, get_user_info
+
 # 로깅 설정 - CloudWatch에 로그 출력
 logger = logging.getLogger()
-logger.setLevel(logging.INFO)
-
-# AWS 서비스 클라이언트 초기화
-s3 = boto3.client('s3')
-dynamodb = boto3.resource('dynamodb')
+logger.setLevel(request_log.LOG_LEVEL)
 
 # 환경 변수
 PDF_BUCKET = os.environ['PDF_BUCKET']
@@ -19,50 +32,65 @@ USERS_TABLE = os.environ['USERS_TABLE']
 PDF_FILES_TABLE = os.environ['PDF_FILES_TABLE']
 URL_EXPIRATION = 3600  # 1시간
 
+# 자주 쓰는 사용자/템플릿 목록/파일 메타데이터를 컨테이너 캐시에 미리 읽어 둠 (PREWARM_ON_INIT=1일 때)
+prewarm.warm_on_init()
+
+@tracing.traced_handler('put_pdf_resource')
+@responses.compressed
 def lambda_handler(event, context):
     """
     AWS Lambda 핸들러 함수 - PUT, DELETE, POST 요청 처리
     """
     # 요청 정보 로깅
-    logger.info(f"[PUT] 수신된 이벤트: {json.dumps(event)}")
+    logger.debug("[PUT] 수신된 이벤트: %s", request_log.redacted(event))
     
     try:
         headers = {
             'Content-Type': 'application/json'
         }
 
+        # 예약 실행 warm 이벤트는 인증 없이 캐시만 다시 채움
+        if prewarm.is_warm_event(event):
+            return prewarm.handle(event, headers)
+
         # 요청에서 사용자 ID 가져오기
         user_id = event.get('headers', {}).get('authorization', '0')
-        logger.info(f"[PUT] 요청 사용자 ID: {user_id}")
-        
+        logger.info("[PUT] 요청 사용자 ID: %s", user_id)
+
+        # 쿼리 파라미터에서 액션 가져오기
+        query_params = event.get('queryStringParameters', {}) or {}
+
+        # HTTP 메서드에 따라 다른 처리
+        http_method = query_params.get('method', '')
+        action = query_params.get('action', '')
+
+        # 파일 조회/삭제는 메타데이터를 사용자 조회와 동시에 가져옴 (권한 확인은 두 결과가 모두 온 뒤)
+        # authorization 헤더가 없는 요청은 미리 읽지 않고, 401/403이면 읽은 메타데이터는 버림
+        prefetched = None
+        if action in ('getUploadedFile', 'deleteFile') and query_params.get('fileId') and user_id not in ('', '0'):
+            prefetched = concurrency.submit(get_file_metadata, query_params['fileId'])
+
         # 사용자 정보 가져오기
         user_info = get_user_info(user_id)
         if not user_info:
-            logger.warning(f"[PUT] 인증되지 않은 사용자: {user_id}")
+            logger.warning("[PUT] 인증되지 않은 사용자: %s", user_id)
             return {
                 'statusCode': 401,
                 'headers': headers,
                 'body': json.dumps({'error': '인증되지 않은 사용자입니다'})
             }
 
-        logger.info(f"[PUT] 사용자 정보: {json.dumps(user_info)}")
-        
-        # 쿼리 파라미터에서 액션 가져오기
-        query_params = event.get('queryStringParameters', {}) or {}
-
-        # HTTP 메서드에 따라 다른 처리
-        http_method = query_params.get('method', '')
-        action = query_params.get('action', '')
-        logger.info(f"[PUT] HTTP 메서드: {http_method}, 요청 액션: {action}")
+        logger.info("[PUT] 사용자 정보: %s", request_log.redacted(user_info))
+        logger.info("[PUT] HTTP 메서드: %s, 요청 액션: %s", http_method, action)
 
         # HTTP 메서드 및 액션에 따른 처리
         if http_method == 'GET':
             if action == 'getPresignedUrl':
                 return generate_presigned_url(user_info, query_params, headers)
             elif action == 'getUploadedFile':
-                return get_uploaded_file(user_info, query_params, headers)
+                return get_uploaded_file(user_info, query_params, headers, prefetched)
             else:
-                logger.warning(f"[PUT] 유효하지 않은 GET 액션: {action}")
+                logger.warning("[PUT] 유효하지 않은 GET 액션: %s", action)
                 return {
                     'statusCode': 400,
                     'headers': headers,
@@ -74,7 +102,7 @@ def lambda_handler(event, context):
                 body = json.loads(event.get('body', '{}'))
                 return save_file_metadata(user_info, body, headers)
             else:
-                logger.warning(f"[PUT] 유효하지 않은 POST 액션: {action}")
+                logger.warning("[PUT] 유효하지 않은 POST 액션: %s", action)
                 return {
                     'statusCode': 400,
                     'headers': headers,
@@ -82,16 +110,16 @@ def lambda_handler(event, context):
                 }
         elif http_method == 'DELETE':
             if action == 'deleteFile':
-                return delete_file(user_info, query_params, headers)
+                return delete_file(user_info, query_params, headers, prefetched)
             else:
-                logger.warning(f"[PUT] 유효하지 않은 DELETE 액션: {action}")
+                logger.warning("[PUT] 유효하지 않은 DELETE 액션: %s", action)
                 return {
                     'statusCode': 400,
                     'headers': headers,
                     'body': json.dumps({'error': '유효하지 않은 액션입니다'})
                 }
         else:
-            logger.warning(f"[PUT] 지원하지 않는 HTTP 메서드: {http_method}")
+            logger.warning("[PUT] 지원하지 않는 HTTP 메서드: %s", http_method)
             return {
                 'statusCode': 405,
                 'headers': headers,
@@ -99,7 +127,7 @@ def lambda_handler(event, context):
             }
 
     except Exception as e:
-        logger.error(f"[PUT] 오류 발생: {str(e)}", exc_info=True)
+        logger.error("[PUT] 오류 발생: %s", e, exc_info=True)
         return {
             'statusCode': 500,
             'headers': {
@@ -108,32 +136,8 @@ def lambda_handler(event, context):
             },
             'body': json.dumps({'error': f'서버 오류가 발생했습니다: {str(e)}'})
         }
-
-def get_user_info(user_id):
-    """
-    사용자 정보 가져오기
-    """
-    if user_id == '0':
-        logger.warning("[PUT] 사용자 ID가 0으로 설정됨")
-        return None
-
-    try:
-        logger.info(f"[PUT] 사용자 정보 조회 시작: {user_id}")
-        table = dynamodb.Table(USERS_TABLE)
-        response = table.get_item(
-            Key={'id': user_id}
-        )
-        
-        user = response.get('Item')
-        if user:
-            logger.info(f"[PUT] 사용자 정보 조회 성공: {user.get('id')}, 조직: {user.get('organization')}")
-        else:
-            logger.warning(f"[PUT] 사용자 정보 없음: {user_id}")
-            
-        return user
-    except Exception as e:
-        logger.error(f"[PUT] 사용자 정보 조회 오류: {str(e)}", exc_info=True)
-        return None
+    finally:
+        init_profiler.report_once('[PUT]')
 
 def generate_presigned_url(user_info, query_params, headers):
     """
@@ -153,7 +157,7 @@ def generate_presigned_url(user_info, query_params, headers):
             'body': json.dumps({'error': '파일 이름이 필요합니다'})
         }
     
-    logger.info(f"[PUT] Pre-signed URL 생성 시작: 파일명={file_name}, 타입={file_type}, 공개={is_public}")
+    logger.info("[PUT] Pre-signed URL 생성 시작: 파일명=%s, 타입=%s, 공개=%s", file_name, file_type, is_public)
     
     try:
         # 파일 ID 생성 (UUID)
@@ -163,7 +167,7 @@ def generate_presigned_url(user_info, query_params, headers):
         user_id = user_info.get('id', 'unknown')
         s3_key = f"{user_id}/{file_id}_{file_name}"
         
-        logger.info(f"[PUT] S3 키 생성: {s3_key}")
+        logger.info("[PUT] S3 키 생성: %s", s3_key)
         
         # 현재 시간 (ISO 형식)
         created_at = datetime.now(timezone.utc).isoformat()
@@ -179,20 +183,21 @@ def generate_presigned_url(user_info, query_params, headers):
             'createdAt': created_at
         }
         
-        logger.info(f"[PUT] 파일 메타데이터 생성: {json.dumps(file_metadata)}")
+        logger.info("[PUT] 파일 메타데이터 생성: %s", request_log.redacted(file_metadata))
         
         # S3 업로드용 pre-signed URL 생성
-        upload_url = s3.generate_presigned_url(
-            'put_object',
-            Params={
-                'Bucket': PDF_BUCKET,
-                'Key': s3_key,
-                'ContentType': 'application/pdf'
-            },
-            ExpiresIn=URL_EXPIRATION
-        )
+        with tracing.segment('S3.Presign'):
+            upload_url = aws_clients.s3().generate_presigned_url(
+                'put_object',
+                Params={
+                    'Bucket': PDF_BUCKET,
+                    'Key': s3_key,
+                    'ContentType': 'application/pdf'
+                },
+                ExpiresIn=URL_EXPIRATION
+            )
         
-        logger.info(f"[PUT] 업로드 URL 생성 성공: 만료시간={URL_EXPIRATION}초")
+        logger.info("[PUT] 업로드 URL 생성 성공: 만료시간=%s초", URL_EXPIRATION)
         
         return {
             'statusCode': 200,
@@ -203,7 +208,7 @@ def generate_presigned_url(user_info, query_params, headers):
             })
         }
     except Exception as e:
-        logger.error(f"[PUT] Pre-signed URL 생성 실패: {str(e)}", exc_info=True)
+        logger.error("[PUT] Pre-signed URL 생성 실패: %s", e, exc_info=True)
         return {
             'statusCode': 500,
             'headers': headers,
@@ -231,23 +236,51 @@ def save_file_metadata(user_info, file_metadata, headers):
             'body': json.dumps({'error': '파일 ID가 필요합니다'})
         }
     
-    logger.info(f"[PUT] 파일 메타데이터 저장 시작: fileId={file_id}")
+    logger.info("[PUT] 파일 메타데이터 저장 시작: fileId=%s", file_id)
     
     # 메타데이터에 사용자 ID와 조직 정보가 올바르게 설정되었는지 확인
     if file_metadata.get('ownerId') != user_info.get('id'):
-        logger.warning(f"[PUT] 요청자 ID와 메타데이터의 소유자 ID가 불일치: {user_info.get('id')} vs {file_metadata.get('ownerId')}")
+        logger.warning("[PUT] 요청자 ID와 메타데이터의 소유자 ID가 불일치: %s vs %s", user_info.get('id'), file_metadata.get('ownerId'))
         return {
             'statusCode': 403,
             'headers': headers,
             'body': json.dumps({'error': '권한이 없습니다'})
         }
     
+    # 파생본 정보는 서버에서만 기록 (다른 파일의 키를 가리키지 않도록)
+    file_metadata.pop('derivatives', None)
+
     try:
         # DynamoDB에 메타데이터 저장
-        table = dynamodb.Table(PDF_FILES_TABLE)
-        table.put_item(Item=file_metadata)
+        table = aws_clients.dynamodb().Table(PDF_FILES_TABLE)
+        with tracing.segment('PdfFilesTable.PutItem'):
+            previous = table.put_item(Item=file_metadata, ReturnValues='ALL_OLD').get('Attributes')
+        # 원본이 그대로면 PDF를 다시 읽지 않음 (구간은 메타데이터만 갱신, 파생본은 기존 값 유지)
+        source_changed = not previous or previous.get('s3Key') != file_metadata.get('s3Key')
         
-        logger.info(f"[PUT] 메타데이터 저장 성공: fileId={file_id}")
+        common.invalidate_file_metadata(file_id)
+        common.invalidate_organization_templates(file_metadata.get('organization', ''))
+        feed_key = change_counters.templates_key(file_metadata.get('organization', ''))
+        # 저장 뒤 갱신은 서로 독립이므로 동시에 보냄 (각각 실패해도 로그만 남김)
+        follow_ups = {
+            'changelog': lambda: changelog.record(feed_key, change_counters.bump(feed_key), 'put', file_id, {
+                'fileId': file_id,
+                'fileName': file_metadata.get('fileName', ''),
+                'description': file_metadata.get('description', ''),
+                'isPublic': file_metadata.get('isPublic', False),
+                'ownerId': file_metadata.get('ownerId', ''),
+                'createdAt': file_metadata.get('createdAt', '')
+            }),
+            'search': lambda: search_index.index_template(file_metadata),
+        }
+        if not source_changed:
+            follow_ups['passages'] = lambda: template_retrieval.update_template_meta(file_metadata)
+            if previous.get('derivatives'):
+                follow_ups['derivatives'] = lambda: pdf_derivatives.keep(file_id, previous['derivatives'])
+        else:
+            follow_ups['source'] = lambda: process_source(file_metadata)
+        concurrency.follow_up(follow_ups, '[PUT]')
+        logger.info("[PUT] 메타데이터 저장 성공: fileId=%s", file_id)
         
         return {
             'statusCode': 200,
@@ -255,100 +288,36 @@ def save_file_metadata(user_info, file_metadata, headers):
             'body': json.dumps({'success': True, 'fileId': file_id})
         }
     except Exception as e:
-        logger.error(f"[PUT] 메타데이터 저장 실패: {str(e)}", exc_info=True)
+        logger.error("[PUT] 메타데이터 저장 실패: %s", e, exc_info=True)
         return {
             'statusCode': 500,
             'headers': headers,
             'body': json.dumps({'error': f'메타데이터 저장 실패: {str(e)}'})
         }
 
-def get_uploaded_file(user_info, query_params, headers):
+def process_source(file_metadata):
     """
-    업로드된 파일에 대한 서명된 URL 생성 (get_template과 동일)
+    새 원본의 템플릿 구간 색인과 파생본 생성 - event 모드는 파생본 함수에 맡기고, 호출할 수 없으면 요청 안에서 처리
     """
-    file_id = query_params.get('fileId', '')
-    if not file_id:
-        logger.warning("[PUT] 파일 ID가 제공되지 않음")
-        return {
-            'statusCode': 400,
-            'headers': headers,
-            'body': json.dumps({'error': '파일 ID가 필요합니다'})
-        }
-    
-    logger.info(f"[PUT] 업로드된 파일 정보 조회 시작: fileId={file_id}")
-
-    # DynamoDB에서 파일 메타데이터 조회
-    file_metadata = get_file_metadata(file_id)
-    if not file_metadata:
-        logger.warning(f"[PUT] 파일 메타데이터 없음: fileId={file_id}")
-        return {
-            'statusCode': 404,
-            'headers': headers,
-            'body': json.dumps({'error': '파일을 찾을 수 없습니다'})
-        }
-    
-    logger.info(f"[PUT] 파일 메타데이터 조회 성공: fileName={file_metadata.get('fileName')}")
-
-    # 접근 권한 확인
-    if not can_access_file(user_info, file_metadata):
-        logger.warning(
-            f"[PUT] 파일 접근 권한 없음: 사용자={user_info.get('id')}, " +
-            f"파일소유자={file_metadata.get('ownerId')}, " +
-            f"공유={file_metadata.get('isPublic')}"
-        )
-        return {
-            'statusCode': 403,
-            'headers': headers,
-            'body': json.dumps({'error': '파일 접근 권한이 없습니다'})
-        }
-
-    # S3 키 가져오기
-    s3_key = file_metadata.get('s3Key', '')
-    logger.info(f"[PUT] S3 객체 조회 시작: 버킷={PDF_BUCKET}, 키={s3_key}")
-
-    # 파일이 존재하는지 확인
-    try:
-        s3.head_object(
-            Bucket=PDF_BUCKET,
-            Key=s3_key
-        )
-        logger.info(f"[PUT] S3 객체 존재 확인 성공: 키={s3_key}")
-    except Exception as e:
-        logger.error(f"[PUT] S3 객체 조회 실패: {str(e)}", exc_info=True)
-        return {
-            'statusCode': 404,
-            'headers': headers,
-            'body': json.dumps({'error': 'S3에서 파일을 찾을 수 없습니다'})
-        }
+    if pdf_derivatives.uses_event() and pdf_derivatives.trigger(file_metadata['fileId']):
+        return
+    # 원본은 한 번만 내려받아 구간 추출과 파생본 생성에 같이 씀
+    pdf_derivatives.process_source(file_metadata)
 
-    # 서명된 URL 생성
-    try:
-        url = s3.generate_presigned_url(
-            'get_object',
-            Params={
-                'Bucket': PDF_BUCKET,
-                'Key': s3_key
-            },
-            ExpiresIn=URL_EXPIRATION
-        )
-        logger.info(f"[PUT] 서명된 URL 생성 성공: 만료시간={URL_EXPIRATION}초")
-        
-        return {
-            'statusCode': 200,
-            'headers': headers,
-            'body': json.dumps({'url': url, 'metadata': file_metadata})
-        }
-    except Exception as e:
-        logger.error(f"[PUT] 서명된 URL 생성 실패: {str(e)}", exc_info=True)
-        return {
-            'statusCode': 500,
-            'headers': headers,
-            'body': json.dumps({'error': f'서명된 URL 생성 실패: {str(e)}'})
-        }
+def get_uploaded_file(user_info, query_params, headers, prefetched=None):
+    """
+    업로드된 파일에 대한 서명된 URL 생성 (getTemplate과 동일한 처리, template_files)
+    """
+    logger.info("[PUT] 업로드된 파일 조회: fileId=%s", query_params.get('fileId', ''))
+    return template_files.get_template(user_info, query_params, headers, prefetched)
 
-def delete_file(user_info, query_params, headers):
+def delete_file(user_info, query_params, headers, prefetched=None):
     """
     파일 삭제
+
+    원본/파생본 객체 삭제를 동시에 보내고, 둘 다 끝난 뒤 메타데이터를 삭제한다. 객체 삭제가 실패하면
+    메타데이터가 남아 다시 삭제를 요청할 수 있다. 메타데이터 삭제 뒤의 변경 기록/검색/구간 tombstone은
+    서로 독립이므로 동시에 보낸다 (각각 실패해도 로그만 남김).
     """
     file_id = query_params.get('fileId', '')
     if not file_id:
@@ -359,19 +328,19 @@ def delete_file(user_info, query_params, headers):
             'body': json.dumps({'error': '파일 ID가 필요합니다'})
         }
     
-    logger.info(f"[PUT] 파일 삭제 시작: fileId={file_id}")
+    logger.info("[PUT] 파일 삭제 시작: fileId=%s", file_id)
 
     # DynamoDB에서 파일 메타데이터 조회
-    file_metadata = get_file_metadata(file_id)
+    file_metadata = prefetched.result() if prefetched is not None else get_file_metadata(file_id)
     if not file_metadata:
-        logger.warning(f"[PUT] 파일 메타데이터 없음: fileId={file_id}")
+        logger.warning("[PUT] 파일 메타데이터 없음: fileId=%s", file_id)
         return {
             'statusCode': 404,
             'headers': headers,
             'body': json.dumps({'error': '파일을 찾을 수 없습니다'})
         }
     
-    logger.info(f"[PUT] 파일 메타데이터 조회 성공: fileName={file_metadata.get('fileName')}")
+    logger.info("[PUT] 파일 메타데이터 조회 성공: fileName=%s", file_metadata.get('fileName'))
 
     # 삭제 권한 확인 (파일 소유자 또는 관리자만 삭제 가능)
     user_id = user_info.get('id', '')
@@ -382,8 +351,9 @@ def delete_file(user_info, query_params, headers):
     
     if owner_id != user_id and (role != 'admin' or organization != file_org):
         logger.warning(
-            f"[PUT] 파일 삭제 권한 없음: 사용자={user_id}, 소유자={owner_id}, " +
-            f"사용자역할={role}, 사용자조직={organization}, 파일조직={file_org}"
+            "[PUT] 파일 삭제 권한 없음: 사용자=%s, 소유자=%s, "
+            "사용자역할=%s, 사용자조직=%s, 파일조직=%s",
+            user_id, owner_id, role, organization, file_org
         )
         return {
             'statusCode': 403,
@@ -394,21 +364,30 @@ def delete_file(user_info, query_params, headers):
     try:
         # S3 키 가져오기
         s3_key = file_metadata.get('s3Key', '')
-        logger.info(f"[PUT] S3 객체 삭제 시작: 버킷={PDF_BUCKET}, 키={s3_key}")
+        logger.info("[PUT] S3 객체 삭제 시작: 버킷=%s, 키=%s", PDF_BUCKET, s3_key)
 
-        # S3에서 파일 삭제
-        s3.delete_object(
-            Bucket=PDF_BUCKET,
-            Key=s3_key
-        )
-        logger.info(f"[PUT] S3 객체 삭제 성공: 키={s3_key}")
+        # S3에서 원본과 파생본 삭제 (원본 삭제가 실패하면 예외, 파생본은 로그만 남김)
+        concurrency.gather({
+            'original': lambda: _delete_object(s3_key),
+            'derivatives': lambda: pdf_derivatives.remove(file_metadata),
+        })
+        logger.info("[PUT] S3 객체 삭제 성공: 키=%s", s3_key)
 
         # DynamoDB에서 메타데이터 삭제
-        table = dynamodb.Table(PDF_FILES_TABLE)
-        table.delete_item(
-            Key={'fileId': file_id}
-        )
-        logger.info(f"[PUT] 메타데이터 삭제 성공: fileId={file_id}")
+        table = aws_clients.dynamodb().Table(PDF_FILES_TABLE)
+        with tracing.segment('PdfFilesTable.DeleteItem'):
+            table.delete_item(
+                Key={'fileId': file_id}
+            )
+        common.invalidate_file_metadata(file_id)
+        common.invalidate_organization_templates(file_org)
+        feed_key = change_counters.templates_key(file_org)
+        concurrency.follow_up({
+            'changelog': lambda: changelog.record(feed_key, change_counters.bump(feed_key), 'delete', file_id),
+            'search': lambda: search_index.remove_template(file_metadata),
+            'passages': lambda: template_retrieval.remove_template(file_metadata),
+        }, '[PUT]')
+        logger.info("[PUT] 메타데이터 삭제 성공: fileId=%s", file_id)
         
         return {
             'statusCode': 200,
@@ -416,67 +395,16 @@ def delete_file(user_info, query_params, headers):
             'body': json.dumps({'success': True, 'message': '파일이 성공적으로 삭제되었습니다'})
         }
     except Exception as e:
-        logger.error(f"[PUT] 파일 삭제 실패: {str(e)}", exc_info=True)
+        logger.error("[PUT] 파일 삭제 실패: %s", e, exc_info=True)
         return {
             'statusCode': 500,
             'headers': headers,
             'body': json.dumps({'error': f'파일 삭제 실패: {str(e)}'})
         }
 
-def get_file_metadata(file_id):
-    """
-    DynamoDB에서 파일 메타데이터 조회
-    """
-    try:
-        logger.info(f"[PUT] 파일 메타데이터 조회 시작: fileId={file_id}")
-        table = dynamodb.Table(PDF_FILES_TABLE)
-        response = table.get_item(
-            Key={'fileId': file_id}
+def _delete_object(s3_key):
+    with tracing.segment('S3.DeleteObject'):
+        aws_clients.s3().delete_object(
+            Bucket=PDF_BUCKET,
+            Key=s3_key
         )
-        
-        item = response.get('Item')
-        if item:
-            logger.info(f"[PUT] 파일 메타데이터 조회 성공: fileName={item.get('fileName')}")
-        else:
-            logger.warning(f"[PUT] 파일 메타데이터 없음: fileId={file_id}")
-            
-        return item
-    except Exception as e:
-        logger.error(f"[PUT] 파일 메타데이터 조회 오류: {str(e)}", exc_info=True)
-        return None
-
-def can_access_file(user_info, file_metadata):
-    """
-    파일 접근 권한 확인
-    """
-    user_id = user_info.get('id', '')
-    role = user_info.get('role', '')
-    organization = user_info.get('organization', '')
-    
-    owner_id = file_metadata.get('ownerId', '')
-    file_org = file_metadata.get('organization', '')
-    is_public = file_metadata.get('isPublic', False)
-    
-    logger.info(
-        f"[PUT] 파일 접근 권한 확인: 사용자={user_id}, 소유자={owner_id}, " +
-        f"사용자조직={organization}, 파일조직={file_org}, " +
-        f"사용자역할={role}, 공유={is_public}"
-    )
-    
-    # 1. 파일 소유자인 경우
-    if owner_id == user_id:
-        logger.info(f"[PUT] 파일 접근 권한 있음 (소유자): 사용자={user_id}")
-        return True
-
-    # 2. 관리자이고 같은 조직의 파일인 경우
-    if role == 'admin' and file_org == organization:
-        logger.info(f"[PUT] 파일 접근 권한 있음 (관리자): 사용자={user_id}, 조직={organization}")
-        return True
-
-    # 3. 같은 조직이고 파일이 공개(isPublic)된 경우
-    if file_org == organization and is_public:
-        logger.info(f"[PUT] 파일 접근 권한 있음 (공유): 사용자={user_id}, 조직={organization}")
-        return True
-
-    logger.warning(f"[PUT] 파일 접근 권한 없음: 사용자={user_id}")
-    return False
\ No newline at end of file
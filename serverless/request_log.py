@@ -0,0 +1,136 @@
+"""
+요청 경로용 저비용 로깅 설정
+
+- 로그 레벨과 액션별 샘플링 비율을 환경 변수로 설정
+- 샘플링되지 않은 요청은 WARNING 이상만 출력 (INFO/DEBUG 호출은 포맷팅 없이 버려짐)
+- 이벤트/사용자 정보 등 큰 객체는 redacted()로 감싸서 넘기면 실제로 출력될 때만
+  길이 제한과 민감 정보 마스킹을 적용하여 직렬화
+- 요청 요약은 tracing이 요청당 한 줄로 출력
+
+환경 변수
+    LOG_LEVEL               기본 로그 레벨 (기본 INFO)
+    LOG_SAMPLE_RATES        액션별 INFO 로그 샘플링 비율 (예: "listTemplates=0.01,getTemplate=0.1,*=1")
+    LOG_MAX_FIELD_CHARS     로그에 남길 문자열 필드 최대 길이 (기본 200)
+    LOG_LIBRARY_LEVEL       boto3/botocore/urllib3 로그 레벨 (기본 WARNING)
+"""
+import json
+import logging
+import os
+import random
+
+LOG_LEVEL = logging.getLevelName(os.environ.get('LOG_LEVEL', 'INFO').upper())
+if not isinstance(LOG_LEVEL, int):
+    LOG_LEVEL = logging.INFO
+
+# 라이브러리 로그는 루트 로거 레벨과 관계없이 별도 레벨 적용
+for _library in ('boto3', 'botocore', 'urllib3'):
+    logging.getLogger(_library).setLevel(os.environ.get('LOG_LIBRARY_LEVEL', 'WARNING').upper())
+
+MAX_FIELD_CHARS = int(os.environ.get('LOG_MAX_FIELD_CHARS', '200'))
+
+# 값 전체를 마스킹할 키 (소문자 비교)
+REDACTED_KEYS = {'authorization', 'password', 'token', 'cookie', 'x-api-key'}
+
+# 큰 본문이 들어가는 키 - 길이만 남김
+SIZE_ONLY_KEYS = {'body', 'content', 'prompt', 'output'}
+
+
+def _parse_sample_rates(value):
+    rates = {}
+    for part in (value or '').split(','):
+        if '=' not in part:
+            continue
+        action, rate = part.split('=', 1)
+        try:
+            rates[action.strip()] = min(max(float(rate), 0.0), 1.0)
+        except ValueError:
+            continue
+    return rates
+
+
+SAMPLE_RATES = _parse_sample_rates(os.environ.get('LOG_SAMPLE_RATES', ''))
+
+
+def sample_rate(action):
+    """
+    액션의 INFO 로그 샘플링 비율
+    """
+    return SAMPLE_RATES.get(action, SAMPLE_RATES.get('*', 1.0))
+
+
+def begin(action):
+    """
+    요청 시작 - 샘플링 여부에 따라 루트 로거 레벨 설정, 샘플링 여부 반환
+    """
+    rate = sample_rate(action)
+    sampled = rate >= 1.0 or (rate > 0.0 and random.random() < rate)
+    level = LOG_LEVEL if sampled else max(LOG_LEVEL, logging.WARNING)
+    logging.getLogger().setLevel(level)
+    return sampled
+
+
+def end():
+    """
+    요청 종료 - 루트 로거 레벨 복원
+    """
+    logging.getLogger().setLevel(LOG_LEVEL)
+
+
+def _cap(value):
+    if isinstance(value, str) and len(value) > MAX_FIELD_CHARS:
+        return f"{value[:MAX_FIELD_CHARS]}...(+{len(value) - MAX_FIELD_CHARS}자)"
+    return value
+
+
+def scrub(value, depth=0):
+    """
+    민감 정보 마스킹과 길이 제한을 적용한 사본
+    """
+    if depth > 4:
+        return '...'
+    if isinstance(value, dict):
+        result = {}
+        for key, item in value.items():
+            lowered = str(key).lower()
+            if lowered in REDACTED_KEYS:
+                result[key] = '***'
+            elif lowered in SIZE_ONLY_KEYS and isinstance(item, str):
+                result[key] = f"<{len(item)}자>"
+            else:
+                result[key] = scrub(item, depth + 1)
+        return result
+    if isinstance(value, (list, tuple)):
+        items = [scrub(item, depth + 1) for item in value[:10]]
+        if len(value) > 10:
+            items.append(f"...(+{len(value) - 10}개)")
+        return items
+    return _cap(value)
+
+
+class redacted:
+    """
+    로그 인자용 지연 직렬화 래퍼 - 로그가 실제로 출력될 때만 마스킹/직렬화
+    """
+    __slots__ = ('value',)
+
+    def __init__(self, value):
+        self.value = value
+
+    def __str__(self):
+        return json.dumps(scrub(self.value), ensure_ascii=False, default=str)
+
+
+def event_summary(event):
+    """
+    요약 로그에 넣을 요청 정보 (본문은 크기만)
+    """
+    query_params = event.get('queryStringParameters') or {}
+    body = event.get('body') or ''
+    summary = {
+        'method': query_params.get('method', ''),
+        'bodyChars': len(body),
+    }
+    path_parameters = event.get('pathParameters') or {}
+    if path_parameters:
+        summary['path'] = scrub(path_parameters)
+    return summary
@@ -0,0 +1,130 @@
+"""
+Lambda 프록시 응답 본문 인코딩 공용 함수
+
+- dumps(): 한글을 \\uXXXX로 이스케이프하지 않는 UTF-8 JSON (DynamoDB 타입 변환은 serialization)
+- compressed: 핸들러 데코레이터. 요청의 Accept-Encoding이 br/gzip을 허용하고 본문이
+  기준 크기 이상이면 압축 후 base64로 인코딩하고 isBase64Encoded를 설정한다.
+  brotli 모듈이 없으면 gzip만 사용한다.
+
+API Gateway REST API(v1)에서 압축 응답을 내보내려면 binaryMediaTypes에 */*를 등록해야 한다.
+HTTP API와 Lambda 함수 URL은 isBase64Encoded 응답을 그대로 디코딩해서 전달한다.
+
+환경 변수
+    RESPONSE_COMPRESSION_MIN_BYTES  압축할 최소 본문 크기 (기본 1024, 0이면 압축 안 함)
+    RESPONSE_GZIP_LEVEL             gzip 압축 레벨 (기본 6)
+    RESPONSE_BROTLI_QUALITY         brotli 압축 품질 (기본 5)
+"""
+import base64
+import functools
+import gzip
+import os
+
+import serialization
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+COMPRESSION_MIN_BYTES = int(os.environ.get('RESPONSE_COMPRESSION_MIN_BYTES', '1024'))
+GZIP_LEVEL = int(os.environ.get('RESPONSE_GZIP_LEVEL', '6'))
+BROTLI_QUALITY = int(os.environ.get('RESPONSE_BROTLI_QUALITY', '5'))
+
+
+def dumps(payload):
+    """
+    응답 본문용 JSON 문자열 (ASCII 이스케이프 없음)
+    """
+    return serialization.dumps(payload)
+
+
+def _header(headers, name):
+    for key, value in (headers or {}).items():
+        if key.lower() == name:
+            return value or ''
+    return ''
+
+
+def accepted_encodings(request_headers):
+    """
+    Accept-Encoding에서 허용된 인코딩 집합 (q=0 제외)
+    """
+    accepted = set()
+    for part in _header(request_headers, 'accept-encoding').split(','):
+        name, _, params = part.strip().partition(';')
+        name = name.strip().lower()
+        if not name:
+            continue
+        quality = 1.0
+        params = params.strip()
+        if params.startswith('q='):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        if quality > 0:
+            accepted.add(name)
+    return accepted
+
+
+def choose_encoding(request_headers):
+    """
+    사용할 압축 방식 (br 우선, 허용되지 않으면 None)
+    """
+    accepted = accepted_encodings(request_headers)
+    if brotli is not None and ('br' in accepted or '*' in accepted):
+        return 'br'
+    if 'gzip' in accepted or '*' in accepted:
+        return 'gzip'
+    return None
+
+
+def compress(data, encoding):
+    if encoding == 'br':
+        return brotli.compress(data, quality=BROTLI_QUALITY)
+    return gzip.compress(data, compresslevel=GZIP_LEVEL, mtime=0)
+
+
+def encode(response, request_headers):
+    """
+    프록시 응답 본문을 조건에 맞으면 압축 (이미 base64인 응답과 작은 본문은 그대로)
+    """
+    body = response.get('body')
+    if not isinstance(body, str) or response.get('isBase64Encoded') or COMPRESSION_MIN_BYTES <= 0:
+        return response
+
+    data = body.encode('utf-8')
+    if len(data) < COMPRESSION_MIN_BYTES:
+        return response
+
+    headers = dict(response.get('headers') or {})
+    headers['Vary'] = 'Accept-Encoding'
+    encoding = choose_encoding(request_headers)
+    if encoding is None:
+        return dict(response, headers=headers)
+
+    compressed = compress(data, encoding)
+    if len(compressed) >= len(data):
+        return dict(response, headers=headers)
+
+    headers['Content-Encoding'] = encoding
+    return dict(
+        response,
+        headers=headers,
+        body=base64.b64encode(compressed).decode('ascii'),
+        isBase64Encoded=True
+    )
+
+
+def compressed(handler):
+    """
+    핸들러 응답 압축 데코레이터 (tracing.traced_handler 안쪽에 적용)
+    """
+    @functools.wraps(handler)
+    def wrapper(event, context):
+        response = handler(event, context)
+        if not isinstance(response, dict):
+            return response
+        return encode(response, (event or {}).get('headers') or {})
+
+    return wrapper
@@ -0,0 +1,117 @@
+"""
+통합 Lambda 진입점 (선택 사항)
+
+네 개로 나뉜 함수(get_pdf_list, put_pdf_resource, put_article, text_ai_api)를
+하나의 함수로 배포할 때 사용하는 핸들러. method + action 기준 라우팅 테이블로
+기존 핸들러를 그대로 호출하므로 응답 형식은 개별 함수와 같고, 하나의 웜 컨테이너와
+컨테이너 캐시(common의 사용자/파일 메타데이터 캐시, AWS 클라이언트)를 모든 액션이 공유한다.
+
+기존 개별 함수 배포도 그대로 동작한다. EventBridge 예약 실행 warm 이벤트(prewarm.is_warm_event)는 prewarm으로 처리한다.
+
+    핸들러 설정: router.lambda_handler
+"""
+import init_profiler
+init_profiler.install()
+
+import importlib
+import json
+import logging
+
+import prewarm
+import request_log
+
+# 로깅 설정 - CloudWatch에 로그 출력
+logger = logging.getLogger()
+logger.setLevel(request_log.LOG_LEVEL)
+
+# 라우팅 대상 모듈은 나중에 import되므로 캐시 미리 채우기는 여기서 한 번 실행 (PREWARM_ON_INIT=1일 때)
+prewarm.warm_on_init()
+
+# (HTTP 메서드, 액션) -> 처리 모듈
+ROUTES = {
+    ('GET', 'listTemplates'): 'get_pdf_list',
+    ('GET', 'listTemplateChanges'): 'get_pdf_list',
+    ('GET', 'getTemplate'): 'get_pdf_list',
+    ('GET', 'getUploadedFile'): 'get_pdf_list',
+    ('GET', 'search'): 'get_pdf_list',
+    ('GET', 'recommendTemplates'): 'get_pdf_list',
+    ('GET', 'getUsage'): 'get_pdf_list',
+    ('GET', 'getPresignedUrl'): 'put_pdf_resource',
+    ('POST', 'saveFileMetadata'): 'put_pdf_resource',
+    ('DELETE', 'deleteFile'): 'put_pdf_resource',
+    ('POST', 'saveArticle'): 'put_article',
+    ('GET', '/articles/user/{ownerId}'): 'put_article',
+    ('GET', '/articles/user/{ownerId}/changes'): 'put_article',
+    ('GET', '/articles/org/{organization}'): 'put_article',
+    ('GET', '/articles/stats/{ownerId}'): 'put_article',
+    ('GET', '/articles/stats/org/{organization}'): 'put_article',
+    ('GET', '/articles/{originId}/version'): 'put_article',
+    ('GET', '/articles/version/{versionId}'): 'put_article',
+    ('POST', 'generate'): 'text_ai_api',
+}
+
+# 모듈은 해당 액션이 처음 요청될 때 import
+_modules = {}
+
+
+def resolve_method(event):
+    """
+    쿼리 파라미터 method, 없으면 요청 컨텍스트의 HTTP 메서드
+    """
+    query_params = event.get('queryStringParameters') or {}
+    method = query_params.get('method', '')
+    if not method:
+        request_context = event.get('requestContext') or {}
+        method = (request_context.get('http') or {}).get('method', '') or event.get('httpMethod', '')
+    return (method or 'GET').upper()
+
+
+def resolve_route(event):
+    """
+    이벤트에서 (메서드, 액션) 키 계산
+    """
+    query_params = event.get('queryStringParameters') or {}
+    method = resolve_method(event)
+    action = query_params.get('action', '')
+    if not action and method == 'POST':
+        # text_ai_api는 액션 없이 프롬프트 본문만 받음
+        action = 'generate'
+    return method, action
+
+
+def _module(name):
+    module = _modules.get(name)
+    if module is None:
+        module = importlib.import_module(name)
+        _modules[name] = module
+    return module
+
+
+def lambda_handler(event, context):
+    """
+    통합 Lambda 핸들러 - 라우팅 테이블에 따라 기존 핸들러 호출
+    """
+    event = event or {}
+    if prewarm.is_warm_event(event):
+        # 예약 실행 warm 이벤트는 캐시를 채우는 get_pdf_list로 전달 (인증 없음)
+        return _module('get_pdf_list').lambda_handler(event, context)
+    method, action = resolve_route(event)
+    module_name = ROUTES.get((method, action))
+
+    if module_name is None:
+        logger.warning("[ROUTER] 지원하지 않는 요청: %s %s", method, action)
+        return {
+            'statusCode': 400,
+            'headers': {'Content-Type': 'application/json'},
+            'body': json.dumps({'error': '지원하지 않는 요청입니다'})
+        }
+
+    # 개별 핸들러가 쿼리 파라미터의 method를 기준으로 분기하므로 채워서 전달
+    query_params = dict(event.get('queryStringParameters') or {})
+    query_params.setdefault('method', method)
+    if module_name != 'text_ai_api':
+        query_params.setdefault('action', action)
+    event = dict(event, queryStringParameters=query_params)
+
+    logger.info("[ROUTER] %s %s -> %s", method, action, module_name)
+    return _module(module_name).lambda_handler(event, context)
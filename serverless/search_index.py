@@ -0,0 +1,459 @@
+"""
+기사/템플릿 전문 검색 - 한국어 문자 bigram 역색인
+
+저장 구조 (SEARCH_INDEX_TABLE, 파티션 키 organization, 정렬 키 docId, GSI SeqIndex(organization, seq))
+    문서 하나당 항목 하나: docId = article#{originId} 또는 template#{fileId}
+    terms   : 'term\\ttf\\n...'를 zlib으로 압축한 Binary
+    seq     : 조직 검색 카운터(change_counters.search_key) 값, 삭제는 deleted=True 항목(tombstone)으로 기록
+
+컨테이너는 조직별 InvertedIndex를 캐시해 두고, 검색 요청마다 카운터 한 건을 읽어
+바뀐 경우에만 SeqIndex로 이후 변경분(seq > 캐시 버전 - SYNC_OVERLAP)을 읽어 반영한다.
+카운터 증가와 문서 기록 사이의 경합으로 빠진 항목이 있어도 겹쳐 읽는 구간에서 다시 반영된다.
+
+환경 변수
+    SEARCH_INDEX_TABLE          검색 문서 테이블 (기본 SearchIndex)
+    SEARCH_MAX_CHARS            문서당 색인할 최대 글자 수 (기본 2000)
+    SEARCH_INDEX_CACHE_SIZE     컨테이너에 보관할 조직 색인 수 (기본 8)
+    SEARCH_INDEX_TTL            조직 색인 보관 시간(초, 기본 3600)
+"""
+import heapq
+import json
+import logging
+import math
+import os
+import re
+import threading
+import unicodedata
+import zlib
+from array import array
+from collections import Counter
+from datetime import datetime, timezone
+
+import aws_clients
+import change_counters
+import tracing
+from cache import TTLCache
+
+logger = logging.getLogger()
+
+SEARCH_INDEX_TABLE = os.environ.get('SEARCH_INDEX_TABLE', 'SearchIndex')
+MAX_CHARS = int(os.environ.get('SEARCH_MAX_CHARS', '2000'))
+SYNC_OVERLAP = 20
+
+# BM25 매개변수
+K1 = 1.2
+B = 0.75
+
+# 한글/한자/가나 연속 구간은 bigram, 그 외 영숫자 연속 구간은 단어 단위
+_CJK = r'ᄀ-ᇿ㄰-㆏가-힣぀-ヿ一-鿿'
+_RUN = re.compile(rf'[{_CJK}]+|[^\W{_CJK}_]+')
+_CJK_RUN = re.compile(rf'[{_CJK}]')
+
+# 순번(상위 24비트) + tf(하위 8비트)를 uint32 하나에 저장
+_TF_BITS = 8
+_TF_MAX = (1 << _TF_BITS) - 1
+_MAX_ORDINAL = (1 << (32 - _TF_BITS)) - 1
+
+index_cache = TTLCache(
+    'searchIndex',
+    maxsize=int(os.environ.get('SEARCH_INDEX_CACHE_SIZE', '8')),
+    ttl=float(os.environ.get('SEARCH_INDEX_TTL', '3600'))
+)
+_sync_lock = threading.Lock()
+
+
+def tokenize(text):
+    """
+    검색어/문서 토큰 목록 - 한글은 문자 bigram(한 글자 구간은 그대로), 영숫자는 소문자 단어
+    """
+    text = unicodedata.normalize('NFKC', text or '').lower()
+    tokens = []
+    for run in _RUN.findall(text):
+        if _CJK_RUN.match(run):
+            if len(run) == 1:
+                tokens.append(run)
+            else:
+                tokens.extend(run[index:index + 2] for index in range(len(run) - 1))
+        else:
+            tokens.append(run)
+    return tokens
+
+
+def encode_terms(terms):
+    return zlib.compress('\n'.join(f"{term}\t{tf}" for term, tf in terms.items()).encode('utf-8'))
+
+
+def decode_terms(data):
+    data = bytes(getattr(data, 'value', data))
+    terms = {}
+    for line in zlib.decompress(data).decode('utf-8').split('\n'):
+        if line:
+            term, _, tf = line.partition('\t')
+            terms[term] = int(tf)
+    return terms
+
+
+class InvertedIndex:
+    """
+    조직 하나의 메모리 역색인 (term -> array('I') 포스팅, BM25 순위)
+    """
+
+    def __init__(self):
+        self.postings = {}
+        self.ordinals = {}
+        self.docs = []
+        self.lengths = array('I')
+        self.doc_seq = {}
+        self.total_length = 0
+        self.removed = 0
+        self.version = 0
+        # 권한 필터용 보조 색인 (작성자별 순번, 공개 템플릿 순번)
+        self.by_owner = {}
+        self.public_templates = set()
+        self._norms = None
+
+    def __len__(self):
+        return len(self.ordinals)
+
+    def add(self, doc_id, terms, meta):
+        self.remove(doc_id)
+        if len(self.docs) > _MAX_ORDINAL:
+            self.compact()
+        ordinal = len(self.docs)
+        length = sum(terms.values())
+        self.ordinals[doc_id] = ordinal
+        self.docs.append(dict(meta, docId=doc_id))
+        self.lengths.append(length)
+        self.total_length += length
+        self._add_facets(ordinal, meta)
+        self._norms = None
+        for term, tf in terms.items():
+            posting = self.postings.get(term)
+            if posting is None:
+                posting = self.postings[term] = array('I')
+            posting.append(ordinal << _TF_BITS | min(tf, _TF_MAX))
+
+    def _add_facets(self, ordinal, meta):
+        self.by_owner.setdefault(meta.get('ownerId', ''), set()).add(ordinal)
+        if meta.get('kind') == 'template' and meta.get('isPublic'):
+            self.public_templates.add(ordinal)
+
+    def remove(self, doc_id):
+        ordinal = self.ordinals.pop(doc_id, None)
+        if ordinal is None:
+            return
+        meta = self.docs[ordinal]
+        self.by_owner.get(meta.get('ownerId', ''), set()).discard(ordinal)
+        self.public_templates.discard(ordinal)
+        self.docs[ordinal] = None
+        self.total_length -= self.lengths[ordinal]
+        self.removed += 1
+        self._norms = None
+        if self.removed > 1000 and self.removed > len(self.ordinals) // 4:
+            self.compact()
+
+    def compact(self):
+        """
+        삭제된 문서의 포스팅 제거와 순번 재배치
+        """
+        remap = {}
+        docs = []
+        lengths = array('I')
+        for ordinal, meta in enumerate(self.docs):
+            if meta is not None:
+                remap[ordinal] = len(docs)
+                docs.append(meta)
+                lengths.append(self.lengths[ordinal])
+        postings = {}
+        for term, posting in self.postings.items():
+            kept = array('I', (
+                remap[packed >> _TF_BITS] << _TF_BITS | (packed & _TF_MAX)
+                for packed in posting if (packed >> _TF_BITS) in remap
+            ))
+            if kept:
+                postings[term] = kept
+        self.postings = postings
+        self.docs = docs
+        self.lengths = lengths
+        self.ordinals = {meta['docId']: ordinal for ordinal, meta in enumerate(docs)}
+        self.by_owner = {}
+        self.public_templates = set()
+        for ordinal, meta in enumerate(docs):
+            self._add_facets(ordinal, meta)
+        self.removed = 0
+        self._norms = None
+
+    def _doc_norms(self):
+        """
+        문서별 BM25 길이 보정값 (문서가 바뀐 뒤 첫 검색에서 다시 계산)
+        """
+        if self._norms is None:
+            average_length = max(self.total_length / max(len(self.ordinals), 1), 1.0)
+            self._norms = array('d', (
+                K1 * (1.0 - B + B * length / average_length) for length in self.lengths
+            ))
+        return self._norms
+
+    def owned_or_public(self, owner_id):
+        """
+        작성자 본인 문서와 공개 템플릿 순번 집합 (일반 사용자 검색 범위)
+        """
+        return self.by_owner.get(owner_id, set()) | self.public_templates
+
+    def apply(self, item):
+        """
+        검색 문서 항목(또는 tombstone) 반영 - 이미 반영한 seq 이하는 무시
+        """
+        doc_id = item['docId']
+        seq = int(item.get('seq', 0))
+        if seq and seq <= self.doc_seq.get(doc_id, 0):
+            return False
+        self.doc_seq[doc_id] = seq
+        if item.get('deleted'):
+            self.remove(doc_id)
+        else:
+            meta = {
+                'kind': item.get('kind', ''),
+                'title': item.get('title', ''),
+                'ownerId': item.get('ownerId', ''),
+                'isPublic': bool(item.get('isPublic', False)),
+                'createdAt': item.get('createdAt', ''),
+            }
+            self.add(doc_id, decode_terms(item['terms']), meta)
+        return True
+
+    def search(self, query, accept=None, offset=0, limit=20, allowed=None):
+        """
+        (조건에 맞는 전체 결과 수, [(점수, 문서 메타데이터)]) - BM25 점수 내림차순
+
+        allowed(순번 집합)가 있으면 그 문서만 점수를 계산하고, accept는 점수가 계산된 문서에 적용한다.
+        """
+        query_terms = set(tokenize(query))
+        live = len(self.ordinals)
+        if not query_terms or not live or allowed is not None and not allowed:
+            return 0, []
+        norms = self._doc_norms()
+        docs = self.docs
+
+        scores = {}
+        for term in query_terms:
+            posting = self.postings.get(term)
+            if not posting:
+                continue
+            frequency = len(posting)
+            weight = math.log(1.0 + (live - frequency + 0.5) / (frequency + 0.5)) * (K1 + 1.0)
+            if allowed is not None:
+                for packed in posting:
+                    ordinal = packed >> _TF_BITS
+                    if ordinal in allowed:
+                        tf = packed & _TF_MAX
+                        scores[ordinal] = scores.get(ordinal, 0.0) + weight * tf / (tf + norms[ordinal])
+            else:
+                for packed in posting:
+                    ordinal = packed >> _TF_BITS
+                    if docs[ordinal] is not None:
+                        tf = packed & _TF_MAX
+                        scores[ordinal] = scores.get(ordinal, 0.0) + weight * tf / (tf + norms[ordinal])
+
+        if accept is not None:
+            scores = {ordinal: score for ordinal, score in scores.items() if accept(self.docs[ordinal])}
+        ranked = heapq.nlargest(offset + limit, scores.items(), key=lambda entry: (entry[1], -entry[0]))
+        return len(scores), [(score, self.docs[ordinal]) for ordinal, score in ranked[offset:]]
+
+
+def _table():
+    return aws_clients.dynamodb().Table(SEARCH_INDEX_TABLE)
+
+
+def index_document(organization, doc_id, kind, text, title='', owner_id='', is_public=False, created_at=''):
+    """
+    검색 문서 기록 - 실패해도 원래 쓰기 요청은 성공으로 처리하고 로그만 남김
+    """
+    try:
+        terms = Counter(tokenize((text or '')[:MAX_CHARS]))
+        seq = change_counters.bump(change_counters.search_key(organization))
+        with tracing.segment('SearchIndexTable.PutItem'):
+            _table().put_item(Item={
+                'organization': organization,
+                'docId': doc_id,
+                'kind': kind,
+                'seq': seq or 0,
+                'title': title[:200],
+                'ownerId': owner_id,
+                'isPublic': is_public,
+                'createdAt': created_at,
+                'terms': encode_terms(terms),
+                'updatedAt': datetime.now(timezone.utc).isoformat()
+            })
+        logger.info("[SEARCH] 검색 문서 기록: 조직=%s, docId=%s, 토큰=%s", organization, doc_id, len(terms))
+    except Exception as e:
+        logger.error("[SEARCH] 검색 문서 기록 실패: %s, %s", doc_id, e, exc_info=True)
+
+
+def remove_document(organization, doc_id):
+    """
+    검색 문서 삭제 (다른 컨테이너가 알 수 있도록 tombstone으로 기록)
+    """
+    try:
+        seq = change_counters.bump(change_counters.search_key(organization))
+        with tracing.segment('SearchIndexTable.PutItem'):
+            _table().put_item(Item={
+                'organization': organization,
+                'docId': doc_id,
+                'seq': seq or 0,
+                'deleted': True,
+                'updatedAt': datetime.now(timezone.utc).isoformat()
+            })
+        logger.info("[SEARCH] 검색 문서 삭제: 조직=%s, docId=%s", organization, doc_id)
+    except Exception as e:
+        logger.error("[SEARCH] 검색 문서 삭제 실패: %s, %s", doc_id, e, exc_info=True)
+
+
+def article_title(article):
+    """
+    기사 제목 - description(JSON)의 title, 없으면 본문 앞부분
+    """
+    description = article.get('description') or ''
+    if isinstance(description, str) and description.startswith('{'):
+        try:
+            title = json.loads(description).get('title')
+            if title:
+                return str(title)
+        except (ValueError, AttributeError):
+            pass
+    return (article.get('content') or '')[:40]
+
+
+def index_article(organization, article):
+    title = article_title(article)
+    index_document(
+        organization,
+        f"article#{article.get('originId') or article.get('newsId')}",
+        'article',
+        f"{title}\n{article.get('content', '')}",
+        title=title,
+        owner_id=article.get('ownerId', ''),
+        created_at=article.get('createdAt', '')
+    )
+
+
+def index_template(file_metadata):
+    index_document(
+        file_metadata.get('organization', ''),
+        f"template#{file_metadata.get('fileId')}",
+        'template',
+        f"{file_metadata.get('fileName', '')}\n{file_metadata.get('description', '')}",
+        title=file_metadata.get('fileName', ''),
+        owner_id=file_metadata.get('ownerId', ''),
+        is_public=bool(file_metadata.get('isPublic', False)),
+        created_at=file_metadata.get('createdAt', '')
+    )
+
+
+def remove_template(file_metadata):
+    remove_document(file_metadata.get('organization', ''), f"template#{file_metadata.get('fileId')}")
+
+
+def _query_items(organization, min_seq=None, table_name=SEARCH_INDEX_TABLE, segment='SearchIndexTable'):
+    """
+    조직 파티션의 문서 전체 또는 min_seq 초과 변경분 (모든 페이지)
+    """
+    kwargs = {
+        'ExpressionAttributeNames': {'#org': 'organization'},
+        'ExpressionAttributeValues': {':org': organization},
+    }
+    if min_seq is None:
+        kwargs['KeyConditionExpression'] = '#org = :org'
+    else:
+        kwargs['IndexName'] = 'SeqIndex'
+        kwargs['KeyConditionExpression'] = '#org = :org AND #seq > :seq'
+        kwargs['ExpressionAttributeNames']['#seq'] = 'seq'
+        kwargs['ExpressionAttributeValues'][':seq'] = min_seq
+
+    table = aws_clients.dynamodb().Table(table_name)
+    while True:
+        with tracing.segment(f'{segment}.Query'):
+            response = table.query(**kwargs)
+        yield from response.get('Items', [])
+        if 'LastEvaluatedKey' not in response:
+            return
+        kwargs['ExclusiveStartKey'] = response['LastEvaluatedKey']
+
+
+def sync_index(organization, cache, counter_id, table_name, factory, segment):
+    """
+    카운터 기준으로 최신 상태까지 동기화한 조직 색인 (search_index, template_retrieval 공용)
+
+    캐시에 없으면 파티션 전체를 읽고, 카운터가 캐시 버전보다 크면 SeqIndex로 변경분만 읽는다.
+    """
+    version = change_counters.current(counter_id)
+    with _sync_lock:
+        index = cache.get(organization)
+        if index is not None and version is not None and index.version >= version:
+            return index
+
+        if index is None:
+            index = factory()
+            items = _query_items(organization, None, table_name, segment)
+            logger.info("[SEARCH] 조직 색인 생성: %s, 조직=%s", table_name, organization)
+        else:
+            items = _query_items(organization, max(index.version - SYNC_OVERLAP, 0), table_name, segment)
+            logger.info("[SEARCH] 조직 색인 갱신: %s, 조직=%s, %s -> %s", table_name, organization, index.version, version)
+
+        applied = 0
+        max_seq = index.version
+        for item in items:
+            applied += 1 if index.apply(item) else 0
+            max_seq = max(max_seq, int(item.get('seq', 0)))
+        index.version = version if version is not None else max_seq
+        cache.put(organization, index)
+        logger.info("[SEARCH] 색인 반영: %s, 조직=%s, 반영=%s, 문서=%s", table_name, organization, applied, len(index))
+        return index
+
+
+def organization_index(organization):
+    """
+    최신 상태로 동기화한 조직 검색 색인 (컨테이너 캐시 사용)
+    """
+    return sync_index(
+        organization, index_cache, change_counters.search_key(organization),
+        SEARCH_INDEX_TABLE, InvertedIndex, 'SearchIndexTable'
+    )
+
+
+def can_view(user_info, meta):
+    """
+    검색 결과 노출 여부 - 기사는 작성자/관리자, 템플릿은 list_templates와 같은 기준
+    """
+    user_id = user_info.get('id', '')
+    if user_info.get('role', '') == 'admin' or meta.get('ownerId') == user_id:
+        return True
+    return meta.get('kind') == 'template' and meta.get('isPublic', False)
+
+
+def search(user_info, query, kind='', offset=0, limit=20):
+    """
+    요청자 조직에서 검색 - (전체 결과 수, 결과 목록)
+    """
+    index = organization_index(user_info.get('organization', ''))
+
+    def accept(meta):
+        return (not kind or meta.get('kind') == kind) and can_view(user_info, meta)
+
+    allowed = None
+    if user_info.get('role', '') != 'admin':
+        allowed = index.owned_or_public(user_info.get('id', ''))
+
+    with tracing.segment('SearchIndex.Rank'):
+        total, ranked = index.search(query, accept if kind else None, offset, limit, allowed)
+    results = []
+    for score, meta in ranked:
+        results.append({
+            'kind': meta['kind'],
+            'id': meta['docId'].split('#', 1)[1],
+            'title': meta.get('title', ''),
+            'isOwner': meta.get('ownerId') == user_info.get('id', ''),
+            'createdAt': meta.get('createdAt', ''),
+            'score': round(score, 4),
+        })
+    return total, results
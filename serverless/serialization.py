@@ -0,0 +1,116 @@
+"""
+DynamoDB 항목용 JSON 직렬화
+
+boto3 리소스가 돌려주는 Decimal과 set을 JSON 타입으로 한 번에 변환한다.
+    Decimal -> 정수이면 int, 아니면 float
+    set     -> 정렬된 list
+    bytes   -> base64 문자열 (Binary 속성)
+    datetime/date -> ISO 8601 문자열
+
+orjson이 설치되어 있으면 orjson으로 직렬화하고, 없으면 표준 json 모듈로 변환 후 직렬화한다.
+큰 배열은 iter_array()로 항목 단위로 인코딩하여 변환된 전체 사본을 만들지 않는다.
+
+환경 변수
+    JSON_BACKEND            auto(기본, orjson 있으면 사용) 또는 stdlib
+    JSON_STREAM_MIN_ITEMS   항목 단위로 인코딩할 최소 배열 길이 (기본 500)
+"""
+import base64
+import json
+import os
+from datetime import date, datetime
+from decimal import Decimal
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+BACKEND = os.environ.get('JSON_BACKEND', 'auto').lower()
+STREAM_MIN_ITEMS = int(os.environ.get('JSON_STREAM_MIN_ITEMS', '500'))
+
+
+def _number(value):
+    if value == value.to_integral_value():
+        return int(value)
+    return float(value)
+
+
+def _sorted_list(value):
+    items = [to_json_types(item) for item in value]
+    try:
+        return sorted(items)
+    except TypeError:
+        return items
+
+
+def to_json_types(value):
+    """
+    DynamoDB 값을 JSON 직렬화 가능한 값으로 변환한 사본 (재귀 1회)
+    """
+    if isinstance(value, dict):
+        return {key: to_json_types(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [to_json_types(item) for item in value]
+    if isinstance(value, (str, bool, int, float)) or value is None:
+        return value
+    if isinstance(value, Decimal):
+        return _number(value)
+    if isinstance(value, (set, frozenset, tuple)):
+        return _sorted_list(value)
+    if isinstance(value, (bytes, bytearray)):
+        return base64.b64encode(bytes(value)).decode('ascii')
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    # boto3 Binary 등 value 속성을 가진 래퍼
+    inner = getattr(value, 'value', None)
+    if isinstance(inner, (bytes, bytearray)):
+        return base64.b64encode(bytes(inner)).decode('ascii')
+    return str(value)
+
+
+def _orjson_default(value):
+    if isinstance(value, Decimal):
+        return _number(value)
+    if isinstance(value, (set, frozenset)):
+        return _sorted_list(value)
+    return to_json_types(value)
+
+
+def use_orjson():
+    return orjson is not None and BACKEND != 'stdlib'
+
+
+def dumps_stdlib(value):
+    return json.dumps(to_json_types(value), ensure_ascii=False, separators=(',', ':'))
+
+
+def dumps_orjson(value):
+    try:
+        return orjson.dumps(value, default=_orjson_default).decode('utf-8')
+    except orjson.JSONEncodeError:
+        # 64비트 범위를 넘는 정수 등 orjson이 처리하지 못하는 값
+        return dumps_stdlib(value)
+
+
+def iter_array(items, encode=None):
+    """
+    배열을 항목 단위로 인코딩한 문자열 조각 생성
+    """
+    encode = encode or (dumps_orjson if use_orjson() else dumps_stdlib)
+    yield '['
+    for index, item in enumerate(items):
+        if index:
+            yield ','
+        yield encode(item)
+    yield ']'
+
+
+def dumps(value):
+    """
+    DynamoDB 값을 JSON 문자열로 직렬화 (ASCII 이스케이프 없음)
+    """
+    if isinstance(value, list) and len(value) >= STREAM_MIN_ITEMS:
+        return ''.join(iter_array(value))
+    if use_orjson():
+        return dumps_orjson(value)
+    return dumps_stdlib(value)
@@ -0,0 +1,140 @@
+"""
+템플릿 파일 서명된 URL 조회 - getTemplate(get_pdf_list)과 getUploadedFile(get_pdf_list, put_pdf_resource) 공용
+
+요청한 파생본(pdf_derivatives)이 있으면 그 객체를, 없으면 원본을 서명된 URL로 돌려준다.
+핸들러 모듈끼리 서로 import하지 않도록 조회 처리만 따로 둔 것.
+
+환경 변수
+    PDF_BUCKET      PDF 버킷
+"""
+import json
+import logging
+import os
+
+import aws_clients
+import pdf_derivatives
+import responses
+import tracing
+from common import can_access_file, get_file_metadata
+
+logger = logging.getLogger()
+
+PDF_BUCKET = os.environ.get('PDF_BUCKET', '')
+URL_EXPIRATION = 3600  # 1시간
+
+
+def get_template(user_info, query_params, headers, prefetched=None):
+    """
+    템플릿 파일(또는 요청한 파생본)에 대한 서명된 URL 생성
+
+    prefetched: 핸들러가 사용자 조회와 동시에 시작한 메타데이터 조회 (concurrency.Pending, 없으면 여기서 조회)
+    """
+    file_id = query_params.get('fileId', '')
+    if not file_id:
+        logger.warning("[GET] 파일 ID가 제공되지 않음")
+        return {
+            'statusCode': 400,
+            'headers': headers,
+            'body': json.dumps({'error': '파일 ID가 필요합니다'})
+        }
+    
+    logger.info("[GET] 템플릿 정보 조회 시작: fileId=%s", file_id)
+
+    # DynamoDB에서 파일 메타데이터 조회
+    file_metadata = prefetched.result() if prefetched is not None else get_file_metadata(file_id)
+    if not file_metadata:
+        logger.warning("[GET] 파일 메타데이터 없음: fileId=%s", file_id)
+        return {
+            'statusCode': 404,
+            'headers': headers,
+            'body': json.dumps({'error': '파일을 찾을 수 없습니다'})
+        }
+    
+    logger.info("[GET] 파일 메타데이터 조회 성공: fileName=%s", file_metadata.get('fileName'))
+
+    # 접근 권한 확인
+    if not can_access_file(user_info, file_metadata):
+        logger.warning(
+            "[GET] 파일 접근 권한 없음: 사용자=%s, "
+            "파일소유자=%s, "
+            "공유=%s",
+            user_info.get('id'), file_metadata.get('ownerId'), file_metadata.get('isPublic')
+        )
+        return {
+            'statusCode': 403,
+            'headers': headers,
+            'body': json.dumps({'error': '파일 접근 권한이 없습니다'})
+        }
+
+    # 요청한 파생본 (derivative: original/optimized/preview/pages, pages: 3 또는 1-3)
+    try:
+        kind = query_params.get('derivative') or 'original'
+        if kind not in pdf_derivatives.KINDS:
+            raise ValueError(kind)
+        pages = pdf_derivatives.parse_pages(query_params.get('pages'))
+        served, objects = pdf_derivatives.resolve(file_metadata, kind, pages)
+    except ValueError:
+        logger.warning("[GET] 잘못된 파생본 요청: derivative=%s, pages=%s",
+                       query_params.get('derivative'), query_params.get('pages'))
+        return {
+            'statusCode': 400,
+            'headers': headers,
+            'body': json.dumps({'error': '파생본 종류나 페이지 범위가 올바르지 않습니다'})
+        }
+    if served != kind:
+        logger.info("[GET] 파생본 없음, 원본으로 대체: fileId=%s, 요청=%s", file_id, kind)
+
+    # 원본은 파일이 존재하는지 확인 (파생본은 생성 시 메타데이터에 기록된 것만 사용)
+    if served == 'original':
+        s3_key = objects[0][1]
+        logger.info("[GET] S3 객체 조회 시작: 버킷=%s, 키=%s", PDF_BUCKET, s3_key)
+        try:
+            with tracing.segment('S3.HeadObject'):
+                aws_clients.s3().head_object(
+                    Bucket=PDF_BUCKET,
+                    Key=s3_key
+                )
+            logger.info("[GET] S3 객체 존재 확인 성공: 키=%s", s3_key)
+        except Exception as e:
+            logger.error("[GET] S3 객체 조회 실패: %s", e, exc_info=True)
+            return {
+                'statusCode': 404,
+                'headers': headers,
+                'body': json.dumps({'error': 'S3에서 파일을 찾을 수 없습니다'})
+            }
+
+    # 서명된 URL 생성
+    try:
+        urls = []
+        with tracing.segment('S3.Presign'):
+            for page, s3_key, content_type in objects:
+                urls.append((page, aws_clients.s3().generate_presigned_url(
+                    'get_object',
+                    Params={
+                        'Bucket': PDF_BUCKET,
+                        'Key': s3_key
+                    },
+                    ExpiresIn=URL_EXPIRATION
+                )))
+        logger.info("[GET] 서명된 URL 생성 성공: 파생본=%s, %s개, 만료시간=%s초", served, len(urls), URL_EXPIRATION)
+
+        result = {
+            'url': urls[0][1],
+            'metadata': file_metadata,
+            'derivative': served,
+            'contentType': objects[0][2],
+        }
+        if served == 'pages':
+            result['pages'] = [{'page': page, 'url': url} for page, url in urls]
+        return {
+            'statusCode': 200,
+            'headers': headers,
+            'body': responses.dumps(result)
+        }
+    except Exception as e:
+        logger.error("[GET] 서명된 URL 생성 실패: %s", e, exc_info=True)
+        return {
+            'statusCode': 500,
+            'headers': headers,
+            'body': json.dumps({'error': f'서명된 URL 생성 실패: {str(e)}'})
+        }
@@ -0,0 +1,365 @@
+"""
+조직 템플릿 구간(passage) 검색 - 기사 생성 요청에 맞는 형식 예시 자동 선택
+
+업로드된 PDF 템플릿의 텍스트를 추출해 PASSAGE_CHARS 크기의 구간으로 나누고, 구간별 용어 빈도를
+TEMPLATE_PASSAGES_TABLE에 템플릿 하나당 항목 하나로 기록한다. 텍스트 추출은 파생본과 같은 업로드 처리
+단계(pdf_derivatives.process_source)에서 하고, saveFileMetadata는 원본(s3Key)이 그대로면 제목/공개 여부만
+갱신한다(update_template_meta). 삭제는 deleteFile에서 기록한다.
+컨테이너는 search_index와 같은 방식(passages#{organization} 카운터 + SeqIndex 변경분)으로
+조직별 구간 색인을 캐시하고, 생성 요청의 사업명/업체명/핵심 키워드로 BM25(TF-IDF 계열) 점수가
+높은 구간만 골라 프롬프트에 넣는다.
+
+PDF 텍스트 추출은 pypdf가 있을 때만 하고(Lambda 레이어), 없거나 추출에 실패하면
+파일 이름과 설명만 색인한다.
+
+저장 구조 (파티션 키 organization, 정렬 키 docId = fileId, GSI SeqIndex(organization, seq))
+    passages : [[구간 텍스트, {용어: 빈도}], ...] JSON을 zlib으로 압축한 Binary
+    삭제는 deleted=True 항목(tombstone)으로 기록
+
+환경 변수
+    TEMPLATE_PASSAGES_TABLE     템플릿 구간 테이블 (기본 TemplatePassages)
+    TEMPLATE_MAX_BYTES          텍스트를 추출할 최대 PDF 크기 (기본 20MB)
+    TEMPLATE_MAX_PAGES          텍스트를 추출할 최대 페이지 수 (기본 20)
+    TEMPLATE_MAX_CHARS          템플릿당 색인할 최대 글자 수 (기본 30000)
+    PASSAGE_CHARS               구간 크기(글자, 기본 600)
+    PASSAGE_TOP_K               생성 요청에 넣을 구간 수 (기본 3)
+    PASSAGE_PROMPT_CHARS        프롬프트에 넣을 예시 최대 글자 수 (기본 3000)
+    PASSAGE_CACHE_SIZE          컨테이너에 보관할 조직 색인 수 (기본 8)
+    PASSAGE_CACHE_TTL           조직 색인 보관 시간(초, 기본 3600)
+"""
+import io
+import json
+import logging
+import os
+import re
+import zlib
+from collections import Counter
+from datetime import datetime, timezone
+
+import aws_clients
+import change_counters
+import search_index
+import tracing
+from cache import TTLCache
+
+logger = logging.getLogger()
+
+TEMPLATE_PASSAGES_TABLE = os.environ.get('TEMPLATE_PASSAGES_TABLE', 'TemplatePassages')
+MAX_BYTES = int(os.environ.get('TEMPLATE_MAX_BYTES', str(20 * 1024 * 1024)))
+MAX_PAGES = int(os.environ.get('TEMPLATE_MAX_PAGES', '20'))
+MAX_CHARS = int(os.environ.get('TEMPLATE_MAX_CHARS', '30000'))
+PASSAGE_CHARS = int(os.environ.get('PASSAGE_CHARS', '600'))
+TOP_K = int(os.environ.get('PASSAGE_TOP_K', '3'))
+PROMPT_CHARS = int(os.environ.get('PASSAGE_PROMPT_CHARS', '3000'))
+
+# 검색어로 쓰는 생성 요청 항목
+QUERY_FIELDS = ('project', 'company', 'keywords')
+# 한 템플릿에서 고를 최대 구간 수 (같은 템플릿 구간만 채워지지 않도록)
+PER_TEMPLATE = 2
+
+_PARAGRAPH = re.compile(r'\n\s*\n')
+_SENTENCE = re.compile(r'(?<=[.!?。])\s+')
+
+passage_cache = TTLCache(
+    'templatePassages',
+    maxsize=int(os.environ.get('PASSAGE_CACHE_SIZE', '8')),
+    ttl=float(os.environ.get('PASSAGE_CACHE_TTL', '3600'))
+)
+
+
+def _pdf_reader():
+    # text_ai_api 콜드 스타트에 포함되지 않도록 처음 추출할 때 import
+    try:
+        from pypdf import PdfReader
+    except ImportError:
+        return None
+    return PdfReader
+
+
+def extract_text(data):
+    """
+    PDF 본문 텍스트 (pypdf가 없으면 빈 문자열)
+    """
+    reader_class = _pdf_reader()
+    if reader_class is None:
+        return ''
+    reader = reader_class(io.BytesIO(data))
+    pages = []
+    length = 0
+    for page in reader.pages[:MAX_PAGES]:
+        text = page.extract_text() or ''
+        pages.append(text)
+        length += len(text)
+        if length >= MAX_CHARS:
+            break
+    return '\n\n'.join(pages)[:MAX_CHARS]
+
+
+def split_passages(text, size=PASSAGE_CHARS):
+    """
+    문단 경계 기준으로 size 글자 이하 구간 목록 (긴 문단은 문장, 그래도 길면 글자 수로 자름)
+    """
+    passages = []
+    current = ''
+    for paragraph in _PARAGRAPH.split(text or ''):
+        paragraph = ' '.join(paragraph.split())
+        if not paragraph:
+            continue
+        separator = '\n'
+        for piece in ([paragraph] if len(paragraph) <= size else _SENTENCE.split(paragraph)):
+            while len(piece) > size:
+                if current:
+                    passages.append(current)
+                    current = ''
+                passages.append(piece[:size])
+                piece = piece[size:]
+            if not piece:
+                continue
+            if current and len(current) + 1 + len(piece) > size:
+                passages.append(current)
+                current = piece
+            else:
+                current = f"{current}{separator}{piece}" if current else piece
+            separator = ' '
+    if current:
+        passages.append(current)
+    return passages
+
+
+def encode_passages(passages):
+    entries = [[text, Counter(search_index.tokenize(text))] for text in passages]
+    return zlib.compress(json.dumps(entries, ensure_ascii=False, separators=(',', ':')).encode('utf-8'))
+
+
+def decode_passages(data):
+    data = bytes(getattr(data, 'value', data))
+    return json.loads(zlib.decompress(data).decode('utf-8'))
+
+
+class PassageIndex(search_index.InvertedIndex):
+    """
+    조직 하나의 템플릿 구간 색인 - 항목(템플릿) 하나를 구간 여러 개로 펼쳐 색인
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.passage_ids = {}
+
+    def apply(self, item):
+        file_id = item['docId']
+        seq = int(item.get('seq', 0))
+        if seq and seq <= self.doc_seq.get(file_id, 0):
+            return False
+        self.doc_seq[file_id] = seq
+        for passage_id in self.passage_ids.pop(file_id, ()):
+            self.remove(passage_id)
+        if item.get('deleted'):
+            return True
+
+        meta = {
+            'kind': 'template',
+            'fileId': file_id,
+            'title': item.get('title', ''),
+            'ownerId': item.get('ownerId', ''),
+            'isPublic': bool(item.get('isPublic', False)),
+            'createdAt': item.get('createdAt', ''),
+        }
+        passage_ids = []
+        for number, (text, terms) in enumerate(decode_passages(item['passages'])):
+            passage_id = f"{file_id}#{number}"
+            self.add(passage_id, terms, dict(meta, passage=number, text=text))
+            passage_ids.append(passage_id)
+        self.passage_ids[file_id] = passage_ids
+        return True
+
+
+def _table():
+    return aws_clients.dynamodb().Table(TEMPLATE_PASSAGES_TABLE)
+
+
+def _template_text(file_metadata, data=None):
+    """
+    S3의 템플릿 PDF 텍스트 (추출할 수 없으면 빈 문자열)
+
+    data: 이미 읽은 원본 바이트 (pdf_derivatives.process_source, 없으면 여기서 읽음)
+    """
+    s3_key = file_metadata.get('s3Key', '')
+    if not s3_key:
+        return ''
+    try:
+        if data is None:
+            with tracing.segment('S3.GetObject'):
+                response = aws_clients.s3().get_object(Bucket=os.environ.get('PDF_BUCKET', ''), Key=s3_key)
+                if response.get('ContentLength', 0) > MAX_BYTES:
+                    logger.warning("[PASSAGE] 템플릿이 너무 커서 본문 추출 생략: %s, %s bytes", s3_key, response['ContentLength'])
+                    return ''
+                data = response['Body'].read()
+        if not data or len(data) > MAX_BYTES:
+            return ''
+        with tracing.segment('Template.ExtractText'):
+            return extract_text(data)
+    except Exception as e:
+        logger.warning("[PASSAGE] 템플릿 본문 추출 실패: %s, %s", s3_key, e)
+        return ''
+
+
+def index_template(file_metadata, data=None):
+    """
+    템플릿 구간 기록 - 실패해도 원래 쓰기 요청은 성공으로 처리하고 로그만 남김
+    """
+    organization = file_metadata.get('organization', '')
+    file_id = file_metadata.get('fileId')
+    try:
+        text = _template_text(file_metadata, data)
+        source = 'pdf' if text.strip() else 'metadata'
+        if source == 'metadata':
+            text = f"{file_metadata.get('fileName', '')}\n\n{file_metadata.get('description', '')}"
+        passages = split_passages(text)
+        seq = change_counters.bump(change_counters.passages_key(organization))
+        with tracing.segment('TemplatePassagesTable.PutItem'):
+            _table().put_item(Item={
+                'organization': organization,
+                'docId': file_id,
+                'seq': seq or 0,
+                'title': file_metadata.get('fileName', '')[:200],
+                'ownerId': file_metadata.get('ownerId', ''),
+                'isPublic': bool(file_metadata.get('isPublic', False)),
+                'createdAt': file_metadata.get('createdAt', ''),
+                'source': source,
+                'passageCount': len(passages),
+                'passages': encode_passages(passages),
+                'updatedAt': datetime.now(timezone.utc).isoformat()
+            })
+        logger.info("[PASSAGE] 템플릿 구간 기록: 조직=%s, fileId=%s, 구간=%s, 출처=%s", organization, file_id, len(passages), source)
+    except Exception as e:
+        logger.error("[PASSAGE] 템플릿 구간 기록 실패: %s, %s", file_id, e, exc_info=True)
+
+
+def update_template_meta(file_metadata):
+    """
+    원본이 그대로인 템플릿의 구간 항목 메타데이터(제목, 공개 여부)만 갱신 - PDF를 다시 읽지 않음
+
+    아직 색인되지 않은 템플릿이면 아무것도 하지 않는다 (업로드 처리 단계에서 색인).
+    """
+    organization = file_metadata.get('organization', '')
+    file_id = file_metadata.get('fileId')
+    try:
+        seq = change_counters.bump(change_counters.passages_key(organization))
+        with tracing.segment('TemplatePassagesTable.UpdateItem'):
+            _table().update_item(
+                Key={'organization': organization, 'docId': file_id},
+                UpdateExpression='SET seq = :seq, title = :title, ownerId = :owner, isPublic = :public, updatedAt = :now',
+                ConditionExpression='attribute_exists(docId) AND attribute_not_exists(deleted)',
+                ExpressionAttributeValues={
+                    ':seq': seq or 0,
+                    ':title': file_metadata.get('fileName', '')[:200],
+                    ':owner': file_metadata.get('ownerId', ''),
+                    ':public': bool(file_metadata.get('isPublic', False)),
+                    ':now': datetime.now(timezone.utc).isoformat(),
+                }
+            )
+        logger.info("[PASSAGE] 템플릿 구간 메타데이터 갱신: 조직=%s, fileId=%s", organization, file_id)
+    except Exception as e:
+        if aws_clients.error_code(e) != 'ConditionalCheckFailedException':
+            logger.error("[PASSAGE] 템플릿 구간 메타데이터 갱신 실패: %s, %s", file_id, e, exc_info=True)
+            return
+        logger.info("[PASSAGE] 색인되지 않은 템플릿, 메타데이터 갱신 생략: fileId=%s", file_id)
+
+
+def remove_template(file_metadata):
+    """
+    템플릿 구간 삭제 (tombstone)
+    """
+    organization = file_metadata.get('organization', '')
+    file_id = file_metadata.get('fileId')
+    try:
+        seq = change_counters.bump(change_counters.passages_key(organization))
+        with tracing.segment('TemplatePassagesTable.PutItem'):
+            _table().put_item(Item={
+                'organization': organization,
+                'docId': file_id,
+                'seq': seq or 0,
+                'deleted': True,
+                'updatedAt': datetime.now(timezone.utc).isoformat()
+            })
+        logger.info("[PASSAGE] 템플릿 구간 삭제: 조직=%s, fileId=%s", organization, file_id)
+    except Exception as e:
+        logger.error("[PASSAGE] 템플릿 구간 삭제 실패: %s, %s", file_id, e, exc_info=True)
+
+
+def organization_index(organization):
+    """
+    최신 상태로 동기화한 조직 구간 색인 (컨테이너 캐시 사용)
+    """
+    return search_index.sync_index(
+        organization, passage_cache, change_counters.passages_key(organization),
+        TEMPLATE_PASSAGES_TABLE, PassageIndex, 'TemplatePassagesTable'
+    )
+
+
+def fields_query(fields):
+    """
+    생성 요청 항목(사업명, 업체명, 핵심 키워드)으로 만든 검색어
+    """
+    return ' '.join(str(fields.get(name) or '') for name in QUERY_FIELDS).strip()
+
+
+def retrieve(user_info, query, k=TOP_K):
+    """
+    요청자가 볼 수 있는 조직 템플릿에서 점수가 높은 구간 k개 (템플릿당 최대 PER_TEMPLATE개)
+    """
+    index = organization_index(user_info.get('organization', ''))
+    allowed = None
+    if user_info.get('role', '') != 'admin':
+        allowed = index.owned_or_public(user_info.get('id', ''))
+
+    with tracing.segment('TemplatePassages.Rank'):
+        _, ranked = index.search(query, None, 0, k * PER_TEMPLATE * 2, allowed)
+    results = []
+    per_template = Counter()
+    for score, meta in ranked:
+        if per_template[meta['fileId']] >= PER_TEMPLATE:
+            continue
+        per_template[meta['fileId']] += 1
+        results.append({
+            'fileId': meta['fileId'],
+            'fileName': meta.get('title', ''),
+            'passage': meta['passage'],
+            'text': meta['text'],
+            'score': round(score, 4),
+        })
+        if len(results) >= k:
+            break
+    logger.info("[PASSAGE] 구간 검색: 조직=%s, 결과=%s", user_info.get('organization', ''), len(results))
+    return results
+
+
+def rank_templates(passages):
+    """
+    구간 결과를 템플릿별로 묶은 목록 (가장 높은 구간 점수 순)
+    """
+    templates = {}
+    for passage in passages:
+        template = templates.setdefault(passage['fileId'], {
+            'fileId': passage['fileId'],
+            'fileName': passage['fileName'],
+            'score': passage['score'],
+            'passages': [],
+        })
+        template['passages'].append({'passage': passage['passage'], 'text': passage['text'], 'score': passage['score']})
+    return list(templates.values())
+
+
+def prompt_context(passages, max_chars=PROMPT_CHARS):
+    """
+    프롬프트에 넣을 형식 예시 문자열 (점수 순으로 max_chars까지)
+    """
+    parts = []
+    length = 0
+    for passage in passages:
+        text = passage['text'][:max(max_chars - length, 0)]
+        if not text:
+            break
+        parts.append(f"[{passage['fileName']}]\n{text}")
+        length += len(text)
+    return '\n\n'.join(parts)
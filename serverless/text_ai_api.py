@@ -1,69 +1,316 @@
+import init_profiler
+init_profiler.install()
+
 import json
-import boto3
+import logging
+import time
+import uuid
+from datetime import datetime, timezone
+
+import change_counters
+import common
+import drafts
+import generation
+import prewarm
+import request_log
+import responses
+import template_retrieval
+import tracing
+import usage_meter
+
+# 로깅 설정 - CloudWatch에 로그 출력
+logger = logging.getLogger()
+logger.setLevel(request_log.LOG_LEVEL)
+
+# Lambda 남은 시간 중 응답 반환에 남겨 둘 시간(초) - 이 시간 안으로는 이어 쓰기를 시작하지 않음
+RESPONSE_MARGIN = 3.0
+
+# 프롬프트 없이 생성 요청 항목만 보낸 경우 사용하는 프롬프트 (App.js의 기사 생성 프롬프트와 같은 형식)
+# 템플릿 예시는 같은 항목으로 다시 생성할 때 프롬프트 캐시를 읽도록 context(system 블록)로 분리
+FIELDS_CONTEXT = """형식 참고 예시: {examples}"""
+FIELDS_PROMPT = """
+다음 정보를 바탕으로 기사를 작성해주세요:
+기관/조직: {organization}
+사업명: {project}
+업체명: {company}
+핵심 키워드: {keywords}
+추가 내용: {additional}
+최종 결과물은 한글로 1000자 이상이어야한다
+"""
+
+
+def build_prompt(user_info, request_body):
+    """
+    생성 요청 항목(project, company, keywords)으로 조직 템플릿 구간을 검색해 만든 프롬프트, context, 사용한 구간
+    """
+    passages = template_retrieval.retrieve(user_info, template_retrieval.fields_query(request_body))
+    context = FIELDS_CONTEXT.format(examples=template_retrieval.prompt_context(passages))
+    prompt = FIELDS_PROMPT.format(
+        organization=request_body.get("organization") or user_info.get("organization", ""),
+        project=request_body.get("project", ""),
+        company=request_body.get("company", ""),
+        keywords=request_body.get("keywords", ""),
+        additional=request_body.get("additional", ""),
+    )
+    return prompt, context, passages
+
+
+def deadline(context):
+    """
+    이어 쓰기 시작 한도 (time.monotonic 기준, 컨텍스트가 없으면 None)
+    """
+    remaining = getattr(context, "get_remaining_time_in_millis", None)
+    if remaining is None:
+        return None
+    return time.monotonic() + remaining() / 1000.0 - RESPONSE_MARGIN
+
+
+def resolve_save(user_info, options):
+    """
+    요청 본문 save 검증과 저장할 ID/버전 결정 - (저장 옵션, 오류 응답) 중 하나는 None
+
+    newsId는 항상 서버에서 새로 만든다. originId를 주면 ArticleIdIndex에서 그 기사의 가장 큰 version N을
+    읽고, 기사별 버전 카운터(change_counters.reserve)로 N+1 이상인 번호를 원자적으로 잡는다.
+    동시에 같은 기사를 생성하거나 write-behind 큐에 아직 반영되지 않은 저장이 있어도 번호가 겹치지 않는다.
+    version을 함께 주면 잡은 번호와 같아야 하고(다르면 409), 다른 사용자의 기사에는 관리자만 이어 저장할 수 있다.
+    """
+    # 기사 저장 모듈(변경 기록, 검색 색인, 통계, write-behind)은 저장 요청에서만 불러옴 (생성 요청 콜드 스타트)
+    import put_article
 
-# Bedrock runtime
-bedrock_runtime = boto3.client(
-    service_name="bedrock-runtime", region_name="ap-northeast-2"
-)
+    options = dict(options) if isinstance(options, dict) else {}
 
+    def error(status, message):
+        return None, {
+            "statusCode": status,
+            "body": json.dumps({"message": message}, ensure_ascii=False)
+        }
+
+    requested = options.get("version")
+    if requested is not None:
+        try:
+            requested = int(requested)
+        except (TypeError, ValueError):
+            return error(400, "save.version은 숫자여야 합니다.")
+
+    news_id = str(uuid.uuid4())
+    origin_id = str(options.get("originId") or news_id)
+    if origin_id == news_id:
+        latest = 0
+    else:
+        latest, owner_id = put_article.latest_version(origin_id)
+        if not latest:
+            logger.warning("[AI] 이어 저장할 기사 없음: originId=%s", origin_id)
+            return error(404, "이어 저장할 기사를 찾을 수 없습니다.")
+        if owner_id != user_info.get("id") and user_info.get("role") != "admin":
+            logger.warning("[AI] 다른 사용자의 기사에 저장 요청: originId=%s, 소유자=%s", origin_id, owner_id)
+            return error(403, "권한이 없습니다.")
+    version = change_counters.reserve(change_counters.versions_key(origin_id), latest + 1)
+    if requested is not None and requested != version:
+        logger.warning("[AI] 저장 버전 불일치: originId=%s, 요청=%s, 다음 버전=%s", origin_id, requested, version)
+        return error(409, f"다음 버전은 {version}입니다.")
+
+    options.update(newsId=news_id, originId=origin_id, version=str(version))
+    return options, None
+
+
+def save_generated(user_info, options, result):
+    """
+    생성한 기사를 put_article.save_article과 같은 경로로 저장 (조직 기록, 통계, 변경 기록, 검색 색인, write-behind)
+
+    options: resolve_save가 정한 저장 옵션 (newsId, originId, version, description)
+    저장한 ID를 돌려주고, 저장에 실패해도 생성 결과는 그대로 응답하도록 error만 담아 돌려줌
+    """
+    news_id = options["newsId"]
+    origin_id = options["originId"]
+    article = {
+        "newsId": news_id,
+        "originId": origin_id,
+        "ownerId": str(user_info.get("id")),
+        "version": options["version"],
+        "createdAt": datetime.now(timezone.utc).isoformat(),
+        "content": result["output"],
+        "description": options.get("description", {}),
+        "usage": {
+            "inputTokens": result["input_tokens"],
+            "outputTokens": result["output_tokens"],
+            "cacheReadInputTokens": result["cache_read_input_tokens"],
+            "cacheCreationInputTokens": result["cache_creation_input_tokens"],
+        },
+    }
+    if result.get("model"):
+        article["model"] = result["model"]
+
+    import put_article
+
+    response = put_article.save_article(user_info, article, {"Content-Type": "application/json"}, create_only=True)
+    body = json.loads(response["body"])
+    if response["statusCode"] >= 300:
+        logger.warning("[AI] 생성 기사 저장 실패: newsId=%s, %s", news_id, body.get("error"))
+        return {"error": body.get("error")}
+    logger.info("[AI] 생성 기사 저장: newsId=%s, originId=%s", news_id, origin_id)
+    tracing.add_metric("SavedArticles", 1)
+    return {
+        "newsId": news_id,
+        "originId": origin_id,
+        "version": article["version"],
+        "createdAt": article["createdAt"],
+        "queued": bool(body.get("queued")),
+    }
+
+@tracing.traced_handler("text_ai_api", default_action="generate")
+@responses.compressed
 def lambda_handler(event, context):
+    # 예약 실행 warm 이벤트 (캐시 미리 채우기, 쌓인 사용량 반영)
+    if prewarm.is_warm_event(event):
+        return prewarm.handle(event, {"Content-Type": "application/json"})
+
     try:
         # 디버깅용 로그
-        print("이벤트 데이터:", event)
+        logger.debug("[AI] 이벤트 데이터: %s", request_log.redacted(event))
         
         # 요청 본문 파싱
         request_body = json.loads(event.get("body", "{}"))
         prompt = request_body.get("prompt")
+        # 세션 안에서 바뀌지 않는 앞부분 (템플릿 예시 등, 프롬프트 캐시 대상)
+        prompt_context = request_body.get("context")
+        passages = None
+
+        # 요청 사용자 (사용량 집계용, authorization 헤더가 없으면 익명)
+        user_id = (event.get("headers") or {}).get("authorization", "")
+        user_info = common.get_user_info(user_id) if user_id else None
+
+        # 프롬프트 없이 생성 요청 항목만 보낸 경우 관련 템플릿 구간을 골라 프롬프트 구성
+        if not prompt and template_retrieval.fields_query(request_body):
+            if not user_info:
+                logger.warning("[AI] 인증되지 않은 사용자")
+                return {
+                    "statusCode": 401,
+                    "body": json.dumps({"message": "인증되지 않은 사용자입니다."}, ensure_ascii=False)
+                }
+            prompt, prompt_context, passages = build_prompt(user_info, request_body)
+            logger.info("[AI] 템플릿 구간 %d개로 프롬프트 구성", len(passages))
         
         # 프롬프트 유효성 검사
         if not prompt:
-            print("프롬프트가 없습니다.")
+            logger.warning("[AI] 프롬프트가 없습니다.")
             return {
                 "statusCode": 400,
                 "body": json.dumps({"message": "프롬프트는 필수 항목입니다."}, ensure_ascii=False)
             }
         
-        print("프롬프트:", prompt[:100] + "..." if len(prompt) > 100 else prompt)
-        
-        # Bedrock API 요청 본문 구성
-        body = json.dumps(
-            {
-                "anthropic_version": "bedrock-2023-05-31",
-                "max_tokens": 10000,
-                "messages": [
-                    {
-                        "role": "user",
-                        "content": [{"type": "text", "text": prompt}],
-                    }
-                ],
+        if prompt_context is not None and not isinstance(prompt_context, str):
+            return {
+                "statusCode": 400,
+                "body": json.dumps({"message": "context는 문자열이어야 합니다."}, ensure_ascii=False)
+            }
+
+        logger.info("[AI] 프롬프트: %d자, context: %d자", len(prompt), len(prompt_context or ""))
+
+        # 병렬 초안 수 (2 이상이면 검사를 통과한 첫 초안 사용)
+        try:
+            draft_count = min(max(int(request_body.get("drafts") or 1), 1), drafts.MAX_COUNT)
+        except (TypeError, ValueError):
+            return {
+                "statusCode": 400,
+                "body": json.dumps({"message": "drafts는 숫자여야 합니다."}, ensure_ascii=False)
             }
-        )
         
-        # Bedrock API 호출
-        print("Bedrock API 호출 시작")
-        response = bedrock_runtime.invoke_model(
-            modelId="anthropic.claude-3-haiku-20240307-v1:0",
-            body=body,
-        )
+        # 모델 선택용 요청 종류와 지연 목표 (없으면 항목 생성은 fields, 프롬프트는 generate)
+        kind = str(request_body.get("kind") or ("fields" if passages is not None else "generate"))
+        try:
+            slo_ms = float(request_body["sloMs"]) if request_body.get("sloMs") else None
+        except (TypeError, ValueError):
+            return {
+                "statusCode": 400,
+                "body": json.dumps({"message": "sloMs는 숫자여야 합니다."}, ensure_ascii=False)
+            }
+
+        # 생성 결과를 기사 테이블에 바로 저장 (브라우저가 본문을 다시 올려 저장하지 않도록)
+        save = request_body.get("save")
+        if save is not None and not isinstance(save, (bool, dict)):
+            return {
+                "statusCode": 400,
+                "body": json.dumps({"message": "save는 true 또는 객체여야 합니다."}, ensure_ascii=False)
+            }
+        if save and not user_info:
+            logger.warning("[AI] 인증되지 않은 사용자의 저장 요청")
+            return {
+                "statusCode": 401,
+                "body": json.dumps({"message": "인증되지 않은 사용자입니다."}, ensure_ascii=False)
+            }
+        if save:
+            save, error_response = resolve_save(user_info, save)
+            if error_response:
+                return error_response
+
+        # Bedrock API 요청 본문 구성
+        request = generation.build_request(prompt, context=prompt_context)
+        limit = deadline(context)
         
-        # 응답 처리
-        response_body = json.loads(response.get("body").read())
-        print("Bedrock API 응답 수신 완료")
+        # Bedrock API 호출 (max_tokens에서 멈추면 이어 쓰기)
+        draft = None
+        if draft_count > 1:
+            logger.info("[AI] 병렬 초안 %d개 요청 시작", draft_count)
+            with tracing.segment("Bedrock.Drafts"):
+                draft = drafts.first_acceptable(
+                    lambda: generation.complete(request, limit, kind, slo_ms),
+                    draft_count,
+                    # 응답 뒤에 끝나는 초안도 토큰은 쓰므로 요청 수 없이 토큰만 집계
+                    on_discarded=lambda usage: usage_meter.record(user_info, usage, requests=0),
+                )
+            response_body = draft["response"]
+        else:
+            logger.info("[AI] Bedrock API 호출 시작")
+            with tracing.segment("Bedrock.InvokeModel"):
+                response_body = generation.complete(request, limit, kind, slo_ms)
+        logger.info("[AI] Bedrock API 응답 수신 완료")
+
+        # 사용량 집계 (병렬 초안은 응답 전에 끝난 초안 전체)
+        if draft is not None:
+            usage_meter.record(user_info, draft["usage"])
+        else:
+            usage_meter.record(user_info, response_body["usage"])
         
         # 결과 반환
         result = {
             "output": response_body["content"][0]["text"],
             "input_tokens": response_body["usage"]["input_tokens"],
             "output_tokens": response_body["usage"]["output_tokens"],
+            "cache_read_input_tokens": response_body["usage"].get("cache_read_input_tokens", 0),
+            "cache_creation_input_tokens": response_body["usage"].get("cache_creation_input_tokens", 0),
+            "stop_reason": response_body.get("stop_reason"),
+            "continuations": response_body["continuations"],
+            "model": response_body.get("model"),
         }
+        tracing.set_property("model", result["model"])
+        tracing.add_metric("InputTokens", result["input_tokens"])
+        tracing.add_metric("OutputTokens", result["output_tokens"])
+        tracing.add_metric("CacheReadInputTokens", result["cache_read_input_tokens"])
+        tracing.add_metric("CacheWriteInputTokens", result["cache_creation_input_tokens"])
+        tracing.add_metric("Continuations", result["continuations"])
+        if result["stop_reason"] == "max_tokens":
+            tracing.add_metric("Truncated", 1)
+        if draft is not None:
+            result["drafts"] = {key: draft[key] for key in ("launched", "completed", "failed", "problems")}
+            tracing.add_metric("DraftInputTokens", draft["inputTokens"])
+            tracing.add_metric("DraftOutputTokens", draft["outputTokens"])
+        if passages is not None:
+            result["templates"] = [
+                {key: passage[key] for key in ("fileId", "fileName", "passage", "score")}
+                for passage in passages
+            ]
+        if save:
+            result["saved"] = save_generated(user_info, save, result)
         
         return {
             "statusCode": 200,
             "body": json.dumps(result, ensure_ascii=False)
         }
     except Exception as e:
-        print("오류 발생:", str(e))
+        logger.error("[AI] 오류 발생: %s", e, exc_info=True)
         return {
             "statusCode": 500,
             "body": json.dumps({"message": f"오류 발생: {str(e)}"}, ensure_ascii=False)
-        }
\ No newline at end of file
+        }
+    finally:
+        init_profiler.report_once("[AI]")
\ No newline at end of file
@@ -0,0 +1,253 @@
+"""
+요청 단위 지연 시간 추적 - CloudWatch EMF(Embedded Metric Format) 출력
+
+    @tracing.traced_handler('get_pdf_list')
+    def lambda_handler(event, context):
+        ...
+
+    @tracing.traced('get_user_info')
+    def get_user_info(user_id):
+        with tracing.segment('dynamodb.get_item'):
+            ...
+
+요청이 끝나면 구간별 소요 시간, 콜드/웜 여부, 페이로드 크기, 토큰 수 등을
+EMF JSON 한 줄로 stdout에 출력한다. CloudWatch는 이 로그 줄에서 지표를 추출하므로
+Service/Action 차원별 p50/p99 차트를 바로 만들 수 있다. 이 줄은 요청 요약 로그도 겸한다.
+
+스레드 풀에 넘기는 호출은 wrap()으로 넘긴 시점의 요청에 묶는다. 응답 뒤에 끝나는 호출(버린 초안,
+기다리지 않는 후속 갱신)의 구간은 이미 출력한 요청에 기록되고 다음 요청의 지표에 섞이지 않는다.
+
+환경 변수
+    TRACING_ENABLED     0이면 EMF 지표 메타데이터 없이 요약 줄만 출력 (기본 1)
+    METRICS_NAMESPACE   EMF 네임스페이스 (기본 BlacKnight)
+"""
+import functools
+import json
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+
+import aws_clients
+import request_log
+
+ENABLED = os.environ.get('TRACING_ENABLED', '1') == '1'
+NAMESPACE = os.environ.get('METRICS_NAMESPACE', 'BlacKnight')
+
+# EMF 지시문 하나에 담을 수 있는 최대 지표 수
+MAX_METRICS = 100
+
+# 컨테이너의 첫 요청 여부
+_cold_start = True
+
+# 현재 처리 중인 요청 (Lambda 컨테이너는 한 번에 한 요청만 처리)
+_current = None
+
+# 풀 스레드에서 wrap()으로 묶은 요청 (묶지 않은 스레드는 _current 사용)
+_bound = threading.local()
+_UNBOUND = object()
+
+
+class Trace:
+    """
+    요청 하나의 구간 시간/지표 모음
+    """
+
+    def __init__(self, service, action, cold_start):
+        self.service = service
+        self.action = action
+        self.cold_start = cold_start
+        self.started_at = time.perf_counter()
+        self.segments = {}
+        self.metrics = {}
+        self.properties = {}
+        self._lock = threading.Lock()
+
+    def add_segment(self, name, duration_ms):
+        with self._lock:
+            count, total = self.segments.get(name, (0, 0.0))
+            self.segments[name] = (count + 1, total + duration_ms)
+
+    def add_metric(self, name, value, unit='Count'):
+        with self._lock:
+            previous = self.metrics.get(name, (0, unit))[0]
+            self.metrics[name] = (previous + value, unit)
+
+    def to_emf(self, duration_ms):
+        metric_values = {
+            'Duration': (round(duration_ms, 3), 'Milliseconds'),
+            'ColdStart': (1 if self.cold_start else 0, 'Count'),
+        }
+        for name, (count, total) in self.segments.items():
+            metric_values[f"{name}.Duration"] = (round(total, 3), 'Milliseconds')
+            if count > 1:
+                self.properties[f"{name}.Calls"] = count
+        metric_values.update(self.metrics)
+
+        names = list(metric_values)[:MAX_METRICS]
+        record = {
+            '_aws': {
+                'Timestamp': int(time.time() * 1000),
+                'CloudWatchMetrics': [{
+                    'Namespace': NAMESPACE,
+                    'Dimensions': [['Service', 'Action']],
+                    'Metrics': [{'Name': name, 'Unit': metric_values[name][1]} for name in names],
+                }],
+            },
+            'Service': self.service,
+            'Action': self.action or 'unknown',
+        }
+        for name in names:
+            record[name] = metric_values[name][0]
+        record.update(self.properties)
+        return record
+
+
+def current():
+    """
+    현재 요청의 Trace (요청 처리 중이 아니면 None)
+    """
+    return getattr(_bound, 'trace', _current)
+
+
+def wrap(func):
+    """
+    지금 요청의 Trace에 묶어 실행하는 func (스레드 풀에 넘길 때 사용)
+    """
+    trace = current()
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        previous = getattr(_bound, 'trace', _UNBOUND)
+        _bound.trace = trace
+        try:
+            return func(*args, **kwargs)
+        finally:
+            if previous is _UNBOUND:
+                del _bound.trace
+            else:
+                _bound.trace = previous
+    return wrapper
+
+
+@contextmanager
+def segment(name):
+    """
+    I/O 호출 구간 시간 측정
+    """
+    trace = current()
+    if trace is None:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        trace.add_segment(name, (time.perf_counter() - start) * 1000)
+
+
+def traced(name):
+    """
+    함수 전체를 하나의 구간으로 측정하는 데코레이터
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with segment(name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def add_metric(name, value, unit='Count'):
+    """
+    현재 요청에 지표 추가 (같은 이름은 합산)
+    """
+    trace = current()
+    if trace is not None:
+        trace.add_metric(name, value, unit)
+
+
+def set_property(name, value):
+    """
+    지표가 아닌 검색용 속성 추가 (요청 ID, 상태 코드 등)
+    """
+    trace = current()
+    if trace is not None:
+        trace.properties[name] = value
+
+
+def set_action(action):
+    """
+    라우팅 후 확정된 액션 이름 기록
+    """
+    trace = current()
+    if trace is not None:
+        trace.action = action
+
+
+def _aws_retries():
+    return sum(values.get('retries', 0) for values in aws_clients.metrics().values())
+
+
+def _event_action(event):
+    query_params = event.get('queryStringParameters') or {}
+    return query_params.get('action', '')
+
+
+def emit(record):
+    """
+    EMF 레코드를 로그 한 줄로 출력 (로거 접두사 없이 stdout에 직접 기록)
+    """
+    sys.stdout.write(json.dumps(record, ensure_ascii=False) + '\n')
+    sys.stdout.flush()
+
+
+def traced_handler(service, default_action=''):
+    """
+    Lambda 핸들러 데코레이터 - 요청 시작/종료와 EMF 출력 처리
+    """
+    def decorator(handler):
+        @functools.wraps(handler)
+        def wrapper(event, context):
+            global _cold_start, _current
+            event = event or {}
+            action = _event_action(event) or default_action
+            sampled = request_log.begin(action)
+            trace = Trace(service, action, _cold_start)
+            _cold_start = False
+            _current = trace
+            retries_before = _aws_retries()
+
+            request_body = event.get('body') or ''
+            trace.add_metric('RequestBytes', len(request_body.encode('utf-8')), 'Bytes')
+            request_id = getattr(context, 'aws_request_id', None)
+            if request_id:
+                trace.properties['requestId'] = request_id
+
+            response = None
+            try:
+                response = handler(event, context)
+                return response
+            finally:
+                _current = None
+                duration_ms = (time.perf_counter() - trace.started_at) * 1000
+                if isinstance(response, dict):
+                    trace.properties['statusCode'] = response.get('statusCode')
+                    response_body = response.get('body') or ''
+                    trace.add_metric('ResponseBytes', len(response_body.encode('utf-8')), 'Bytes')
+                    if (response.get('statusCode') or 500) >= 500:
+                        trace.add_metric('Errors', 1)
+                else:
+                    trace.add_metric('Errors', 1)
+                trace.add_metric('AwsRetries', _aws_retries() - retries_before)
+                trace.properties['sampled'] = sampled
+                trace.properties.update(request_log.event_summary(event))
+                record = trace.to_emf(duration_ms)
+                if not ENABLED:
+                    record.pop('_aws')
+                emit(record)
+                request_log.end()
+        return wrapper
+    return decorator
@@ -0,0 +1,204 @@
+"""
+Bedrock 토큰 사용량 집계 - 사용자/조직별 일 단위 합계
+
+text_ai_api가 요청마다 record()로 컨테이너 메모리에 더해 두고, 마지막 반영 후
+USAGE_FLUSH_INTERVAL초가 지났거나 쌓인 키가 USAGE_FLUSH_MAX_KEYS개 이상이 되면
+키마다 UpdateItem(ADD) 한 번으로 반영한다. ADD는 원자적으로 증가하므로 여러 컨테이너가
+동시에 반영해도 합계가 맞고, 요청마다 쓰기가 생기지 않는다.
+record()가 시작하는 반영은 키별 UpdateItem을 concurrency 스레드 풀에 넘기고 기다리지 않으므로
+임계값을 넘긴 요청의 응답도 늦추지 않는다. 응답 뒤 컨테이너가 멈추면 남은 쓰기는 다음 호출 때
+이어지고, 실패한 키는 버퍼로 돌아가 다음 반영 때 다시 쓴다.
+예약 실행 warm 이벤트(prewarm.is_warm_event)를 받으면 text_ai_api가 flush()로 기다리며 반영한다.
+컨테이너가 종료되면 마지막 반영 이후 값(최대 USAGE_FLUSH_INTERVAL초 분량)은 유실될 수 있다.
+
+저장 구조 (USAGE_TABLE, 파티션 키 usageKey, 정렬 키 day, GSI OrganizationDayIndex(memberOf, day))
+    usageKey = org#{organization} 또는 user#{userId}, day = YYYY-MM-DD (UTC)
+    requests, inputTokens, outputTokens : ADD로 증가
+    cacheReadTokens, cacheWriteTokens   : 프롬프트 캐시에서 읽은/캐시에 쓴 입력 토큰 (inputTokens와 별도)
+    memberOf : 사용자 항목에만 있는 소속 조직 (조직별 사용자 목록 조회용 sparse GSI)
+
+환경 변수
+    USAGE_TABLE             사용량 테이블 (기본 TokenUsage)
+    USAGE_FLUSH_INTERVAL    반영 주기(초, 기본 60, 0이면 요청마다 반영)
+    USAGE_FLUSH_MAX_KEYS    이 수 이상의 키가 쌓이면 바로 반영 (기본 50)
+"""
+import logging
+import os
+import threading
+import time
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+
+import aws_clients
+import concurrency
+import tracing
+
+logger = logging.getLogger()
+
+USAGE_TABLE = os.environ.get('USAGE_TABLE', 'TokenUsage')
+FLUSH_INTERVAL = float(os.environ.get('USAGE_FLUSH_INTERVAL', '60'))
+FLUSH_MAX_KEYS = int(os.environ.get('USAGE_FLUSH_MAX_KEYS', '50'))
+
+# Bedrock usage 필드 -> 사용량 테이블 속성
+FIELDS = {
+    'input_tokens': 'inputTokens',
+    'output_tokens': 'outputTokens',
+    'cache_read_input_tokens': 'cacheReadTokens',
+    'cache_creation_input_tokens': 'cacheWriteTokens',
+}
+ATTRIBUTES = ('requests',) + tuple(FIELDS.values())
+
+# (usageKey, day) -> Counter, 사용자 항목의 소속 조직
+_buffer = {}
+_member_of = {}
+_last_flush = time.monotonic()
+_lock = threading.Lock()
+
+
+def organization_key(organization):
+    return f"org#{organization}"
+
+
+def user_key(user_id):
+    return f"user#{user_id}"
+
+
+def today():
+    return datetime.now(timezone.utc).strftime('%Y-%m-%d')
+
+
+def record(user_info, usage, requests=1):
+    """
+    요청 하나의 사용량을 메모리에 더하고 임계값을 넘으면 반영 - 실패해도 요청에는 영향 없음
+    """
+    try:
+        user_info = user_info or {}
+        organization = user_info.get('organization') or 'unknown'
+        user_id = user_info.get('id') or 'anonymous'
+        values = Counter({'requests': requests})
+        for field, attribute in FIELDS.items():
+            values[attribute] += int(usage.get(field, 0) or 0)
+
+        day = today()
+        with _lock:
+            for key in (organization_key(organization), user_key(user_id)):
+                _buffer.setdefault((key, day), Counter()).update(values)
+            _member_of[(user_key(user_id), day)] = organization
+            due = time.monotonic() - _last_flush >= FLUSH_INTERVAL or len(_buffer) >= FLUSH_MAX_KEYS
+        if due:
+            flush(wait=False)
+    except Exception as e:
+        logger.error("[USAGE] 사용량 기록 실패: %s", e, exc_info=True)
+
+
+def flush(wait=True):
+    """
+    쌓인 사용량을 키마다 ADD로 반영 (키별 UpdateItem은 동시에, 실패한 키는 다음 반영 때 다시 시도)
+
+    wait=False면 쓰기를 스레드 풀에 넘기기만 하고 넘긴 키 수를 돌려줌 (요청 경로용)
+    """
+    global _buffer, _member_of, _last_flush
+    with _lock:
+        pending, member_of = _buffer, _member_of
+        _buffer, _member_of = {}, {}
+        _last_flush = time.monotonic()
+    if not pending:
+        return 0
+
+    now = datetime.now(timezone.utc).isoformat()
+    calls = {
+        (key, day): (lambda key=key, day=day, values=values:
+                     _write(key, day, values, member_of.get((key, day)), now))
+        for (key, day), values in pending.items()
+    }
+    if not wait:
+        for call in calls.values():
+            concurrency.submit(call)
+        logger.info("[USAGE] 사용량 반영 시작: %s건", len(calls))
+        return len(calls)
+
+    written = sum(1 for ok in concurrency.gather(calls).values() if ok)
+    logger.info("[USAGE] 사용량 반영: %s/%s건", written, len(pending))
+    return written
+
+
+def _write(key, day, values, member_of, now):
+    """
+    키 하나 반영 - 실패하면 값을 버퍼로 되돌리고 False
+    """
+    names = [attribute for attribute in ATTRIBUTES if values.get(attribute)]
+    if not names:
+        return True
+    expression = 'ADD ' + ', '.join(f"{name} :{name}" for name in names) + ' SET updatedAt = :now'
+    attribute_values = {f":{name}": values[name] for name in names}
+    attribute_values[':now'] = now
+    if member_of is not None:
+        expression += ', memberOf = :org'
+        attribute_values[':org'] = member_of
+    try:
+        with tracing.segment('UsageTable.UpdateItem'):
+            aws_clients.dynamodb().Table(USAGE_TABLE).update_item(
+                Key={'usageKey': key, 'day': day},
+                UpdateExpression=expression,
+                ExpressionAttributeValues=attribute_values
+            )
+        return True
+    except Exception as e:
+        logger.error("[USAGE] 사용량 반영 실패: %s %s, %s", key, day, e)
+        with _lock:
+            _buffer.setdefault((key, day), Counter()).update(values)
+            if member_of is not None:
+                _member_of[(key, day)] = member_of
+        return False
+
+
+def _query_all(**kwargs):
+    table = aws_clients.dynamodb().Table(USAGE_TABLE)
+    while True:
+        with tracing.segment('UsageTable.Query'):
+            response = table.query(**kwargs)
+        yield from response.get('Items', [])
+        if 'LastEvaluatedKey' not in response:
+            return
+        kwargs['ExclusiveStartKey'] = response['LastEvaluatedKey']
+
+
+def _totals(items):
+    return {attribute: sum(int(item.get(attribute, 0)) for item in items) for attribute in ATTRIBUTES}
+
+
+def organization_report(organization, start_day, end_day):
+    """
+    조직의 일별 사용량, 기간 합계, 사용자별 합계(출력 토큰 내림차순)
+    """
+    days = list(_query_all(
+        KeyConditionExpression='usageKey = :key AND #day BETWEEN :start AND :end',
+        ExpressionAttributeNames={'#day': 'day'},
+        ExpressionAttributeValues={':key': organization_key(organization), ':start': start_day, ':end': end_day}
+    ))
+    members = list(_query_all(
+        IndexName='OrganizationDayIndex',
+        KeyConditionExpression='memberOf = :org AND #day BETWEEN :start AND :end',
+        ExpressionAttributeNames={'#day': 'day'},
+        ExpressionAttributeValues={':org': organization, ':start': start_day, ':end': end_day}
+    ))
+
+    by_user = {}
+    for item in members:
+        by_user.setdefault(item['usageKey'].split('#', 1)[1], []).append(item)
+    users = [dict(_totals(items), userId=user_id) for user_id, items in by_user.items()]
+    users.sort(key=lambda entry: (-entry['outputTokens'], entry['userId']))
+
+    return {
+        'organization': organization,
+        'from': start_day,
+        'to': end_day,
+        'days': [dict(_totals([item]), day=item['day']) for item in sorted(days, key=lambda item: item['day'])],
+        'total': _totals(days),
+        'users': users,
+    }
+
+
+def default_range(days=30):
+    end = datetime.now(timezone.utc)
+    return (end - timedelta(days=days - 1)).strftime('%Y-%m-%d'), end.strftime('%Y-%m-%d')